@@ -10,43 +10,57 @@ import argparse
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List, Set, Any, Optional
+from typing import List, Set, Optional
 
 # Import the shared data loader
 try:
     from ..shared.durc_data_loader import DurcDataLoader
+    from ..shared.durc_relational_model import DurcRelationalModel, DurcTable
+    from ..shared.durc_table_matcher import DurcTableMatcher
 except ImportError:
     # Handle case when running as standalone script
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
     from shared.durc_data_loader import DurcDataLoader
+    from shared.durc_relational_model import DurcRelationalModel, DurcTable
+    from shared.durc_table_matcher import DurcTableMatcher
 
 
 class ForeignKeyGenerator:
     """Generates PostgreSQL foreign key statements from DURC relational model."""
     
     @staticmethod
-    def generate_foreign_keys(input_json_file: str, output_sql_file: str) -> None:
+    def generate_foreign_keys(input_json_file: str, output_sql_file: str, include: Optional[List[str]] = None,
+                              exclude: Optional[List[str]] = None) -> None:
         """
         Main method to generate foreign key statements.
         
         Args:
             input_json_file (str): Path to input JSON file
             output_sql_file (str): Path to output SQL file
+            include (list): Optional db, db.schema or db.schema.table patterns (globs allowed)
+                selecting the tables to process (default: every table)
+            exclude (list): Optional patterns for tables to leave out
         """
+        try:
+            table_matcher = DurcTableMatcher.from_strings(include, exclude)
+        except ValueError as e:
+            print(f"Error: Invalid pattern: {e}", file=sys.stderr)
+            sys.exit(1)
+        
         print(f"Loading relational model from: {input_json_file}")
         
         # Load the relational model using shared data loader
         data_loader = DurcDataLoader()
         try:
-            relational_model = data_loader.load_relational_model(input_json_file)
+            relational_model = data_loader.load_model(input_json_file, databases=table_matcher.databases)
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
         
         # Generate foreign key statements
-        foreign_key_statements = ForeignKeyGenerator._generate_foreign_key_statements(relational_model)
+        foreign_key_statements = ForeignKeyGenerator._generate_foreign_key_statements(relational_model, table_matcher)
         
         # Ensure output directory exists
         output_dir = os.path.dirname(output_sql_file)
@@ -60,12 +74,14 @@ class ForeignKeyGenerator:
         print(f"Output written to: {output_sql_file}")
     
     @staticmethod
-    def _generate_foreign_key_statements(relational_model: Dict[str, Any]) -> List[str]:
+    def _generate_foreign_key_statements(relational_model: DurcRelationalModel,
+                                         table_matcher: Optional[DurcTableMatcher] = None) -> List[str]:
         """
         Generate foreign key statements from the relational model.
         
         Args:
-            relational_model (dict): The loaded JSON relational model
+            relational_model (DurcRelationalModel): The loaded relational model
+            table_matcher (DurcTableMatcher): Optional filter for the tables to process
             
         Returns:
             list: List of SQL foreign key statements
@@ -74,111 +90,92 @@ class ForeignKeyGenerator:
         processed_constraints: Set[str] = set()
         
         # Process each database in the model
-        for db_name, schemas_or_tables in relational_model.items():
-            if not isinstance(schemas_or_tables, dict):
-                continue
-                
-            print(f"Processing database: {db_name}")
+        for database in relational_model.databases.values():
+            print(f"Processing database: {database.name}")
             
-            # Check if this is a schema-based structure or direct table structure
-            for schema_or_table_name, schema_or_table_info in schemas_or_tables.items():
-                if not isinstance(schema_or_table_info, dict):
+            # Tables of databases without a schema layer
+            for table in database.tables.values():
+                if table_matcher is not None and not table_matcher.matches_table(table):
                     continue
-                
-                # Check if this looks like a schema (contains tables) or a direct table
-                if 'table_name' in schema_or_table_info:
-                    # This is a direct table
-                    table_name = schema_or_table_name
-                    table_info = schema_or_table_info
-                    print(f"  Processing table: {table_name}")
-                    ForeignKeyGenerator._process_table(db_name, table_name, table_info, foreign_key_statements, processed_constraints, None)
-                else:
-                    # This is a schema containing tables
-                    schema_name = schema_or_table_name
-                    print(f"  Processing schema: {schema_name}")
-                    
-                    for table_name, table_info in schema_or_table_info.items():
-                        if not isinstance(table_info, dict):
-                            continue
-                        
-                        print(f"    Processing table: {table_name}")
-                        ForeignKeyGenerator._process_table(db_name, table_name, table_info, foreign_key_statements, processed_constraints, schema_name)
+                print(f"  Processing table: {table.name}")
+                ForeignKeyGenerator._process_table(table, foreign_key_statements, processed_constraints)
+            
+            # Tables of databases with a schema layer (PostgreSQL)
+            for schema in database.schemas.values():
+                print(f"  Processing schema: {schema.name}")
+                for table in schema.tables.values():
+                    if table_matcher is not None and not table_matcher.matches_table(table):
+                        continue
+                    print(f"    Processing table: {table.name}")
+                    ForeignKeyGenerator._process_table(table, foreign_key_statements, processed_constraints)
         
         return foreign_key_statements
     
     @staticmethod
-    def _process_table(db_name: str, table_name: str, table_info: Dict[str, Any], 
-                      foreign_key_statements: List[str], processed_constraints: Set[str],
-                      schema_name: Optional[str] = None) -> None:
+    def _process_table(table: DurcTable, foreign_key_statements: List[str],
+                      processed_constraints: Set[str]) -> None:
         """
         Process a single table for foreign key relationships.
         
         Args:
-            db_name (str): Database name
-            table_name (str): Table name
-            table_info (dict): Table information from JSON
+            table (DurcTable): Table to process
             foreign_key_statements (list): List to append generated statements to
             processed_constraints (set): Set of processed constraints to avoid duplicates
-            schema_name (str): Schema name (optional)
         """
         # Process belongs_to relationships (foreign keys in this table)
-        belongs_to = table_info.get('belongs_to', {})
-        print(f"    Found {len(belongs_to)} belongs_to relationships")
-        for relationship_name, relationship_info in belongs_to.items():
-            print(f"    Processing relationship: {relationship_name} -> {relationship_info}")
+        print(f"    Found {len(table.belongs_to)} belongs_to relationships")
+        for relationship in table.belongs_to.values():
+            print(f"    Processing relationship: {relationship.name} -> {relationship.to_table}")
             try:
                 fk_statement = ForeignKeyGenerator._create_foreign_key_statement(
-                    db_name, table_name, relationship_info, processed_constraints, schema_name
+                    table, relationship.local_key, relationship.to_db, relationship.to_table,
+                    processed_constraints, relationship.to_schema
                 )
                 if fk_statement:
                     foreign_key_statements.append(fk_statement)
-                    print(f"    Generated FK: {relationship_name}")
+                    print(f"    Generated FK: {relationship.name}")
             except Exception as e:
-                print(f"    Warning: Skipping relationship {relationship_name}: {e}")
+                print(f"    Warning: Skipping relationship {relationship.name}: {e}")
         
         # Also process existing foreign keys from column metadata
-        column_data = table_info.get('column_data', [])
-        print(f"    Found {len(column_data)} columns")
-        for column in column_data:
+        print(f"    Found {len(table.columns)} columns")
+        for column in table.columns:
             # Check for both is_foreign_key and is_linked_key
-            is_fk = column.get('is_foreign_key', False)
-            is_linked = column.get('is_linked_key', False)
-            has_foreign_table = column.get('foreign_table') is not None
-            print(f"    Column {column.get('column_name')}: is_foreign_key={is_fk}, is_linked_key={is_linked}, foreign_table={column.get('foreign_table')}")
+            print(f"    Column {column.name}: is_foreign_key={column.is_foreign_key}, is_linked_key={column.is_linked_key}, foreign_table={column.foreign_table}")
             
-            if (is_fk or is_linked) and has_foreign_table:
+            if (column.is_foreign_key or column.is_linked_key) and column.foreign_table is not None:
                 try:
-                    fk_statement = ForeignKeyGenerator._create_foreign_key_from_column(
-                        db_name, table_name, column, processed_constraints, schema_name
+                    fk_statement = ForeignKeyGenerator._create_foreign_key_statement(
+                        table, column.name, column.foreign_db, column.foreign_table, processed_constraints
                     )
                     if fk_statement:
                         foreign_key_statements.append(fk_statement)
-                        print(f"    Generated FK from column: {column['column_name']}")
+                        print(f"    Generated FK from column: {column.name}")
                 except Exception as e:
-                    print(f"    Warning: Skipping column FK {column.get('column_name')}: {e}")
+                    print(f"    Warning: Skipping column FK {column.name}: {e}")
     
     @staticmethod
-    def _create_foreign_key_statement(db_name: str, table_name: str, 
-                                    relationship_info: Dict[str, Any], 
-                                    processed_constraints: Set[str],
-                                    schema_name: Optional[str] = None) -> Optional[str]:
+    def _create_foreign_key_statement(table: DurcTable, local_key: Optional[str], to_db: Optional[str],
+                                    to_table: Optional[str], processed_constraints: Set[str],
+                                    to_schema: Optional[str] = None) -> Optional[str]:
         """
-        Create a foreign key statement from relationship information.
+        Create a foreign key statement for one key column.
         
         Args:
-            db_name (str): Source database name
-            table_name (str): Source table name
-            relationship_info (dict): Relationship information from JSON
+            table (DurcTable): Source table
+            local_key (str): Column in the source table holding the key
+            to_db (str): Database of the referenced table (default: the source database)
+            to_table (str): Referenced table
             processed_constraints (set): Set of already processed constraints to avoid duplicates
+            to_schema (str): Schema of the referenced table, if it is in another schema
             
         Returns:
             str: SQL ALTER TABLE statement or None if invalid/duplicate
         """
-        # Extract relationship details
-        local_key = relationship_info.get('local_key')
-        to_table = relationship_info.get('to_table')
-        to_db = relationship_info.get('to_db', db_name)
-        to_schema = relationship_info.get('to_schema')
+        db_name = table.database.name
+        schema_name = table.schema_name
+        table_name = table.name
+        to_db = to_db or db_name
         
         if not local_key or not to_table:
             raise ValueError(f"Missing local_key or to_table in relationship")
@@ -186,22 +183,23 @@ class ForeignKeyGenerator:
         # Determine target column (assume 'id' if not specified)
         target_column = 'id'  # Most foreign keys reference the primary key 'id'
         
-        # Create unique identifier for this foreign key relationship to avoid duplicates
-        # Use source table, column, and target table to identify unique relationships
+        # Build source table reference - use schema_name if available, otherwise db_name
         if schema_name:
             source_table_ref = f"{schema_name}.{table_name}"
         else:
             source_table_ref = f"{db_name}.{table_name}"
         
-        # Build target table reference for uniqueness check
+        # Build target table reference - use to_schema if available, otherwise use schema_name or db_name
         if to_schema:
             target_table_ref = f"{to_schema}.{to_table}"
         elif schema_name:
+            # If no to_schema specified but we have a schema_name, assume same schema
             target_table_ref = f"{schema_name}.{to_table}"
         else:
             target_table_ref = f"{to_db}.{to_table}"
         
-        # Create unique relationship identifier
+        # Create unique relationship identifier to avoid duplicates
+        # Use source table, column, and target table to identify unique relationships
         relationship_id = f"{source_table_ref}.{local_key} -> {target_table_ref}.{target_column}"
         
         # Check if this exact relationship already exists
@@ -212,21 +210,6 @@ class ForeignKeyGenerator:
         # Create constraint name using standard convention
         constraint_name = f"fk_{table_name}_{local_key}"
         
-        # Build source table reference - use schema_name if available, otherwise db_name
-        if schema_name:
-            source_table_ref = f"{schema_name}.{table_name}"
-        else:
-            source_table_ref = f"{db_name}.{table_name}"
-        
-        # Build target table reference - use to_schema if available, otherwise use schema_name or db_name
-        if to_schema:
-            target_table_ref = f"{to_schema}.{to_table}"
-        elif schema_name:
-            # If no to_schema specified but we have a schema_name, assume same schema
-            target_table_ref = f"{schema_name}.{to_table}"
-        else:
-            target_table_ref = f"{to_db}.{to_table}"
-        
         # Generate the ALTER TABLE statement
         sql_statement = (
             f"ALTER TABLE {source_table_ref} "
@@ -237,41 +220,6 @@ class ForeignKeyGenerator:
         
         return sql_statement
     
-    @staticmethod
-    def _create_foreign_key_from_column(db_name: str, table_name: str, 
-                                      column: Dict[str, Any], 
-                                      processed_constraints: Set[str],
-                                      schema_name: Optional[str] = None) -> Optional[str]:
-        """
-        Create a foreign key statement from column metadata.
-        
-        Args:
-            db_name (str): Source database name
-            table_name (str): Source table name
-            column (dict): Column information from JSON
-            processed_constraints (set): Set of already processed constraints to avoid duplicates
-            
-        Returns:
-            str: SQL ALTER TABLE statement or None if invalid/duplicate
-        """
-        column_name = column.get('column_name')
-        foreign_table = column.get('foreign_table')
-        foreign_db = column.get('foreign_db', db_name)
-        
-        if not column_name or not foreign_table:
-            raise ValueError(f"Missing column_name or foreign_table in column")
-        
-        # Create a relationship info dict to reuse existing logic
-        relationship_info = {
-            'local_key': column_name,
-            'to_table': foreign_table,
-            'to_db': foreign_db
-        }
-        
-        return ForeignKeyGenerator._create_foreign_key_statement(
-            db_name, table_name, relationship_info, processed_constraints, schema_name
-        )
-    
     @staticmethod
     def _write_sql_file(output_sql_file: str, foreign_key_statements: List[str], 
                        input_json_file: str) -> None:
@@ -322,6 +270,7 @@ Examples:
   durc-mine-fkeys
   durc-mine-fkeys --input_json_file custom/model.json
   durc-mine-fkeys --input_json_file model.json --output_sql_file fkeys.sql
+  durc-mine-fkeys --include 'npd.public.provider_*' --exclude 'npd.*.*_archive'
         """
     )
     
@@ -339,10 +288,25 @@ Examples:
         help='Output SQL file for foreign key statements (default: durc_config/foreign_keys.sql)'
     )
     
+    parser.add_argument(
+        '--include',
+        nargs='+',
+        type=str,
+        help='Only process these databases, schemas, or tables, in the format: db.schema.table, db.schema, or db '
+             '(every part may be a glob; default: every table)'
+    )
+    
+    parser.add_argument(
+        '--exclude',
+        nargs='+',
+        type=str,
+        help='Leave out matching schemas or tables, in the same format as --include'
+    )
+    
     args = parser.parse_args()
     
     # Create and run the foreign key generator
-    ForeignKeyGenerator.generate_foreign_keys(args.input_json_file, args.output_sql_file)
+    ForeignKeyGenerator.generate_foreign_keys(args.input_json_file, args.output_sql_file, args.include, args.exclude)
 
 
 if __name__ == '__main__':
@@ -1,6 +1,10 @@
 import os
 import json
 from django.core.management.base import BaseCommand, CommandError
+from .durc_utils.compile_engine import DURC_CompileEngine
+from .durc_utils.compile_manifest import DURC_CompileManifest
+from .durc_utils.template_loader import DURC_TemplateLoader
+from ...shared.durc_data_loader import DurcDataLoader
 
 class Command(BaseCommand):
     help = 'Compile DURC relational model into code artifacts'
@@ -9,7 +13,7 @@ class Command(BaseCommand):
         parser.add_argument(
             '--input_json_file',
             type=str,
-            help='Specify the input DURC relational model JSON file (default: durc_config/DURC_relational_model.json)'
+            help='Specify the input DURC relational model JSON or .durcpack file (default: durc_config/DURC_relational_model.json)'
         )
         parser.add_argument(
             '--output_dir',
@@ -19,13 +23,24 @@ class Command(BaseCommand):
         parser.add_argument(
             '--template_dir',
             type=str,
-            help='Specify a custom template directory (default: built-in templates)'
+            help='Specify a directory of custom templates, overriding the built-in templates of the same name'
         )
         parser.add_argument(
             '--config_file',
             type=str,
             help='Specify a custom configuration file for code generation'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes rendering tables in parallel (default: 1)'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Render every table, ignoring the manifest of the previous compile'
+        )
 
     def handle(self, *args, **options):
         # Get the input JSON file path
@@ -37,6 +52,14 @@ class Command(BaseCommand):
         if not os.path.exists(input_json_file):
             raise CommandError(f"Input file {input_json_file} does not exist. Run durc_mine first.")
         
+        workers = options.get('workers') or 1
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
+        
+        template_dir = options.get('template_dir')
+        if template_dir and not os.path.isdir(template_dir):
+            raise CommandError(f"Template directory {template_dir} does not exist")
+        
         # Get the output directory
         output_dir = options.get('output_dir')
         if not output_dir:
@@ -45,22 +68,39 @@ class Command(BaseCommand):
         # Create the output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Load the relational model
+        # Load the table entries of the relational model
         try:
-            with open(input_json_file, 'r') as f:
-                relational_model = json.load(f)
+            with DurcDataLoader().open_relational_model(input_json_file) as relational_model:
+                tables = list(relational_model.iter_tables())
         except json.JSONDecodeError:
             raise CommandError(f"Failed to parse {input_json_file} as JSON")
         except Exception as e:
             raise CommandError(f"Error reading {input_json_file}: {e}")
         
-        # TODO: Implement the actual code generation logic
-        self.stdout.write("DURC compile command is not yet implemented")
-        self.stdout.write(f"Would compile {input_json_file} to {output_dir}")
+        # Compiled templates are cached by content hash, so only new or edited templates are compiled
+        templates = DURC_TemplateLoader(template_dir, cache_dir=DURC_TemplateLoader.DEFAULT_CACHE_DIR)
+        try:
+            templates.compile_all()
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Error loading templates: {e}")
+        
+        # Tables whose entries (and related tables' entries) are unchanged since the last
+        # compile are skipped, unless --full is given
+        if options.get('full'):
+            manifest = DURC_CompileManifest(output_dir, templates=templates)
+        else:
+            manifest = DURC_CompileManifest.load(DURC_CompileManifest.DEFAULT_PATH, output_dir, templates=templates)
         
-        # For now, just write a placeholder file to show the command ran
-        with open(os.path.join(output_dir, 'durc_compile_placeholder.txt'), 'w') as f:
-            f.write(f"DURC compile command was run with input file: {input_json_file}\n")
-            f.write(f"This is a placeholder file. Actual code generation is not yet implemented.\n")
+        # Render the out-of-date tables, in parallel with --workers, then write the shared index files
+        result = DURC_CompileEngine(output_dir, workers=workers, manifest=manifest, templates=templates).compile(tables)
+        manifest.save(DURC_CompileManifest.DEFAULT_PATH)
         
-        self.stdout.write(self.style.SUCCESS(f"DURC compile command completed"))
+        self.stdout.write(
+            f"Compiled {result.table_count} tables in {result.elapsed:.2f}s "
+            f"({result.tables_per_second:.0f} tables/s, {result.workers} worker{'s' if result.workers != 1 else ''}): "
+            f"rendered {result.tables_rendered}, {result.table_count - result.tables_rendered} up to date, "
+            f"wrote {result.files_written} files"
+        )
+        if result.files_removed:
+            self.stdout.write(f"Removed {result.files_removed} generated files of tables no longer in the model")
+        self.stdout.write(self.style.SUCCESS(f"Successfully compiled {input_json_file} to {output_dir}"))
@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand, CommandError
 from .durc_utils.sql_parser import DURC_SQLParser
 from .durc_utils.diagram_section_parser import DURC_DiagramSectionParser
 from .durc_utils.mermaid_generator import DURC_MermaidGenerator
+from ...shared.durc_table_matcher import DurcTableMatcher
 
 class Command(BaseCommand):
     help = 'Generate Mermaid diagrams from CREATE TABLE SQL statements'
@@ -21,6 +22,19 @@ class Command(BaseCommand):
             required=True,
             help='Output markdown file path for the generated diagram'
         )
+        parser.add_argument(
+            '--include',
+            nargs='+',
+            type=str,
+            help='Only draw matching tables, in the format: db.schema.table, db.schema, or db. Every part may be a glob. '
+                 'Tables parsed from SQL files have no database, so the database part is not compared'
+        )
+        parser.add_argument(
+            '--exclude',
+            nargs='+',
+            type=str,
+            help='Leave out matching tables, in the same format as --include'
+        )
 
     def handle(self, *args, **options):
         sql_files = options.get('sql_files', [])
@@ -32,6 +46,13 @@ class Command(BaseCommand):
         if not output_md_file:
             raise CommandError("You must specify an output markdown file using --output_md_file")
         
+        table_matcher = None
+        if options.get('include') or options.get('exclude'):
+            try:
+                table_matcher = DurcTableMatcher.from_strings(options.get('include'), options.get('exclude'))
+            except ValueError as e:
+                raise CommandError(f"Invalid table pattern: {e}")
+        
         # Validate that all SQL files exist and have .sql extension
         for sql_file in sql_files:
             if not os.path.exists(sql_file):
@@ -61,6 +82,14 @@ class Command(BaseCommand):
             
             self.stdout.write(f"Found {len(tables)} tables in {sql_file}")
         
+        # Keep only the tables selected by --include and --exclude
+        if table_matcher is not None:
+            all_tables = {
+                table_name: table_info for table_name, table_info in all_tables.items()
+                if table_matcher.matches(None, table_info.get('schema'), table_name)
+            }
+            self.stdout.write(f"Selected {len(all_tables)} tables matching the table patterns")
+        
         # Process diagram sections
         section_assignments = DURC_DiagramSectionParser.assign_tables_to_sections(
             all_tables, 
@@ -1,8 +1,20 @@
 import os
-import json
+import tempfile
+from contextlib import ExitStack, nullcontext
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
 from .durc_utils.include_pattern_parser import DURC_IncludePatternParser
 from .durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from .durc_utils.introspection_backends import INTROSPECTION_BACKENDS
+from .durc_utils.incremental_mining import DURC_IncrementalMiningState
+from .durc_utils.relationship_graph import DURC_RelationshipGraph
+from .durc_utils.catalog_snapshot import DURC_CatalogSnapshot
+from .durc_utils.ddl_parser import DURC_DDLParser
+from .durc_utils.database_engine import DURC_DatabaseEngine
+from .durc_utils.read_only_mining import DURC_ReadOnlyMining
+from .durc_utils.mining_profiler import DURC_MiningProfiler
+from ...shared.durc_compact_model import get_model_writer_class
 
 class Command(BaseCommand):
     help = 'Mine database schema and generate DURC relational model JSON'
@@ -12,12 +24,109 @@ class Command(BaseCommand):
             '--include',
             nargs='+',
             type=str,
-            help='Specify databases, schemas, or tables to include in the format: db.schema.table, db.schema, or db'
+            help='Specify databases, schemas, or tables to include in the format: db.schema.table, db.schema, or db. '
+                 'Schema and table names may be globs (*, ?, [...]), e.g. npd.public.provider_*'
+        )
+        parser.add_argument(
+            '--exclude',
+            nargs='+',
+            type=str,
+            help='Leave out matching schemas or tables, in the same format as --include; every part may be a glob, '
+                 'e.g. npd.*.*_archive'
         )
         parser.add_argument(
             '--output_json_file',
             type=str,
-            help='Specify a custom output path for the JSON file (default: durc_config/DURC_relational_model.json)'
+            help='Specify a custom output path for the JSON file (default: durc_config/DURC_relational_model.json). '
+                 'A path ending in .durcpack writes the compact binary format instead'
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Load the catalog for each schema with a fixed number of set-based queries instead of several queries per table'
+        )
+        parser.add_argument(
+            '--pipeline',
+            action='store_true',
+            help='Send the per-table catalog queries for a batch of tables together instead of one round trip per query '
+                 '(psycopg 3 pipeline mode when available, otherwise one combined statement per kind of query)'
+        )
+        parser.add_argument(
+            '--introspection',
+            type=str,
+            choices=sorted(INTROSPECTION_BACKENDS),
+            help='Catalog introspection backend (default: pg_catalog for PostgreSQL, information_schema otherwise; '
+                 'use sqlite for SQLite databases)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of include patterns to mine concurrently, each with its own database connection (default: 1)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Store per-table catalog fingerprints next to the output file and only re-mine tables whose fingerprint changed since the last run'
+        )
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Write each table to the output file as soon as it is mined instead of building the whole model in memory'
+        )
+        parser.add_argument(
+            '--snapshot-out',
+            type=str,
+            help='Copy the information_schema catalog of the included databases into this SQLite file, '
+                 'then mine from the copy'
+        )
+        parser.add_argument(
+            '--snapshot-in',
+            type=str,
+            help='Mine from a catalog snapshot written by --snapshot-out instead of connecting to the databases'
+        )
+        parser.add_argument(
+            '--from-sql',
+            nargs='+',
+            type=str,
+            help='Mine from CREATE TABLE / ALTER TABLE statements in these SQL files, glob patterns or directories '
+                 'instead of connecting to the databases'
+        )
+        parser.add_argument(
+            '--read-only',
+            action='store_true',
+            help='Mine each database in one READ ONLY, REPEATABLE READ transaction with lock and statement timeouts, '
+                 'retrying tables that time out with backoff'
+        )
+        parser.add_argument(
+            '--lock-timeout',
+            type=int,
+            default=1000,
+            help='With --read-only, longest wait for a lock in milliseconds, 0 for no limit (default: 1000)'
+        )
+        parser.add_argument(
+            '--statement-timeout',
+            type=int,
+            default=30000,
+            help='With --read-only, longest run time of one catalog query in milliseconds, 0 for no limit (default: 30000)'
+        )
+        parser.add_argument(
+            '--table-retries',
+            type=int,
+            default=3,
+            help='With --read-only, number of times a table that timed out is retried before it is skipped (default: 3)'
+        )
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Write per-phase timings and query counts, per-table latency percentiles and the slowest tables '
+                 'as JSON next to the output file'
+        )
+        parser.add_argument(
+            '--profile-top',
+            type=int,
+            default=10,
+            help='With --profile, number of slowest tables to list (default: 10)'
         )
 
     def handle(self, *args, **options):
@@ -26,30 +135,211 @@ class Command(BaseCommand):
         if not include_patterns:
             raise CommandError("You must specify at least one database, schema, or table to include using --include")
         
+        workers = options.get('workers') or 1
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
+        
+        snapshot_out = options.get('snapshot_out')
+        snapshot_in = options.get('snapshot_in')
+        if snapshot_out and snapshot_in:
+            raise CommandError("--snapshot-out and --snapshot-in cannot be used together")
+        from_sql = options.get('from_sql')
+        if from_sql and snapshot_in:
+            raise CommandError("--from-sql and --snapshot-in cannot be used together")
+        introspection = options.get('introspection')
+        if (snapshot_out or snapshot_in or from_sql) and introspection not in (None, 'information_schema'):
+            raise CommandError(f"Catalog snapshots hold information_schema rows and cannot be used with --introspection {introspection}")
+        
+        read_only = None
+        if options.get('read_only'):
+            if snapshot_in or from_sql:
+                raise CommandError("--read-only cannot be used with --snapshot-in or --from-sql, which do not query the databases")
+            for option in ('lock_timeout', 'statement_timeout', 'table_retries'):
+                if options.get(option, 0) < 0:
+                    raise CommandError(f"--{option.replace('_', '-')} must not be negative")
+            read_only = DURC_ReadOnlyMining(
+                lock_timeout_ms=options.get('lock_timeout', 1000),
+                statement_timeout_ms=options.get('statement_timeout', 30000),
+                retries=options.get('table_retries', 3),
+            )
+        
+        profiler = None
+        if options.get('profile'):
+            profiler = DURC_MiningProfiler(top_n=max(options.get('profile_top', 10), 0))
+        
         # Parse the include patterns
         db_schema_table_patterns = DURC_IncludePatternParser.parse_include_patterns(include_patterns)
+        exclude_patterns = DURC_IncludePatternParser.parse_exclude_patterns(options.get('exclude') or [])
         
-        # Extract the relational model
-        relational_model = DURC_RelationalModelExtractor.extract_relational_model(
-            db_schema_table_patterns, 
-            self.stdout.write,
-            self.style
-        )
+        with ExitStack() as cleanup:
+            # Load or capture the offline copy of the catalog
+            catalog_snapshot = self._get_catalog_snapshot(options, db_schema_table_patterns, cleanup, read_only)
+            
+            # Determine the output path
+            output_path = options.get('output_json_file')
+            if not output_path:
+                # Use the default path
+                os.makedirs('durc_config', exist_ok=True)
+                output_path = os.path.join('durc_config', 'DURC_relational_model.json')
+            else:
+                # Ensure the directory for the custom output path exists
+                output_dir = os.path.dirname(output_path)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+            
+            # Load the fingerprints and model written by the previous run
+            incremental = None
+            if options.get('incremental'):
+                incremental = DURC_IncrementalMiningState.load(output_path)
+            
+            extract_options = {
+                'bulk': options.get('bulk', False),
+                'pipeline': options.get('pipeline', False),
+                'introspection_backend': options.get('introspection'),
+                'workers': workers,
+                'incremental': incremental,
+                'catalog_snapshot': catalog_snapshot,
+                'read_only': read_only,
+                'profiler': profiler,
+                'exclude_patterns': exclude_patterns,
+            }
+            
+            # The output format is chosen by file extension
+            model_writer_class = get_model_writer_class(output_path)
+            
+            if options.get('stream'):
+                # Stream tables to a scratch file, then derive has_many from every belongs_to while
+                # copying it to a temporary file that replaces the output file once done
+                with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as scratch_dir:
+                    mined_path = os.path.join(scratch_dir, os.path.basename(output_path))
+                    with model_writer_class(mined_path) as table_writer:
+                        DURC_RelationalModelExtractor.extract_relational_model(
+                            db_schema_table_patterns,
+                            self.stdout.write,
+                            self.style,
+                            table_writer=table_writer,
+                            **extract_options
+                        )
+                    with profiler.phase('relationship_graph') if profiler is not None else nullcontext():
+                        derived_count = DURC_RelationshipGraph.complete_model_file(
+                            mined_path, output_path, model_writer_class
+                        )
+                if derived_count:
+                    self.stdout.write(f"Derived {derived_count} has_many relationships from belongs_to")
+            else:
+                # Extract the relational model
+                relational_model = DURC_RelationalModelExtractor.extract_relational_model(
+                    db_schema_table_patterns, 
+                    self.stdout.write,
+                    self.style,
+                    **extract_options
+                )
+            
+                # Write the relational model to the output file
+                model_writer_class.write_relational_model(output_path, relational_model)
+            
+            if incremental is not None:
+                incremental.save(output_path)
+                self.stdout.write(
+                    f"Reused {len(incremental.reused_tables)} unchanged tables, "
+                    f"refreshed {len(incremental.refreshed_tables)} tables"
+                )
+                for qualified_name in sorted(incremental.refreshed_tables):
+                    self.stdout.write(f"Refreshed: {qualified_name}")
+            
+            if profiler is not None:
+                profile_path = profiler.save(output_path)
+                self.stdout.write(f"Wrote mining profile to {profile_path}")
+            
+            self.stdout.write(self.style.SUCCESS(f"Successfully generated DURC relational model at {output_path}"))
+    
+    def _get_catalog_snapshot(self, options, db_schema_table_patterns, cleanup, read_only=None):
+        """
+        Open, capture or build the catalog snapshot to mine from, if any.
+        
+        Args:
+            options (dict): Command options
+            db_schema_table_patterns (list): Parsed include patterns
+            cleanup (ExitStack): Cleanup stack that owns temporary files until mining is done
+            read_only (DURC_ReadOnlyMining): Optional low-impact mode for capturing a snapshot
+            
+        Returns:
+            DURC_CatalogSnapshot: The snapshot, or None to mine the live databases
+        """
+        snapshot_in = options.get('snapshot_in')
+        snapshot_out = options.get('snapshot_out')
+        from_sql = options.get('from_sql')
+        db_names = list(dict.fromkeys(pattern['db'] for pattern in db_schema_table_patterns))
         
-        # Determine the output path
-        output_path = options.get('output_json_file')
-        if not output_path:
-            # Use the default path
-            os.makedirs('durc_config', exist_ok=True)
-            output_path = os.path.join('durc_config', 'DURC_relational_model.json')
+        if snapshot_in:
+            try:
+                return DURC_CatalogSnapshot(snapshot_in)
+            except (FileNotFoundError, ValueError) as e:
+                raise CommandError(str(e))
+        
+        snapshot_path = snapshot_out
+        if snapshot_out:
+            snapshot_dir = os.path.dirname(snapshot_out)
+            if snapshot_dir:
+                os.makedirs(snapshot_dir, exist_ok=True)
+        elif from_sql:
+            snapshot_path = os.path.join(cleanup.enter_context(tempfile.TemporaryDirectory()), 'catalog.sqlite')
+        else:
+            return None
+        
+        if from_sql:
+            catalog_snapshot = self._build_sql_snapshot(snapshot_path, from_sql, db_names)
         else:
-            # Ensure the directory for the custom output path exists
-            output_dir = os.path.dirname(output_path)
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
+            connections_by_name = {
+                db_name: connections[db_name] if db_name in connections else connection
+                for db_name in db_names
+            }
+            with ExitStack() as transactions:
+                if read_only is not None:
+                    for conn in connections_by_name.values():
+                        transactions.enter_context(read_only.coordinate(conn))
+                catalog_snapshot = DURC_CatalogSnapshot.write(
+                    snapshot_path, connections_by_name, self.stdout.write, self.style
+                )
+        if snapshot_out:
+            self.stdout.write(self.style.SUCCESS(f"Wrote catalog snapshot to {snapshot_out}"))
+        return catalog_snapshot
+    
+    def _build_sql_snapshot(self, snapshot_path, sql_paths, db_names):
+        """
+        Parse DDL files into a catalog snapshot holding their tables for every included database.
         
-        # Write the relational model to JSON file
-        with open(output_path, 'w') as f:
-            json.dump(relational_model, f, indent=2)
+        Each database keeps the engine from its settings, without connecting to it, so the
+        model has the same layout as one mined from the live database. Tables written without
+        a schema go to "public" on PostgreSQL and to the schema named after the database otherwise.
         
-        self.stdout.write(self.style.SUCCESS(f"Successfully generated DURC relational model at {output_path}"))
+        Args:
+            snapshot_path (str): Path of the snapshot file to write
+            sql_paths (list): SQL file paths, glob patterns or directories
+            db_names (list): Names of the included databases
+            
+        Returns:
+            DURC_CatalogSnapshot: The written snapshot
+        """
+        sql_files = DURC_DDLParser.find_sql_files(sql_paths)
+        if not sql_files:
+            raise CommandError(f"No SQL files found for --from-sql {' '.join(sql_paths)}")
+        
+        catalogs = []
+        parsers = {}
+        for db_name in db_names:
+            database_settings = settings.DATABASES.get(db_name) or settings.DATABASES['default']
+            engine = database_settings['ENGINE']
+            postgresql = DURC_DatabaseEngine.is_postgresql(engine)
+            parser = parsers.get(postgresql)
+            if parser is None:
+                parser = parsers[postgresql] = DURC_DDLParser(postgresql=postgresql)
+                for sql_file in sql_files:
+                    table_count = parser.parse_file(sql_file)
+                    self.stdout.write(f"Parsed {table_count} tables from {sql_file}")
+            default_schema = 'public' if postgresql else db_name
+            catalogs.append((db_name, engine, parser.information_schema_rows(default_schema)))
+        
+        DURC_CatalogSnapshot.write_rows(snapshot_path, catalogs)
+        return DURC_CatalogSnapshot(snapshot_path)
+
@@ -3,6 +3,7 @@ from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
 from .durc_utils.include_pattern_parser import DURC_IncludePatternParser
 from ...shared.durc_data_loader import DurcDataLoader
+from ...shared.durc_table_matcher import DurcTableMatcher
 
 class Command(BaseCommand):
     help = 'Generate PostgreSQL foreign key statements from DURC relational model'
@@ -12,7 +13,14 @@ class Command(BaseCommand):
             '--include',
             nargs='+',
             type=str,
-            help='Specify databases, schemas, or tables to include in the format: db.schema.table, db.schema, or db'
+            help='Specify databases, schemas, or tables to include in the format: db.schema.table, db.schema, or db. '
+                 'Schema and table names may be globs (*, ?, [...])'
+        )
+        parser.add_argument(
+            '--exclude',
+            nargs='+',
+            type=str,
+            help='Leave out matching schemas or tables, in the same format as --include; every part may be a glob'
         )
         parser.add_argument(
             '--input_json_file',
@@ -33,6 +41,8 @@ class Command(BaseCommand):
         
         # Parse the include patterns
         db_schema_table_patterns = DURC_IncludePatternParser.parse_include_patterns(include_patterns)
+        exclude_patterns = DURC_IncludePatternParser.parse_exclude_patterns(options.get('exclude') or [])
+        table_matcher = DurcTableMatcher(db_schema_table_patterns, exclude_patterns)
         
         # Get the input JSON file path
         input_json_file = options.get('input_json_file')
@@ -55,17 +65,17 @@ class Command(BaseCommand):
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
         
-        # Load the relational model using shared data loader
+        # Load the databases named by the patterns using shared data loader
         data_loader = DurcDataLoader()
         try:
-            relational_model = data_loader.load_relational_model(input_json_file)
+            relational_model = data_loader.load_model(input_json_file, databases=table_matcher.databases)
         except Exception as e:
             raise CommandError(f"Error loading relational model: {e}")
         
         # Generate foreign key statements
         foreign_key_statements = self._generate_foreign_key_statements(
             relational_model, 
-            db_schema_table_patterns,
+            table_matcher,
             include_patterns
         )
         
@@ -75,13 +85,13 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f"Successfully generated foreign key statements at {output_sql_file}"))
         self.stdout.write(f"Generated {len(foreign_key_statements)} foreign key statements")
 
-    def _generate_foreign_key_statements(self, relational_model, db_schema_table_patterns, include_patterns):
+    def _generate_foreign_key_statements(self, relational_model, table_matcher, include_patterns):
         """
         Generate foreign key statements from the relational model.
         
         Args:
-            relational_model (dict): The loaded JSON relational model
-            db_schema_table_patterns (list): Parsed include patterns
+            relational_model (DurcRelationalModel): The loaded relational model
+            table_matcher (DurcTableMatcher): Compiled include and exclude patterns
             include_patterns (list): Original include patterns for reference
             
         Returns:
@@ -90,90 +100,47 @@ class Command(BaseCommand):
         foreign_key_statements = []
         processed_constraints = set()  # To avoid duplicates
         
-        # Process each database in the model
-        for db_name, tables in relational_model.items():
-            if not isinstance(tables, dict):
+        for table in relational_model.iter_tables():
+            # Check if this table matches our include patterns
+            if not table_matcher.matches_table(table):
                 continue
-                
-            # Process each table in the database
-            for table_name, table_info in tables.items():
-                if not isinstance(table_info, dict):
-                    continue
-                
-                # Check if this table matches our include patterns
-                if not self._table_matches_patterns(db_name, table_name, db_schema_table_patterns):
-                    continue
-                
-                self.stdout.write(f"Processing table: {db_name}.{table_name}")
-                
-                # Process belongs_to relationships (foreign keys in this table)
-                belongs_to = table_info.get('belongs_to', {})
-                for relationship_name, relationship_info in belongs_to.items():
-                    try:
-                        fk_statement = self._create_foreign_key_statement(
-                            db_name, table_name, relationship_info, processed_constraints
-                        )
-                        if fk_statement:
-                            foreign_key_statements.append(fk_statement)
-                    except Exception as e:
-                        self.stdout.write(self.style.WARNING(
-                            f"Skipping relationship {relationship_name} in {db_name}.{table_name}: {e}"
-                        ))
-        
-        return foreign_key_statements
-
-    def _table_matches_patterns(self, db_name, table_name, db_schema_table_patterns):
-        """
-        Check if a table matches the include patterns.
-        
-        Args:
-            db_name (str): Database name
-            table_name (str): Table name
-            db_schema_table_patterns (list): Parsed include patterns
             
-        Returns:
-            bool: True if table matches patterns
-        """
-        for pattern in db_schema_table_patterns:
-            pattern_db = pattern.get('db')
-            pattern_schema = pattern.get('schema')
-            pattern_table = pattern.get('table')
-            
-            # Check database match
-            if pattern_db and pattern_db != db_name:
-                continue
-            
-            # For now, we'll treat schema and db as the same since the JSON structure
-            # uses db as the top level. In a real implementation, you might need to
-            # handle schema differently based on your database structure.
+            self.stdout.write(f"Processing table: {table.qualified_name}")
             
-            # Check table match
-            if pattern_table and pattern_table != table_name:
-                continue
-            
-            # If we get here, the table matches this pattern
-            return True
+            # Process belongs_to relationships (foreign keys in this table)
+            for relationship in table.belongs_to.values():
+                try:
+                    fk_statement = self._create_foreign_key_statement(table, relationship, processed_constraints)
+                    if fk_statement:
+                        foreign_key_statements.append(fk_statement)
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(
+                        f"Skipping relationship {relationship.name} in {table.qualified_name}: {e}"
+                    ))
         
-        return False
+        return foreign_key_statements
 
-    def _create_foreign_key_statement(self, db_name, table_name, relationship_info, processed_constraints):
+    def _create_foreign_key_statement(self, table, relationship, processed_constraints):
         """
-        Create a foreign key statement from relationship information.
+        Create a foreign key statement from a belongs_to relationship.
         
         Args:
-            db_name (str): Source database name
-            table_name (str): Source table name
-            relationship_info (dict): Relationship information from JSON
+            table (DurcTable): Source table
+            relationship (DurcRelationship): belongs_to relationship of the source table
             processed_constraints (set): Set of already processed constraints to avoid duplicates
             
         Returns:
             str: SQL ALTER TABLE statement or None if invalid/duplicate
         """
+        db_name = table.database.name
+        schema_name = table.schema_name
+        table_name = table.name
+        
         # Extract relationship details
-        local_key = relationship_info.get('local_key')
-        to_table = relationship_info.get('to_table')
-        to_db = relationship_info.get('to_db', db_name)
-        to_schema = relationship_info.get('to_schema')
+        local_key = relationship.local_key
+        to_table = relationship.to_table
+        to_db = relationship.to_db or db_name
+        to_schema = relationship.to_schema
         
         if not local_key or not to_table:
             raise ValueError(f"Missing local_key or to_table in relationship")
@@ -185,13 +152,13 @@ class Command(BaseCommand):
         constraint_name = f"fk_{table_name}_{local_key}"
         
         # Create unique identifier for this constraint to avoid duplicates
-        constraint_id = f"{db_name}.{table_name}.{constraint_name}"
+        constraint_id = f"{db_name}.{schema_name}.{table_name}.{constraint_name}"
         if constraint_id in processed_constraints:
             return None
         processed_constraints.add(constraint_id)
         
-        # Build source table reference
-        source_table_ref = f"{db_name}.{table_name}"
+        # Build source table reference; PostgreSQL tables are qualified by their schema
+        source_table_ref = f"{schema_name or db_name}.{table_name}"
         
         # Build target table reference
         if to_schema and to_schema != db_name:
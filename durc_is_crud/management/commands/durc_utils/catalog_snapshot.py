@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from datetime import datetime, timezone
+
+
+class DURC_CatalogSnapshot:
+    """
+    Offline copy of the information_schema rows the relational model extractor reads.
+
+    write() copies the tables, columns, constraints and key usage of every schema in a
+    database into a local SQLite file with one bulk read per information_schema view.
+    connection() then gives the extractor a connection-like object that answers the same
+    information_schema queries from that file, so the whole extraction runs without
+    touching the database the snapshot was taken from.
+
+    Each snapshot table holds the information_schema columns the extractor uses, plus a
+    db_name column so that one file can hold several databases.
+
+    Attributes:
+        path (str): Path of the snapshot file
+        engines (dict): Database name -> Django ENGINE of the database it was taken from
+    """
+
+    FORMAT_VERSION = 1
+
+    # Snapshot table -> information_schema columns copied into it
+    VIEWS = {
+        'tables': ('table_schema', 'table_name', 'table_type'),
+        'columns': (
+            'table_schema', 'table_name', 'column_name', 'data_type',
+            'is_nullable', 'column_default', 'ordinal_position',
+        ),
+        'table_constraints': ('constraint_name', 'table_schema', 'table_name', 'constraint_type'),
+        'key_column_usage': ('constraint_name', 'table_schema', 'table_name', 'column_name'),
+        'constraint_column_usage': ('constraint_name', 'table_schema', 'table_name', 'column_name'),
+    }
+
+    # Catalog schemas are never part of a relational model
+    EXCLUDED_SCHEMAS = ('information_schema', 'pg_catalog')
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Catalog snapshot {path} does not exist")
+        self.path = path
+        try:
+            with closing(sqlite3.connect(path)) as snapshot:
+                version = snapshot.execute("SELECT value FROM durc_snapshot_info WHERE key = 'version'").fetchone()
+                rows = snapshot.execute("SELECT db_name, engine FROM durc_snapshot_databases ORDER BY position").fetchall()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"{path} is not a DURC catalog snapshot: {e}")
+        if version is None or int(version[0]) != self.FORMAT_VERSION:
+            raise ValueError(f"{path} uses an unsupported catalog snapshot version")
+        self.engines = dict(rows)
+
+    @classmethod
+    def write(cls, path, connections_by_name, stdout_writer, style):
+        """
+        Copy the catalog of each database into a new snapshot file.
+
+        The file is written next to its final path and moved into place once complete.
+
+        Args:
+            path (str): Path of the snapshot file
+            connections_by_name (dict): Database name -> Django connection
+            stdout_writer: Django stdout writer for output messages
+            style: Django style for formatting output messages
+
+        Returns:
+            DURC_CatalogSnapshot: The written snapshot
+        """
+        catalogs = (
+            (db_name, conn.settings_dict['ENGINE'], cls._read_catalog(conn))
+            for db_name, conn in connections_by_name.items()
+        )
+        for db_name, row_count in cls.write_rows(path, catalogs):
+            stdout_writer(style.SUCCESS(f"Captured {row_count} catalog rows from database '{db_name}'"))
+        return cls(path)
+
+    @classmethod
+    def write_rows(cls, path, catalogs):
+        """
+        Write catalog rows that were read or built elsewhere into a new snapshot file.
+
+        The file is written next to its final path and moved into place once complete.
+
+        Args:
+            path (str): Path of the snapshot file
+            catalogs: Iterable of (db_name, engine, rows_by_view), where rows_by_view maps each
+                view in VIEWS to a list of rows with its columns
+
+        Returns:
+            list: (db_name, row_count) for each database written
+        """
+        output_dir = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=output_dir)
+        os.close(fd)
+        row_counts = []
+        try:
+            snapshot = sqlite3.connect(temp_path)
+            try:
+                cls._create_tables(snapshot)
+                for position, (db_name, engine, rows_by_view) in enumerate(catalogs):
+                    row_count = 0
+                    for view, columns in cls.VIEWS.items():
+                        rows = [(db_name, *row) for row in rows_by_view.get(view, [])]
+                        placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+                        snapshot.executemany(f"INSERT INTO {view} VALUES ({placeholders})", rows)
+                        row_count += len(rows)
+                    snapshot.execute("INSERT INTO durc_snapshot_databases VALUES (?, ?, ?)", [position, db_name, engine])
+                    row_counts.append((db_name, row_count))
+                snapshot.commit()
+            finally:
+                snapshot.close()
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return row_counts
+
+    @classmethod
+    def _create_tables(cls, snapshot):
+        snapshot.execute("CREATE TABLE durc_snapshot_info (key TEXT PRIMARY KEY, value TEXT)")
+        snapshot.executemany("INSERT INTO durc_snapshot_info VALUES (?, ?)", [
+            ('version', str(cls.FORMAT_VERSION)),
+            ('created_at', datetime.now(timezone.utc).isoformat()),
+        ])
+        snapshot.execute("CREATE TABLE durc_snapshot_databases (position INTEGER, db_name TEXT, engine TEXT)")
+        for view, columns in cls.VIEWS.items():
+            snapshot.execute(f"CREATE TABLE {view} (db_name TEXT, {', '.join(columns)})")
+            snapshot.execute(f"CREATE INDEX {view}_db_name ON {view} (db_name)")
+
+    @classmethod
+    def _read_catalog(cls, conn):
+        # One bulk read per view; catalog schemas are left out
+        rows_by_view = {}
+        excluded = ', '.join(f"'{schema}'" for schema in cls.EXCLUDED_SCHEMAS)
+        with conn.cursor() as cursor:
+            for view, columns in cls.VIEWS.items():
+                cursor.execute(
+                    f"SELECT {', '.join(columns)} FROM information_schema.{view} "
+                    f"WHERE table_schema NOT IN ({excluded})"
+                )
+                rows_by_view[view] = cursor.fetchall()
+        return rows_by_view
+
+    def connection(self, db_name):
+        """
+        Get a connection-like object that answers information_schema queries for one
+        database from the snapshot.
+
+        Args:
+            db_name (str): Database name
+
+        Returns:
+            DURC_SnapshotConnection: The connection
+
+        Raises:
+            KeyError: If the snapshot does not contain the database
+        """
+        if db_name not in self.engines:
+            raise KeyError(f"Database '{db_name}' is not in catalog snapshot {self.path}")
+        return DURC_SnapshotConnection(self, db_name)
+
+
+class DURC_SnapshotConnection:
+    """
+    Stands in for a Django connection during extraction from a catalog snapshot.
+
+    Every cursor() opens a private in-memory SQLite database with an information_schema
+    schema holding only this database's rows, so cursors can be used from any thread.
+    """
+
+    def __init__(self, snapshot, db_name):
+        self.snapshot = snapshot
+        self.db_name = db_name
+        # The extractor reads ENGINE to decide whether the model has a schema layer
+        self.settings_dict = {'ENGINE': snapshot.engines[db_name], 'NAME': snapshot.path}
+
+    def cursor(self):
+        """Open a cursor over this database's rows in the snapshot."""
+        catalog = sqlite3.connect(':memory:')
+        catalog.execute("ATTACH DATABASE ? AS snapshot", [self.snapshot.path])
+        catalog.execute("ATTACH DATABASE ':memory:' AS information_schema")
+        for view, columns in DURC_CatalogSnapshot.VIEWS.items():
+            catalog.execute(
+                f"CREATE TABLE information_schema.{view} AS "
+                f"SELECT {', '.join(columns)} FROM snapshot.{view} WHERE db_name = ?",
+                [self.db_name]
+            )
+        catalog.execute("DETACH DATABASE snapshot")
+        return DURC_SnapshotCursor(catalog)
+
+
+class DURC_SnapshotCursor:
+    """DB-API cursor over a snapshot that accepts Django-style %s placeholders."""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+        self._cursor = catalog.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def execute(self, sql, params=None):
+        # Same placeholder and escaping rules as Django's SQLite backend
+        self._cursor.execute(sql.replace('%s', '?').replace('%%', '%'), params or [])
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+        self._catalog.close()
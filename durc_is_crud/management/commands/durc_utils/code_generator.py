@@ -0,0 +1,457 @@
+import keyword
+import re
+from .query_planner import DURC_QueryPlanner
+from .template_loader import DURC_TemplateLoader
+
+
+class DURC_CodeGenerator:
+    """
+    Renders the Django source files for one table of a relational model, and the index
+    files that tie the tables of an app together.
+
+    Every database (or schema, for databases with a schema layer) becomes one Django app
+    package in the output directory:
+
+        <db>[/<schema>]/
+            models/g_<table>.py        generated abstract model, overwritten on every compile
+            models/v_<table>.py        validated model subclass, only created once
+            forms/v_<table>_form.py    ModelForm with enhanced widgets
+            rest/<table>_api.py        REST serializer and viewset for the autosuggest widgets
+            tests/test_<table>_queries.py
+                                       query count test of the table's list page
+            models/__init__.py, forms/__init__.py, rest/__init__.py, tests/__init__.py,
+            apps.py, urls.py           index files, written by render_app_indexes()
+
+    The layout of every file comes from a template (see DURC_TemplateLoader); this class
+    works out the names, fields and widgets the templates are rendered with.
+
+    render_table() only needs the table's own entry, the set of tables in the model and
+    the table's query plan (see query_plans()), so tables can be rendered independently
+    of each other, e.g. in a process pool. Nothing in this class depends on Django.
+    """
+
+    GENERATED_HEADER = "# Generated by durc_compile from {source}. Do not edit: this file is overwritten on every compile."
+
+    # Renders the files unless a custom template set is given
+    BUILTIN_TEMPLATES = DURC_TemplateLoader()
+
+    TEXT_TYPES = frozenset(('varchar', 'char', 'text', 'mediumtext', 'longtext'))
+    NUMERIC_TYPES = frozenset(('int', 'float', 'decimal'))
+
+    # Rows per list page, and the most a client may ask for with ?page_size=
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 1000
+
+    # Simplified data type -> Django field class and keyword arguments
+    FIELD_TYPES = {
+        'int': ('IntegerField', ''),
+        'varchar': ('CharField', 'max_length=255'),
+        'char': ('CharField', 'max_length=255'),
+        'text': ('TextField', ''),
+        'mediumtext': ('TextField', ''),
+        'longtext': ('TextField', ''),
+        'float': ('FloatField', ''),
+        'decimal': ('DecimalField', 'max_digits=20, decimal_places=6'),
+        'date': ('DateField', ''),
+        'datetime': ('DateTimeField', ''),
+        'timestamp': ('DateTimeField', ''),
+        'time': ('TimeField', ''),
+        'blob': ('BinaryField', ''),
+        'tinyint': ('BooleanField', ''),
+    }
+
+    @staticmethod
+    def identifier(name):
+        """
+        Turn a database name into a lower case Python identifier.
+
+        Args:
+            name (str): Database, schema, table or column name
+
+        Returns:
+            str: Identifier made of lower case letters, digits and underscores
+        """
+        ident = re.sub(r'\W', '_', name.lower())
+        if not ident or ident[0].isdigit():
+            ident = f"_{ident}"
+        if keyword.iskeyword(ident):
+            ident = f"{ident}_"
+        return ident
+
+    @staticmethod
+    def class_name(table):
+        """
+        Get the class name of a table's validated model, e.g. ProviderAddress for provider_address.
+
+        Args:
+            table (str): Table name
+
+        Returns:
+            str: CamelCase class name
+        """
+        name = ''.join(part[:1].upper() + part[1:] for part in re.split(r'[\W_]+', table.lower()) if part)
+        if not name or name[0].isdigit():
+            name = f"T{name}"
+        return name
+
+    @staticmethod
+    def app_path(db_name, schema_name=None):
+        """
+        Get the package path of the app holding a database's (or schema's) tables.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+
+        Returns:
+            tuple: Package names, relative to the output directory
+        """
+        if schema_name is None:
+            return (DURC_CodeGenerator.identifier(db_name),)
+        return (DURC_CodeGenerator.identifier(db_name), DURC_CodeGenerator.identifier(schema_name))
+
+    @staticmethod
+    def app_label(app_path):
+        """Get the Django app label of an app package path."""
+        return '_'.join(app_path)
+
+    @staticmethod
+    def label_column(columns):
+        """
+        Choose the column shown for a row in autosuggest widgets.
+
+        Follows the DURC naming conventions: a column called select_name, else the first
+        text column whose name ends in name or label, else the first text column.
+
+        Args:
+            columns (list): column_data entries of a table
+
+        Returns:
+            str: Column name, or None if the table has no text column
+        """
+        text_columns = [
+            column['column_name'] for column in columns
+            if column.get('data_type') in DURC_CodeGenerator.TEXT_TYPES
+        ]
+        if 'select_name' in text_columns:
+            return 'select_name'
+        for column_name in text_columns:
+            if column_name.endswith(('name', 'label')):
+                return column_name
+        return text_columns[0] if text_columns else None
+
+    @staticmethod
+    def keyset_fields(columns, foreign_keys):
+        """
+        Choose the key list pages are ordered and paginated by (keyset pagination).
+
+        A page then starts after the key of the previous page's last row, which the primary
+        key index finds directly, instead of skipping the rows of every earlier page with
+        OFFSET. An auto-increment primary key column is unique and ordered on its own and is
+        the key; otherwise the key is every primary key column, in column order.
+
+        Args:
+            columns (list): column_data entries of a table
+            foreign_keys (dict): Result of foreign_keys() for the table
+
+        Returns:
+            list: Model attribute names of the key columns (<field>_id for foreign keys, which
+                orders by the column instead of joining the target), empty if the table has no
+                primary key
+        """
+        key_columns = [column for column in columns if column.get('is_primary_key')]
+        auto_increment = [column for column in key_columns if column.get('is_auto_increment')]
+        if len(auto_increment) == 1:
+            key_columns = auto_increment
+        fields = []
+        for column in key_columns:
+            column_name = column['column_name']
+            if column_name in foreign_keys:
+                fields.append(f"{foreign_keys[column_name][0]}_id")
+            else:
+                fields.append(DURC_CodeGenerator.identifier(column_name))
+        return fields
+
+    @staticmethod
+    def table_names(db_name, schema_name, table):
+        """
+        Get the names a table is generated under.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+            table (str): Table name
+
+        Returns:
+            tuple: (app package path, module name, validated model class name)
+        """
+        return (
+            DURC_CodeGenerator.app_path(db_name, schema_name),
+            DURC_CodeGenerator.identifier(table),
+            DURC_CodeGenerator.class_name(table),
+        )
+
+    @staticmethod
+    def render_table(db_name, schema_name, table, table_info, known_tables, templates=None, query_plan=None):
+        """
+        Render the source files of one table.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+            table (str): Table name
+            table_info (dict): Table entry of the relational model
+            known_tables (set): (db, schema or None, table) of every table in the model,
+                used to decide which foreign keys become ForeignKey fields
+            templates (DURC_TemplateLoader): Templates to render, or None for the built-in ones
+            query_plan (dict): The table's plan from query_plans(), or None to only join the
+                direct foreign keys
+
+        Returns:
+            dict: With keys
+                - app_path: package path of the table's app
+                - module: module name of the table
+                - class_name: class name of the validated model
+                - files: relative path -> source of the files to write on every compile
+                - create_once: relative path -> source of the files to write only if missing
+        """
+        templates = templates or DURC_CodeGenerator.BUILTIN_TEMPLATES
+        app_path, module, class_name = DURC_CodeGenerator.table_names(db_name, schema_name, table)
+        source = '.'.join(part for part in (db_name, schema_name, table) if part is not None)
+        header = DURC_CodeGenerator.GENERATED_HEADER.format(source=source)
+        app_dir = '/'.join(app_path)
+
+        columns = table_info.get('column_data', [])
+        foreign_keys = DURC_CodeGenerator.foreign_keys(db_name, schema_name, table, table_info, known_tables)
+        if query_plan is None:
+            # Without the other tables' entries only the direct foreign keys can be planned
+            query_plan = DURC_CodeGenerator.query_plans(
+                [(db_name, schema_name, table, table_info)], known_tables
+            )[(db_name, schema_name, table)]
+        label = DURC_CodeGenerator.label_column(columns)
+        label_field = DURC_CodeGenerator.identifier(label) if label is not None else None
+        keyset = DURC_CodeGenerator.keyset_fields(columns, foreign_keys)
+
+        form_fields, widgets = DURC_CodeGenerator._form_fields(columns, foreign_keys)
+        return {
+            'app_path': app_path,
+            'module': module,
+            'class_name': class_name,
+            'files': {
+                f"{app_dir}/models/g_{module}.py": templates.render(
+                    'g_model.py', header=header, source=source, module=module, class_name=class_name,
+                    fields=DURC_CodeGenerator._model_fields(columns, foreign_keys),
+                    db_table=table if schema_name is None else f'{schema_name}"."{table}',
+                    label_field=label_field, select_related=query_plan['select_related'],
+                    prefetch_related=query_plan['prefetch_related'], depth=query_plan['depth'],
+                    keyset=keyset, page_size=DURC_CodeGenerator.PAGE_SIZE,
+                ),
+                f"{app_dir}/forms/v_{module}_form.py": templates.render(
+                    'form.py', header=header, class_name=class_name, fields=form_fields, widgets=widgets
+                ),
+                f"{app_dir}/rest/{module}_api.py": templates.render(
+                    'rest_api.py', header=header, class_name=class_name,
+                    search_fields=[label_field] if label_field is not None else [],
+                    related_fields=[foreign_key[0] for foreign_key in foreign_keys.values()],
+                    keyset=keyset, page_size=DURC_CodeGenerator.PAGE_SIZE,
+                    max_page_size=DURC_CodeGenerator.MAX_PAGE_SIZE,
+                ),
+                f"{app_dir}/tests/test_{module}_queries.py": templates.render(
+                    'test_queries.py', header=header, module=module, class_name=class_name,
+                    root_package='.' * (len(app_path) + 2),
+                ),
+            },
+            'create_once': {
+                f"{app_dir}/models/v_{module}.py": templates.render(
+                    'v_model.py', source=source, module=module, class_name=class_name
+                ),
+            },
+        }
+
+    @staticmethod
+    def foreign_keys(db_name, schema_name, table, table_info, known_tables):
+        """
+        Get the columns of a table that become ForeignKey fields.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+            table (str): Table name
+            table_info (dict): Table entry of the relational model
+            known_tables (set): (db, schema or None, table) of every table in the model
+
+        Returns:
+            dict: Column name -> (field name, target model reference, target app path, target
+                module, related name, target table key) for every belongs_to whose target
+                table is in the model and whose local key is a column of the table
+        """
+        column_names = {column['column_name'] for column in table_info.get('column_data', [])}
+        foreign_keys = {}
+        for name, relationship in table_info.get('belongs_to', {}).items():
+            local_key = relationship.get('local_key')
+            to_table = relationship.get('to_table')
+            if not local_key or not to_table or local_key not in column_names:
+                continue
+            to_db = relationship.get('to_db') or db_name
+            to_schema = relationship.get('to_schema') or schema_name
+            if (to_db, to_schema, to_table) not in known_tables:
+                continue
+            to_app_path = DURC_CodeGenerator.app_path(to_db, to_schema)
+            # The has_many name the relationship has on the target table
+            prefix = local_key[:-3] if local_key.endswith('_id') else None
+            related_name = table if prefix in (None, to_table) else f"{prefix}_{table}"
+            foreign_keys[local_key] = (
+                DURC_CodeGenerator.identifier(name),
+                f"{DURC_CodeGenerator.app_label(to_app_path)}.{DURC_CodeGenerator.class_name(to_table)}",
+                to_app_path,
+                DURC_CodeGenerator.identifier(to_table),
+                DURC_CodeGenerator.identifier(related_name),
+                (to_db, to_schema, to_table),
+            )
+        return foreign_keys
+
+    @staticmethod
+    def query_plans(tables, known_tables):
+        """
+        Plan the related rows every table's queryset loads up front (see DURC_QueryPlanner).
+
+        Args:
+            tables (list): (db, schema or None, table, table_info) tuples
+            known_tables (set): (db, schema or None, table) of every table in the model
+
+        Returns:
+            dict: (db, schema or None, table) -> {'select_related': [paths],
+                'prefetch_related': [names], 'depth': int}
+        """
+        edges = {}
+        for db_name, schema_name, table, table_info in tables:
+            foreign_keys = DURC_CodeGenerator.foreign_keys(db_name, schema_name, table, table_info, known_tables)
+            edges[(db_name, schema_name, table)] = [
+                (field_name, target_key, related_name)
+                for field_name, _, _, _, related_name, target_key in foreign_keys.values()
+            ]
+        return DURC_QueryPlanner.plan(edges)
+
+    @staticmethod
+    def _model_field(column, foreign_keys, has_primary_key):
+        # (field name, Django field class, field arguments) of a column
+        column_name = column['column_name']
+        if column_name in foreign_keys:
+            field_name, target, _, _, related_name, _ = foreign_keys[column_name]
+            field_class = 'ForeignKey'
+            arguments = [repr(target), 'models.DO_NOTHING', f"related_name={related_name!r}"]
+        else:
+            field_name = DURC_CodeGenerator.identifier(column_name)
+            data_type = column.get('data_type')
+            if column.get('is_primary_key') and column.get('is_auto_increment'):
+                field_class, options = 'AutoField', ''
+            elif data_type == 'int' and column_name.startswith('is_'):
+                # DURC naming convention: is_* integers are booleans
+                field_class, options = 'BooleanField', ''
+            else:
+                field_class, options = DURC_CodeGenerator.FIELD_TYPES.get(data_type, ('TextField', ''))
+            arguments = [options] if options else []
+
+        if field_name != column_name:
+            arguments.append(f"db_column={column_name!r}")
+        if column.get('is_primary_key') and not has_primary_key:
+            arguments.append('primary_key=True')
+        if column.get('is_nullable'):
+            arguments.append('null=True, blank=True')
+        return field_name, field_class, arguments
+
+    @staticmethod
+    def _model_fields(columns, foreign_keys):
+        fields = []
+        has_primary_key = False
+        for column in columns:
+            fields.append(DURC_CodeGenerator._model_field(column, foreign_keys, has_primary_key))
+            # Django models have a single primary key field; the first key column is used
+            has_primary_key = has_primary_key or bool(column.get('is_primary_key'))
+        return fields
+
+    @staticmethod
+    def _form_fields(columns, foreign_keys):
+        # Field names of the form, and (field name, widget expression) of the fields with
+        # an enhanced widget
+        fields = []
+        widgets = []
+        for column in columns:
+            column_name = column['column_name']
+            # Auto-increment keys and binary columns are not editable in a form
+            if (column.get('is_primary_key') and column.get('is_auto_increment')) or column.get('data_type') == 'blob':
+                continue
+            if column_name in foreign_keys:
+                field_name, _, to_app_path, to_module, _, _ = foreign_keys[column_name]
+                url = f"/{'/'.join(to_app_path)}/api/{to_module}/"
+                widgets.append((
+                    field_name,
+                    f"forms.Select(attrs={{'class': 'tom-select', 'data-autosuggest-url': {url!r}}})",
+                ))
+            else:
+                field_name = DURC_CodeGenerator.identifier(column_name)
+                data_type = column.get('data_type')
+                if column_name.endswith('_date') or data_type == 'date':
+                    widgets.append((field_name, "forms.DateInput(attrs={'type': 'date'})"))
+                elif data_type in DURC_CodeGenerator.NUMERIC_TYPES and not column_name.startswith('is_'):
+                    widgets.append((field_name, "forms.NumberInput(attrs={'inputmode': 'decimal'})"))
+            fields.append(field_name)
+        return fields, widgets
+
+    @staticmethod
+    def render_app_indexes(app_path, tables, templates=None):
+        """
+        Render the index files of one app.
+
+        Args:
+            app_path (tuple): Package path of the app
+            tables (list): (module, class_name) of every table in the app
+            templates (DURC_TemplateLoader): Templates to render, or None for the built-in ones
+
+        Returns:
+            dict: Relative path -> source. The output only depends on the set of tables,
+                not on the order they are given in
+        """
+        templates = templates or DURC_CodeGenerator.BUILTIN_TEMPLATES
+        app_dir = '/'.join(app_path)
+        app_label = DURC_CodeGenerator.app_label(app_path)
+        header = DURC_CodeGenerator.GENERATED_HEADER.format(source='.'.join(app_path))
+        tables = sorted(tables)
+        return {
+            f"{app_dir}/__init__.py": templates.render('package_init.py', header=header),
+            f"{app_dir}/apps.py": templates.render(
+                'apps.py', header=header, config_class=f"{DURC_CodeGenerator.class_name(app_label)}Config",
+                app_label=app_label,
+            ),
+            f"{app_dir}/models/__init__.py": templates.render('models_init.py', header=header, tables=tables),
+            f"{app_dir}/forms/__init__.py": templates.render('forms_init.py', header=header, tables=tables),
+            f"{app_dir}/rest/__init__.py": templates.render('rest_init.py', header=header, tables=tables),
+            f"{app_dir}/urls.py": templates.render('app_urls.py', header=header, tables=tables),
+            f"{app_dir}/tests/__init__.py": templates.render('package_init.py', header=header),
+        }
+
+    @staticmethod
+    def render_root_indexes(app_paths, templates=None):
+        """
+        Render the package files of the output directory and the URL registry of every app.
+
+        Args:
+            app_paths (iterable): Package paths of every app
+            templates (DURC_TemplateLoader): Templates to render, or None for the built-in ones
+
+        Returns:
+            dict: Relative path -> source
+        """
+        templates = templates or DURC_CodeGenerator.BUILTIN_TEMPLATES
+        header = DURC_CodeGenerator.GENERATED_HEADER.format(source='the relational model')
+        package_init = templates.render('package_init.py', header=header)
+        app_paths = sorted(set(app_paths))
+        files = {'__init__.py': package_init}
+        for app_path in app_paths:
+            # Packages between the output directory and an app, e.g. a database with schemas
+            for depth in range(1, len(app_path)):
+                files[f"{'/'.join(app_path[:depth])}/__init__.py"] = package_init
+
+        files['urls.py'] = templates.render('root_urls.py', header=header, app_paths=app_paths)
+        files['testing.py'] = templates.render('testing.py', header=header)
+        return files
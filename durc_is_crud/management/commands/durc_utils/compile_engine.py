@@ -0,0 +1,275 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .code_generator import DURC_CodeGenerator
+from .compile_manifest import DURC_CompileManifest
+from ....shared.durc_relational_model import DurcRelationalModel
+
+
+class DURC_CompileResult:
+    """
+    Summary of a durc_compile run.
+
+    Attributes:
+        table_count (int): Number of tables in the model
+        tables_rendered (int): Number of tables rendered again; the others were up to date
+        files_written (int): Number of files written, index files included. Files whose
+            content did not change are not written
+        files_removed (int): Number of generated files of tables no longer in the model
+        elapsed (float): Wall time of the run in seconds
+        workers (int): Number of worker processes used
+    """
+
+    def __init__(self, table_count, tables_rendered, files_written, files_removed, elapsed, workers):
+        self.table_count = table_count
+        self.tables_rendered = tables_rendered
+        self.files_written = files_written
+        self.files_removed = files_removed
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def tables_per_second(self):
+        """float: Compile throughput."""
+        return self.table_count / self.elapsed if self.elapsed > 0 else float(self.table_count)
+
+
+class DURC_CompileEngine:
+    """
+    Compiles a relational model into Django source files, one table at a time.
+
+    Rendering and writing a table's files only needs that table's entry (see
+    DURC_CodeGenerator.render_table()), so the tables are split into chunks that worker
+    processes render and write in parallel. The files shared by every table of an app
+    (package __init__ files, the URL registries) are written afterwards in one merge step
+    by this process, from the tables sorted by app and module, so they come out the same
+    whatever the number of workers and the order they finished in.
+
+    Compiles are incremental: tables whose input hash (see DURC_CompileManifest) matches
+    the previous run and whose files are untouched are not rendered at all, and a file is
+    only written when its bytes change, so unchanged files keep their modification time.
+
+    Usage:
+        engine = DURC_CompileEngine('durc_generated', workers=8, manifest=manifest)
+        with DurcDataLoader().open_relational_model(path) as model:
+            result = engine.compile(model.iter_tables())
+        manifest.save(path)
+    """
+
+    # Upper bound on the tables sent to a worker process at once; smaller chunks balance
+    # the load better, larger ones cost fewer round trips
+    MAX_CHUNK_SIZE = 100
+
+    def __init__(self, output_dir, workers=1, manifest=None, templates=None):
+        """
+        Args:
+            output_dir (str): Directory the generated packages are written to
+            workers (int): Number of worker processes; 1 renders in this process
+            manifest (DURC_CompileManifest): Manifest of the previous compile, updated in
+                place; None to render every table
+            templates (DURC_TemplateLoader): Templates to render, or None for the built-in ones
+        """
+        self.output_dir = output_dir
+        self.workers = workers
+        self.templates = templates or DURC_CodeGenerator.BUILTIN_TEMPLATES
+        self.manifest = manifest if manifest is not None else DURC_CompileManifest(output_dir, templates=self.templates)
+
+    def compile(self, tables):
+        """
+        Render and write the files of every out-of-date table, then the index files.
+
+        Args:
+            tables (iterable): (db, schema or None, table, table_info) tuples, as yielded by
+                DurcLazyRelationalModel.iter_tables()
+
+        Returns:
+            DURC_CompileResult: Number of tables and files, and the time taken
+        """
+        start = time.perf_counter()
+        tables = list(tables)
+        known_tables = frozenset((db_name, schema_name, table) for db_name, schema_name, table, _ in tables)
+        # The related rows each table's queryset loads depend on the whole graph, so they
+        # are planned here and handed to the renderers
+        query_plans = DURC_CodeGenerator.query_plans(tables, known_tables)
+        input_hashes = self.manifest.input_hashes(tables, query_plans)
+
+        previous_tables = self.manifest.tables
+        current_tables = {}
+        index_entries = []
+        stale_tables = []
+        for db_name, schema_name, table, table_info in tables:
+            qualified_name = DurcRelationalModel.qualified_name(db_name, schema_name, table)
+            input_hash = input_hashes[(db_name, schema_name, table)]
+            if self.manifest.is_current(qualified_name, input_hash):
+                current_tables[qualified_name] = previous_tables[qualified_name]
+                index_entries.append(DURC_CodeGenerator.table_names(db_name, schema_name, table))
+            else:
+                stale_tables.append((db_name, schema_name, table, table_info))
+
+        compiled = []
+        if self.workers > 1 and len(stale_tables) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.output_dir, known_tables, self.templates, query_plans)
+            ) as executor:
+                for chunk_result in executor.map(_compile_chunk_in_worker, self._chunks(stale_tables)):
+                    compiled.extend(chunk_result)
+        elif stale_tables:
+            compiled = compile_tables(self.output_dir, known_tables, stale_tables, self.templates, query_plans)
+
+        files_written = 0
+        for key, app_path, module, class_name, written, files in compiled:
+            qualified_name = DurcRelationalModel.qualified_name(*key)
+            current_tables[qualified_name] = {'input': input_hashes[key], 'files': files}
+            index_entries.append((app_path, module, class_name))
+            files_written += written
+
+        files_removed = self._remove_dropped_tables(previous_tables, current_tables)
+        self.manifest.tables = current_tables
+
+        files_written += self._write_indexes(index_entries)
+        return DURC_CompileResult(
+            len(tables), len(stale_tables), files_written, files_removed, time.perf_counter() - start, self.workers
+        )
+
+    def _chunks(self, tables):
+        # About four chunks per worker, so a worker that drew large tables does not hold up the rest
+        chunk_size = max(1, min(self.MAX_CHUNK_SIZE, -(-len(tables) // (self.workers * 4))))
+        for position in range(0, len(tables), chunk_size):
+            yield tables[position:position + chunk_size]
+
+    def _remove_dropped_tables(self, previous_tables, current_tables):
+        """
+        Delete the overwritten files of tables that are no longer in the model.
+
+        Validated models are never recorded in the manifest, so they are kept.
+
+        Returns:
+            int: Number of files deleted
+        """
+        kept_files = {path for entry in current_tables.values() for path in entry['files']}
+        removed = 0
+        for qualified_name, entry in previous_tables.items():
+            if qualified_name in current_tables:
+                continue
+            for relative_path in entry.get('files', {}):
+                if relative_path in kept_files:
+                    continue
+                try:
+                    os.remove(os.path.join(self.output_dir, *relative_path.split('/')))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def _write_indexes(self, index_entries):
+        """
+        Write the index files of every app and of the output directory.
+
+        Args:
+            index_entries (list): (app_path, module, class_name) of every table
+
+        Returns:
+            int: Number of files written
+        """
+        tables_by_app = {}
+        for app_path, module, class_name in index_entries:
+            tables_by_app.setdefault(tuple(app_path), []).append((module, class_name))
+
+        files = DURC_CodeGenerator.render_root_indexes(tables_by_app, self.templates)
+        for app_path in sorted(tables_by_app):
+            files.update(DURC_CodeGenerator.render_app_indexes(app_path, tables_by_app[app_path], self.templates))
+
+        written = 0
+        for relative_path in sorted(files):
+            changed, _ = write_file(self.output_dir, relative_path, files[relative_path])
+            written += changed
+        return written
+
+
+def write_file(output_dir, relative_path, content):
+    """
+    Write a generated file unless it already holds the same bytes, creating its directory if needed.
+
+    Args:
+        output_dir (str): Output directory
+        relative_path (str): Path of the file relative to output_dir, with / separators
+        content (str): File content
+
+    Returns:
+        tuple: (whether the file was written, [sha256, size, mtime_ns] of the file)
+    """
+    data = content.encode('utf-8')
+    path = os.path.join(output_dir, *relative_path.split('/'))
+    try:
+        with open(path, 'rb') as f:
+            changed = f.read() != data
+    except FileNotFoundError:
+        changed = True
+
+    if changed:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    stat = os.stat(path)
+    return changed, [hashlib.sha256(data).hexdigest(), stat.st_size, stat.st_mtime_ns]
+
+
+def compile_tables(output_dir, known_tables, tables, templates=None, query_plans=None):
+    """
+    Render and write the files of a list of tables.
+
+    Args:
+        output_dir (str): Output directory
+        known_tables (frozenset): (db, schema or None, table) of every table in the model
+        tables (list): (db, schema or None, table, table_info) tuples
+        templates (DURC_TemplateLoader): Templates to render, or None for the built-in ones
+        query_plans (dict): Plans from DURC_CodeGenerator.query_plans() of at least these
+            tables, or None to only join direct foreign keys
+
+    Returns:
+        list: ((db, schema, table), app_path, module, class_name, files written, file records)
+            for every table, in the given order. The file records map the relative path of
+            every file rendered on each compile to its [sha256, size, mtime_ns]
+    """
+    compiled = []
+    for db_name, schema_name, table, table_info in tables:
+        rendered = DURC_CodeGenerator.render_table(
+            db_name, schema_name, table, table_info, known_tables, templates,
+            query_plans.get((db_name, schema_name, table)) if query_plans is not None else None
+        )
+        written = 0
+        files = {}
+        for relative_path, content in rendered['files'].items():
+            changed, files[relative_path] = write_file(output_dir, relative_path, content)
+            written += changed
+        for relative_path, content in rendered['create_once'].items():
+            if not os.path.exists(os.path.join(output_dir, *relative_path.split('/'))):
+                write_file(output_dir, relative_path, content)
+                written += 1
+        compiled.append((
+            (db_name, schema_name, table), rendered['app_path'], rendered['module'], rendered['class_name'],
+            written, files
+        ))
+    return compiled
+
+
+# Set in each worker process by _init_worker(), so the table set, the templates and the
+# query plans are sent once per worker instead of with every chunk
+_worker_output_dir = None
+_worker_known_tables = None
+_worker_templates = None
+_worker_query_plans = None
+
+
+def _init_worker(output_dir, known_tables, templates, query_plans):
+    global _worker_output_dir, _worker_known_tables, _worker_templates, _worker_query_plans
+    _worker_output_dir = output_dir
+    _worker_known_tables = known_tables
+    _worker_templates = templates
+    _worker_query_plans = query_plans
+
+
+def _compile_chunk_in_worker(tables):
+    return compile_tables(_worker_output_dir, _worker_known_tables, tables, _worker_templates, _worker_query_plans)
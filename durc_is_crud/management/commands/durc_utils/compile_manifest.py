@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+from .... import __version__
+from . import code_generator, template_loader
+
+
+class DURC_CompileManifest:
+    """
+    Per-table input and output hashes for incremental compiles.
+
+    A table's input hash covers its own entry in the relational model, the entries of the
+    tables it is related to (belongs_to targets and has_many sources, whose names, keys
+    and presence change the rendered files), the table's query plan (which depends on
+    tables further away), the code generator itself and the templates it renders. When the hash
+    matches the previous run and the table's generated files are still the ones that run
+    wrote (same size and modification time), the table is not rendered again.
+
+    The manifest is stored in durc_config/ with the relational model. It describes the
+    files of one output directory; compiling into another directory starts afresh.
+
+    Attributes:
+        output_dir (str): Absolute output directory the previous run wrote to
+        tables (dict): Qualified table name -> {'input': hash, 'files': {path: [sha256, size, mtime_ns]}}
+    """
+
+    # Bump when the manifest layout changes
+    MANIFEST_VERSION = 1
+
+    DEFAULT_PATH = os.path.join('durc_config', 'DURC_compile_manifest.json')
+
+    def __init__(self, output_dir, generator=None, tables=None, templates=None):
+        self.output_dir = os.path.abspath(output_dir)
+        self.generator = generator if generator is not None else self.generator_fingerprint(templates)
+        self.tables = tables or {}
+
+    @staticmethod
+    def generator_fingerprint(templates=None):
+        """
+        Hash the code generator and its templates, so that files rendered by another
+        version or from other templates are not trusted.
+
+        Args:
+            templates (DURC_TemplateLoader): Templates of this compile, or None for the built-in ones
+
+        Returns:
+            str: Hex digest of the package version, the code generator source and the templates
+        """
+        templates = templates or code_generator.DURC_CodeGenerator.BUILTIN_TEMPLATES
+        digest = hashlib.sha256(__version__.encode('utf-8'))
+        for module in (code_generator, template_loader):
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        digest.update(templates.fingerprint().encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def load(cls, manifest_path, output_dir, templates=None):
+        """
+        Load the manifest written by the previous compile.
+
+        If the manifest is missing, unreadable, was written for another output directory,
+        by another version of the generator or from other templates, it is empty and every
+        table is compiled.
+
+        Args:
+            manifest_path (str): Path of the manifest file
+            output_dir (str): Output directory of this compile
+            templates (DURC_TemplateLoader): Templates of this compile, or None for the built-in ones
+
+        Returns:
+            DURC_CompileManifest: The previous manifest, or an empty one
+        """
+        manifest = cls(output_dir, templates=templates)
+        try:
+            with open(manifest_path, 'r') as f:
+                stored = json.load(f)
+        except Exception:
+            return manifest
+
+        if (not isinstance(stored, dict) or stored.get('version') != cls.MANIFEST_VERSION
+                or stored.get('output_dir') != manifest.output_dir or stored.get('generator') != manifest.generator):
+            return manifest
+        manifest.tables = stored.get('tables') or {}
+        return manifest
+
+    def save(self, manifest_path):
+        """
+        Write the manifest.
+
+        Args:
+            manifest_path (str): Path of the manifest file
+        """
+        manifest_dir = os.path.dirname(manifest_path)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump({
+                'version': self.MANIFEST_VERSION,
+                'output_dir': self.output_dir,
+                'generator': self.generator,
+                'tables': self.tables,
+            }, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def entry_hash(table_info):
+        """
+        Hash a table entry of the relational model.
+
+        Args:
+            table_info (dict): Table entry
+
+        Returns:
+            str: Hex digest of the entry, independent of key order
+        """
+        payload = json.dumps(table_info, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def related_tables(db_name, schema_name, table_info):
+        """
+        List the tables whose entries can change the files rendered for a table.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+            table_info (dict): Table entry
+
+        Returns:
+            set: (db, schema or None, table) of every belongs_to target and has_many source
+        """
+        related = set()
+        for relationship in table_info.get('belongs_to', {}).values():
+            if relationship.get('to_table'):
+                related.add((
+                    relationship.get('to_db') or db_name,
+                    relationship.get('to_schema') or schema_name,
+                    relationship['to_table'],
+                ))
+        for relationship in table_info.get('has_many', {}).values():
+            if relationship.get('from_table'):
+                related.add((
+                    relationship.get('from_db') or db_name,
+                    relationship.get('from_schema') or schema_name,
+                    relationship['from_table'],
+                ))
+        return related
+
+    def input_hashes(self, tables, query_plans=None):
+        """
+        Compute the input hash of every table.
+
+        Args:
+            tables (list): (db, schema or None, table, table_info) tuples
+            query_plans (dict): (db, schema or None, table) -> query plan of the table, from
+                DURC_CodeGenerator.query_plans()
+
+        Returns:
+            dict: (db, schema or None, table) -> hex digest
+        """
+        entry_hashes = {
+            (db_name, schema_name, table): self.entry_hash(table_info)
+            for db_name, schema_name, table, table_info in tables
+        }
+        input_hashes = {}
+        for db_name, schema_name, table, table_info in tables:
+            key = (db_name, schema_name, table)
+            parts = [self.generator, entry_hashes[key]]
+            if query_plans is not None:
+                parts.append(json.dumps(query_plans.get(key), sort_keys=True))
+            for related_key in sorted(self.related_tables(db_name, schema_name, table_info), key=repr):
+                # A related table that is not in the model hashes as None, so adding it later changes the hash
+                parts.append(f"{related_key!r}={entry_hashes.get(related_key)}")
+            input_hashes[key] = hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+        return input_hashes
+
+    def is_current(self, qualified_name, input_hash):
+        """
+        Check whether a table's generated files are up to date.
+
+        Args:
+            qualified_name (str): Qualified table name
+            input_hash (str): Input hash of the table in this compile
+
+        Returns:
+            bool: True if the previous compile rendered the same input and its files are untouched
+        """
+        previous = self.tables.get(qualified_name)
+        if previous is None or previous.get('input') != input_hash:
+            return False
+        for relative_path, (_, size, mtime_ns) in previous.get('files', {}).items():
+            try:
+                stat = os.stat(os.path.join(self.output_dir, *relative_path.split('/')))
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return False
+        return True
@@ -1,54 +1,190 @@
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from .database_engine import DURC_DatabaseEngine
+
+
 class DURC_DataTypeMapper:
     """
     Utility class for mapping database data types to simplified types used in DURC schema.
+
+    Types are resolved from a registry keyed by dialect ('postgresql', 'mysql', 'sqlite').
+    Each dialect has a table of exact type names and a table of prefixes for parameterized
+    types such as character varying(255) or numeric(10,2). A dialect's own entries win over
+    the shared entries under the None key, which hold the built-in mappings for every engine;
+    the dialect tables start empty and hold the types added with register_type(). Exact
+    names are dictionary lookups; prefixes are tried longest first. Resolved strings are
+    kept in an LRU cache, so a type name seen before costs one cache hit.
+
+    Changing a built-in mapping changes the mined model of existing databases, so bump
+    DURC_IncrementalMiningState.FINGERPRINT_VERSION along with it.
+
+    Usage:
+        DURC_DataTypeMapper.map_data_type('character varying(255)')  # 'varchar'
+        DURC_DataTypeMapper.map_data_types(['integer', 'text'], dialect='mysql')  # ['int', 'text']
+        DURC_DataTypeMapper.register_type('citext', 'text')  # an extension type
+        DURC_DataTypeMapper.register_type('geometry', 'blob', prefix=True)  # geometry(Point,4326)
     """
-    
+
+    # Number of distinct (type, dialect) pairs kept in the resolution cache
+    CACHE_SIZE = 4096
+
+    # Dialect -> type name -> simplified type
+    EXACT_TYPES = {
+        None: {
+            # Integer types
+            'integer': 'int', 'int': 'int', 'int4': 'int', 'serial': 'int', 'bigint': 'int', 'int8': 'int',
+            'bigserial': 'int', 'smallint': 'int', 'int2': 'int', 'smallserial': 'int',
+            # String types
+            'text': 'text', 'char': 'char',
+            # Text types
+            'mediumtext': 'mediumtext', 'longtext': 'longtext',
+            # Numeric types
+            'real': 'float', 'float4': 'float', 'float8': 'float', 'double precision': 'float',
+            # Date/time types
+            'date': 'date', 'datetime': 'datetime',
+            # Binary types
+            'bytea': 'blob',
+            # Boolean types
+            'boolean': 'tinyint', 'bool': 'tinyint',
+        },
+        'postgresql': {},
+        'mysql': {},
+        'sqlite': {},
+    }
+
+    # Dialect -> (prefix, simplified type) for parameterized types
+    PREFIX_TYPES = {
+        None: [
+            ('varchar', 'varchar'), ('character varying', 'varchar'), ('character', 'char'),
+            ('numeric', 'decimal'), ('decimal', 'decimal'),
+            ('timestamp', 'timestamp'), ('time', 'time'),
+        ],
+        'postgresql': [],
+        'mysql': [],
+        'sqlite': [],
+    }
+
+    # Guards the registry tables and the prefix lists derived from them
+    _lock = threading.Lock()
+    _sorted_prefixes = {}
+
+    @classmethod
+    def map_data_type(cls, pg_type, dialect=None):
+        """
+        Map a database data type to the simplified type used in DURC schema.
+
+        Args:
+            pg_type (str): Data type as reported by the catalog, in any case
+            dialect (str): 'postgresql', 'mysql', 'sqlite', or None for the shared table only
+
+        Returns:
+            str: Simplified type, or the lowercased type name when it is not in the registry
+        """
+        return _resolve(pg_type, dialect)
+
+    @classmethod
+    def map_data_types(cls, data_types, dialect=None):
+        """
+        Map the data types of a whole table's columns in one call.
+
+        Args:
+            data_types (iterable): Data types as reported by the catalog
+            dialect (str): Dialect of the database the types come from
+
+        Returns:
+            list: Simplified types, in the same order
+        """
+        return [_resolve(data_type, dialect) for data_type in data_types]
+
+    @classmethod
+    def register_type(cls, data_type, simplified_type, dialect=None, prefix=False):
+        """
+        Add or replace a mapping, e.g. for a domain or an extension type.
+
+        Args:
+            data_type (str): Type name, or the start of a parameterized type name with prefix=True
+            simplified_type (str): Simplified type to map it to
+            dialect (str): Dialect the mapping applies to, or None for every dialect
+            prefix (bool): Match every type name that starts with data_type
+        """
+        data_type = data_type.lower()
+        with cls._lock:
+            if prefix:
+                prefixes = [entry for entry in cls.PREFIX_TYPES.setdefault(dialect, []) if entry[0] != data_type]
+                prefixes.append((data_type, simplified_type))
+                cls.PREFIX_TYPES[dialect] = prefixes
+            else:
+                cls.EXACT_TYPES.setdefault(dialect, {})[data_type] = simplified_type
+        cls.clear_cache()
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget every resolved type, e.g. after changing EXACT_TYPES or PREFIX_TYPES directly."""
+        with cls._lock:
+            cls._sorted_prefixes = {}
+        _resolve.cache_clear()
+
+    @classmethod
+    def registry_fingerprint(cls):
+        """
+        Hash the registry, including the types added with register_type().
+
+        Returns:
+            str: Hex digest that changes whenever a mapping is added or changed
+        """
+        with cls._lock:
+            state = {
+                'exact': {str(dialect): sorted(types.items()) for dialect, types in cls.EXACT_TYPES.items()},
+                'prefix': {str(dialect): sorted(prefixes) for dialect, prefixes in cls.PREFIX_TYPES.items()},
+            }
+        payload = json.dumps(state, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
     @staticmethod
-    def map_data_type(pg_type):
-        """Map PostgreSQL data types to simplified types used in DURC schema"""
-        pg_type = pg_type.lower()
-        
-        # Integer types
-        if pg_type in ('integer', 'int', 'int4', 'serial', 'bigint', 'int8', 'bigserial', 'smallint', 'int2', 'smallserial'):
-            return 'int'
-        
-        # String types
-        if pg_type.startswith('varchar') or pg_type.startswith('character varying'):
-            return 'varchar'
-        if pg_type == 'text':
-            return 'text'
-        if pg_type == 'char' or pg_type.startswith('character'):
-            return 'char'
-        
-        # Text types
-        if pg_type == 'mediumtext':
-            return 'mediumtext'
-        if pg_type == 'longtext':
-            return 'longtext'
-        
-        # Numeric types
-        if pg_type == 'real' or pg_type == 'float4' or pg_type == 'float8' or pg_type == 'double precision':
-            return 'float'
-        if pg_type.startswith('numeric') or pg_type.startswith('decimal'):
-            return 'decimal'
-        
-        # Date/time types
-        if pg_type == 'date':
-            return 'date'
-        if pg_type == 'timestamp' or pg_type.startswith('timestamp'):
-            return 'timestamp'
-        if pg_type == 'time' or pg_type.startswith('time'):
-            return 'time'
-        if pg_type == 'datetime':
-            return 'datetime'
-        
-        # Binary types
-        if pg_type == 'bytea':
-            return 'blob'
-        
-        # Boolean types
-        if pg_type == 'boolean' or pg_type == 'bool':
-            return 'tinyint'
-        
+    def dialect_for_engine(engine):
+        """
+        Get the registry dialect of a Django database engine.
+
+        Args:
+            engine (str): ENGINE setting, e.g. 'django.db.backends.postgresql'
+
+        Returns:
+            str: 'postgresql', 'mysql' or 'sqlite', or None for other engines
+        """
+        return DURC_DatabaseEngine.dialect(engine)
+
+    @classmethod
+    def _resolve_uncached(cls, data_type, dialect):
+        data_type = data_type.lower()
+
+        for tables_dialect in (dialect, None) if dialect is not None else (None,):
+            simplified_type = cls.EXACT_TYPES.get(tables_dialect, {}).get(data_type)
+            if simplified_type is not None:
+                return simplified_type
+
+        for type_prefix, simplified_type in cls._prefixes(dialect):
+            if data_type.startswith(type_prefix):
+                return simplified_type
+
         # Default fallback
-        return pg_type
+        return data_type
+
+    @classmethod
+    def _prefixes(cls, dialect):
+        # The dialect's prefixes and the shared ones, longest first so that e.g. character
+        # varying is tried before character; a dialect's own prefix wins a tie
+        prefixes = cls._sorted_prefixes.get(dialect)
+        if prefixes is None:
+            with cls._lock:
+                entries = list(cls.PREFIX_TYPES.get(dialect, [])) if dialect is not None else []
+                entries += cls.PREFIX_TYPES.get(None, [])
+                prefixes = sorted(entries, key=lambda entry: len(entry[0]), reverse=True)
+                cls._sorted_prefixes[dialect] = prefixes
+        return prefixes
+
+
+@lru_cache(maxsize=DURC_DataTypeMapper.CACHE_SIZE)
+def _resolve(data_type, dialect):
+    return DURC_DataTypeMapper._resolve_uncached(data_type, dialect)
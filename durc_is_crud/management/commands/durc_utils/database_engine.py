@@ -0,0 +1,40 @@
+class DURC_DatabaseEngine:
+    """
+    Utility class for telling which database a Django ENGINE setting points to.
+
+    Every place that branches on the database (the schema layer and introspection backend
+    of the extractor, the dialect of the data type registry, the default schema of models
+    parsed from SQL files) goes through dialect(), so a connection is never PostgreSQL in
+    one place and something else in another. ENGINE is used rather than the connection's
+    vendor because catalog snapshot connections only carry the ENGINE they were taken from.
+    """
+
+    # Dialect -> substrings of the ENGINE settings of its backends, including GIS backends
+    # and third-party PostgreSQL backends named after their driver
+    ENGINE_MARKERS = (
+        ('postgresql', ('postgresql', 'postgis', 'psycopg')),
+        ('mysql', ('mysql',)),
+        ('sqlite', ('sqlite', 'spatialite')),
+    )
+
+    @staticmethod
+    def dialect(engine):
+        """
+        Get the dialect of a Django database engine.
+
+        Args:
+            engine (str): ENGINE setting, e.g. 'django.contrib.gis.db.backends.postgis'
+
+        Returns:
+            str: 'postgresql', 'mysql' or 'sqlite', or None for other engines
+        """
+        engine = (engine or '').lower()
+        for dialect, markers in DURC_DatabaseEngine.ENGINE_MARKERS:
+            if any(marker in engine for marker in markers):
+                return dialect
+        return None
+
+    @staticmethod
+    def is_postgresql(engine):
+        """Check whether a Django database engine is a PostgreSQL one."""
+        return DURC_DatabaseEngine.dialect(engine) == 'postgresql'
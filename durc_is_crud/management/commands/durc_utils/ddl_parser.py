@@ -0,0 +1,453 @@
+import glob
+import os
+import re
+
+
+class DURC_DDLParser:
+    """
+    Parser that turns CREATE TABLE and ALTER TABLE statements into information_schema rows.
+
+    The rows have the same shape as the ones DURC_CatalogSnapshot copies from a live
+    database, so the relational model extractor can mine SQL files through a snapshot
+    with exactly the same primary key, foreign key, *_id and pattern-based inference.
+
+    Supported statements:
+        CREATE [TEMP | UNLOGGED] TABLE [IF NOT EXISTS] [schema.]table (...) with column
+            definitions, inline PRIMARY KEY / REFERENCES / NOT NULL / DEFAULT, and table-level
+            PRIMARY KEY and FOREIGN KEY constraints
+        ALTER TABLE [ONLY] [schema.]table ADD [CONSTRAINT name] PRIMARY KEY / FOREIGN KEY ...
+            and ADD [COLUMN] ..., as written by pg_dump
+    Every other statement is ignored.
+
+    Usage:
+        parser = DURC_DDLParser(postgresql=True)
+        for path in DURC_DDLParser.find_sql_files(['schema/*.sql']):
+            parser.parse_file(path)
+        rows_by_view = parser.information_schema_rows('public')
+
+    Attributes:
+        postgresql (bool): Fold unquoted identifiers to lower case and report data types
+            under their information_schema names, as PostgreSQL does
+        tables (dict): (schema or None, table) -> parsed table, in definition order
+    """
+
+    # Merged files written by merge_create_sql_files.py repeat the tables of the other files
+    MERGED_FILENAME = '_merged_.sql'
+
+    _TOKEN_RE = re.compile(r"""
+        (?P<space>\s+|--[^\n]*|/\*.*?\*/)
+        |(?P<quoted>"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\])
+        |(?P<string>[EeNn]?'(?:[^'\\]|''|\\.)*')
+        |(?P<dollar>\$(?P<tag>[A-Za-z_]*)\$.*?\$(?P=tag)\$)
+        |(?P<word>[A-Za-z_][\w$]*)
+        |(?P<number>\d+(?:\.\d*)?)
+        |(?P<op>::|.)
+    """, re.S | re.X)
+
+    # Keywords that end a column's data type or DEFAULT expression
+    _COLUMN_CONSTRAINT_KEYWORDS = frozenset({
+        'CONSTRAINT', 'NOT', 'NULL', 'DEFAULT', 'PRIMARY', 'REFERENCES', 'UNIQUE', 'CHECK',
+        'COLLATE', 'GENERATED', 'AUTO_INCREMENT', 'AUTOINCREMENT', 'IDENTITY', 'COMMENT', 'ON',
+    })
+
+    # Table elements that are neither columns nor keys the extractor reads
+    _IGNORED_TABLE_ELEMENTS = frozenset({
+        'UNIQUE', 'CHECK', 'KEY', 'INDEX', 'FULLTEXT', 'SPATIAL', 'EXCLUDE', 'LIKE',
+    })
+
+    # PostgreSQL type aliases -> information_schema data_type
+    _POSTGRESQL_TYPES = {
+        'int': 'integer', 'int4': 'integer', 'int8': 'bigint', 'int2': 'smallint',
+        'serial': 'integer', 'serial4': 'integer', 'bigserial': 'bigint', 'serial8': 'bigint',
+        'smallserial': 'smallint', 'serial2': 'smallint',
+        'varchar': 'character varying', 'char': 'character', 'bpchar': 'character',
+        'bool': 'boolean', 'float8': 'double precision', 'float4': 'real', 'decimal': 'numeric',
+        'timestamptz': 'timestamp with time zone', 'timestamp': 'timestamp without time zone',
+        'timetz': 'time with time zone', 'time': 'time without time zone', 'array': 'ARRAY',
+    }
+
+    _SERIAL_TYPES = frozenset({'serial', 'serial4', 'bigserial', 'serial8', 'smallserial', 'serial2'})
+
+    def __init__(self, postgresql=False):
+        self.postgresql = postgresql
+        self.tables = {}
+        # (schema, table) -> ALTER TABLE ADD elements for tables not defined yet
+        self._pending_elements = {}
+
+    @classmethod
+    def find_sql_files(cls, paths):
+        """
+        Expand file paths, glob patterns and directories into a list of SQL files.
+
+        Directories are searched recursively for *.sql files, skipping _merged_.sql files.
+
+        Args:
+            paths (list): File paths, glob patterns or directories
+
+        Returns:
+            list: SQL file paths, in the order given and sorted within each pattern or directory
+        """
+        sql_files = []
+        for path in paths:
+            if os.path.isdir(path):
+                matches = [
+                    match for match in glob.glob(os.path.join(path, '**', '*.sql'), recursive=True)
+                    if os.path.basename(match) != cls.MERGED_FILENAME
+                ]
+            elif glob.has_magic(path):
+                matches = glob.glob(path, recursive=True)
+            else:
+                matches = [path] if os.path.isfile(path) else []
+            for match in sorted(matches):
+                if match not in sql_files:
+                    sql_files.append(match)
+        return sql_files
+
+    def parse_file(self, path):
+        """
+        Parse the statements of a SQL file.
+
+        Args:
+            path (str): SQL file path
+
+        Returns:
+            int: Number of tables defined by the file
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.parse_sql(f.read())
+
+    def parse_sql(self, sql):
+        """
+        Parse the statements of a SQL script.
+
+        A table defined again replaces its earlier definition.
+
+        Args:
+            sql (str): SQL script
+
+        Returns:
+            int: Number of tables defined by the script
+        """
+        table_count = 0
+        for statement in self._split_statements(self._tokenize(sql)):
+            keywords = [token[1].upper() for token in statement[:8] if token[0] == 'word']
+            if keywords[:1] == ['CREATE'] and 'TABLE' in keywords:
+                if self._parse_create_table(statement):
+                    table_count += 1
+            elif keywords[:2] == ['ALTER', 'TABLE']:
+                self._parse_alter_table(statement)
+        return table_count
+
+    def information_schema_rows(self, default_schema):
+        """
+        Build the information_schema rows for every parsed table.
+
+        Args:
+            default_schema (str): Schema for tables and references written without one
+
+        Returns:
+            dict: View name -> list of rows, with the columns of DURC_CatalogSnapshot.VIEWS
+        """
+        rows = {
+            'tables': [], 'columns': [], 'table_constraints': [],
+            'key_column_usage': [], 'constraint_column_usage': [],
+        }
+        tables = {
+            (schema_name or default_schema, table_name): table
+            for (schema_name, table_name), table in self.tables.items()
+        }
+        constraint_number = 0
+
+        for (schema_name, table_name), table in tables.items():
+            rows['tables'].append((schema_name, table_name, 'BASE TABLE'))
+            for position, (column_name, data_type, is_nullable, column_default) in enumerate(table['columns'], 1):
+                if column_name in table['primary_key']:
+                    is_nullable = 'NO'
+                rows['columns'].append(
+                    (schema_name, table_name, column_name, data_type, is_nullable, column_default, position)
+                )
+
+            # Constraint names only need to be unique; the extractor joins on them
+            if table['primary_key']:
+                constraint_number += 1
+                constraint_name = f"durc_ddl_{constraint_number}_pkey"
+                rows['table_constraints'].append((constraint_name, schema_name, table_name, 'PRIMARY KEY'))
+                for column_name in table['primary_key']:
+                    rows['key_column_usage'].append((constraint_name, schema_name, table_name, column_name))
+                    rows['constraint_column_usage'].append((constraint_name, schema_name, table_name, column_name))
+
+            for columns, ref_schema, ref_table, ref_columns in table['foreign_keys']:
+                ref_schema = ref_schema or default_schema
+                if not ref_columns:
+                    referenced = tables.get((ref_schema, ref_table))
+                    ref_columns = referenced['primary_key'] if referenced and referenced['primary_key'] else ['id']
+                constraint_number += 1
+                constraint_name = f"durc_ddl_{constraint_number}_fkey"
+                rows['table_constraints'].append((constraint_name, schema_name, table_name, 'FOREIGN KEY'))
+                for column_name in columns:
+                    rows['key_column_usage'].append((constraint_name, schema_name, table_name, column_name))
+                for column_name in ref_columns:
+                    rows['constraint_column_usage'].append((constraint_name, ref_schema, ref_table, column_name))
+
+        return rows
+
+    @classmethod
+    def _tokenize(cls, sql):
+        # (kind, value, start, end, sql) tuples; comments and whitespace are dropped
+        tokens = []
+        for match in cls._TOKEN_RE.finditer(sql):
+            kind = match.lastgroup
+            if kind == 'tag':
+                kind = 'dollar'
+            if kind != 'space':
+                tokens.append((kind, match.group(), match.start(), match.end(), sql))
+        return tokens
+
+    @staticmethod
+    def _split_statements(tokens):
+        statement = []
+        for token in tokens:
+            if token[0] == 'op' and token[1] == ';':
+                if statement:
+                    yield statement
+                statement = []
+            else:
+                statement.append(token)
+        if statement:
+            yield statement
+
+    @staticmethod
+    def _split_elements(tokens):
+        # Split the tokens between parentheses at the top-level commas
+        elements = []
+        element = []
+        depth = 0
+        for token in tokens:
+            if token[0] == 'op' and token[1] == '(':
+                depth += 1
+            elif token[0] == 'op' and token[1] == ')':
+                depth -= 1
+            elif token[0] == 'op' and token[1] == ',' and depth == 0:
+                elements.append(element)
+                element = []
+                continue
+            element.append(token)
+        if element:
+            elements.append(element)
+        return elements
+
+    @staticmethod
+    def _matching_paren(tokens, start):
+        # Index of the ')' closing the '(' at tokens[start]
+        depth = 0
+        for position in range(start, len(tokens)):
+            kind, value = tokens[position][:2]
+            if kind == 'op' and value == '(':
+                depth += 1
+            elif kind == 'op' and value == ')':
+                depth -= 1
+                if depth == 0:
+                    return position
+        return len(tokens)
+
+    @staticmethod
+    def _is_keyword(token, *keywords):
+        return token is not None and token[0] == 'word' and token[1].upper() in keywords
+
+    def _identifier(self, token):
+        kind, value = token[:2]
+        if kind == 'quoted':
+            quote = value[0]
+            if quote == '[':
+                return value[1:-1]
+            return value[1:-1].replace(quote * 2, quote)
+        return value.lower() if self.postgresql else value
+
+    def _qualified_name(self, tokens, position):
+        """Read schema.table (or db.schema.table) at position; returns (schema, table, next_position)."""
+        parts = [self._identifier(tokens[position])]
+        position += 1
+        while (position + 1 < len(tokens) and tokens[position][:2] == ('op', '.')
+               and tokens[position + 1][0] in ('word', 'quoted')):
+            parts.append(self._identifier(tokens[position + 1]))
+            position += 2
+        schema_name = parts[-2] if len(parts) > 1 else None
+        return schema_name, parts[-1], position
+
+    def _identifier_list(self, tokens, position):
+        """Read a parenthesized identifier list at position; returns (names, next_position)."""
+        if position >= len(tokens) or tokens[position][:2] != ('op', '('):
+            return [], position
+        end = self._matching_paren(tokens, position)
+        names = [self._identifier(token) for token in tokens[position + 1:end] if token[0] in ('word', 'quoted')]
+        return names, end + 1
+
+    def _parse_create_table(self, tokens):
+        position = 1
+        while position < len(tokens) and not self._is_keyword(tokens[position], 'TABLE'):
+            position += 1
+        position += 1
+        if (self._is_keyword(tokens[position] if position < len(tokens) else None, 'IF')
+                and position + 2 < len(tokens)):
+            position += 3
+        if position >= len(tokens):
+            return False
+
+        schema_name, table_name, position = self._qualified_name(tokens, position)
+        # CREATE TABLE ... AS SELECT and PARTITION OF have no column list to read
+        if position >= len(tokens) or tokens[position][:2] != ('op', '('):
+            return False
+
+        end = self._matching_paren(tokens, position)
+        table = {'name': table_name, 'columns': [], 'primary_key': [], 'foreign_keys': []}
+        for element in self._split_elements(tokens[position + 1:end]):
+            self._parse_table_element(table, element)
+
+        # ALTER TABLE statements may come before the table, e.g. in an earlier file
+        for element in self._pending_elements.pop((schema_name, table_name), []):
+            self._parse_table_element(table, element)
+
+        # A redefinition replaces the earlier table, in its original position
+        self.tables[(schema_name, table_name)] = table
+        return True
+
+    def _parse_alter_table(self, tokens):
+        position = 2
+        while self._is_keyword(tokens[position] if position < len(tokens) else None, 'IF', 'EXISTS', 'ONLY'):
+            position += 1
+        if position >= len(tokens):
+            return
+        schema_name, table_name, position = self._qualified_name(tokens, position)
+
+        table = self.tables.get((schema_name, table_name))
+        for action in self._split_elements(tokens[position:]):
+            if not self._is_keyword(action[0], 'ADD'):
+                continue
+            element = action[1:]
+            if element and self._is_keyword(element[0], 'COLUMN'):
+                element = element[1:]
+                if element and self._is_keyword(element[0], 'IF'):
+                    element = element[3:]
+            if table is None:
+                self._pending_elements.setdefault((schema_name, table_name), []).append(element)
+            else:
+                self._parse_table_element(table, element)
+
+    def _parse_table_element(self, table, element):
+        if not element:
+            return
+        if self._is_keyword(element[0], 'CONSTRAINT'):
+            element = element[2:]
+            if not element:
+                return
+
+        if self._is_keyword(element[0], 'PRIMARY'):
+            columns, _ = self._identifier_list(element, 2)
+            table['primary_key'] = columns
+        elif self._is_keyword(element[0], 'FOREIGN'):
+            columns, position = self._identifier_list(element, 2)
+            self._parse_references(table, columns, element, position)
+        elif not self._is_keyword(element[0], *self._IGNORED_TABLE_ELEMENTS) and element[0][0] in ('word', 'quoted'):
+            self._parse_column(table, element)
+
+    def _parse_references(self, table, columns, tokens, position):
+        """Record REFERENCES [schema.]table [(columns)] at position for the given local columns."""
+        if not columns or position + 1 >= len(tokens) or not self._is_keyword(tokens[position], 'REFERENCES'):
+            return
+        ref_schema, ref_table, position = self._qualified_name(tokens, position + 1)
+        ref_columns, position = self._identifier_list(tokens, position)
+        table['foreign_keys'].append((columns, ref_schema, ref_table, ref_columns))
+        return position
+
+    def _parse_column(self, table, tokens):
+        column_name = self._identifier(tokens[0])
+
+        # The data type runs up to the first column constraint
+        position = 1
+        type_words = []
+        depth = 0
+        while position < len(tokens):
+            kind, value = tokens[position][:2]
+            if depth == 0 and self._is_keyword(tokens[position], *self._COLUMN_CONSTRAINT_KEYWORDS):
+                break
+            if kind == 'op' and value == '(':
+                depth += 1
+            elif kind == 'op' and value == ')':
+                depth -= 1
+            elif depth == 0 and kind == 'quoted' and value.startswith('['):
+                # integer[] and integer[3] are array types
+                type_words = ['ARRAY']
+            elif depth == 0 and kind in ('word', 'quoted') and type_words != ['ARRAY']:
+                type_words.append(self._identifier(tokens[position]) if kind == 'quoted' else value)
+            position += 1
+        base_type = ' '.join(type_words)
+        data_type = self._data_type(base_type)
+
+        is_nullable = 'YES'
+        column_default = None
+        if base_type.lower() in self._SERIAL_TYPES:
+            is_nullable = 'NO'
+            if self.postgresql:
+                column_default = f"nextval('{table['name']}_{column_name}_seq'::regclass)"
+            else:
+                column_default = 'auto_increment'
+
+        while position < len(tokens):
+            token = tokens[position]
+            keyword = token[1].upper() if token[0] == 'word' else None
+            next_token = tokens[position + 1] if position + 1 < len(tokens) else None
+            if keyword == 'NOT' and self._is_keyword(next_token, 'NULL'):
+                is_nullable = 'NO'
+                position += 2
+            elif keyword == 'PRIMARY':
+                table['primary_key'] = [column_name]
+                is_nullable = 'NO'
+                position += 2
+            elif keyword == 'REFERENCES':
+                position = self._parse_references(table, [column_name], tokens, position) or len(tokens)
+                # Skip ON DELETE / ON UPDATE actions
+                while position < len(tokens) and not self._is_keyword(
+                        tokens[position], 'NOT', 'NULL', 'DEFAULT', 'PRIMARY', 'UNIQUE', 'CHECK', 'CONSTRAINT'):
+                    position += 1
+            elif keyword == 'DEFAULT':
+                start = position + 1
+                position = start
+                depth = 0
+                while position < len(tokens):
+                    kind, value = tokens[position][:2]
+                    if kind == 'op' and value == '(':
+                        depth += 1
+                    elif kind == 'op' and value == ')':
+                        depth -= 1
+                    elif depth == 0 and self._is_keyword(tokens[position], *self._COLUMN_CONSTRAINT_KEYWORDS - {'NULL'}):
+                        break
+                    position += 1
+                if position > start:
+                    # Keep the expression as written; DEFAULT NULL is the same as no default
+                    sql = tokens[start][4]
+                    expression = sql[tokens[start][2]:tokens[position - 1][3]]
+                    column_default = None if expression.upper() == 'NULL' else expression
+            elif keyword in ('AUTO_INCREMENT', 'AUTOINCREMENT'):
+                if column_default is None:
+                    column_default = 'auto_increment'
+                position += 1
+            elif keyword in ('CHECK', 'GENERATED', 'COLLATE', 'COMMENT', 'ON', 'CONSTRAINT'):
+                # Skip the keyword and its argument
+                position += 1
+                if position < len(tokens) and tokens[position][:2] == ('op', '('):
+                    position = self._matching_paren(tokens, position) + 1
+                elif keyword != 'GENERATED':
+                    position += 1
+            else:
+                position += 1
+
+        table['columns'].append((column_name, data_type, is_nullable, column_default))
+
+    def _data_type(self, base_type):
+        data_type = base_type.lower()
+        if self.postgresql:
+            return self._POSTGRESQL_TYPES.get(data_type, data_type)
+        if data_type.endswith(' unsigned'):
+            data_type = data_type[:-len(' unsigned')]
+        return data_type
+
@@ -1,10 +1,23 @@
 from django.core.management.base import CommandError
+from ....shared import durc_table_pattern
 
 class DURC_IncludePatternParser:
     """
     Utility class for parsing include patterns for database, schema, and table selection.
+    
+    The schema and table parts of a pattern may be shell-style globs (*, ? and [...]), e.g.
+    npd.public.provider_* or npd.*.*_archive. The database part of an include pattern names
+    a connection and must be literal; exclude patterns may use a glob there too.
+    
+    The pattern grammar itself (splitting, glob detection and matching) lives in
+    shared/durc_table_pattern.py, which DurcTableMatcher uses as well.
     """
     
+    GLOB_CHARS = durc_table_pattern.GLOB_CHARS
+    
+    # Escape character for the LIKE predicates built by glob_to_like()
+    LIKE_ESCAPE = '!'
+    
     @staticmethod
     def parse_include_patterns(patterns):
         """
@@ -16,39 +29,95 @@ class DURC_IncludePatternParser:
         Returns:
             list: A list of dictionaries with keys:
                 - db: database name
-                - schema: schema name (or None for all schemas)
-                - table: table name (or None for all tables)
+                - schema: schema name or glob (or None for all schemas)
+                - table: table name or glob (or None for all tables)
+                
+        Raises:
+            CommandError: If an invalid pattern format is provided
+        """
+        result = DURC_IncludePatternParser._parse_patterns(patterns, 'include')
+        
+        for pattern in result:
+            if DURC_IncludePatternParser.is_glob(pattern['db']):
+                raise CommandError(f"Invalid include pattern: the database name '{pattern['db']}' cannot be a glob")
                 
+        return result
+    
+    @staticmethod
+    def parse_exclude_patterns(patterns):
+        """
+        Parse the exclude patterns into the same format as the include patterns.
+        
+        A pattern without a table part excludes whole schemas, and one without a schema part
+        excludes whole databases.
+        
+        Args:
+            patterns (list): List of pattern strings in the format db.schema.table, db.schema, or db
+            
+        Returns:
+            list: A list of dictionaries with db, schema and table keys
+            
         Raises:
             CommandError: If an invalid pattern format is provided
         """
+        return DURC_IncludePatternParser._parse_patterns(patterns, 'exclude')
+    
+    @staticmethod
+    def _parse_patterns(patterns, kind):
         result = []
         
         for pattern in patterns:
-            parts = pattern.split('.')
-            
-            if len(parts) == 1:
-                # Format: db
-                result.append({
-                    'db': parts[0],
-                    'schema': None,
-                    'table': None
-                })
-            elif len(parts) == 2:
-                # Format: db.schema
-                result.append({
-                    'db': parts[0],
-                    'schema': parts[1],
-                    'table': None
-                })
-            elif len(parts) == 3:
-                # Format: db.schema.table
-                result.append({
-                    'db': parts[0],
-                    'schema': parts[1],
-                    'table': parts[2]
-                })
-            else:
-                raise CommandError(f"Invalid include pattern: {pattern}. Use format: db.schema.table, db.schema, or db")
+            try:
+                result.append(durc_table_pattern.parse_table_pattern(pattern))
+            except ValueError:
+                raise CommandError(f"Invalid {kind} pattern: {pattern}. Use format: db.schema.table, db.schema, or db")
         
         return result
+    
+    is_glob = staticmethod(durc_table_pattern.is_glob)
+    
+    matches = staticmethod(durc_table_pattern.matches)
+    
+    @staticmethod
+    def glob_to_like(part):
+        """
+        Translate a glob into a LIKE pattern that uses LIKE_ESCAPE as its escape character.
+        
+        * and ? become % and _. A [...] class becomes _, so the LIKE pattern may match more
+        names than the glob; callers check the rows it returns with matches().
+        
+        Args:
+            part (str): Literal name or glob
+            
+        Returns:
+            str: LIKE pattern
+        """
+        escape = DURC_IncludePatternParser.LIKE_ESCAPE
+        like = []
+        position = 0
+        while position < len(part):
+            char = part[position]
+            if char == '*':
+                like.append('%')
+            elif char == '?':
+                like.append('_')
+            elif char == '[' and DURC_IncludePatternParser._class_end(part, position) is not None:
+                like.append('_')
+                position = DURC_IncludePatternParser._class_end(part, position)
+            elif char in ('%', '_', escape):
+                like.append(escape + char)
+            else:
+                like.append(char)
+            position += 1
+        return ''.join(like)
+    
+    @staticmethod
+    def _class_end(part, start):
+        # Position of the ] closing the [...] class at start, following fnmatch's rules
+        position = start + 1
+        if position < len(part) and part[position] == '!':
+            position += 1
+        if position < len(part) and part[position] == ']':
+            position += 1
+        class_end = part.find(']', position)
+        return class_end if class_end != -1 else None
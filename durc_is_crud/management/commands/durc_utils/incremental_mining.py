@@ -0,0 +1,174 @@
+import os
+import json
+import hashlib
+import threading
+from ....shared.durc_data_loader import DurcDataLoader
+from .data_type_mapper import DURC_DataTypeMapper
+
+
+class DURC_IncrementalMiningState:
+    """
+    Per-table catalog fingerprints for incremental re-mining.
+
+    A table's fingerprint is a hash of every catalog row that can change its entry in the
+    relational model: its own columns and constraints, the foreign keys in other tables that
+    point at it (has_many), the naming-convention references to it, and the table lookups
+    its *_id columns resolve to. When the fingerprint matches the one stored by the previous
+    run, the table's entry is copied from the previous model instead of being re-derived.
+
+    The fingerprints are stored next to the relational model file, with a hash of the data
+    type registry: types added or changed with DURC_DataTypeMapper.register_type() change
+    the entries of tables whose catalog rows did not change, so a different registry
+    mines every table.
+
+    Attributes:
+        previous_model (dict): Relational model written by the previous run
+        previous_fingerprints (dict): db -> schema -> table -> fingerprint from the previous run
+        fingerprints (dict): db -> schema -> table -> fingerprint for this run
+        reused_tables (list): Qualified names of the tables copied from the previous model
+        refreshed_tables (list): Qualified names of the tables that were mined again
+    """
+
+    # Bump when the extractor starts producing different output for the same catalog rows,
+    # so that fingerprints written by an older version are not trusted
+    FINGERPRINT_VERSION = 2
+
+    def __init__(self, previous_model=None, previous_fingerprints=None):
+        self.previous_model = previous_model or {}
+        self.previous_fingerprints = previous_fingerprints or {}
+        self.fingerprints = {}
+        self.reused_tables = []
+        self.refreshed_tables = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprints_path(output_path):
+        """
+        Get the path of the fingerprints file stored next to a relational model file.
+
+        Args:
+            output_path (str): Path of the relational model file
+
+        Returns:
+            str: Path of the fingerprints file
+        """
+        base_path, _ = os.path.splitext(output_path)
+        return f"{base_path}.fingerprints.json"
+
+    @classmethod
+    def load(cls, output_path):
+        """
+        Load the previous relational model and its fingerprints.
+
+        If either file is missing, unreadable, or was written by a different fingerprint
+        version or with a different data type registry, nothing is reused and every table
+        is mined.
+
+        Args:
+            output_path (str): Path of the relational model file
+
+        Returns:
+            DURC_IncrementalMiningState: State for the next run
+        """
+        try:
+            with open(cls.fingerprints_path(output_path), 'r') as f:
+                stored = json.load(f)
+            previous_model = DurcDataLoader().load_relational_model(output_path)
+        except Exception:
+            return cls()
+
+        if not isinstance(stored, dict) or stored.get('version') != cls.FINGERPRINT_VERSION:
+            return cls()
+        if stored.get('type_registry') != DURC_DataTypeMapper.registry_fingerprint():
+            return cls()
+        return cls(previous_model, stored.get('tables'))
+
+    def save(self, output_path):
+        """
+        Write this run's fingerprints next to the relational model file.
+
+        Args:
+            output_path (str): Path of the relational model file
+        """
+        with open(self.fingerprints_path(output_path), 'w') as f:
+            json.dump({
+                'version': self.FINGERPRINT_VERSION,
+                'type_registry': DURC_DataTypeMapper.registry_fingerprint(),
+                'tables': self.fingerprints,
+            }, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def fingerprint_table(catalog, table, suffix_index, table_index):
+        """
+        Compute the fingerprint of a table from catalog rows.
+
+        Args:
+            catalog (DURC_SchemaCatalog): Catalog rows for the table's schema
+            table (str): Table name
+            suffix_index (DURC_TableSuffixIndex): Index of the schema's table names
+            table_index (DURC_TableIndex): Index of every table in the database
+
+        Returns:
+            str: Hex digest of the table's catalog rows
+        """
+        columns = catalog.columns.get(table, [])
+
+        # Tables that *_id columns resolve to by naming convention
+        lookups = [
+            (row[0], suffix_index.find_table(row[0]), table_index.schemas_by_table.get(row[0][:-3], []))
+            for row in columns if row[0].endswith('_id')
+        ]
+
+        rows = [
+            columns,
+            sorted(catalog.primary_keys.get(table, ())),
+            sorted(catalog.foreign_key_columns.get(table, ())),
+            sorted(catalog.foreign_keys.get(table, []), key=repr),
+            sorted(catalog.referencing_keys.get(table, []), key=repr),
+            sorted(catalog.named_references.get(f"{table}_id", []), key=repr),
+            lookups,
+        ]
+        payload = json.dumps(rows, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_unchanged_table(self, db_name, schema_name, table, fingerprint, is_postgresql):
+        """
+        Get a table's entry from the previous model if its fingerprint has not changed.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name
+            table (str): Table name
+            fingerprint (str): Fingerprint computed for this run
+            is_postgresql (bool): Whether the model has a schema layer for this database
+
+        Returns:
+            dict: The previous table entry, or None if the table must be mined again
+        """
+        previous_fingerprint = self.previous_fingerprints.get(db_name, {}).get(schema_name, {}).get(table)
+        if previous_fingerprint != fingerprint:
+            return None
+
+        db_model = self.previous_model.get(db_name, {})
+        if is_postgresql:
+            return db_model.get(schema_name, {}).get(table)
+        return db_model.get(table)
+
+    def record_table(self, db_name, schema_name, table, fingerprint, reused):
+        """
+        Record a table's fingerprint for this run and whether it was reused.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name
+            table (str): Table name
+            fingerprint (str): Fingerprint computed for this run
+            reused (bool): Whether the entry was copied from the previous model
+        """
+        with self._lock:
+            self.fingerprints.setdefault(db_name, {}).setdefault(schema_name, {})[table] = fingerprint
+            qualified_name = f"{db_name}.{schema_name}.{table}"
+            if reused:
+                self.reused_tables.append(qualified_name)
+            else:
+                self.refreshed_tables.append(qualified_name)
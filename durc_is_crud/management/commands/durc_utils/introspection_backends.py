@@ -0,0 +1,852 @@
+from contextlib import nullcontext
+from .include_pattern_parser import DURC_IncludePatternParser
+from .schema_catalog import DURC_SchemaCatalog
+from .table_index import DURC_TableIndex
+
+
+class DURC_InformationSchemaBackend:
+    """
+    Introspection backend that reads the catalog through the standard information_schema views.
+
+    This is the portable fallback used for every database engine that does not have a
+    native backend. Subclasses only need to replace the SQL statements below; the code
+    that loads the rows into a DURC_SchemaCatalog is shared.
+    """
+
+    name = 'information_schema'
+
+    # Tables whose per-table catalog queries are sent together by load_tables_catalog()
+    PIPELINE_BATCH_SIZE = 50
+
+    # Schema to mine when a pattern names none; None to use the database name
+    DEFAULT_SCHEMA = None
+
+    # Base tables in a schema: params (schema)
+    TABLES_SQL = """
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = %s
+        AND table_type = 'BASE TABLE'
+        AND table_name NOT LIKE '\\_%%'
+    """
+
+    # Schemas holding base tables: no params
+    SCHEMAS_SQL = """
+        SELECT DISTINCT table_schema
+        FROM information_schema.tables
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        AND table_type = 'BASE TABLE'
+    """
+
+    # Columns that LIKE predicates are added on by list_tables() and list_schemas()
+    TABLE_NAME_COLUMN = 'table_name'
+    SCHEMA_NAME_COLUMN = 'table_schema'
+
+    # Per-table queries: params (table, schema) unless noted otherwise
+    TABLE_COLUMNS_SQL = """
+        SELECT column_name, data_type, is_nullable, column_default
+        FROM information_schema.columns c
+        WHERE table_name = %s
+        AND table_schema = %s
+        ORDER BY ordinal_position
+    """
+
+    TABLE_PRIMARY_KEYS_SQL = """
+        SELECT ccu.column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.constraint_column_usage ccu
+        ON tc.constraint_name = ccu.constraint_name
+        WHERE tc.table_name = %s
+        AND tc.table_schema = %s
+        AND tc.constraint_type = 'PRIMARY KEY'
+    """
+
+    TABLE_FOREIGN_KEY_COLUMNS_SQL = """
+        SELECT kcu.column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.key_column_usage kcu
+        ON tc.constraint_name = kcu.constraint_name
+        WHERE tc.table_name = %s
+        AND tc.table_schema = %s
+        AND tc.constraint_type = 'FOREIGN KEY'
+    """
+
+    TABLE_FOREIGN_KEYS_SQL = """
+        SELECT kcu.column_name, ccu.table_schema, ccu.table_name, ccu.column_name
+        FROM information_schema.table_constraints AS tc
+        JOIN information_schema.key_column_usage AS kcu
+        ON tc.constraint_name = kcu.constraint_name
+        JOIN information_schema.constraint_column_usage AS ccu
+        ON ccu.constraint_name = tc.constraint_name
+        WHERE tc.constraint_type = 'FOREIGN KEY'
+        AND tc.table_name = %s
+        AND tc.table_schema = %s
+    """
+
+    TABLE_REFERENCING_KEYS_SQL = """
+        SELECT tc.table_name, kcu.column_name, tc.table_schema
+        FROM information_schema.table_constraints AS tc
+        JOIN information_schema.key_column_usage AS kcu
+        ON tc.constraint_name = kcu.constraint_name
+        JOIN information_schema.constraint_column_usage AS ccu
+        ON ccu.constraint_name = tc.constraint_name
+        WHERE tc.constraint_type = 'FOREIGN KEY'
+        AND ccu.table_name = %s
+        AND ccu.table_schema = %s
+    """
+
+    # params (column_name, schema)
+    TABLE_NAMED_REFERENCES_SQL = """
+        SELECT c.table_schema, c.table_name, c.column_name
+        FROM information_schema.columns c
+        JOIN information_schema.tables t ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+        WHERE c.column_name = %s
+        AND t.table_type = 'BASE TABLE'
+        AND c.table_schema != %s
+        AND c.table_schema NOT IN ('information_schema', 'pg_catalog')
+    """
+
+    # Whole-schema queries: params (schema)
+    SCHEMA_COLUMNS_SQL = """
+        SELECT table_name, column_name, data_type, is_nullable, column_default
+        FROM information_schema.columns
+        WHERE table_schema = %s
+        ORDER BY table_name, ordinal_position
+    """
+
+    SCHEMA_PRIMARY_KEYS_SQL = """
+        SELECT tc.table_name, ccu.column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.constraint_column_usage ccu
+        ON tc.constraint_name = ccu.constraint_name
+        WHERE tc.table_schema = %s
+        AND tc.constraint_type = 'PRIMARY KEY'
+    """
+
+    SCHEMA_FOREIGN_KEY_COLUMNS_SQL = """
+        SELECT tc.table_name, kcu.column_name
+        FROM information_schema.table_constraints tc
+        JOIN information_schema.key_column_usage kcu
+        ON tc.constraint_name = kcu.constraint_name
+        WHERE tc.table_schema = %s
+        AND tc.constraint_type = 'FOREIGN KEY'
+    """
+
+    SCHEMA_FOREIGN_KEYS_SQL = """
+        SELECT tc.table_name, kcu.column_name, ccu.table_schema, ccu.table_name, ccu.column_name
+        FROM information_schema.table_constraints AS tc
+        JOIN information_schema.key_column_usage AS kcu
+        ON tc.constraint_name = kcu.constraint_name
+        JOIN information_schema.constraint_column_usage AS ccu
+        ON ccu.constraint_name = tc.constraint_name
+        WHERE tc.constraint_type = 'FOREIGN KEY'
+        AND tc.table_schema = %s
+    """
+
+    SCHEMA_REFERENCING_KEYS_SQL = """
+        SELECT ccu.table_name, tc.table_name, kcu.column_name, tc.table_schema
+        FROM information_schema.table_constraints AS tc
+        JOIN information_schema.key_column_usage AS kcu
+        ON tc.constraint_name = kcu.constraint_name
+        JOIN information_schema.constraint_column_usage AS ccu
+        ON ccu.constraint_name = tc.constraint_name
+        WHERE tc.constraint_type = 'FOREIGN KEY'
+        AND ccu.table_schema = %s
+    """
+
+    # The LIKE pattern is deliberately loose (_ is a wildcard); exact names are matched later.
+    SCHEMA_NAMED_REFERENCES_SQL = """
+        SELECT c.table_schema, c.table_name, c.column_name
+        FROM information_schema.columns c
+        JOIN information_schema.tables t ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+        WHERE c.column_name LIKE '%%_id'
+        AND t.table_type = 'BASE TABLE'
+        AND c.table_schema != %s
+        AND c.table_schema NOT IN ('information_schema', 'pg_catalog')
+    """
+
+    # Expression each kind of per-table query is ordered by, for queries whose row order is
+    # part of the model (column order becomes column_data order)
+    TABLE_CATALOG_ORDINALS = {'columns': 'ordinal_position'}
+
+    # Every table (or view) in the database, for linked key detection, and whether it is a
+    # base table: no params
+    ALL_TABLES_SQL = """
+        SELECT table_schema, table_name, CASE WHEN table_type = 'BASE TABLE' THEN 1 ELSE 0 END
+        FROM information_schema.tables
+        WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+        ORDER BY table_schema
+    """
+
+    def list_tables(self, cursor, schema_name, include=None, exclude=None):
+        """
+        List the base tables in a schema.
+
+        Include and exclude globs are added to the query as LIKE predicates, so only the
+        matching slice of the schema is read. A LIKE pattern can match more names than its
+        glob (case-insensitive collations, [...] classes), so the rows are checked again here.
+
+        Args:
+            cursor: Database cursor
+            schema_name (str): Schema name
+            include (list): Optional table names or globs; a table is listed if it matches any of them
+            exclude (list): Optional table names or globs; a table matching any of them is left out
+
+        Returns:
+            list: Table names
+        """
+        sql = self.TABLES_SQL
+        params = [schema_name]
+        if include:
+            sql += self._like_predicate(self.TABLE_NAME_COLUMN, include, params)
+        if exclude:
+            sql += self._like_predicate(self.TABLE_NAME_COLUMN, exclude, params, negate=True)
+        cursor.execute(sql, params)
+        tables = [row[0] for row in cursor.fetchall()]
+        if include or exclude:
+            tables = [
+                table for table in tables
+                if (not include or any(DURC_IncludePatternParser.matches(glob, table) for glob in include))
+                and not any(DURC_IncludePatternParser.matches(glob, table) for glob in exclude or ())
+            ]
+        return tables
+
+    def list_schemas(self, cursor, schema_glob):
+        """
+        List the schemas holding base tables whose names match a glob.
+
+        Args:
+            cursor: Database cursor
+            schema_glob (str): Schema name or glob
+
+        Returns:
+            list: Schema names, sorted
+        """
+        params = []
+        sql = self.SCHEMAS_SQL + self._like_predicate(self.SCHEMA_NAME_COLUMN, [schema_glob], params)
+        cursor.execute(sql, params)
+        return sorted(
+            row[0] for row in cursor.fetchall()
+            if DURC_IncludePatternParser.matches(schema_glob, row[0])
+        )
+
+    @staticmethod
+    def _like_predicate(column, globs, params, negate=False):
+        """
+        Build an AND clause matching a column against any of several globs.
+
+        Args:
+            column (str): Column expression
+            globs (list): Names or globs
+            params (list): Query parameters, extended with one LIKE pattern per glob
+            negate (bool): Match rows where the column matches none of the globs instead
+
+        Returns:
+            str: SQL fragment to append to a WHERE clause
+        """
+        escape = DURC_IncludePatternParser.LIKE_ESCAPE
+        operator = 'NOT LIKE' if negate else 'LIKE'
+        conditions = []
+        for glob in globs:
+            conditions.append(f"{column} {operator} %s ESCAPE '{escape}'")
+            params.append(DURC_IncludePatternParser.glob_to_like(glob))
+        joiner = ' AND ' if negate else ' OR '
+        return f"\n        AND ({joiner.join(conditions)})\n"
+
+    def load_table_catalog(self, cursor, schema_name, table):
+        """
+        Load the catalog rows for a single table, one query per kind of row.
+
+        Args:
+            cursor: Database cursor
+            schema_name (str): Schema name
+            table (str): Table name
+
+        Returns:
+            DURC_SchemaCatalog: Catalog holding only the rows for the given table
+        """
+        catalog = DURC_SchemaCatalog(schema_name, [table])
+        for kind, sql, params in self._table_catalog_queries(schema_name, table):
+            cursor.execute(sql, params)
+            self._add_table_rows(catalog, kind, table, cursor.fetchall())
+
+        return catalog
+
+    def load_tables_catalog(self, cursor, schema_name, tables):
+        """
+        Load the catalog rows for a batch of tables without a round trip per query.
+
+        The same per-table queries as load_table_catalog() are used. On a psycopg 3
+        connection they are all queued in pipeline mode and sent in one flush. Otherwise
+        every kind of query is combined for the whole batch into one UNION ALL statement,
+        so the batch costs six round trips however many tables it holds.
+
+        Args:
+            cursor: Database cursor
+            schema_name (str): Schema name
+            tables (list): Table names, at most PIPELINE_BATCH_SIZE of them
+
+        Returns:
+            DURC_SchemaCatalog: Catalog holding only the rows for the given tables
+        """
+        queries = [
+            (kind, table, sql, params)
+            for table in tables
+            for kind, sql, params in self._table_catalog_queries(schema_name, table)
+        ]
+
+        raw_connection = getattr(cursor, 'connection', None)
+        if hasattr(raw_connection, 'pipeline'):
+            results = self._execute_pipelined(cursor, raw_connection, queries)
+        else:
+            results = self._execute_combined(cursor, queries)
+
+        catalog = DURC_SchemaCatalog(schema_name, tables)
+        for (kind, table, _, _), rows in zip(queries, results):
+            self._add_table_rows(catalog, kind, table, rows)
+        return catalog
+
+    def _table_catalog_queries(self, schema_name, table):
+        # (kind, sql, params) for every per-table query, in load_table_catalog() order
+        return [
+            ('columns', self.TABLE_COLUMNS_SQL, [table, schema_name]),
+            ('primary_keys', self.TABLE_PRIMARY_KEYS_SQL, [table, schema_name]),
+            ('foreign_key_columns', self.TABLE_FOREIGN_KEY_COLUMNS_SQL, [table, schema_name]),
+            ('foreign_keys', self.TABLE_FOREIGN_KEYS_SQL, [table, schema_name]),
+            ('referencing_keys', self.TABLE_REFERENCING_KEYS_SQL, [table, schema_name]),
+            ('named_references', self.TABLE_NAMED_REFERENCES_SQL, [f"{table}_id", schema_name]),
+        ]
+
+    @staticmethod
+    def _add_table_rows(catalog, kind, table, rows):
+        if kind == 'columns':
+            catalog.columns[table] = [tuple(row) for row in rows]
+        elif kind == 'primary_keys':
+            catalog.primary_keys[table] = set([row[0] for row in rows])
+        elif kind == 'foreign_key_columns':
+            catalog.foreign_key_columns[table] = set([row[0] for row in rows])
+        elif kind == 'foreign_keys':
+            catalog.foreign_keys[table] = [tuple(row) for row in rows]
+        elif kind == 'referencing_keys':
+            catalog.referencing_keys[table] = [tuple(row) for row in rows]
+        else:
+            catalog.named_references[f"{table}_id"] = [tuple(row) for row in rows]
+
+    @staticmethod
+    def _execute_pipelined(cursor, raw_connection, queries):
+        """
+        Send every query in one psycopg 3 pipeline flush and collect the results.
+
+        The queries run on cursors of the raw connection, which are wrapped the way the
+        mining cursor is (see wrap_pipelined_cursor()), so query counters and the profiler
+        still see them. Django does not wrap the errors of raw cursors, so they are passed
+        through the connection's wrap_database_errors: a statement or lock timeout then
+        raises django.db.utils.OperationalError, which read-only mining retries.
+
+        Args:
+            cursor: The mining cursor, possibly wrapped
+            raw_connection: psycopg 3 connection
+            queries (list): (kind, table, sql, params) tuples
+
+        Returns:
+            list: Rows of each query, in query order
+        """
+        wrap_pipelined_cursor = getattr(cursor, 'wrap_pipelined_cursor', None)
+        # The Django connection of the mining cursor, if it has one
+        database = getattr(cursor, 'db', None)
+        pending = []
+        try:
+            with database.wrap_database_errors if database is not None else nullcontext():
+                with raw_connection.pipeline():
+                    for _, _, sql, params in queries:
+                        pipelined_cursor = raw_connection.cursor()
+                        if wrap_pipelined_cursor is not None:
+                            pipelined_cursor = wrap_pipelined_cursor(pipelined_cursor)
+                        pending.append(pipelined_cursor)
+                        pipelined_cursor.execute(sql, params)
+                # Leaving the pipeline block synchronizes, so every result has arrived
+                return [pipelined_cursor.fetchall() for pipelined_cursor in pending]
+        finally:
+            for pipelined_cursor in pending:
+                pipelined_cursor.close()
+
+    def _execute_combined(self, cursor, queries):
+        """
+        Run each kind of query once for every table in the batch, as one UNION ALL statement.
+
+        Every row is tagged with the position of the query it came from and, for kinds in
+        TABLE_CATALOG_ORDINALS, with the value the query is ordered by. UNION ALL does not
+        keep the order of its branches (PostgreSQL may run them as a parallel Append), so
+        the statement is ordered by both tags.
+
+        Args:
+            cursor: Database cursor
+            queries (list): (kind, table, sql, params) tuples
+
+        Returns:
+            list: Rows of each query, in query order
+        """
+        results = [[] for _ in queries]
+        positions_by_kind = {}
+        for position, (kind, _, _, _) in enumerate(queries):
+            positions_by_kind.setdefault(kind, []).append(position)
+
+        for kind, positions in positions_by_kind.items():
+            ordinal = self.TABLE_CATALOG_ORDINALS.get(kind, '0')
+            branches = []
+            params = []
+            for position in positions:
+                _, _, sql, query_params = queries[position]
+                # The ordinal is projected inside the query, where its ORDER BY columns are in scope
+                select, _, rest = sql.lstrip().partition(' ')
+                if select.upper() != 'SELECT' or rest.lstrip().upper().startswith('DISTINCT'):
+                    raise ValueError(f"Cannot combine the {kind} query: it must start with SELECT and not be DISTINCT")
+                branches.append(
+                    f"SELECT {position} AS durc_query, durc_rows.* "
+                    f"FROM (SELECT {ordinal} AS durc_ordinal, {rest}) AS durc_rows"
+                )
+                params.extend(query_params)
+            cursor.execute("\nUNION ALL\n".join(branches) + "\nORDER BY durc_query, durc_ordinal", params)
+            for row in cursor.fetchall():
+                results[row[0]].append(row[2:])
+        return results
+
+    def load_schema_catalog(self, cursor, schema_name, all_tables):
+        """
+        Load the catalog rows for every table in a schema with a fixed number of set-based queries.
+
+        Args:
+            cursor: Database cursor
+            schema_name (str): Schema name
+            all_tables (list): List of all tables in the schema
+
+        Returns:
+            DURC_SchemaCatalog: Catalog holding the rows for every table in the schema
+        """
+        catalog = DURC_SchemaCatalog(schema_name, all_tables)
+
+        cursor.execute(self.SCHEMA_COLUMNS_SQL, [schema_name])
+        for table, col_name, data_type, is_nullable, default_value in cursor.fetchall():
+            catalog.add_column(table, (col_name, data_type, is_nullable, default_value))
+
+        cursor.execute(self.SCHEMA_PRIMARY_KEYS_SQL, [schema_name])
+        for table, col_name in cursor.fetchall():
+            catalog.add_primary_key(table, col_name)
+
+        cursor.execute(self.SCHEMA_FOREIGN_KEY_COLUMNS_SQL, [schema_name])
+        for table, col_name in cursor.fetchall():
+            catalog.add_foreign_key_column(table, col_name)
+
+        cursor.execute(self.SCHEMA_FOREIGN_KEYS_SQL, [schema_name])
+        for table, fk_col, fk_schema, fk_table, fk_target_col in cursor.fetchall():
+            catalog.add_foreign_key(table, (fk_col, fk_schema, fk_table, fk_target_col))
+
+        cursor.execute(self.SCHEMA_REFERENCING_KEYS_SQL, [schema_name])
+        for target_table, ref_table, ref_column, ref_schema in cursor.fetchall():
+            catalog.add_referencing_key(target_table, (ref_table, ref_column, ref_schema))
+
+        cursor.execute(self.SCHEMA_NAMED_REFERENCES_SQL, [schema_name])
+        for ref_schema, ref_table, ref_column in cursor.fetchall():
+            catalog.add_named_reference(ref_column, (ref_schema, ref_table, ref_column))
+
+        return catalog
+
+    def load_table_index(self, cursor):
+        """
+        Load the names of every table in the database and the schemas that contain them.
+
+        Args:
+            cursor: Database cursor
+
+        Returns:
+            DURC_TableIndex: Index of table names to schemas
+        """
+        table_index = DURC_TableIndex()
+        cursor.execute(self.ALL_TABLES_SQL, [])
+        for table_schema, table, is_base_table in cursor.fetchall():
+            table_index.add_table(table_schema, table, bool(is_base_table))
+        return table_index
+
+
+class DURC_PgCatalogBackend(DURC_InformationSchemaBackend):
+    """
+    PostgreSQL introspection backend that reads pg_class, pg_attribute, pg_constraint and
+    pg_attrdef directly.
+
+    The information_schema views in PostgreSQL are permission-filtered views over pg_catalog
+    and are slow on large catalogs. The queries below return the same rows (data_type uses
+    the same rules as information_schema.columns) without going through those views.
+    """
+
+    name = 'pg_catalog'
+
+    # Same rules as information_schema.columns.data_type
+    _DATA_TYPE_SQL = """
+        CASE
+            WHEN t.typtype = 'd' THEN
+                CASE
+                    WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY'
+                    WHEN bt.typnamespace = 'pg_catalog'::regnamespace THEN pg_catalog.format_type(t.typbasetype, NULL)
+                    ELSE 'USER-DEFINED'
+                END
+            WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+            WHEN t.typnamespace = 'pg_catalog'::regnamespace THEN pg_catalog.format_type(a.atttypid, NULL)
+            ELSE 'USER-DEFINED'
+        END"""
+
+    _COLUMNS_FROM_SQL = """
+        FROM pg_catalog.pg_attribute a
+        JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_catalog.pg_type t ON t.oid = a.atttypid
+        LEFT JOIN pg_catalog.pg_type bt ON bt.oid = t.typbasetype
+        LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    """
+
+    # information_schema.columns also reports columns of a NOT NULL domain as NOT NULL
+    _COLUMN_VALUES_SQL = f"""a.attname, {_DATA_TYPE_SQL},
+        CASE WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) THEN 'NO' ELSE 'YES' END,
+        CASE WHEN a.attgenerated = '' THEN pg_catalog.pg_get_expr(d.adbin, d.adrelid) END"""
+
+    # Constraint key columns
+    _CONSTRAINT_KEYS_FROM_SQL = """
+        FROM pg_catalog.pg_constraint con
+        JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        CROSS JOIN LATERAL unnest(con.conkey) AS k(attnum)
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+    """
+
+    # Foreign key columns, paired positionally with the referenced columns
+    _FOREIGN_KEYS_FROM_SQL = """
+        FROM pg_catalog.pg_constraint con
+        JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_catalog.pg_class fc ON fc.oid = con.confrelid
+        JOIN pg_catalog.pg_namespace fn ON fn.oid = fc.relnamespace
+        CROSS JOIN LATERAL unnest(con.conkey, con.confkey) AS k(attnum, fattnum)
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+        JOIN pg_catalog.pg_attribute fa ON fa.attrelid = con.confrelid AND fa.attnum = k.fattnum
+    """
+
+    TABLES_SQL = """
+        SELECT c.relname
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %s
+        AND c.relkind IN ('r', 'p')
+        AND c.relname NOT LIKE '\\_%%'
+    """
+
+    SCHEMAS_SQL = """
+        SELECT DISTINCT n.nspname
+        FROM pg_catalog.pg_namespace n
+        JOIN pg_catalog.pg_class c ON c.relnamespace = n.oid
+        WHERE n.nspname NOT IN ('information_schema', 'pg_catalog')
+        AND c.relkind IN ('r', 'p')
+    """
+
+    TABLE_NAME_COLUMN = 'c.relname'
+    SCHEMA_NAME_COLUMN = 'n.nspname'
+
+    TABLE_COLUMNS_SQL = f"""
+        SELECT {_COLUMN_VALUES_SQL}
+        {_COLUMNS_FROM_SQL}
+        WHERE c.relname = %s
+        AND n.nspname = %s
+        AND a.attnum > 0
+        AND NOT a.attisdropped
+        ORDER BY a.attnum
+    """
+
+    TABLE_PRIMARY_KEYS_SQL = f"""
+        SELECT a.attname
+        {_CONSTRAINT_KEYS_FROM_SQL}
+        WHERE c.relname = %s
+        AND n.nspname = %s
+        AND con.contype = 'p'
+    """
+
+    TABLE_FOREIGN_KEY_COLUMNS_SQL = f"""
+        SELECT a.attname
+        {_CONSTRAINT_KEYS_FROM_SQL}
+        WHERE c.relname = %s
+        AND n.nspname = %s
+        AND con.contype = 'f'
+    """
+
+    TABLE_FOREIGN_KEYS_SQL = f"""
+        SELECT a.attname, fn.nspname, fc.relname, fa.attname
+        {_FOREIGN_KEYS_FROM_SQL}
+        WHERE con.contype = 'f'
+        AND c.relname = %s
+        AND n.nspname = %s
+    """
+
+    TABLE_REFERENCING_KEYS_SQL = f"""
+        SELECT c.relname, a.attname, n.nspname
+        {_FOREIGN_KEYS_FROM_SQL}
+        WHERE con.contype = 'f'
+        AND fc.relname = %s
+        AND fn.nspname = %s
+    """
+
+    TABLE_NAMED_REFERENCES_SQL = """
+        SELECT n.nspname, c.relname, a.attname
+        FROM pg_catalog.pg_attribute a
+        JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE a.attname = %s
+        AND c.relkind IN ('r', 'p')
+        AND a.attnum > 0
+        AND NOT a.attisdropped
+        AND n.nspname != %s
+        AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+    """
+
+    SCHEMA_COLUMNS_SQL = f"""
+        SELECT c.relname, {_COLUMN_VALUES_SQL}
+        {_COLUMNS_FROM_SQL}
+        WHERE n.nspname = %s
+        AND c.relkind IN ('r', 'p', 'v', 'f')
+        AND a.attnum > 0
+        AND NOT a.attisdropped
+        ORDER BY c.relname, a.attnum
+    """
+
+    SCHEMA_PRIMARY_KEYS_SQL = f"""
+        SELECT c.relname, a.attname
+        {_CONSTRAINT_KEYS_FROM_SQL}
+        WHERE n.nspname = %s
+        AND con.contype = 'p'
+    """
+
+    SCHEMA_FOREIGN_KEY_COLUMNS_SQL = f"""
+        SELECT c.relname, a.attname
+        {_CONSTRAINT_KEYS_FROM_SQL}
+        WHERE n.nspname = %s
+        AND con.contype = 'f'
+    """
+
+    SCHEMA_FOREIGN_KEYS_SQL = f"""
+        SELECT c.relname, a.attname, fn.nspname, fc.relname, fa.attname
+        {_FOREIGN_KEYS_FROM_SQL}
+        WHERE con.contype = 'f'
+        AND n.nspname = %s
+    """
+
+    SCHEMA_REFERENCING_KEYS_SQL = f"""
+        SELECT fc.relname, c.relname, a.attname, n.nspname
+        {_FOREIGN_KEYS_FROM_SQL}
+        WHERE con.contype = 'f'
+        AND fn.nspname = %s
+    """
+
+    SCHEMA_NAMED_REFERENCES_SQL = """
+        SELECT n.nspname, c.relname, a.attname
+        FROM pg_catalog.pg_attribute a
+        JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE a.attname LIKE '%%_id'
+        AND c.relkind IN ('r', 'p')
+        AND a.attnum > 0
+        AND NOT a.attisdropped
+        AND n.nspname != %s
+        AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+    """
+
+    TABLE_CATALOG_ORDINALS = {'columns': 'a.attnum'}
+
+    # Same relation kinds as information_schema.tables
+    ALL_TABLES_SQL = """
+        SELECT n.nspname, c.relname, c.relkind IN ('r', 'p')
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p', 'v', 'f')
+        AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+        ORDER BY n.nspname
+    """
+
+
+class DURC_SQLiteBackend(DURC_InformationSchemaBackend):
+    """
+    SQLite introspection backend that reads the pragma table-valued functions.
+
+    SQLite has no information_schema. Tables are listed from pragma_table_list, and the
+    columns, keys and foreign keys of each table come from pragma_table_info and
+    pragma_foreign_key_list. Schemas are the attached databases (main, temp and any
+    ATTACHed file), and a pattern without a schema mines main. The rows have the same
+    shape as the information_schema rows, so mining a SQLite file produces the same
+    relational model structure as any other engine.
+    """
+
+    name = 'sqlite'
+
+    DEFAULT_SCHEMA = 'main'
+
+    TABLE_CATALOG_ORDINALS = {'columns': 'c.cid'}
+
+    # Tables and views of every attached database, without SQLite's own tables
+    _TABLES_FROM_SQL = """
+        FROM pragma_table_list AS tl"""
+
+    _USER_TABLE_SQL = "tl.name NOT LIKE 'sqlite!_%%' ESCAPE '!'"
+
+    # information_schema reports primary key columns as NOT NULL
+    _COLUMN_VALUES_SQL = """c.name, c.type,
+        CASE WHEN c."notnull" = 0 AND c.pk = 0 THEN 'YES' ELSE 'NO' END,
+        c.dflt_value"""
+
+    # A foreign key without a column list references the primary key of the other table
+    _FOREIGN_KEY_VALUES_SQL = """f."from", tl.schema, f."table", COALESCE(f."to", (
+            SELECT p.name FROM pragma_table_info(f."table", tl.schema) AS p WHERE p.pk = f.seq + 1
+        ))"""
+
+    TABLES_SQL = f"""
+        SELECT tl.name
+        {_TABLES_FROM_SQL}
+        WHERE tl.schema = %s
+        AND tl.type = 'table'
+        AND {_USER_TABLE_SQL}
+        AND tl.name NOT LIKE '!_%%' ESCAPE '!'
+    """
+
+    SCHEMAS_SQL = f"""
+        SELECT DISTINCT tl.schema
+        {_TABLES_FROM_SQL}
+        WHERE tl.type = 'table'
+        AND {_USER_TABLE_SQL}
+    """
+
+    TABLE_NAME_COLUMN = 'tl.name'
+    SCHEMA_NAME_COLUMN = 'tl.schema'
+
+    TABLE_COLUMNS_SQL = f"""
+        SELECT {_COLUMN_VALUES_SQL}
+        {_TABLES_FROM_SQL}
+        JOIN pragma_table_info(tl.name, tl.schema) AS c
+        WHERE tl.name = %s
+        AND tl.schema = %s
+        ORDER BY c.cid
+    """
+
+    TABLE_PRIMARY_KEYS_SQL = f"""
+        SELECT c.name
+        {_TABLES_FROM_SQL}
+        JOIN pragma_table_info(tl.name, tl.schema) AS c
+        WHERE tl.name = %s
+        AND tl.schema = %s
+        AND c.pk > 0
+    """
+
+    TABLE_FOREIGN_KEY_COLUMNS_SQL = f"""
+        SELECT f."from"
+        {_TABLES_FROM_SQL}
+        JOIN pragma_foreign_key_list(tl.name, tl.schema) AS f
+        WHERE tl.name = %s
+        AND tl.schema = %s
+    """
+
+    TABLE_FOREIGN_KEYS_SQL = f"""
+        SELECT {_FOREIGN_KEY_VALUES_SQL}
+        {_TABLES_FROM_SQL}
+        JOIN pragma_foreign_key_list(tl.name, tl.schema) AS f
+        WHERE tl.name = %s
+        AND tl.schema = %s
+    """
+
+    # SQLite foreign keys can only reference tables in the same database
+    TABLE_REFERENCING_KEYS_SQL = f"""
+        SELECT tl.name, f."from", tl.schema
+        {_TABLES_FROM_SQL}
+        JOIN pragma_foreign_key_list(tl.name, tl.schema) AS f
+        WHERE f."table" = %s COLLATE NOCASE
+        AND tl.schema = %s
+        AND tl.type = 'table'
+    """
+
+    TABLE_NAMED_REFERENCES_SQL = f"""
+        SELECT tl.schema, tl.name, c.name
+        {_TABLES_FROM_SQL}
+        JOIN pragma_table_info(tl.name, tl.schema) AS c
+        WHERE c.name = %s
+        AND tl.type = 'table'
+        AND {_USER_TABLE_SQL}
+        AND tl.schema != %s
+    """
+
+    SCHEMA_COLUMNS_SQL = f"""
+        SELECT tl.name, {_COLUMN_VALUES_SQL}
+        {_TABLES_FROM_SQL}
+        JOIN pragma_table_info(tl.name, tl.schema) AS c
+        WHERE tl.schema = %s
+        AND tl.type IN ('table', 'view')
+        AND {_USER_TABLE_SQL}
+        ORDER BY tl.name, c.cid
+    """
+
+    SCHEMA_PRIMARY_KEYS_SQL = f"""
+        SELECT tl.name, c.name
+        {_TABLES_FROM_SQL}
+        JOIN pragma_table_info(tl.name, tl.schema) AS c
+        WHERE tl.schema = %s
+        AND tl.type = 'table'
+        AND c.pk > 0
+    """
+
+    SCHEMA_FOREIGN_KEY_COLUMNS_SQL = f"""
+        SELECT tl.name, f."from"
+        {_TABLES_FROM_SQL}
+        JOIN pragma_foreign_key_list(tl.name, tl.schema) AS f
+        WHERE tl.schema = %s
+        AND tl.type = 'table'
+    """
+
+    SCHEMA_FOREIGN_KEYS_SQL = f"""
+        SELECT tl.name, {_FOREIGN_KEY_VALUES_SQL}
+        {_TABLES_FROM_SQL}
+        JOIN pragma_foreign_key_list(tl.name, tl.schema) AS f
+        WHERE tl.schema = %s
+        AND tl.type = 'table'
+    """
+
+    # REFERENCES keeps the table name as written, and SQLite resolves it case-insensitively.
+    # Rows are keyed by the referenced table's own name, which TABLE_REFERENCING_KEYS_SQL
+    # matches with COLLATE NOCASE
+    SCHEMA_REFERENCING_KEYS_SQL = f"""
+        SELECT COALESCE((
+            SELECT rt.name FROM pragma_table_list AS rt
+            WHERE rt.schema = tl.schema
+            AND rt.name = f."table" COLLATE NOCASE
+            AND rt.type = 'table'
+        ), f."table"), tl.name, f."from", tl.schema
+        {_TABLES_FROM_SQL}
+        JOIN pragma_foreign_key_list(tl.name, tl.schema) AS f
+        WHERE tl.schema = %s
+        AND tl.type = 'table'
+    """
+
+    SCHEMA_NAMED_REFERENCES_SQL = f"""
+        SELECT tl.schema, tl.name, c.name
+        {_TABLES_FROM_SQL}
+        JOIN pragma_table_info(tl.name, tl.schema) AS c
+        WHERE c.name LIKE '%%_id'
+        AND tl.type = 'table'
+        AND {_USER_TABLE_SQL}
+        AND tl.schema != %s
+    """
+
+    ALL_TABLES_SQL = f"""
+        SELECT tl.schema, tl.name, tl.type = 'table'
+        {_TABLES_FROM_SQL}
+        WHERE tl.type IN ('table', 'view')
+        AND {_USER_TABLE_SQL}
+        ORDER BY tl.schema
+    """
+
+
+INTROSPECTION_BACKENDS = {
+    DURC_InformationSchemaBackend.name: DURC_InformationSchemaBackend,
+    DURC_PgCatalogBackend.name: DURC_PgCatalogBackend,
+    DURC_SQLiteBackend.name: DURC_SQLiteBackend,
+}
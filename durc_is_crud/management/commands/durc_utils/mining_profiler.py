@@ -0,0 +1,274 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from .... import __version__
+from .introspection_backends import INTROSPECTION_BACKENDS
+
+
+class DURC_MiningProfiler:
+    """
+    Records where a durc_mine run spends its time.
+
+    Catalog queries are timed through wrap_cursor() (execute and fetch calls) and assigned
+    to a phase by matching their SQL against the statements of the introspection backends.
+    Work done in Python is timed with phase(). Each table's wall time and query count are
+    recorded with table(), and report() turns everything into a JSON-ready summary with
+    latency percentiles and the slowest tables. The profiler can be shared by worker threads.
+
+    Phases:
+        table_listing: listing the tables of a schema and indexing every table in the database
+        columns, primary_keys, foreign_keys: the catalog queries for those rows
+        linked_keys: *_id linked-key and pattern-based relationship detection
+        has_many: the referencing-key queries and building each table's relationships
+        cross_schema_scan: the naming-convention scan of columns in other schemas
+        catalog_batch: combined per-table queries in --pipeline mode
+        relationship_graph: deriving has_many from every belongs_to after mining
+        other: any other query
+
+    Usage:
+        profiler = DURC_MiningProfiler()
+        DURC_RelationalModelExtractor.extract_relational_model(patterns, writer, style, profiler=profiler)
+        profiler.save(output_path)
+
+    Attributes:
+        top_n (int): Number of slowest tables listed in the report
+    """
+
+    PROFILE_VERSION = 1
+
+    PHASES = (
+        'table_listing', 'columns', 'primary_keys', 'foreign_keys', 'linked_keys', 'has_many',
+        'cross_schema_scan', 'catalog_batch', 'relationship_graph', 'other',
+    )
+
+    # Backend SQL attribute -> phase
+    SQL_PHASES = {
+        'TABLES_SQL': 'table_listing',
+        'SCHEMAS_SQL': 'table_listing',
+        'ALL_TABLES_SQL': 'table_listing',
+        'TABLE_COLUMNS_SQL': 'columns',
+        'SCHEMA_COLUMNS_SQL': 'columns',
+        'TABLE_PRIMARY_KEYS_SQL': 'primary_keys',
+        'SCHEMA_PRIMARY_KEYS_SQL': 'primary_keys',
+        'TABLE_FOREIGN_KEY_COLUMNS_SQL': 'foreign_keys',
+        'SCHEMA_FOREIGN_KEY_COLUMNS_SQL': 'foreign_keys',
+        'TABLE_FOREIGN_KEYS_SQL': 'foreign_keys',
+        'SCHEMA_FOREIGN_KEYS_SQL': 'foreign_keys',
+        'TABLE_REFERENCING_KEYS_SQL': 'has_many',
+        'SCHEMA_REFERENCING_KEYS_SQL': 'has_many',
+        'TABLE_NAMED_REFERENCES_SQL': 'cross_schema_scan',
+        'SCHEMA_NAMED_REFERENCES_SQL': 'cross_schema_scan',
+    }
+
+    # Backend SQL attributes that list_tables() and list_schemas() extend with LIKE predicates
+    FILTERED_SQL = ('TABLES_SQL', 'SCHEMAS_SQL')
+
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self._phases = {phase: {'seconds': 0.0, 'queries': 0} for phase in self.PHASES}
+        # (qualified table name, seconds, query count)
+        self._tables = []
+        self._sql_phases = {}
+        self._filtered_sql_phases = []
+        for backend_class in INTROSPECTION_BACKENDS.values():
+            for attribute, phase in self.SQL_PHASES.items():
+                sql = getattr(backend_class, attribute, None)
+                if sql:
+                    self._sql_phases[sql] = phase
+                    if attribute in self.FILTERED_SQL:
+                        self._filtered_sql_phases.append((sql, phase))
+
+    @staticmethod
+    def profile_path(output_path):
+        """
+        Get the path of the profile file stored next to a relational model file.
+
+        Args:
+            output_path (str): Path of the relational model file
+
+        Returns:
+            str: Path of the profile file
+        """
+        base_path, _ = os.path.splitext(output_path)
+        return f"{base_path}.profile.json"
+
+    def wrap_cursor(self, cursor):
+        """
+        Wrap a cursor so that its queries are timed and counted.
+
+        Args:
+            cursor: Database cursor to wrap
+
+        Returns:
+            DURC_ProfilingCursor: A cursor that delegates to the original cursor
+        """
+        return DURC_ProfilingCursor(cursor, self)
+
+    def phase_for_sql(self, sql):
+        """Get the phase a catalog query belongs to."""
+        phase = self._sql_phases.get(sql)
+        if phase is None:
+            phase = next(
+                (phase for prefix, phase in self._filtered_sql_phases if sql.startswith(prefix)),
+                'catalog_batch' if 'durc_query' in sql else 'other'
+            )
+        return phase
+
+    def record_query(self, phase, seconds, new_query):
+        """
+        Add time spent on a query (its execute or one of its fetch calls) to a phase.
+
+        Args:
+            phase (str): Phase name
+            seconds (float): Time spent
+            new_query (bool): Whether this is the query's execute call
+        """
+        with self._lock:
+            self._phases[phase]['seconds'] += seconds
+            if new_query:
+                self._phases[phase]['queries'] += 1
+        if new_query:
+            self._local.query_count = getattr(self._local, 'query_count', 0) + 1
+        # Query time is already part of the phase; keep it out of an enclosing phase() block
+        self._local.query_seconds = getattr(self._local, 'query_seconds', 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of Python work. Queries run inside it keep their own phase.
+
+        Args:
+            name (str): Phase name
+        """
+        started = time.perf_counter()
+        query_seconds = getattr(self._local, 'query_seconds', 0.0)
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            seconds -= getattr(self._local, 'query_seconds', 0.0) - query_seconds
+            with self._lock:
+                self._phases[name]['seconds'] += max(seconds, 0.0)
+
+    @contextmanager
+    def table(self, qualified_name):
+        """
+        Record the wall time and query count of mining one table.
+
+        Args:
+            qualified_name (str): Table name qualified with its database and schema
+        """
+        started = time.perf_counter()
+        query_count = getattr(self._local, 'query_count', 0)
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            queries = getattr(self._local, 'query_count', 0) - query_count
+            with self._lock:
+                self._tables.append((qualified_name, seconds, queries))
+
+    def report(self):
+        """
+        Summarize the run.
+
+        Returns:
+            dict: Total time and query count, per-phase timings, per-table latency
+                percentiles and the slowest tables
+        """
+        with self._lock:
+            phases = {name: dict(values) for name, values in self._phases.items()}
+            tables = list(self._tables)
+
+        latencies = sorted(seconds for _, seconds, _ in tables)
+        table_latency_ms = {}
+        if latencies:
+            for percentile in self.PERCENTILES:
+                # Nearest-rank percentile
+                rank = max(1, math.ceil(percentile / 100 * len(latencies)))
+                table_latency_ms[f"p{percentile}"] = round(latencies[rank - 1] * 1000, 3)
+            table_latency_ms['max'] = round(latencies[-1] * 1000, 3)
+
+        slowest = sorted(tables, key=lambda entry: entry[1], reverse=True)[:self.top_n]
+        return {
+            'version': self.PROFILE_VERSION,
+            'durc_version': __version__,
+            'total_seconds': round(time.perf_counter() - self._started, 6),
+            'query_count': sum(values['queries'] for values in phases.values()),
+            'table_count': len(tables),
+            'phases': {
+                name: {'seconds': round(values['seconds'], 6), 'queries': values['queries']}
+                for name, values in phases.items()
+            },
+            'table_latency_ms': table_latency_ms,
+            'slowest_tables': [
+                {'table': qualified_name, 'ms': round(seconds * 1000, 3), 'queries': queries}
+                for qualified_name, seconds, queries in slowest
+            ],
+        }
+
+    def save(self, output_path):
+        """
+        Write the report next to the relational model file.
+
+        Args:
+            output_path (str): Path of the relational model file
+
+        Returns:
+            str: Path of the profile file
+        """
+        path = self.profile_path(output_path)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+class DURC_ProfilingCursor:
+    """
+    Thin cursor proxy that times execute() and fetch calls for a DURC_MiningProfiler.
+    """
+
+    def __init__(self, cursor, profiler):
+        self._cursor = cursor
+        self._profiler = profiler
+        self._phase = 'other'
+
+    def execute(self, sql, params=None):
+        self._phase = self._profiler.phase_for_sql(sql)
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params)
+        finally:
+            self._profiler.record_query(self._phase, time.perf_counter() - started, True)
+
+    def _timed_fetch(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._profiler.record_query(self._phase, time.perf_counter() - started, False)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def wrap_pipelined_cursor(self, cursor):
+        """Wrap another cursor of the same connection, e.g. one queued in a pipeline, the way this one is wrapped."""
+        wrap_inner = getattr(self._cursor, 'wrap_pipelined_cursor', None)
+        return DURC_ProfilingCursor(wrap_inner(cursor) if wrap_inner is not None else cursor, self._profiler)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
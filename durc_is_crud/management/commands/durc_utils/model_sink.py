@@ -0,0 +1,75 @@
+class DURC_ModelBuilder:
+    """
+    Collects mined tables into the nested relational model dictionary.
+
+    The relational model extractor hands every database and table it mines to a sink with
+    add_database() and add_table(). This sink keeps them in memory; a streaming writer
+    with the same two methods can write them to disk instead.
+
+    Attributes:
+        relational_model (dict): db -> table, or db -> schema -> table for PostgreSQL
+    """
+
+    def __init__(self):
+        self.relational_model = {}
+
+    def add_database(self, db_name):
+        """Make sure a database is present in the model, even if none of its tables are mined."""
+        self.relational_model.setdefault(db_name, {})
+
+    def add_table(self, db_name, schema_name, table, table_info):
+        """
+        Add a mined table to the model.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name for models with a schema layer, or None
+            table (str): Table name
+            table_info (dict): Table entry
+        """
+        db_model = self.relational_model.setdefault(db_name, {})
+        if schema_name is not None:
+            # For PostgreSQL, create schema layer: db -> schema -> table
+            db_model.setdefault(schema_name, {})[table] = table_info
+        else:
+            # For MySQL or when no schema specified: db -> table
+            db_model[table] = table_info
+
+
+class DURC_BufferedModelSink:
+    """
+    Records the messages, databases and tables produced while mining one pattern in a
+    worker thread, so they can be replayed in pattern order on the main thread.
+    """
+
+    def __init__(self):
+        self._events = []
+
+    def write_message(self, message):
+        """Record an output message."""
+        self._events.append(('message', message))
+
+    def add_database(self, db_name):
+        """Record a database."""
+        self._events.append(('database', db_name))
+
+    def add_table(self, db_name, schema_name, table, table_info):
+        """Record a mined table."""
+        self._events.append(('table', (db_name, schema_name, table, table_info)))
+
+    def replay(self, stdout_writer, sink):
+        """
+        Replay the recorded events in the order they happened.
+
+        Args:
+            stdout_writer: Django stdout writer for output messages
+            sink: Sink receiving the databases and tables
+        """
+        for kind, payload in self._events:
+            if kind == 'message':
+                stdout_writer(payload)
+            elif kind == 'database':
+                sink.add_database(payload)
+            else:
+                sink.add_table(*payload)
+        self._events = []
@@ -0,0 +1,59 @@
+import threading
+
+
+class DURC_QueryCounter:
+    """
+    Utility class for counting the catalog queries issued while mining a database.
+
+    Wrap a database cursor with wrap_cursor() and every call to execute() on the
+    returned cursor is counted. This lets tests (and profiling) check how many
+    round trips the relational model extractor makes. Cursors from several worker
+    threads can share one counter.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self._lock = threading.Lock()
+
+    def count_query(self):
+        """Record one query."""
+        with self._lock:
+            self.query_count += 1
+
+    def wrap_cursor(self, cursor):
+        """
+        Wrap a cursor so that its queries are counted.
+
+        Args:
+            cursor: Database cursor to wrap
+
+        Returns:
+            DURC_CountingCursor: A cursor that delegates to the original cursor
+        """
+        return DURC_CountingCursor(cursor, self)
+
+    def reset(self):
+        """Reset the query count to zero."""
+        self.query_count = 0
+
+
+class DURC_CountingCursor:
+    """
+    Thin cursor proxy that increments a DURC_QueryCounter on every execute() call.
+    """
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, sql, params=None):
+        self._counter.count_query()
+        return self._cursor.execute(sql, params)
+
+    def wrap_pipelined_cursor(self, cursor):
+        """Wrap another cursor of the same connection, e.g. one queued in a pipeline, the way this one is wrapped."""
+        wrap_inner = getattr(self._cursor, 'wrap_pipelined_cursor', None)
+        return DURC_CountingCursor(wrap_inner(cursor) if wrap_inner is not None else cursor, self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,80 @@
+class DURC_QueryPlanner:
+    """
+    Works out which related rows the generated querysets load up front.
+
+    A list page that shows a foreign key's label runs one query per row unless the
+    foreign key is joined into the list query (select_related), and one that shows a
+    has_many relation runs one query per row unless the relation is prefetched
+    (prefetch_related, one query per relation for the whole page). The plan of a table
+    lists both, from the belongs_to edges of the whole model:
+
+    - select_related follows belongs_to edges breadth first. Direct foreign keys are
+      always joined; each further level is added only while the total number of joins
+      stays within MAX_SELECT_JOINS and the depth within MAX_SELECT_DEPTH, and a path
+      never returns to a table it already passed through. Tables with many foreign keys
+      therefore get shallow plans, and chains of single foreign keys deep ones.
+    - prefetch_related names every has_many relation of the table, one level deep.
+      Prefetching runs a query per relation even when the page does not show it, so
+      generated querysets only prefetch on request.
+
+    Usage:
+        edges = {('npd', 'public', 'address'): [('provider', ('npd', 'public', 'provider'), 'address')]}
+        plans = DURC_QueryPlanner.plan(edges)
+        plans[('npd', 'public', 'address')]['select_related']  # ['provider']
+    """
+
+    # Deepest belongs_to chain joined into a list query
+    MAX_SELECT_DEPTH = 3
+
+    # Joins beyond which no further level of belongs_to edges is added
+    MAX_SELECT_JOINS = 8
+
+    @classmethod
+    def plan(cls, edges):
+        """
+        Plan the related rows of every table.
+
+        Args:
+            edges (dict): Table key of every table in the model -> (field name, target table
+                key, related name) of every foreign key of the table, where the related name
+                is the has_many accessor the foreign key gets on the target
+
+        Returns:
+            dict: Table key -> {'select_related': [paths], 'prefetch_related': [names],
+                'depth': depth of the longest select_related path}
+        """
+        edges = {key: sorted(table_edges) for key, table_edges in edges.items()}
+        reverse = {}
+        for key, table_edges in edges.items():
+            for _, target, related_name in table_edges:
+                reverse.setdefault(target, set()).add(related_name)
+
+        plans = {}
+        for key in edges:
+            select_related, depth = cls._select_related(key, edges)
+            plans[key] = {
+                'select_related': select_related,
+                'prefetch_related': sorted(reverse.get(key, ())),
+                'depth': depth,
+            }
+        return plans
+
+    @classmethod
+    def _select_related(cls, key, edges):
+        # (paths, depth); the first level is every direct foreign key, even a self reference
+        frontier = [(field_name, target, (key, target)) for field_name, target, _ in edges.get(key, ())]
+        paths = [path for path, _, _ in frontier]
+        depth = 1 if paths else 0
+        while frontier and depth < cls.MAX_SELECT_DEPTH:
+            next_level = [
+                (f"{path}__{field_name}", target, seen + (target,))
+                for path, table, seen in frontier
+                for field_name, target, _ in edges.get(table, ())
+                if target not in seen
+            ]
+            if not next_level or len(paths) + len(next_level) > cls.MAX_SELECT_JOINS:
+                break
+            paths += [path for path, _, _ in next_level]
+            frontier = next_level
+            depth += 1
+        return paths, depth
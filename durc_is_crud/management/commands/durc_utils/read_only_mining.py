@@ -0,0 +1,197 @@
+import math
+import re
+import time
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.utils import OperationalError
+
+
+class DURC_ReadOnlyMining:
+    """
+    Low-impact mining mode: every database is mined inside one READ ONLY, REPEATABLE READ
+    transaction with a lock timeout and a statement timeout.
+
+    The relational model extractor opens the transaction for each database on the calling
+    thread before it mines any pattern and keeps it open until the run is done, so every
+    table of a database is read from the same catalog snapshot. On PostgreSQL, worker
+    threads import that snapshot (pg_export_snapshot / SET TRANSACTION SNAPSHOT) into their
+    own transactions, so a parallel run sees the same catalog as a serial one.
+
+    Each table is mined under a savepoint. A table whose queries hit the lock or statement
+    timeout is rolled back to its savepoint and retried with exponential backoff; if it still
+    times out, it is left out of the model with an error message and mining carries on with
+    the next table instead of failing the whole database.
+
+    Timeouts are set with SET LOCAL on PostgreSQL and with session variables on MySQL, which
+    has no transaction-scoped timeouts; the session values they replace are read before the
+    transaction starts and set back once it has ended, so a pooled or persistent connection
+    does not keep mining's timeouts. Other engines only get the transaction.
+
+    Attributes:
+        lock_timeout_ms (int): Longest wait for a lock, in milliseconds (0 for no limit)
+        statement_timeout_ms (int): Longest run time of one catalog query, in milliseconds (0 for no limit)
+        retries (int): Number of times a timed-out table is retried
+        backoff_seconds (float): Wait before the first retry; doubled for every further retry
+    """
+
+    # SQLSTATE query_canceled (statement_timeout) and lock_not_available (lock_timeout)
+    POSTGRESQL_TIMEOUT_SQLSTATES = frozenset({'57014', '55P03'})
+
+    # MySQL error codes for max_execution_time and lock wait timeouts
+    MYSQL_TIMEOUT_ERRORS = frozenset({1205, 3024})
+
+    # MySQL session variables set for the transaction and restored after it
+    MYSQL_SESSION_VARIABLES = ('max_execution_time', 'lock_wait_timeout', 'innodb_lock_wait_timeout')
+
+    _SNAPSHOT_ID_RE = re.compile(r'^[0-9A-Fa-f-]+$')
+
+    def __init__(self, lock_timeout_ms=1000, statement_timeout_ms=30000, retries=3, backoff_seconds=0.5):
+        self.lock_timeout_ms = lock_timeout_ms
+        self.statement_timeout_ms = statement_timeout_ms
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        # Connection alias -> snapshot exported by the coordinating transaction (PostgreSQL only)
+        self._exported_snapshots = {}
+
+    @contextmanager
+    def coordinate(self, conn, export_snapshot=False):
+        """
+        Hold the read-only transaction of a database open for a whole mining run.
+
+        Args:
+            conn: Django connection of the database, used by the calling thread
+            export_snapshot (bool): Export the transaction's snapshot so that transactions
+                opened by worker threads with transaction() see the same catalog
+        """
+        with self._atomic(conn):
+            if export_snapshot and conn.vendor == 'postgresql':
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_export_snapshot()")
+                    self._exported_snapshots[conn.alias] = cursor.fetchone()[0]
+            try:
+                yield
+            finally:
+                self._exported_snapshots.pop(conn.alias, None)
+
+    @contextmanager
+    def transaction(self, conn):
+        """
+        Run a block inside the read-only transaction of a database.
+
+        On the thread that called coordinate() the block simply joins the open transaction.
+        Elsewhere a new one is opened, importing the exported snapshot when there is one.
+
+        Args:
+            conn: Django connection of the database for the current thread
+        """
+        if conn.in_atomic_block:
+            yield
+            return
+        with self._atomic(conn, self._exported_snapshots.get(conn.alias)):
+            yield
+
+    @contextmanager
+    def _atomic(self, conn, snapshot_id=None):
+        # A transaction the caller already opened keeps its own isolation level
+        starts_transaction = not conn.in_atomic_block
+        # Read outside the transaction: MySQL rejects SET TRANSACTION once one has begun
+        session_values = self._save_session(conn) if starts_transaction else None
+        try:
+            with transaction.atomic(using=conn.alias):
+                if starts_transaction:
+                    self._start_transaction(conn, snapshot_id)
+                yield
+        finally:
+            if session_values is not None:
+                self._restore_session(conn, session_values)
+
+    def _save_session(self, conn):
+        # Session variables _start_transaction() is about to change, or None if it changes none
+        if conn.vendor != 'mysql':
+            return None
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT " + ", ".join(f"@@SESSION.{name}" for name in self.MYSQL_SESSION_VARIABLES)
+            )
+            return cursor.fetchone()
+
+    def _restore_session(self, conn, session_values):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SET SESSION " + ", ".join(f"{name} = %s" for name in self.MYSQL_SESSION_VARIABLES),
+                list(session_values)
+            )
+
+    def _start_transaction(self, conn, snapshot_id=None):
+        # These statements must come before the transaction's first query
+        with conn.cursor() as cursor:
+            if conn.vendor == 'postgresql':
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                if snapshot_id and self._SNAPSHOT_ID_RE.match(snapshot_id):
+                    cursor.execute(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+                cursor.execute(
+                    "SELECT set_config('lock_timeout', %s, true), set_config('statement_timeout', %s, true)",
+                    [f"{self.lock_timeout_ms}ms", f"{self.statement_timeout_ms}ms"]
+                )
+            elif conn.vendor == 'mysql':
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                # Session variables: MySQL has no transaction-scoped timeouts. _atomic() restores them
+                cursor.execute("SET SESSION max_execution_time = %s", [self.statement_timeout_ms])
+                if self.lock_timeout_ms:
+                    lock_timeout_seconds = max(1, math.ceil(self.lock_timeout_ms / 1000))
+                    cursor.execute("SET SESSION lock_wait_timeout = %s", [lock_timeout_seconds])
+                    cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", [lock_timeout_seconds])
+
+    def run(self, conn, description, stdout_writer, style, function):
+        """
+        Call function under a savepoint, retrying it with backoff when it times out.
+
+        Args:
+            conn: Django connection the function queries
+            description (str): What the function mines, for messages (e.g. "table db.schema.table")
+            stdout_writer: Django stdout writer for output messages
+            style: Django style for formatting output messages
+            function: Callable without arguments
+
+        Returns:
+            The function's result, or None if it still timed out after every retry
+
+        Raises:
+            Exception: Any error from the function that is not a timeout
+        """
+        attempts = self.retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                with transaction.atomic(using=conn.alias):
+                    return function()
+            except OperationalError as e:
+                if not self.is_timeout_error(e):
+                    raise
+                if attempt == attempts:
+                    stdout_writer(style.ERROR(f"Skipped {description}: timed out {attempts} times ({e})"))
+                    return None
+                delay = self.backoff_seconds * 2 ** (attempt - 1)
+                stdout_writer(style.WARNING(
+                    f"Timed out mining {description} (attempt {attempt} of {attempts}), retrying in {delay:g}s"
+                ))
+                time.sleep(delay)
+
+    @classmethod
+    def is_timeout_error(cls, error):
+        """
+        Check whether a database error was caused by a lock or statement timeout.
+
+        Args:
+            error (Exception): Error raised by a query
+
+        Returns:
+            bool: True for lock and statement timeouts
+        """
+        cause = error.__cause__ or error
+        sqlstate = getattr(cause, 'sqlstate', None) or getattr(cause, 'pgcode', None)
+        if sqlstate:
+            return sqlstate in cls.POSTGRESQL_TIMEOUT_SQLSTATES
+        if cause.args and cause.args[0] in cls.MYSQL_TIMEOUT_ERRORS:
+            return True
+        message = str(error).lower()
+        return 'timeout' in message or 'canceling statement' in message
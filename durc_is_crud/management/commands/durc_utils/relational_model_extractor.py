@@ -1,7 +1,16 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
 from django.db import connections, connection
 from django.db.utils import OperationalError
 from django.core.management.base import CommandError
 from .data_type_mapper import DURC_DataTypeMapper
+from .database_engine import DURC_DatabaseEngine
+from .table_suffix_index import DURC_TableSuffixIndex
+from .model_sink import DURC_ModelBuilder, DURC_BufferedModelSink
+from .relationship_graph import DURC_RelationshipGraph
+from .introspection_backends import INTROSPECTION_BACKENDS, DURC_InformationSchemaBackend, DURC_PgCatalogBackend
+from .include_pattern_parser import DURC_IncludePatternParser
 
 class DURC_RelationalModelExtractor:
     """
@@ -9,116 +18,530 @@ class DURC_RelationalModelExtractor:
     """
     
     @staticmethod
-    def extract_relational_model(db_schema_table_patterns, stdout_writer, style):
+    def extract_relational_model(db_schema_table_patterns, stdout_writer, style, bulk=False, query_counter=None,
+                                 introspection_backend=None, workers=1, incremental=None, table_writer=None,
+                                 pipeline=False, catalog_snapshot=None, read_only=None, profiler=None,
+                                 exclude_patterns=None):
         """
         Extract the relational model based on the specified patterns.
         
+        Schema and table parts may be globs (see DURC_IncludePatternParser). A schema glob is
+        expanded into the matching schemas with one query per pattern; table globs and
+        exclude patterns are added to each schema's table listing query, so mining a slice
+        of a schema only reads the catalog rows of the tables in the slice.
+        
         Args:
             db_schema_table_patterns (list): List of dictionaries with db, schema, and table patterns
             stdout_writer: Django stdout writer for output messages
             style: Django style for formatting output messages
+            bulk (bool): Load the catalog for each schema with a fixed number of set-based
+                queries instead of issuing several queries per table
+            query_counter (DURC_QueryCounter): Optional counter that records every catalog query
+            introspection_backend (str): Name of the introspection backend to use, or None to
+                use pg_catalog for PostgreSQL and information_schema for everything else
+            workers (int): Number of patterns to mine concurrently. Each worker thread uses its
+                own database connections; results and messages are merged in pattern order,
+                so the relational model is the same as for a serial run
+            incremental (DURC_IncrementalMiningState): Optional fingerprints from the previous run.
+                The catalog is then loaded per schema (as in bulk mode) and tables whose
+                fingerprint is unchanged are copied from the previous model
+            table_writer (DurcModelWriter): Optional streaming writer. Each table is handed to the
+                writer as soon as it is mined instead of being kept in memory. Patterns are
+                grouped by database and schema so that each one is written contiguously.
+                The has_many pass of DURC_RelationshipGraph is then left to the caller, since
+                it needs every table
+            pipeline (bool): Send the per-table catalog queries for a batch of tables together
+                (psycopg 3 pipeline mode, or one combined statement per kind of query) instead
+                of waiting for a round trip per query. Has no effect in bulk or incremental mode
+            catalog_snapshot (DURC_CatalogSnapshot): Optional offline catalog. Every database is
+                then read from the snapshot with the information_schema backend instead of
+                from its Django connection
+            read_only (DURC_ReadOnlyMining): Optional low-impact mode. Each database is then mined
+                in one read-only, repeatable read transaction held open for the whole run, with
+                lock and statement timeouts, and timed-out tables are retried with backoff
+            profiler (DURC_MiningProfiler): Optional profiler that records per-phase timings and
+                query counts and the wall time of each table
+            exclude_patterns (list): Optional dictionaries with db, schema, and table patterns
+                (as parsed by DURC_IncludePatternParser.parse_exclude_patterns) for tables to
+                leave out. A pattern without a table excludes whole schemas
             
         Returns:
-            dict: A dictionary structured according to the DURC_simplified schema
+            dict: A dictionary structured according to the DURC_simplified schema, or None
+                when the tables were streamed to table_writer
         """
-        relational_model = {}
+        if any(DURC_IncludePatternParser.is_glob(pattern['schema']) for pattern in db_schema_table_patterns):
+            db_schema_table_patterns = DURC_RelationalModelExtractor._expand_schema_globs(
+                db_schema_table_patterns, stdout_writer, style, query_counter, introspection_backend,
+                catalog_snapshot, profiler
+            )
+        
+        builder = None
+        sink = table_writer
+        if sink is None:
+            builder = DURC_ModelBuilder()
+            sink = builder
+        else:
+            db_schema_table_patterns = DURC_RelationalModelExtractor._group_patterns(
+                db_schema_table_patterns, catalog_snapshot
+            )
         
-        # Use the default connection if no specific database is provided
-        conn = connection
+        if pipeline:
+            db_schema_table_patterns = DURC_RelationalModelExtractor._merge_table_patterns(db_schema_table_patterns)
         
+        # Table name -> schemas index for each database, built once per run and shared by all workers
+        table_indexes = {}
+        table_indexes_lock = threading.Lock()
+        
+        def extract_pattern(pattern, writer, pattern_sink):
+            DURC_RelationalModelExtractor._extract_pattern(
+                pattern, writer, style, bulk, query_counter, introspection_backend,
+                table_indexes, table_indexes_lock, incremental, pattern_sink, pipeline, catalog_snapshot,
+                read_only, profiler, exclude_patterns
+            )
+        
+        use_workers = workers > 1 and len(db_schema_table_patterns) > 1
+        with ExitStack() as transactions:
+            if read_only is not None and catalog_snapshot is None:
+                # One transaction per database for the whole run; workers share its snapshot
+                coordinated = set()
+                for pattern in db_schema_table_patterns:
+                    conn = DURC_RelationalModelExtractor._get_connection(pattern['db'])
+                    if conn.alias not in coordinated:
+                        coordinated.add(conn.alias)
+                        transactions.enter_context(read_only.coordinate(conn, export_snapshot=use_workers))
+            
+            if use_workers:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(DURC_RelationalModelExtractor._run_in_worker, extract_pattern, pattern)
+                        for pattern in db_schema_table_patterns
+                    ]
+                    # Replay in submission order so the result does not depend on which worker finished first
+                    for future in futures:
+                        future.result().replay(stdout_writer, sink)
+            else:
+                for pattern in db_schema_table_patterns:
+                    extract_pattern(pattern, stdout_writer, sink)
+        
+        if builder is None:
+            return None
+        
+        # Add the has_many side of every belongs_to edge found while mining
+        with profiler.phase('relationship_graph') if profiler is not None else nullcontext():
+            derived_count = DURC_RelationshipGraph.complete_relational_model(builder.relational_model)
+        if derived_count:
+            stdout_writer(f"Derived {derived_count} has_many relationships from belongs_to")
+        return builder.relational_model
+    
+    @staticmethod
+    def _expand_schema_globs(db_schema_table_patterns, stdout_writer, style, query_counter=None,
+                             introspection_backend=None, catalog_snapshot=None, profiler=None):
+        """
+        Replace each pattern whose schema is a glob with one pattern per matching schema.
+        
+        Args:
+            db_schema_table_patterns (list): List of dictionaries with db, schema, and table patterns
+            stdout_writer: Django stdout writer for output messages
+            style: Django style for formatting output messages
+            query_counter (DURC_QueryCounter): Optional counter that records every catalog query
+            introspection_backend (str): Name of the introspection backend to use, or None
+            catalog_snapshot (DURC_CatalogSnapshot): Optional offline catalog to read instead of the database
+            profiler (DURC_MiningProfiler): Optional profiler for the schema listing queries
+            
+        Returns:
+            list: The patterns, with only literal schema names
+        """
+        expanded = []
         for pattern in db_schema_table_patterns:
-            db_name = pattern['db']
-            schema_name = pattern['schema']
-            table_name = pattern['table']
+            if not DURC_IncludePatternParser.is_glob(pattern['schema']):
+                expanded.append(pattern)
+                continue
             
-            # Try to get the connection for the specified database
+            db_name = pattern['db']
             try:
-                if db_name in connections:
-                    conn = connections[db_name]
+                conn = DURC_RelationalModelExtractor._get_connection(db_name, catalog_snapshot)
+                if catalog_snapshot is not None:
+                    backend = DURC_InformationSchemaBackend()
                 else:
-                    stdout_writer(style.WARNING(f"Database '{db_name}' not found in settings, using default connection"))
+                    backend = DURC_RelationalModelExtractor._get_introspection_backend(
+                        DURC_RelationalModelExtractor._is_postgresql(conn), introspection_backend
+                    )
+                with conn.cursor() as cursor:
+                    if query_counter is not None:
+                        cursor = query_counter.wrap_cursor(cursor)
+                    if profiler is not None:
+                        cursor = profiler.wrap_cursor(cursor)
+                    schema_names = backend.list_schemas(cursor, pattern['schema'])
             except Exception as e:
-                stdout_writer(style.ERROR(f"Error connecting to database '{db_name}': {e}"))
+                stdout_writer(style.ERROR(f"Error listing schemas matching '{db_name}.{pattern['schema']}': {e}"))
                 continue
             
-            # Detect database type
-            is_postgresql = 'postgresql' in conn.settings_dict['ENGINE'].lower() or 'psycopg' in conn.settings_dict['ENGINE'].lower()
-            
-            # Initialize the database in the relational model if not already present
-            if db_name not in relational_model:
-                relational_model[db_name] = {}
+            if not schema_names:
+                stdout_writer(style.WARNING(f"No schema in database '{db_name}' matches '{pattern['schema']}'"))
+            for schema_name in schema_names:
+                expanded.append(dict(pattern, schema=schema_name))
+        return expanded
+    
+    @staticmethod
+    def _excluded_tables(exclude_patterns, db_name, schema_name):
+        """
+        Collect the exclude patterns that apply to a schema.
+        
+        Args:
+            exclude_patterns (list): Dictionaries with db, schema, and table patterns, or None
+            db_name (str): Database name
+            schema_name (str): Schema name
             
-            # Get the introspection API for the connection
-            introspection = conn.introspection
+        Returns:
+            list: Table names or globs to leave out of the schema, or None if the whole
+                schema is excluded
+        """
+        excluded_tables = []
+        for exclude in exclude_patterns or ():
+            if (DURC_IncludePatternParser.matches(exclude['db'], db_name)
+                    and DURC_IncludePatternParser.matches(exclude['schema'], schema_name)):
+                if exclude['table'] is None:
+                    return None
+                excluded_tables.append(exclude['table'])
+        return excluded_tables
+    
+    @staticmethod
+    def _group_patterns(db_schema_table_patterns, catalog_snapshot=None):
+        """
+        Reorder patterns so that patterns for the same database are adjacent, and for
+        PostgreSQL databases (which have a schema layer) so are patterns for the same schema.
+        Groups keep the order in which they first appear, which is the order the keys of
+        the in-memory relational model would have.
+        
+        Args:
+            db_schema_table_patterns (list): List of dictionaries with db, schema, and table patterns
+            catalog_snapshot (DURC_CatalogSnapshot): Optional offline catalog the databases are read from
             
-            # Get all table names in the database
+        Returns:
+            list: The same patterns, grouped
+        """
+        db_positions = {}
+        schema_positions = {}
+        for pattern in db_schema_table_patterns:
+            db_positions.setdefault(pattern['db'], len(db_positions))
+            db_schemas = schema_positions.setdefault(pattern['db'], {})
+            db_schemas.setdefault(pattern['schema'] or pattern['db'], len(db_schemas))
+        
+        has_schema_layer = {}
+        for db_name in db_positions:
             try:
-                with conn.cursor() as cursor:
-                    # Get all tables in the database/schema
-                    if schema_name:
-                        # If schema is specified, get tables from that schema
-                        cursor.execute(f"""
-                            SELECT table_name 
-                            FROM information_schema.tables 
-                            WHERE table_schema = %s 
-                            AND table_type = 'BASE TABLE'
-                            AND table_name NOT LIKE '\\_%%'
-                        """, [schema_name])
-                    else:
-                        # If no schema is specified, use the database name as the schema name
-                        # This assumes that the database name is also the schema name
-                        schema_name = db_name
-                        cursor.execute(f"""
-                            SELECT table_name 
-                            FROM information_schema.tables 
-                            WHERE table_schema = %s
-                            AND table_type = 'BASE TABLE'
-                            AND table_name NOT LIKE '\\_%%'
-                        """, [schema_name])
-                    
-                    all_tables = [row[0] for row in cursor.fetchall()]
-                    
-                    # Filter tables based on the pattern
-                    tables_to_process = []
-                    if table_name:
+                conn = DURC_RelationalModelExtractor._get_connection(db_name, catalog_snapshot)
+            except KeyError:
+                # Not in the snapshot; the pattern is reported and skipped when it is mined
+                conn = None
+            has_schema_layer[db_name] = conn is not None and DURC_RelationalModelExtractor._is_postgresql(conn)
+        
+        def group_key(pattern):
+            db_name = pattern['db']
+            if not has_schema_layer[db_name]:
+                return db_positions[db_name], 0
+            return db_positions[db_name], schema_positions[db_name][pattern['schema'] or db_name]
+        
+        return sorted(db_schema_table_patterns, key=group_key)
+    
+    @staticmethod
+    def _merge_table_patterns(db_schema_table_patterns):
+        """
+        Merge adjacent single-table patterns for the same database and schema into one
+        pattern with a 'tables' list, so that their catalog queries can be batched together.
+        Only adjacent patterns are merged, so tables are still mined in the order given.
+        
+        Args:
+            db_schema_table_patterns (list): List of dictionaries with db, schema, and table patterns
+            
+        Returns:
+            list: The patterns, with runs of table patterns merged
+        """
+        merged = []
+        for pattern in db_schema_table_patterns:
+            previous = merged[-1] if merged else None
+            if (pattern['table'] and previous is not None and previous.get('tables')
+                    and (previous['db'], previous['schema']) == (pattern['db'], pattern['schema'])):
+                previous['tables'].append(pattern['table'])
+            elif pattern['table']:
+                merged.append({'db': pattern['db'], 'schema': pattern['schema'], 'table': None, 'tables': [pattern['table']]})
+            else:
+                merged.append(pattern)
+        return merged
+    
+    @staticmethod
+    def _get_connection(db_name, catalog_snapshot=None):
+        """
+        Get the connection to mine a database from.
+        
+        Args:
+            db_name (str): Database name
+            catalog_snapshot (DURC_CatalogSnapshot): Optional offline catalog
+            
+        Returns:
+            The snapshot connection for the database, its Django connection, or the default
+            Django connection when the database is not configured
+            
+        Raises:
+            KeyError: If a snapshot is given and does not contain the database
+        """
+        if catalog_snapshot is not None:
+            return catalog_snapshot.connection(db_name)
+        if db_name in connections:
+            return connections[db_name]
+        return connection
+    
+    @staticmethod
+    def _is_postgresql(conn):
+        """Check whether a connection is to a PostgreSQL database."""
+        return DURC_DatabaseEngine.is_postgresql(conn.settings_dict['ENGINE'])
+    
+    @staticmethod
+    def _run_in_worker(extract_pattern, pattern):
+        """
+        Mine one pattern in a worker thread, buffering its output messages and tables.
+        
+        Django connections are per thread, so the connections opened here are closed again
+        before the worker picks up its next pattern.
+        
+        Args:
+            extract_pattern (callable): Function taking (pattern, writer, sink)
+            pattern (dict): Dictionary with db, schema, and table patterns
+            
+        Returns:
+            DURC_BufferedModelSink: The buffered messages and tables
+        """
+        buffer = DURC_BufferedModelSink()
+        try:
+            extract_pattern(pattern, buffer.write_message, buffer)
+            return buffer
+        finally:
+            connections.close_all()
+    
+    @staticmethod
+    def _extract_pattern(pattern, stdout_writer, style, bulk, query_counter, introspection_backend,
+                         table_indexes, table_indexes_lock, incremental, sink, pipeline=False,
+                         catalog_snapshot=None, read_only=None, profiler=None, exclude_patterns=None):
+        """
+        Mine the tables matching one include pattern.
+        
+        Args:
+            pattern (dict): Dictionary with db, schema, and table patterns, or with a 'tables'
+                list instead of a single table
+            stdout_writer: Django stdout writer for output messages
+            style: Django style for formatting output messages
+            bulk (bool): Load the catalog for the whole schema up front
+            query_counter (DURC_QueryCounter): Optional counter that records every catalog query
+            introspection_backend (str): Name of the introspection backend to use, or None
+            table_indexes (dict): Database name -> DURC_TableIndex cache shared across patterns
+            table_indexes_lock (threading.Lock): Lock guarding table_indexes
+            incremental (DURC_IncrementalMiningState): Optional fingerprints from the previous run
+            sink: Receives the database and every mined table (DURC_ModelBuilder or a streaming writer)
+            pipeline (bool): Load the per-table catalog rows for batches of tables at a time
+            catalog_snapshot (DURC_CatalogSnapshot): Optional offline catalog to read instead of the database
+            read_only (DURC_ReadOnlyMining): Optional low-impact mode with timeouts and per-table retries
+            profiler (DURC_MiningProfiler): Optional profiler for queries, phases and tables
+            exclude_patterns (list): Optional dictionaries with db, schema, and table patterns to leave out
+        """
+        db_name = pattern['db']
+        schema_name = pattern['schema']
+        table_names = pattern.get('tables') or ([pattern['table']] if pattern['table'] else None)
+        
+        # Try to get the connection for the specified database
+        try:
+            if catalog_snapshot is None and db_name not in connections:
+                stdout_writer(style.WARNING(f"Database '{db_name}' not found in settings, using default connection"))
+            conn = DURC_RelationalModelExtractor._get_connection(db_name, catalog_snapshot)
+        except Exception as e:
+            stdout_writer(style.ERROR(f"Error connecting to database '{db_name}': {e}"))
+            return
+        
+        # Detect database type
+        is_postgresql = DURC_RelationalModelExtractor._is_postgresql(conn)
+        
+        # Pick the catalog introspection backend for this database. A snapshot holds
+        # information_schema rows whatever the database engine was.
+        if catalog_snapshot is not None:
+            backend = DURC_InformationSchemaBackend()
+        else:
+            backend = DURC_RelationalModelExtractor._get_introspection_backend(is_postgresql, introspection_backend)
+        
+        sink.add_database(db_name)
+        
+        if catalog_snapshot is not None:
+            read_only = None
+        transaction_context = read_only.transaction(conn) if read_only is not None else nullcontext()
+        
+        # Get all table names in the database
+        try:
+            with transaction_context, conn.cursor() as cursor:
+                if query_counter is not None:
+                    cursor = query_counter.wrap_cursor(cursor)
+                if profiler is not None:
+                    cursor = profiler.wrap_cursor(cursor)
+                
+                # Get all tables in the database/schema
+                if not schema_name:
+                    # If no schema is specified, use the backend's default schema, or else the
+                    # database name (this assumes that the database name is also the schema name)
+                    schema_name = backend.DEFAULT_SCHEMA or db_name
+                
+                excluded_tables = DURC_RelationalModelExtractor._excluded_tables(exclude_patterns, db_name, schema_name)
+                has_globs = any(DURC_IncludePatternParser.is_glob(table_name) for table_name in table_names or ())
+                
+                # Filter tables based on the pattern
+                tables_to_process = []
+                all_tables = None
+                if excluded_tables is None:
+                    stdout_writer(f"Excluded schema: {db_name}.{schema_name}")
+                    all_tables = []
+                elif has_globs or excluded_tables:
+                    # Only list the slice of the schema that the pattern selects
+                    listed_tables = backend.list_tables(cursor, schema_name, table_names, excluded_tables)
+                    for table_name in table_names or [None]:
+                        matched = [
+                            table for table in listed_tables if DURC_IncludePatternParser.matches(table_name, table)
+                        ]
+                        literal = table_name is not None and not DURC_IncludePatternParser.is_glob(table_name)
+                        if (not matched and literal and not any(
+                                DURC_IncludePatternParser.matches(glob, table_name) for glob in excluded_tables)):
+                            stdout_writer(style.WARNING(f"Table '{table_name}' not found in schema '{schema_name or 'default'}'"))
+                        tables_to_process.extend(matched)
+                    tables_to_process = list(dict.fromkeys(tables_to_process))
+                elif table_names:
+                    all_tables = backend.list_tables(cursor, schema_name)
+                    for table_name in table_names:
                         if table_name in all_tables:
                             tables_to_process.append(table_name)
                         else:
                             stdout_writer(style.WARNING(f"Table '{table_name}' not found in schema '{schema_name or 'default'}'"))
-                    else:
-                        tables_to_process = all_tables
+                else:
+                    all_tables = backend.list_tables(cursor, schema_name)
+                    tables_to_process = all_tables
+                
+                # Build the table index for this database the first time it is needed
+                table_index = None
+                if tables_to_process:
+                    with table_indexes_lock:
+                        if db_name not in table_indexes:
+                            table_indexes[db_name] = backend.load_table_index(cursor)
+                        table_index = table_indexes[db_name]
+                
+                # The schema was only listed in part; take its base tables from the table index.
+                # Pattern-based relationships and the schema catalog must see the same tables
+                # as a full mine, so views are left out as list_tables() leaves them out
+                if all_tables is None:
+                    all_tables = [
+                        table for table in (
+                            table_index.tables_in_schema(schema_name, base_tables_only=True) if table_index else []
+                        )
+                        if not table.startswith('_')
+                    ]
+                
+                # Index the schema's table names once for pattern-based relationship detection
+                suffix_index = DURC_TableSuffixIndex(all_tables)
+                
+                # In bulk mode, load the catalog for the whole schema up front. Incremental
+                # mining needs every table's rows to fingerprint it, so it loads it the same way.
+                catalog = None
+                if (bulk or incremental is not None) and tables_to_process:
+                    catalog = backend.load_schema_catalog(cursor, schema_name, all_tables)
+                
+                # In pipeline mode, the per-table catalog rows are loaded for a batch of tables at a time
+                batch_catalog = None
+                batch_size = backend.PIPELINE_BATCH_SIZE
+                if pipeline and catalog is None:
+                    tables_to_process = [table for table in tables_to_process if not table.startswith('_')]
+                
+                # Process each table
+                for position, current_table in enumerate(tables_to_process):
+                    # Skip tables that start with underscore
+                    if current_table.startswith('_'):
+                        continue
+                    
+                    qualified_name = f"{db_name}.{schema_name + '.' if schema_name else ''}{current_table}"
                     
-                    # Process each table
-                    for current_table in tables_to_process:
-                        # Skip tables that start with underscore
-                        if current_table.startswith('_'):
-                            continue
+                    with profiler.table(qualified_name) if profiler is not None else nullcontext():
+                        table_catalog = catalog
+                        if pipeline and catalog is None:
+                            if position % batch_size == 0:
+                                batch = tables_to_process[position:position + batch_size]
+                                load_batch = lambda: backend.load_tables_catalog(cursor, schema_name, batch)
+                                if read_only is not None:
+                                    # A batch that keeps timing out falls back to per-table queries
+                                    batch_catalog = read_only.run(
+                                        conn, f"catalog batch of {len(batch)} tables in {db_name}.{schema_name}",
+                                        stdout_writer, style, load_batch
+                                    )
+                                else:
+                                    batch_catalog = load_batch()
+                            table_catalog = batch_catalog
                         
-                        table_info = DURC_RelationalModelExtractor._process_table(
-                            conn, cursor, db_name, schema_name, current_table, all_tables, stdout_writer, style, is_postgresql
-                        )
+                        # Reuse the previous entry if none of the table's catalog rows changed
+                        table_info = None
+                        if incremental is not None:
+                            fingerprint = incremental.fingerprint_table(catalog, current_table, suffix_index, table_index)
+                            table_info = incremental.get_unchanged_table(
+                                db_name, schema_name, current_table, fingerprint, is_postgresql
+                            )
+                            incremental.record_table(db_name, schema_name, current_table, fingerprint, table_info is not None)
                         
-                        # Add the table to the relational model with proper structure
-                        if is_postgresql and schema_name:
-                            # For PostgreSQL, create schema layer: db -> schema -> table
-                            if schema_name not in relational_model[db_name]:
-                                relational_model[db_name][schema_name] = {}
-                            relational_model[db_name][schema_name][current_table] = table_info
-                        else:
-                            # For MySQL or when no schema specified: db -> table
-                            relational_model[db_name][current_table] = table_info
+                        reused = table_info is not None
+                        if not reused:
+                            process_table = lambda: DURC_RelationalModelExtractor._process_table(
+                                conn, cursor, db_name, schema_name, current_table, all_tables, stdout_writer, style, is_postgresql,
+                                table_catalog, backend, table_index, suffix_index, profiler
+                            )
+                            if read_only is not None:
+                                table_info = read_only.run(conn, f"table {qualified_name}", stdout_writer, style, process_table)
+                                if table_info is None:
+                                    continue
+                            else:
+                                table_info = process_table()
                         
-                        stdout_writer(f"Processed table: {db_name}.{schema_name + '.' if schema_name else ''}{current_table}")
-                    
-            except OperationalError as e:
-                stdout_writer(style.ERROR(f"Database operation error: {e}"))
-            except Exception as e:
-                stdout_writer(style.ERROR(f"Error processing database '{db_name}': {e}"))
+                        # PostgreSQL models have a schema layer: db -> schema -> table
+                        sink.add_table(db_name, schema_name if is_postgresql and schema_name else None, current_table, table_info)
+                        
+                        if reused:
+                            stdout_writer(f"Reused unchanged table: {qualified_name}")
+                        else:
+                            stdout_writer(f"Processed table: {qualified_name}")
+                
+        except OperationalError as e:
+            stdout_writer(style.ERROR(f"Database operation error: {e}"))
+        except Exception as e:
+            stdout_writer(style.ERROR(f"Error processing database '{db_name}': {e}"))
+    
+    @staticmethod
+    def _get_introspection_backend(is_postgresql, backend_name=None):
+        """
+        Get the catalog introspection backend for a database.
         
-        return relational_model
+        Args:
+            is_postgresql (bool): Whether the database is PostgreSQL
+            backend_name (str): Name of a registered backend, or None to choose automatically
+            
+        Returns:
+            DURC_InformationSchemaBackend: The introspection backend instance
+            
+        Raises:
+            CommandError: If the backend name is unknown
+        """
+        if backend_name:
+            if backend_name not in INTROSPECTION_BACKENDS:
+                raise CommandError(
+                    f"Unknown introspection backend: {backend_name}. "
+                    f"Choose one of: {', '.join(INTROSPECTION_BACKENDS)}"
+                )
+            return INTROSPECTION_BACKENDS[backend_name]()
+        
+        if is_postgresql:
+            return DURC_PgCatalogBackend()
+        return DURC_InformationSchemaBackend()
     
     @staticmethod
-    def _process_table(conn, cursor, db_name, schema_name, table, all_tables, stdout_writer, style, is_postgresql):
+    def _process_table(conn, cursor, db_name, schema_name, table, all_tables, stdout_writer, style, is_postgresql,
+                       catalog=None, backend=None, table_index=None, suffix_index=None, profiler=None):
         """
         Process a single table and extract its information.
         
@@ -132,62 +555,32 @@ class DURC_RelationalModelExtractor:
             stdout_writer: Django stdout writer for output messages
             style: Django style for formatting output messages
             is_postgresql (bool): Whether the database is PostgreSQL
+            catalog (DURC_SchemaCatalog): Preloaded catalog holding the table's rows (for the whole schema or a
+                batch of tables), or None to query the catalog rows for this table only
+            backend (DURC_InformationSchemaBackend): Introspection backend used for queries
+            table_index (DURC_TableIndex): Index of every table in the database, or None to load it
+            suffix_index (DURC_TableSuffixIndex): Index of the schema's table names, or None to
+                build it from all_tables
+            profiler (DURC_MiningProfiler): Optional profiler for the linked-key and has_many phases
             
         Returns:
             dict: Table information including columns and relationships
         """
-        # Get table description (columns)
-        cursor.execute(f"""
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns c
-            WHERE table_name = %s
-            {f"AND table_schema = '{schema_name}'" if schema_name else ""}
-            ORDER BY ordinal_position
-        """, [table])
-        
-        columns_data = cursor.fetchall()
-        
-        # Get primary key information
-        cursor.execute(f"""
-            SELECT ccu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.constraint_column_usage ccu 
-            ON tc.constraint_name = ccu.constraint_name
-            WHERE tc.table_name = %s
-            {f"AND tc.table_schema = '{schema_name}'" if schema_name else ""}
-            AND tc.constraint_type = 'PRIMARY KEY'
-        """, [table])
-        
-        primary_keys = set([row[0] for row in cursor.fetchall()])
-        
-        # Get foreign key information
-        cursor.execute(f"""
-            SELECT kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-            ON tc.constraint_name = kcu.constraint_name
-            WHERE tc.table_name = %s
-            {f"AND tc.table_schema = '{schema_name}'" if schema_name else ""}
-            AND tc.constraint_type = 'FOREIGN KEY'
-        """, [table])
-        
-        foreign_key_columns = set([row[0] for row in cursor.fetchall()])
-        
-        # Get foreign key relationships
-        cursor.execute(f"""
-            SELECT kcu.column_name, ccu.table_schema, ccu.table_name, ccu.column_name
-            FROM information_schema.table_constraints AS tc 
-            JOIN information_schema.key_column_usage AS kcu
-            ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage AS ccu 
-            ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY' 
-            AND tc.table_name = %s
-            {f"AND tc.table_schema = '{schema_name}'" if schema_name else ""}
-        """, [table])
+        if backend is None:
+            backend = DURC_InformationSchemaBackend()
+        if catalog is None:
+            catalog = backend.load_table_catalog(cursor, schema_name, table)
+        if table_index is None:
+            table_index = backend.load_table_index(cursor)
+        if suffix_index is None:
+            suffix_index = DURC_TableSuffixIndex(all_tables)
+        
+        columns_data = catalog.columns.get(table, [])
+        primary_keys = catalog.primary_keys.get(table, set())
+        foreign_key_columns = catalog.foreign_key_columns.get(table, set())
         
         foreign_keys = {}
-        for fk_col, fk_schema, fk_table, fk_target_col in cursor.fetchall():
+        for fk_col, fk_schema, fk_table, fk_target_col in catalog.foreign_keys.get(table, []):
             foreign_keys[fk_col] = {
                 'schema': fk_schema,
                 'table': fk_table,
@@ -200,15 +593,18 @@ class DURC_RelationalModelExtractor:
         )
         
         # Process columns
-        column_data = DURC_RelationalModelExtractor._process_columns(
-            columns_data, primary_keys, foreign_key_columns, foreign_keys, 
-            db_name, schema_name, table, all_tables, cursor, stdout_writer, style
-        )
+        with profiler.phase('linked_keys') if profiler is not None else nullcontext():
+            column_data = DURC_RelationalModelExtractor._process_columns(
+                columns_data, primary_keys, foreign_key_columns, foreign_keys, 
+                db_name, schema_name, table, suffix_index, cursor, stdout_writer, style, table_index,
+                DURC_DataTypeMapper.dialect_for_engine(conn.settings_dict['ENGINE'])
+            )
         
         # Process relationships
-        has_many, belongs_to = DURC_RelationalModelExtractor._process_relationships(
-            column_data, foreign_keys, db_name, schema_name, table, cursor, stdout_writer, style
-        )
+        with profiler.phase('has_many') if profiler is not None else nullcontext():
+            has_many, belongs_to = DURC_RelationalModelExtractor._process_relationships(
+                column_data, foreign_keys, db_name, schema_name, table, cursor, stdout_writer, style, catalog
+            )
         
         # Create the table info dictionary
         table_info = {
@@ -259,9 +655,12 @@ class DURC_RelationalModelExtractor:
             
             column_parts.append(col_def)
         
-        # Add primary key constraint if any
+        # Add primary key constraint if any, with its columns in column order: primary_keys
+        # is a set, and its iteration order changes between processes
         if primary_keys:
-            column_parts.append(f"  PRIMARY KEY ({', '.join(primary_keys)})")
+            key_columns = [col_name for col_name, _, _, _ in columns_data if col_name in primary_keys]
+            key_columns += sorted(set(primary_keys) - set(key_columns))
+            column_parts.append(f"  PRIMARY KEY ({', '.join(key_columns)})")
         
         # Add foreign key constraints
         for fk_col, fk_info in foreign_keys.items():
@@ -278,7 +677,8 @@ class DURC_RelationalModelExtractor:
     
     @staticmethod
     def _process_columns(columns_data, primary_keys, foreign_key_columns, foreign_keys, 
-                         db_name, schema_name, table, all_tables, cursor, stdout_writer, style):
+                         db_name, schema_name, table, suffix_index, cursor, stdout_writer, style, table_index,
+                         dialect=None):
         """
         Process column information for a table.
         
@@ -290,17 +690,24 @@ class DURC_RelationalModelExtractor:
             db_name (str): Database name
             schema_name (str): Schema name
             table (str): Table name
-            all_tables (list): List of all tables in the schema
+            suffix_index (DURC_TableSuffixIndex): Index of the schema's table names
             cursor: Database cursor
             stdout_writer: Django stdout writer for output messages
             style: Django style for formatting output messages
+            table_index (DURC_TableIndex): Index of every table in the database
+            dialect (str): Type registry dialect of the database (see DURC_DataTypeMapper)
             
         Returns:
             list: Processed column data
         """
         processed_columns = []
         
-        for col_name, data_type, is_nullable, default_value in columns_data:
+        # Map the data types of every column in one call
+        simplified_types = DURC_DataTypeMapper.map_data_types(
+            [column[1] for column in columns_data], dialect
+        )
+        
+        for position, (col_name, data_type, is_nullable, default_value) in enumerate(columns_data):
             # Determine if this column is a primary key or foreign key
             is_primary = col_name in primary_keys
             is_foreign = col_name in foreign_key_columns
@@ -320,13 +727,13 @@ class DURC_RelationalModelExtractor:
             elif is_linked_key and not is_foreign:
                 # Try pattern-based relationship detection
                 foreign_db, foreign_table = DURC_RelationalModelExtractor._detect_pattern_based_relationship(
-                    col_name, db_name, schema_name, table, all_tables, cursor, foreign_keys, stdout_writer, style
+                    col_name, db_name, schema_name, table, suffix_index, foreign_keys, stdout_writer, style
                 )
                 
                 if not foreign_table:
                     # Try standard linked key detection
                     foreign_db, foreign_table = DURC_RelationalModelExtractor._detect_linked_key_relationship(
-                        col_name, db_name, schema_name, cursor, foreign_keys, stdout_writer, style
+                        col_name, db_name, schema_name, table_index, foreign_keys, stdout_writer, style
                     )
             
             # Determine if auto-increment
@@ -334,8 +741,7 @@ class DURC_RelationalModelExtractor:
             if default_value and ('nextval' in str(default_value) or 'auto_increment' in str(default_value).lower()):
                 is_auto_increment = True
             
-            # Map PostgreSQL data types to simplified types
-            simplified_type = DURC_DataTypeMapper.map_data_type(data_type)
+            simplified_type = simplified_types[position]
             
             processed_columns.append({
                 'column_name': col_name,
@@ -353,18 +759,20 @@ class DURC_RelationalModelExtractor:
         return processed_columns
     
     @staticmethod
-    def _detect_pattern_based_relationship(col_name, db_name, schema_name, table, all_tables, 
-                                          cursor, foreign_keys, stdout_writer, style):
+    def _detect_pattern_based_relationship(col_name, db_name, schema_name, table, suffix_index, 
+                                          foreign_keys, stdout_writer, style):
         """
         Detect pattern-based relationships for columns following patterns like *_{table_name}_id.
         
+        When several tables match (e.g. user and other_user for a_other_user_id), the longest
+        table name wins.
+        
         Args:
             col_name (str): Column name
             db_name (str): Database name
             schema_name (str): Schema name
             table (str): Table name
-            all_tables (list): List of all tables in the schema
-            cursor: Database cursor
+            suffix_index (DURC_TableSuffixIndex): Index of the schema's table names
             foreign_keys (dict): Dictionary of foreign key information
             stdout_writer: Django stdout writer for output messages
             style: Django style for formatting output messages
@@ -372,27 +780,27 @@ class DURC_RelationalModelExtractor:
         Returns:
             tuple: (foreign_db, foreign_table) or (None, None) if not detected
         """
-        for potential_table in all_tables:
-            # Check if the column follows the pattern *_{table_name}_id
-            if col_name.endswith(f"_{potential_table}_id") and col_name != f"{potential_table}_id":
-                stdout_writer(style.SUCCESS(
-                    f"Detected pattern-based relationship: {schema_name}.{table}.{col_name} -> {schema_name}.{potential_table}"
-                ))
-                
-                # Add to foreign_keys for use in belongs_to relationships
-                foreign_keys[col_name] = {
-                    'schema': schema_name,
-                    'table': potential_table,
-                    'column': 'id',  # Assume the primary key is 'id'
-                    'is_pattern_based': True
-                }
-                
-                return db_name, potential_table
+        # Check if the column follows the pattern *_{table_name}_id
+        potential_table = suffix_index.find_table(col_name)
+        if potential_table:
+            stdout_writer(style.SUCCESS(
+                f"Detected pattern-based relationship: {schema_name}.{table}.{col_name} -> {schema_name}.{potential_table}"
+            ))
+            
+            # Add to foreign_keys for use in belongs_to relationships
+            foreign_keys[col_name] = {
+                'schema': schema_name,
+                'table': potential_table,
+                'column': 'id',  # Assume the primary key is 'id'
+                'is_pattern_based': True
+            }
+            
+            return db_name, potential_table
         
         return None, None
     
     @staticmethod
-    def _detect_linked_key_relationship(col_name, db_name, schema_name, cursor, 
+    def _detect_linked_key_relationship(col_name, db_name, schema_name, table_index, 
                                        foreign_keys, stdout_writer, style):
         """
         Detect linked key relationships for columns ending with _id.
@@ -401,7 +809,7 @@ class DURC_RelationalModelExtractor:
             col_name (str): Column name
             db_name (str): Database name
             schema_name (str): Schema name
-            cursor: Database cursor
+            table_index (DURC_TableIndex): Index of every table in the database
             foreign_keys (dict): Dictionary of foreign key information
             stdout_writer: Django stdout writer for output messages
             style: Django style for formatting output messages
@@ -413,34 +821,14 @@ class DURC_RelationalModelExtractor:
         inferred_table = col_name[:-3]  # Remove _id suffix
         
         # First check if this table exists in the current schema
-        cursor.execute(f"""
-            SELECT EXISTS (
-                SELECT 1 
-                FROM information_schema.tables 
-                WHERE table_name = %s
-                {f"AND table_schema = '{schema_name}'" if schema_name else ""}
-            )
-        """, [inferred_table])
-        
-        if cursor.fetchone()[0]:
+        if table_index.has_table(schema_name, inferred_table):
             # Table exists in the current schema
             return db_name, inferred_table
         else:
             # If not found in current schema, check all schemas in this database
-            cursor.execute("""
-                SELECT table_schema 
-                FROM information_schema.tables 
-                WHERE table_name = %s
-                AND table_schema != 'information_schema'
-                AND table_schema != 'pg_catalog'
-                LIMIT 1
-            """, [inferred_table])
-            
-            result = cursor.fetchone()
-            if result:
+            foreign_schema = table_index.find_schema(inferred_table)
+            if foreign_schema:
                 # Found in another schema
-                foreign_schema = result[0]
-                
                 # Store the cross-schema information
                 # Use the table parameter passed to this method
                 stdout_writer(style.SUCCESS(
@@ -460,7 +848,8 @@ class DURC_RelationalModelExtractor:
         return None, None
     
     @staticmethod
-    def _process_relationships(column_data, foreign_keys, db_name, schema_name, table, cursor, stdout_writer, style):
+    def _process_relationships(column_data, foreign_keys, db_name, schema_name, table, cursor, stdout_writer, style,
+                               catalog):
         """
         Process relationships for a table.
         
@@ -473,6 +862,7 @@ class DURC_RelationalModelExtractor:
             cursor: Database cursor
             stdout_writer: Django stdout writer for output messages
             style: Django style for formatting output messages
+            catalog (DURC_SchemaCatalog): Catalog rows for the schema
             
         Returns:
             tuple: (has_many, belongs_to) dictionaries
@@ -514,20 +904,7 @@ class DURC_RelationalModelExtractor:
                     belongs_to[col['column_name'][:-3] if col['column_name'].endswith('_id') else col['column_name']] = relationship
         
         # Find "has_many" relationships (foreign keys in other tables pointing to this table)
-        # First, check for foreign keys in the same schema
-        cursor.execute(f"""
-            SELECT tc.table_name, kcu.column_name, tc.table_schema
-            FROM information_schema.table_constraints AS tc 
-            JOIN information_schema.key_column_usage AS kcu
-            ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage AS ccu 
-            ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY' 
-            AND ccu.table_name = %s
-            {f"AND ccu.table_schema = '{schema_name}'" if schema_name else ""}
-        """, [table])
-        
-        for ref_table, ref_column, ref_schema in cursor.fetchall():
+        for ref_table, ref_column, ref_schema in catalog.referencing_keys.get(table, []):
             # Skip tables that start with underscore
             if ref_table.startswith('_'):
                 continue
@@ -562,17 +939,7 @@ class DURC_RelationalModelExtractor:
         
         # Now check for potential cross-schema relationships based on naming conventions
         # Look for tables in other schemas that might have columns ending with _id that match this table name
-        cursor.execute("""
-            SELECT c.table_schema, c.table_name, c.column_name
-            FROM information_schema.columns c
-            JOIN information_schema.tables t ON c.table_schema = t.table_schema AND c.table_name = t.table_name
-            WHERE c.column_name = %s
-            AND t.table_type = 'BASE TABLE'
-            AND c.table_schema != %s
-            AND c.table_schema NOT IN ('information_schema', 'pg_catalog')
-        """, [f"{table}_id", schema_name])
-        
-        for ref_schema, ref_table, ref_column in cursor.fetchall():
+        for ref_schema, ref_table, ref_column in catalog.named_references.get(f"{table}_id", []):
             # Skip tables that start with underscore
             if ref_table.startswith('_'):
                 continue
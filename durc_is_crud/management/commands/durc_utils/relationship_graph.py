@@ -0,0 +1,192 @@
+from ....shared.durc_data_loader import DurcDataLoader
+
+
+class DURC_RelationshipGraph:
+    """
+    Post-extraction pass that derives has_many relationships from every table's belongs_to.
+
+    While mining, has_many is filled per table from declared foreign keys and from
+    naming-convention matches in other schemas only. A belongs_to found any other way
+    (a same-schema *_id link, or a pattern-based one such as other_user_id) never shows up
+    on the target table. This pass indexes every belongs_to edge by its target once and then
+    adds the missing has_many entries to every table, without any database queries.
+
+    Derived entries are marked with 'is_derived': True, and with 'is_inferred': True when
+    the key column has no declared foreign key. Derived entries already present in the
+    model (e.g. copied from the previous run by incremental mining) are dropped and
+    derived again, so the result only depends on the current belongs_to edges.
+
+    Usage:
+        graph = DURC_RelationshipGraph()
+        for db_name, schema_name, table, table_info in tables:
+            graph.add_table(db_name, schema_name, table, table_info)
+        for db_name, schema_name, table, table_info in tables:
+            graph.complete_table(db_name, schema_name, table, table_info)
+
+    Attributes:
+        derived_count (int): Number of has_many entries added by complete_table()
+    """
+
+    def __init__(self):
+        # (db, schema or None, table) -> [(db, schema or None, table, local_key, is_declared)]
+        self._inbound_edges = {}
+        self.derived_count = 0
+
+    @classmethod
+    def complete_relational_model(cls, relational_model):
+        """
+        Derive the missing has_many entries of a whole relational model, in place.
+
+        Args:
+            relational_model (dict): db -> table, or db -> schema -> table
+
+        Returns:
+            int: Number of has_many entries added
+        """
+        tables = list(cls._iter_tables(relational_model))
+        graph = cls()
+        for entry in tables:
+            graph.add_table(*entry)
+        for entry in tables:
+            graph.complete_table(*entry)
+        return graph.derived_count
+
+    @classmethod
+    def complete_model_file(cls, input_path, output_path, model_writer_class):
+        """
+        Derive the missing has_many entries of a relational model file, writing the result
+        to another file. Tables are decoded one at a time, so only the edge index is held
+        in memory.
+
+        Args:
+            input_path (str): Relational model file written by the extractor
+            output_path (str): Relational model file to write
+            model_writer_class (type): DurcModelWriter or a subclass for the output format
+
+        Returns:
+            int: Number of has_many entries added
+        """
+        graph = cls()
+        with DurcDataLoader().open_relational_model(input_path) as lazy_model:
+            for entry in lazy_model.iter_tables():
+                graph.add_table(*entry)
+
+            with model_writer_class(output_path) as writer:
+                for db_name in lazy_model.databases:
+                    writer.add_database(db_name)
+                    for _, schema_name, table, table_info in lazy_model.iter_tables(db_name):
+                        graph.complete_table(db_name, schema_name, table, table_info)
+                        writer.add_table(db_name, schema_name, table, table_info)
+        return graph.derived_count
+
+    def add_table(self, db_name, schema_name, table, table_info):
+        """
+        Index the belongs_to edges of a table by their target.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name for models with a schema layer, or None
+            table (str): Table name
+            table_info (dict): Table entry
+        """
+        belongs_to = table_info.get('belongs_to')
+        if not belongs_to:
+            return
+
+        declared_keys = {
+            column.get('column_name') for column in table_info.get('column_data', []) if column.get('is_foreign_key')
+        }
+        for relationship in belongs_to.values():
+            to_table = relationship.get('to_table')
+            local_key = relationship.get('local_key')
+            if not to_table or not local_key:
+                continue
+            # Without a schema layer every schema's tables share the db -> table level
+            to_schema = (relationship.get('to_schema') or schema_name) if schema_name is not None else None
+            target = (relationship.get('to_db') or db_name, to_schema, to_table)
+            self._inbound_edges.setdefault(target, []).append(
+                (db_name, schema_name, table, local_key, local_key in declared_keys)
+            )
+
+    def complete_table(self, db_name, schema_name, table, table_info):
+        """
+        Add a has_many entry for every indexed belongs_to edge pointing at a table that its
+        has_many does not already cover. The table entry is changed in place.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name for models with a schema layer, or None
+            table (str): Table name
+            table_info (dict): Table entry
+        """
+        has_many = {
+            name: relationship for name, relationship in table_info.get('has_many', {}).items()
+            if not relationship.get('is_derived')
+        }
+        covered = {self._source_key(relationship, db_name, schema_name) for relationship in has_many.values()}
+
+        for source_db, source_schema, source_table, local_key, is_declared in self._inbound_edges.get(
+                (db_name, schema_name, table), []):
+            # Same rule as the extractor: tables starting with an underscore are skipped
+            if source_table.startswith('_'):
+                continue
+            source_key = (source_db, source_schema, source_table, local_key)
+            if source_key in covered:
+                continue
+
+            # Same naming as the extractor's has_many entries
+            prefix = None
+            if local_key.endswith('_id') and local_key[:-3] != table:
+                prefix = local_key[:-3]
+            name = f"{prefix}_{source_table}" if prefix else source_table
+            cross_schema = source_schema is not None and source_schema != schema_name
+            if cross_schema and name in has_many:
+                name = f"{source_schema}_{name}"
+            if name in has_many:
+                continue
+
+            relationship = {
+                'prefix': prefix,
+                'type': source_table,
+                'from_table': source_table,
+                'from_db': source_db,
+                'from_column': local_key,
+            }
+            if cross_schema:
+                relationship['from_schema'] = source_schema
+            if not is_declared:
+                relationship['is_inferred'] = True
+            relationship['is_derived'] = True
+
+            has_many[name] = relationship
+            covered.add(source_key)
+            self.derived_count += 1
+
+        # Keep the extractor's key order: has_many comes before belongs_to
+        belongs_to = table_info.pop('belongs_to', None)
+        if has_many:
+            table_info['has_many'] = has_many
+        else:
+            table_info.pop('has_many', None)
+        if belongs_to is not None:
+            table_info['belongs_to'] = belongs_to
+
+    @staticmethod
+    def _source_key(relationship, db_name, schema_name):
+        # The from_* fields of a has_many entry, in the form add_table() indexes sources
+        source_schema = (relationship.get('from_schema') or schema_name) if schema_name is not None else None
+        return (
+            relationship.get('from_db') or db_name, source_schema,
+            relationship.get('from_table'), relationship.get('from_column'),
+        )
+
+    @staticmethod
+    def _iter_tables(relational_model):
+        for db_name, db_model in relational_model.items():
+            for key, value in db_model.items():
+                if isinstance(value, dict) and isinstance(value.get('table_name'), str):
+                    yield db_name, None, key, value
+                elif isinstance(value, dict):
+                    # PostgreSQL schema layer: db -> schema -> table
+                    for table, table_info in value.items():
+                        yield db_name, key, table, table_info
@@ -0,0 +1,54 @@
+class DURC_SchemaCatalog:
+    """
+    In-memory copy of the catalog rows that the relational model extractor needs for one schema.
+
+    The catalog can be filled for a single table (one set of queries per table) or for
+    the whole schema at once (bulk mode). The extractor only ever reads from the catalog,
+    so both modes produce the same relational model.
+
+    Attributes:
+        schema_name (str): Schema the catalog was loaded for
+        tables (list): Names of the base tables in the schema
+        columns (dict): table -> list of (column_name, data_type, is_nullable, column_default)
+        primary_keys (dict): table -> set of primary key column names
+        foreign_key_columns (dict): table -> set of foreign key column names
+        foreign_keys (dict): table -> list of (column_name, ref_schema, ref_table, ref_column)
+        referencing_keys (dict): table -> list of (ref_table, ref_column, ref_schema) for
+            declared foreign keys in other tables that point at the table
+        named_references (dict): column_name -> list of (schema, table, column) for columns in
+            other schemas whose name matches, used for naming-convention has_many detection
+    """
+
+    def __init__(self, schema_name, tables=None):
+        self.schema_name = schema_name
+        self.tables = list(tables or [])
+        self.columns = {}
+        self.primary_keys = {}
+        self.foreign_key_columns = {}
+        self.foreign_keys = {}
+        self.referencing_keys = {}
+        self.named_references = {}
+
+    def add_column(self, table, column_row):
+        """Append a (column_name, data_type, is_nullable, column_default) row for a table."""
+        self.columns.setdefault(table, []).append(tuple(column_row))
+
+    def add_primary_key(self, table, column_name):
+        """Record a primary key column for a table."""
+        self.primary_keys.setdefault(table, set()).add(column_name)
+
+    def add_foreign_key_column(self, table, column_name):
+        """Record a foreign key column for a table."""
+        self.foreign_key_columns.setdefault(table, set()).add(column_name)
+
+    def add_foreign_key(self, table, fk_row):
+        """Append a (column_name, ref_schema, ref_table, ref_column) row for a table."""
+        self.foreign_keys.setdefault(table, []).append(tuple(fk_row))
+
+    def add_referencing_key(self, table, ref_row):
+        """Append a (ref_table, ref_column, ref_schema) row for a table that is referenced."""
+        self.referencing_keys.setdefault(table, []).append(tuple(ref_row))
+
+    def add_named_reference(self, column_name, ref_row):
+        """Append a (schema, table, column) row for a column name seen in another schema."""
+        self.named_references.setdefault(column_name, []).append(tuple(ref_row))
@@ -0,0 +1,70 @@
+class DURC_TableIndex:
+    """
+    Per-run index of every table name in a database and the schemas that contain it.
+
+    The index is built once per database with a single catalog query. Linked key and
+    cross-schema resolution are then dictionary lookups instead of one or two
+    existence queries for every *_id column.
+    """
+
+    def __init__(self):
+        self.schemas_by_table = {}
+        self.tables_by_schema = {}
+        self.base_tables_by_schema = {}
+
+    def add_table(self, schema_name, table, is_base_table=True):
+        """
+        Record that a table with the given name exists in the given schema.
+
+        Args:
+            schema_name (str): Schema name
+            table (str): Table (or view) name
+            is_base_table (bool): False for views and other relations that are not mined
+        """
+        self.schemas_by_table.setdefault(table, []).append(schema_name)
+        self.tables_by_schema.setdefault(schema_name, []).append(table)
+        if is_base_table:
+            self.base_tables_by_schema.setdefault(schema_name, []).append(table)
+
+    def has_table(self, schema_name, table):
+        """
+        Check whether a table exists in a schema.
+
+        Args:
+            schema_name (str): Schema name
+            table (str): Table name
+
+        Returns:
+            bool: True if the schema contains the table
+        """
+        return schema_name in self.schemas_by_table.get(table, ())
+
+    def find_schema(self, table):
+        """
+        Find a schema that contains a table with the given name.
+
+        Args:
+            table (str): Table name
+
+        Returns:
+            str: The first schema (in schema name order) containing the table, or None
+        """
+        schemas = self.schemas_by_table.get(table)
+        return schemas[0] if schemas else None
+
+    def tables_in_schema(self, schema_name, base_tables_only=False):
+        """
+        List the tables in a schema.
+
+        Args:
+            schema_name (str): Schema name
+            base_tables_only (bool): Leave out views, as the backends' list_tables() does
+
+        Returns:
+            list: Names of every table in the schema
+        """
+        tables = self.base_tables_by_schema if base_tables_only else self.tables_by_schema
+        return list(tables.get(schema_name, ()))
+
+    def __len__(self):
+        return sum(len(schemas) for schemas in self.schemas_by_table.values())
@@ -0,0 +1,50 @@
+class DURC_TableSuffixIndex:
+    """
+    Reversed-name trie over the tables in a schema, used for pattern-based relationship detection.
+
+    A column named like prefix_{table_name}_id refers to table_name. Checking every table in
+    the schema for every *_id column is O(columns x tables); walking the column name backwards
+    through a trie of reversed table names finds the matching table in time proportional to
+    the length of the column name, regardless of how many tables the schema has.
+    """
+
+    # Marks a trie node where a complete (reversed) table name ends
+    _END = None
+
+    def __init__(self, table_names=()):
+        self._root = {}
+        for table_name in table_names:
+            self.add_table(table_name)
+
+    def add_table(self, table_name):
+        """Add a table name to the index."""
+        node = self._root
+        for char in reversed(table_name):
+            node = node.setdefault(char, {})
+        node[self._END] = table_name
+
+    def find_table(self, col_name):
+        """
+        Find the table referred to by a column following the prefix_{table_name}_id pattern.
+
+        Args:
+            col_name (str): Column name
+
+        Returns:
+            str: The longest table name that col_name ends with as _{table_name}_id,
+                or None if there is no such table
+        """
+        if not col_name.endswith('_id'):
+            return None
+
+        stem_end = len(col_name) - 3
+        node = self._root
+        match = None
+        for position in range(stem_end - 1, 0, -1):
+            node = node.get(col_name[position])
+            if node is None:
+                break
+            # A table name ends here; it only counts if an underscore precedes it
+            if self._END in node and col_name[position - 1] == '_':
+                match = node[self._END]
+        return match
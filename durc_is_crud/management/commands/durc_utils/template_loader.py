@@ -0,0 +1,380 @@
+import ast
+import builtins
+import hashlib
+import importlib.util
+import marshal
+import os
+import re
+import tempfile
+import types
+
+
+class DURC_Template:
+    """
+    A compiled template.
+
+    Usage:
+        template.render({'class_name': 'Provider', 'fields': fields})
+    """
+
+    def __init__(self, name, code):
+        """
+        Args:
+            name (str): Template name, used in error messages
+            code (code): Code object made by DURC_TemplateLoader.compile_source()
+        """
+        self.name = name
+        namespace = {'_builtins': builtins, '_missing': self._missing}
+        exec(code, namespace)
+        self._render = namespace['render']
+
+    def _missing(self, variable):
+        raise ValueError(f"Template {self.name} needs the variable '{variable}'")
+
+    def render(self, context):
+        """
+        Render the template.
+
+        Args:
+            context (dict): Variable name -> value
+
+        Returns:
+            str: The rendered text
+
+        Raises:
+            ValueError: If the template reads a variable that neither the context nor a loop sets
+        """
+        try:
+            return self._render(context)
+        except UnboundLocalError as e:
+            raise ValueError(f"Template {self.name} reads a variable before setting it: {e}") from e
+
+
+class DURC_TemplateLoader:
+    """
+    Loads the templates durc_compile renders its files from.
+
+    Templates are read from a custom template directory first, so that it only needs the
+    templates it changes, then from the built-in templates. A template is a text file
+    named <name>.tpl, rendered line by line:
+
+        {{ expression }}                 is replaced with str() of a Python expression
+        {% for a, b in expression %}     repeats the lines up to {% endfor %}
+        {% if expression %}              with {% elif expression %}, {% else %} and {% endif %}
+        {# comment #}                    is dropped
+
+    Tag and comment lines must be on a line of their own and produce no output.
+
+    Parsing a template into Python source and compiling that is far slower than running
+    it, so each template is compiled once per process and the compiled code is kept in a
+    cache directory, keyed by a hash of the template's name and content (and the Python
+    and compiler versions). An edited template has a new key, so it is compiled again on
+    the next run without flushing the cache, and the other templates are still loaded
+    from it.
+
+    Usage:
+        templates = DURC_TemplateLoader('my_templates', cache_dir=DURC_TemplateLoader.DEFAULT_CACHE_DIR)
+        source = templates.render('g_model.py', class_name='Provider', ...)
+    """
+
+    # Bump when the code generated from templates changes
+    COMPILER_VERSION = 2
+
+    TEMPLATE_SUFFIX = '.tpl'
+
+    BUILTIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))), 'templates', 'durc_compile')
+
+    DEFAULT_CACHE_DIR = os.path.join('durc_config', 'template_cache')
+
+    _TAG = re.compile(r'^\s*\{%\s*(\w+)(?:\s+(.*?))?\s*%\}\s*$')
+    _COMMENT = re.compile(r'^\s*\{#.*#\}\s*$')
+    _EXPRESSION = re.compile(r'\{\{(.*?)\}\}')
+
+    # Content key -> DURC_Template, shared by every loader in the process
+    _compiled = {}
+
+    def __init__(self, template_dir=None, cache_dir=None):
+        """
+        Args:
+            template_dir (str): Directory of custom templates, or None for the built-in ones only
+            cache_dir (str): Directory the compiled templates are kept in, or None to only
+                keep them in memory
+        """
+        self.template_dir = template_dir
+        self.cache_dir = cache_dir
+        # Template name -> (path, source, content key)
+        self._sources = {}
+        self._templates = {}
+
+    def __getstate__(self):
+        # Worker processes get the sources this loader read, so that they render the same
+        # templates even if a file changes meanwhile; they compile them (or load them from
+        # the cache) themselves
+        self.load_all()
+        return {'template_dir': self.template_dir, 'cache_dir': self.cache_dir, '_sources': self._sources}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._templates = {}
+
+    def template_names(self):
+        """
+        List the templates the code generator renders.
+
+        Returns:
+            list: Names of the built-in templates, sorted
+        """
+        suffix = self.TEMPLATE_SUFFIX
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.BUILTIN_DIR) if name.endswith(suffix))
+
+    def source_path(self, name):
+        """
+        Find the file of a template.
+
+        Args:
+            name (str): Template name, e.g. 'g_model.py'
+
+        Returns:
+            str: Path of the custom template if there is one, else of the built-in template
+
+        Raises:
+            FileNotFoundError: If there is no template of that name
+        """
+        for template_dir in (self.template_dir, self.BUILTIN_DIR):
+            if template_dir is None:
+                continue
+            path = os.path.join(template_dir, name + self.TEMPLATE_SUFFIX)
+            if os.path.isfile(path):
+                return path
+        raise FileNotFoundError(f"Template {name} does not exist")
+
+    def _source(self, name):
+        source = self._sources.get(name)
+        if source is None:
+            path = self.source_path(name)
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            key = hashlib.sha256(
+                f"{self.COMPILER_VERSION}\0{importlib.util.MAGIC_NUMBER.hex()}\0{name}\0{text}".encode('utf-8')
+            ).hexdigest()
+            source = self._sources[name] = (path, text, key)
+        return source
+
+    def load_all(self):
+        """Read every template, so that later edits to the files do not affect this loader."""
+        for name in self.template_names():
+            self._source(name)
+
+    def compile_all(self):
+        """
+        Compile every template now, so that syntax errors surface before any file is written.
+
+        Raises:
+            ValueError: If a template has a syntax error
+        """
+        for name in self.template_names():
+            self.get_template(name)
+
+    def fingerprint(self):
+        """
+        Hash the content of every template.
+
+        Returns:
+            str: Hex digest that changes whenever a template the code generator renders changes
+        """
+        self.load_all()
+        digest = hashlib.sha256()
+        for name in sorted(self._sources):
+            digest.update(f"{name}={self._sources[name][2]}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_template(self, name):
+        """
+        Get a compiled template, compiling it only if neither this process nor the cache has it.
+
+        Args:
+            name (str): Template name
+
+        Returns:
+            DURC_Template: The compiled template
+
+        Raises:
+            FileNotFoundError: If there is no template of that name
+            ValueError: If the template has a syntax error
+        """
+        template = self._templates.get(name)
+        if template is not None:
+            return template
+
+        path, text, key = self._source(name)
+        template = self._compiled.get(key)
+        if template is None:
+            code = self._load_cached(key)
+            if code is None:
+                code = self.compile_source(name, text)
+                self._store_cached(key, code)
+            template = self._compiled[key] = DURC_Template(name, code)
+        self._templates[name] = template
+        return template
+
+    def render(self, name, **context):
+        """
+        Render a template.
+
+        Args:
+            name (str): Template name
+            **context: Template variables
+
+        Returns:
+            str: The rendered text
+        """
+        return self.get_template(name).render(context)
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.durct")
+
+    def _load_cached(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._cache_path(key), 'rb') as f:
+                code = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return code if isinstance(code, types.CodeType) else None
+
+    def _store_cached(self, key, code):
+        # The cache only saves time, so failing to write it is not an error. The file is
+        # written under a temporary name and renamed, so concurrent compiles never read
+        # a partly written entry
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(marshal.dumps(code))
+            os.replace(temp_path, self._cache_path(key))
+        except OSError:
+            pass
+
+    @classmethod
+    def compile_source(cls, name, text):
+        """
+        Compile a template into a code object defining render(context).
+
+        Args:
+            name (str): Template name, used in error messages
+            text (str): Template text
+
+        Returns:
+            code: Code object to run with DURC_Template
+
+        Raises:
+            ValueError: If the template has a syntax error
+        """
+        body = []
+        blocks = []
+        loaded_names = set()
+        bound_names = set()
+        pending_text = []
+
+        def emit(statement):
+            body.append('    ' * (len(blocks) + 1) + statement)
+
+        def flush_text():
+            if pending_text:
+                emit(f"_append({''.join(pending_text)!r})")
+                pending_text.clear()
+
+        def parse(source, mode, line_number):
+            try:
+                tree = ast.parse(source, mode=mode)
+            except SyntaxError as e:
+                raise ValueError(f"Template {name}, line {line_number}: invalid expression {source!r}: {e.msg}")
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Name):
+                    (loaded_names if isinstance(node.ctx, ast.Load) else bound_names).add(node.id)
+                elif isinstance(node, ast.arg):
+                    bound_names.add(node.arg)
+
+        for line_number, line in enumerate(text.splitlines(keepends=True), 1):
+            if cls._COMMENT.match(line):
+                continue
+
+            tag = cls._TAG.match(line)
+            if tag is None:
+                if '{%' in line:
+                    raise ValueError(f"Template {name}, line {line_number}: tags must be on a line of their own")
+                for position, part in enumerate(cls._EXPRESSION.split(line)):
+                    if position % 2 == 0:
+                        if part:
+                            pending_text.append(part)
+                    else:
+                        expression = part.strip()
+                        parse(expression, 'eval', line_number)
+                        flush_text()
+                        emit(f"_append(str({expression}))")
+                continue
+
+            flush_text()
+            keyword, argument = tag.group(1), (tag.group(2) or '').strip()
+            if keyword == 'for':
+                parse(f"for {argument}:\n    pass", 'exec', line_number)
+                emit(f"for {argument}:")
+                blocks.append(('for', line_number))
+            elif keyword == 'if':
+                parse(argument, 'eval', line_number)
+                emit(f"if {argument}:")
+                blocks.append(('if', line_number))
+            elif keyword in ('elif', 'else'):
+                if not blocks or blocks[-1][0] != 'if':
+                    raise ValueError(f"Template {name}, line {line_number}: {keyword} outside of an if block")
+                # Close the previous branch; an empty branch gets a pass
+                emit('pass')
+                blocks.pop()
+                if keyword == 'elif':
+                    parse(argument, 'eval', line_number)
+                    emit(f"elif {argument}:")
+                    blocks.append(('if', line_number))
+                else:
+                    emit('else:')
+                    blocks.append(('else', line_number))
+            elif keyword in ('endfor', 'endif'):
+                expected = ('for',) if keyword == 'endfor' else ('if', 'else')
+                if not blocks or blocks[-1][0] not in expected:
+                    raise ValueError(f"Template {name}, line {line_number}: unexpected {keyword}")
+                emit('pass')
+                blocks.pop()
+            else:
+                raise ValueError(f"Template {name}, line {line_number}: unknown tag '{keyword}'")
+
+        if blocks:
+            kind, line_number = blocks[-1]
+            raise ValueError(f"Template {name}, line {line_number}: {kind} block is never closed")
+        flush_text()
+
+        # Template variables become locals of render(), which are faster to look up than
+        # a dictionary; builtins such as repr() are available unless the context overrides them.
+        # Names are tracked for the whole template, not per block, so a name that is also a
+        # loop variable is still loaded from the context when it has one; the loop rebinds it
+        prologue = []
+        for variable in sorted(loaded_names):
+            if hasattr(builtins, variable):
+                prologue.append(f"    {variable} = _context.get({variable!r}, _builtins.{variable})")
+            elif variable in bound_names:
+                prologue.append(f"    if {variable!r} in _context: {variable} = _context[{variable!r}]")
+            else:
+                prologue.append(
+                    f"    {variable} = _context[{variable!r}] if {variable!r} in _context else _missing({variable!r})"
+                )
+        source = '\n'.join([
+            "def render(_context):",
+            *prologue,
+            "    _out = []",
+            "    _append = _out.append",
+            *body,
+            "    return ''.join(_out)",
+        ]) + '\n'
+        return compile(source, f"<template {name}>", 'exec')
@@ -0,0 +1,237 @@
+import io
+import pickle
+import struct
+
+from .durc_model_writer import DurcModelWriter
+
+
+# Relational model files with this extension use the compact format instead of JSON
+COMPACT_MODEL_EXTENSION = '.durcpack'
+
+_MAGIC = b'DURCPACK'
+_FORMAT_VERSION = 1
+# magic, format version
+_HEADER = struct.Struct('<8sH')
+# index offset, index length, magic
+_TRAILER = struct.Struct('<QQ8s')
+# Fixed so that files stay readable across Python versions
+_PICKLE_PROTOCOL = 4
+
+
+def is_compact_model_path(path: str) -> bool:
+    """Check whether a relational model path uses the compact format."""
+    return path.lower().endswith(COMPACT_MODEL_EXTENSION)
+
+
+def get_model_writer_class(path: str):
+    """
+    Get the writer class for a relational model path, chosen by file extension.
+
+    Args:
+        path (str): Output path
+
+    Returns:
+        type: DurcCompactModelWriter for .durcpack files, DurcModelWriter (JSON) otherwise
+    """
+    return DurcCompactModelWriter if is_compact_model_path(path) else DurcModelWriter
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler that only builds plain containers and scalars, never arbitrary objects."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from a DURC model file")
+
+
+def _loads(data):
+    return _RestrictedUnpickler(io.BytesIO(data)).load()
+
+
+class DurcCompactModelWriter(DurcModelWriter):
+    """
+    Streaming, atomic writer for the compact relational model format.
+
+    The file is a header, a series of chunk records, an index record and a fixed-size trailer:
+
+        header:  b'DURCPACK', format version (uint16)
+        chunks:  pickled lists of up to TABLES_PER_CHUNK table entries (plain dicts, lists,
+                 strings, numbers, booleans and None only)
+        index:   pickled {'databases': [db, ...],
+                          'chunks': [(offset, length), ...],
+                          'tables': [(db, schema or None, table, chunk, position), ...]}
+        trailer: index offset (uint64), index length (uint64), b'DURCPACK'
+
+    Strings are interned within a chunk, so repeated names such as dictionary keys, data
+    types and foreign tables are stored once per chunk and shared after loading. Chunks
+    keep the writer's memory bounded while streaming, and let a reader decode the chunk
+    holding one table without reading the rest of the file.
+    """
+
+    TABLES_PER_CHUNK = 256
+
+    def __init__(self, output_path: str):
+        super().__init__(output_path)
+        self._strings = {}
+        self._chunk = []
+        self._databases = []
+        self._chunks = []
+        self._tables = []
+        self._offset = 0
+
+    @staticmethod
+    def write_relational_model(output_path: str, relational_model: dict):
+        """
+        Write a complete relational model dictionary atomically in the compact format.
+
+        Args:
+            output_path (str): Path of the file to write
+            relational_model (dict): The relational model
+        """
+        with DurcCompactModelWriter(output_path) as writer:
+            for db_name, db_model in relational_model.items():
+                writer.add_database(db_name)
+                for key, value in db_model.items():
+                    if DurcCompactModelWriter._is_table_entry(value):
+                        writer.add_table(db_name, None, key, value)
+                    else:
+                        # PostgreSQL schema layer: db -> schema -> table
+                        for table, table_info in value.items():
+                            writer.add_table(db_name, key, table, table_info)
+
+    @staticmethod
+    def _is_table_entry(value):
+        return isinstance(value, dict) and isinstance(value.get('table_name'), str)
+
+    def _open_file(self, temp_path):
+        self._file = open(temp_path, 'wb')
+        self._file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION))
+        self._offset = _HEADER.size
+
+    def _write_database_start(self, db_name):
+        self._databases.append(db_name)
+
+    def _write_database_end(self):
+        pass
+
+    def _write_schema_start(self, schema_name):
+        pass
+
+    def _write_schema_end(self):
+        pass
+
+    def _write_table_entry(self, table, table_info):
+        self._tables.append((self._db_name, self._schema_name, table, len(self._chunks), len(self._chunk)))
+        self._chunk.append(self._intern(table_info))
+        if len(self._chunk) >= self.TABLES_PER_CHUNK:
+            self._flush_chunk()
+
+    def _write_document_end(self):
+        self._flush_chunk()
+        index = pickle.dumps(
+            {'databases': self._databases, 'chunks': self._chunks, 'tables': self._tables},
+            protocol=_PICKLE_PROTOCOL
+        )
+        self._file.write(index)
+        self._file.write(_TRAILER.pack(self._offset, len(index), _MAGIC))
+
+    def _flush_chunk(self):
+        if not self._chunk:
+            return
+        payload = pickle.dumps(self._chunk, protocol=_PICKLE_PROTOCOL)
+        self._file.write(payload)
+        self._chunks.append((self._offset, len(payload)))
+        self._offset += len(payload)
+        self._chunk = []
+        self._strings = {}
+
+    def _intern(self, value):
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        if isinstance(value, dict):
+            return {self._intern(key): self._intern(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._intern(item) for item in value]
+        return value
+
+
+class DurcCompactModelReader:
+    """
+    Reader for relational model files in the compact format.
+
+    The reader works on any buffer (bytes or a memory map). Only the index is decoded up
+    front; chunks are decoded when a table in them is asked for, and the most recently
+    decoded chunk is kept.
+
+    Attributes:
+        databases (list): Database names in file order
+        tables (list): (db, schema or None, table, chunk, position) for every table, in file order
+    """
+
+    def __init__(self, buffer, path='<buffer>'):
+        self._buffer = buffer
+        self.path = path
+        self._cached_chunk = (None, None)
+
+        if len(buffer) < _HEADER.size + _TRAILER.size:
+            raise ValueError(f"{path} is not a DURC compact model file")
+        magic, version = _HEADER.unpack_from(buffer, 0)
+        index_offset, index_length, trailer_magic = _TRAILER.unpack_from(buffer, len(buffer) - _TRAILER.size)
+        if magic != _MAGIC or trailer_magic != _MAGIC:
+            raise ValueError(f"{path} is not a DURC compact model file")
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"{path} uses compact model format version {version}, expected {_FORMAT_VERSION}")
+
+        index = _loads(buffer[index_offset:index_offset + index_length])
+        self.databases = index['databases']
+        self.tables = index['tables']
+        self._chunks = index['chunks']
+
+    @classmethod
+    def read_file(cls, path: str):
+        """
+        Read a compact model file into memory.
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            DurcCompactModelReader: Reader over the file contents
+        """
+        with open(path, 'rb') as f:
+            return cls(f.read(), path)
+
+    def read_table(self, chunk: int, position: int) -> dict:
+        """
+        Decode one table entry.
+
+        Args:
+            chunk (int): Chunk number of the table, from the index
+            position (int): Position of the table in its chunk, from the index
+
+        Returns:
+            dict: The table entry
+        """
+        return self._read_chunk(chunk)[position]
+
+    def load_relational_model(self) -> dict:
+        """
+        Decode every table into the nested relational model dictionary.
+
+        Returns:
+            dict: The relational model, with the same structure and key order as the JSON form
+        """
+        relational_model = {db_name: {} for db_name in self.databases}
+        for db_name, schema_name, table, chunk, position in self.tables:
+            db_model = relational_model.setdefault(db_name, {})
+            if schema_name is not None:
+                db_model = db_model.setdefault(schema_name, {})
+            db_model[table] = self.read_table(chunk, position)
+        return relational_model
+
+    def _read_chunk(self, chunk):
+        cached_number, cached_tables = self._cached_chunk
+        if cached_number != chunk:
+            offset, length = self._chunks[chunk]
+            cached_tables = _loads(self._buffer[offset:offset + length])
+            self._cached_chunk = (chunk, cached_tables)
+        return cached_tables
@@ -1,6 +1,10 @@
 import json
 import os
 
+from .durc_compact_model import DurcCompactModelReader, is_compact_model_path
+from .durc_lazy_model import DurcLazyRelationalModel
+from .durc_relational_model import DurcRelationalModel
+
 
 class DurcDataLoader:
     """
@@ -10,17 +14,20 @@ class DurcDataLoader:
     by both Django management commands (like durc_compile) and standalone CLI tools
     (like durc-mine-fkeys).
     
-    For now, this should simply return a dictionary in the same structure as loading
-    the JSON directly would. In the future, it may have extra functionality that is
-    useful to both Django and non-Django scripts.
+    load_relational_model() returns a dictionary in the same structure as loading
+    the JSON directly would. open_relational_model() gives lazy, per-table access to
+    the file, and load_model() builds typed DurcTable objects with lookup indexes.
+    
+    Files ending in .durcpack are read from the compact binary format written by
+    durc_mine; every other file is read as JSON.
     """
     
     def load_relational_model(self, json_file_path: str) -> dict:
         """
-        Load and return the DURC relational model from JSON file.
+        Load and return the DURC relational model from a JSON or compact (.durcpack) file.
         
         Args:
-            json_file_path (str): Path to the JSON file containing the relational model
+            json_file_path (str): Path to the file containing the relational model
             
         Returns:
             dict: The loaded relational model data
@@ -34,6 +41,9 @@ class DurcDataLoader:
             raise FileNotFoundError(f"Input file {json_file_path} does not exist")
         
         try:
+            if is_compact_model_path(json_file_path):
+                return DurcCompactModelReader.read_file(json_file_path).load_relational_model()
+            
             with open(json_file_path, 'r', encoding='utf-8') as f:
                 relational_model = json.load(f)
             return relational_model
@@ -41,3 +51,61 @@ class DurcDataLoader:
             raise json.JSONDecodeError(f"Failed to parse {json_file_path} as JSON: {e}", e.doc, e.pos)
         except Exception as e:
             raise Exception(f"Error reading {json_file_path}: {e}")
+    
+    def open_relational_model(self, json_file_path: str) -> DurcLazyRelationalModel:
+        """
+        Open the DURC relational model for lazy, per-table access.
+        
+        The file is memory-mapped and indexed once; table entries are only decoded when
+        they are asked for with get_table() or iter_tables(). Close the returned model
+        (or use it as a context manager) when done.
+        
+        Args:
+            json_file_path (str): Path to the JSON or .durcpack file containing the relational model
+            
+        Returns:
+            DurcLazyRelationalModel: Lazy view of the relational model
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            Exception: For other file reading errors
+        """
+        if not os.path.exists(json_file_path):
+            raise FileNotFoundError(f"Input file {json_file_path} does not exist")
+        
+        try:
+            return DurcLazyRelationalModel(json_file_path)
+        except Exception as e:
+            raise Exception(f"Error reading {json_file_path}: {e}")
+    
+    def load_model(self, json_file_path: str, databases=None) -> DurcRelationalModel:
+        """
+        Load the DURC relational model as typed, indexed objects.
+        
+        The table entries are decoded one at a time from the lazily opened file and
+        turned into DurcTable objects, so the nested dictionaries are never held in
+        memory all at once.
+        
+        Args:
+            json_file_path (str): Path to the JSON or .durcpack file containing the relational model
+            databases (iterable): Only load these databases (default: all)
+            
+        Returns:
+            DurcRelationalModel: The relational model
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            Exception: For other file reading errors
+        """
+        with self.open_relational_model(json_file_path) as lazy_model:
+            db_names = [
+                db_name for db_name in lazy_model.databases
+                if databases is None or db_name in databases
+            ]
+            try:
+                return DurcRelationalModel.from_tables(
+                    db_names,
+                    (entry for db_name in db_names for entry in lazy_model.iter_tables(db_name))
+                )
+            except Exception as e:
+                raise Exception(f"Error reading {json_file_path}: {e}")
@@ -0,0 +1,243 @@
+import bisect
+import json
+import mmap
+import re
+
+from .durc_compact_model import DurcCompactModelReader, is_compact_model_path
+
+
+# In json.dump(..., indent=2) output every key at depth N starts a line indented by 2N
+# spaces, and a container opened on such a line closes on a line with the same indent.
+# JSON strings cannot contain raw newlines or unescaped quotes, so these are structural.
+_DATABASE_KEY = re.compile(rb'\n  "((?:[^"\\\n]|\\.)*)": ')
+_SECOND_LEVEL_KEY = re.compile(rb'\n    "((?:[^"\\\n]|\\.)*)": ')
+_TABLE_KEY_LINE = re.compile(rb'( {4}| {6})"((?:[^"\\\n]|\\.)*)": \{')
+# A table entry's "table_name" holds a string; a schema's table named table_name holds an object
+_TABLE_NAME_KEY = b'"table_name": "'
+# Key lines at depth 2 and 3 that open an object: tables, schemas, and objects inside tables
+_OBJECT_KEY_LINE = re.compile(rb'\n( {4}| {6})"(?:[^"\\\n]|\\.)*": \{(\}?)')
+
+
+class DurcLazyRelationalModel:
+    """
+    Read-only, lazily decoded view of a relational model file.
+
+    The file is memory-mapped and an index of where each table entry starts and ends is
+    built once when the model is opened. get_table() and iter_tables() then decode only
+    the entries that are asked for, so a caller interested in one schema does not pay for
+    the whole model.
+
+    Compact (.durcpack) files carry their own index. JSON files written by durc_mine
+    (json.dump with indent=2) are indexed with one pass over the indented key lines. Any
+    other JSON layout is loaded in full, so lookups still work but nothing is saved.
+
+    Usage:
+        with DurcDataLoader().open_relational_model(path) as model:
+            users = model.get_table('npd', 'public', 'users')
+
+    Attributes:
+        databases (list): Database names in file order
+        table_keys (list): (db, schema or None, table) for every table, in file order.
+            schema is None for databases without a schema layer
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        self._mmap = None
+        self._compact_reader = None
+        self._loaded_model = None
+        self._locations = {}
+        self.databases = []
+        self.table_keys = []
+
+        try:
+            if self._file_size() == 0:
+                raise ValueError(f"{file_path} is empty")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if is_compact_model_path(file_path):
+                self._index_compact()
+            elif not self._index_indented_json():
+                self._index_loaded_json()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.table_keys)
+
+    def __contains__(self, table_key):
+        return tuple(table_key) in self._locations
+
+    def close(self):
+        """Release the memory map and the file."""
+        self._compact_reader = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if not self._file.closed:
+            self._file.close()
+
+    def get_table(self, db_name: str, schema_name, table: str):
+        """
+        Decode one table entry.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer.
+                For databases without a schema layer the schema name is ignored
+            table (str): Table name
+
+        Returns:
+            dict: The table entry, or None if the model has no such table
+        """
+        location = self._locations.get((db_name, schema_name, table))
+        if location is None and schema_name is not None:
+            location = self._locations.get((db_name, None, table))
+        if location is None:
+            return None
+        return self._decode(location)
+
+    def iter_tables(self, db_name: str = None, schema_name: str = None):
+        """
+        Iterate over table entries in file order, decoding only the ones that match.
+
+        Args:
+            db_name (str): Only yield tables in this database
+            schema_name (str): Only yield tables in this schema. Tables of databases
+                without a schema layer are only yielded when no schema is given
+
+        Yields:
+            tuple: (db_name, schema_name or None, table, table_info)
+        """
+        for key in self.table_keys:
+            key_db, key_schema, key_table = key
+            if db_name is not None and key_db != db_name:
+                continue
+            if schema_name is not None and key_schema != schema_name:
+                continue
+            yield key_db, key_schema, key_table, self._decode(self._locations[key])
+
+    def _file_size(self):
+        self._file.seek(0, 2)
+        return self._file.tell()
+
+    def _add_table(self, db_name, schema_name, table, location):
+        key = (db_name, schema_name, table)
+        if key not in self._locations:
+            self.table_keys.append(key)
+        self._locations[key] = location
+
+    def _decode(self, location):
+        if self._compact_reader is not None:
+            return self._compact_reader.read_table(*location)
+        if self._loaded_model is not None:
+            return location
+        start, end = location
+        return json.loads(self._mmap[start:end])
+
+    def _index_compact(self):
+        self._compact_reader = DurcCompactModelReader(self._mmap, self.file_path)
+        self.databases = list(self._compact_reader.databases)
+        for db_name, schema_name, table, chunk, position in self._compact_reader.tables:
+            self._add_table(db_name, schema_name, table, (chunk, position))
+
+    def _index_indented_json(self):
+        """
+        Index a JSON file in the json.dump(..., indent=2) layout.
+
+        Every table entry written by durc_mine starts with its "table_name" key and a
+        string value, so the tables are found with a plain substring search and the ends of their entries with
+        a search for the closing line. Only database and schema key lines are matched with
+        regular expressions. Tables whose first key is not "table_name", e.g. in files
+        written with sort_keys=True or edited by hand, are not found that way, so every
+        object key line at table depth is checked against the index afterwards.
+
+        Returns:
+            bool: False if the file is not in that layout
+        """
+        data = self._mmap
+        if not (data[:5] == b'{\n  "' or data[:2] == b'{}'):
+            return False
+
+        database_keys = [(match.start(), self._decode_key(match.group(1))) for match in _DATABASE_KEY.finditer(data)]
+        # In databases without a schema layer these are table keys, so they are decoded only when used
+        second_level_keys = [(match.start(), match.group(1)) for match in _SECOND_LEVEL_KEY.finditer(data)]
+        database_positions = [position for position, _ in database_keys]
+        second_level_positions = [position for position, _ in second_level_keys]
+        self.databases = [name for _, name in database_keys]
+
+        position = data.find(_TABLE_NAME_KEY)
+        while position != -1:
+            line_start = data.rfind(b'\n', 0, position) + 1
+            key_line_start = data.rfind(b'\n', 0, line_start - 1) + 1
+            key_line = _TABLE_KEY_LINE.fullmatch(data, key_line_start, line_start - 1)
+
+            # Only a "table_name" key directly inside a "name": { line at depth 2 or 3 marks a table
+            if key_line is None or position - line_start != len(key_line.group(1)) + 2:
+                position = data.find(_TABLE_NAME_KEY, position + 1)
+                continue
+
+            indent = key_line.group(1)
+            closing = data.find(b'\n' + indent + b'}', position)
+            if closing == -1:
+                raise ValueError(f"{self.file_path} ends inside table entry")
+            start = key_line.end() - 1
+            end = closing + len(indent) + 2
+
+            db_name = database_keys[bisect.bisect_right(database_positions, key_line_start) - 1][1]
+            schema_name = None
+            if len(indent) == 6:
+                # PostgreSQL schema layer: db -> schema -> table
+                raw_schema = second_level_keys[bisect.bisect_right(second_level_positions, key_line_start) - 1][1]
+                schema_name = self._decode_key(raw_schema)
+            self._add_table(db_name, schema_name, self._decode_key(key_line.group(2)), (start, end))
+
+            position = data.find(_TABLE_NAME_KEY, end)
+
+        if self._has_unindexed_objects(data):
+            self.databases = []
+            self.table_keys = []
+            self._locations = {}
+            return False
+        return True
+
+    def _has_unindexed_objects(self, data):
+        # Outside the indexed table entries, an object key line at depth 2 or 3 can only
+        # be a schema that holds indexed tables or is empty; anything else is a table the
+        # index missed. Only the gaps between entries are searched, which are small
+        spans = sorted(self._locations.values())
+        gap_start = 0
+        for gap_end, next_gap_start in spans + [(len(data), len(data))]:
+            for match in _OBJECT_KEY_LINE.finditer(data, gap_start, gap_end):
+                indent, is_empty = match.group(1), bool(match.group(2))
+                if len(indent) == 6:
+                    return True
+                if not is_empty and data.find(b'\n' + indent + b'}', match.end(), gap_end) != -1:
+                    return True
+            gap_start = next_gap_start
+        return False
+
+    @staticmethod
+    def _decode_key(raw_key):
+        if b'\\' not in raw_key:
+            return raw_key.decode('utf-8')
+        return json.loads(b'"' + raw_key + b'"')
+
+    def _index_loaded_json(self):
+        self._loaded_model = json.loads(self._mmap[:])
+        for db_name, db_model in self._loaded_model.items():
+            self.databases.append(db_name)
+            for key, value in db_model.items():
+                if isinstance(value, dict) and isinstance(value.get('table_name'), str):
+                    self._add_table(db_name, None, key, value)
+                elif isinstance(value, dict):
+                    for table, table_info in value.items():
+                        self._add_table(db_name, key, table, table_info)
@@ -0,0 +1,252 @@
+import json
+import os
+import tempfile
+
+
+class DurcModelWriter:
+    """
+    Streaming, atomic writer for DURC relational model JSON files.
+
+    Tables are written to disk as soon as they are added, so memory use does not grow
+    with the size of the model. The output is the same text json.dump(model, f, indent=2)
+    would produce for the equivalent dictionary, as long as each database (and each schema
+    within it) is written contiguously.
+
+    Everything is written to a temporary file in the output directory, which replaces the
+    output file only when the writer is closed successfully. A crash or an error while
+    mining never leaves a half-written model behind.
+
+    Usage:
+        with DurcModelWriter(output_path) as writer:
+            writer.add_table('mydb', 'public', 'users', table_info)
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._file = None
+        self._temp_path = None
+        self._failed = False
+        self._has_databases = False
+        self._db_name = None
+        self._db_has_entries = False
+        self._schema_name = None
+        self._schema_has_entries = False
+        self._written_databases = set()
+        self._written_schemas = set()
+        self._written_tables = set()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    @staticmethod
+    def write_relational_model(output_path: str, relational_model: dict):
+        """
+        Write a complete relational model dictionary atomically.
+
+        Args:
+            output_path (str): Path of the JSON file to write
+            relational_model (dict): The relational model
+        """
+        temp_path = DurcModelWriter._create_temp_file(output_path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(relational_model, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, output_path)
+        except BaseException:
+            DurcModelWriter._remove_file(temp_path)
+            raise
+
+    def open(self):
+        """Start writing to a temporary file next to the output file."""
+        self._temp_path = self._create_temp_file(self.output_path)
+        self._open_file(self._temp_path)
+
+    def add_database(self, db_name: str):
+        """
+        Start a database, or continue the current one.
+
+        Args:
+            db_name (str): Database name
+
+        Raises:
+            ValueError: If the database was already finished earlier in the file
+        """
+        if db_name == self._db_name:
+            return
+        if db_name in self._written_databases:
+            self._failed = True
+            raise ValueError(f"Database '{db_name}' must be written contiguously")
+
+        self._guarded(self._start_database, db_name)
+
+    def add_table(self, db_name: str, schema_name, table: str, table_info: dict):
+        """
+        Write one table entry.
+
+        A table that was already written for the same database and schema is skipped.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name for models with a schema layer, or None
+            table (str): Table name
+            table_info (dict): Table entry
+
+        Raises:
+            ValueError: If the database or schema was already finished earlier in the file
+        """
+        self.add_database(db_name)
+
+        if schema_name != self._schema_name:
+            if schema_name is not None and (db_name, schema_name) in self._written_schemas:
+                self._failed = True
+                raise ValueError(f"Schema '{db_name}.{schema_name}' must be written contiguously")
+            self._guarded(self._start_schema, schema_name)
+
+        table_key = (db_name, schema_name, table)
+        if table_key in self._written_tables:
+            return
+        self._written_tables.add(table_key)
+
+        self._guarded(self._write_table, table, table_info)
+
+    def close(self):
+        """
+        Finish the document and move it over the output file.
+
+        Raises:
+            RuntimeError: If an earlier write failed; the output file is left untouched
+        """
+        if self._failed:
+            self.abort()
+            raise RuntimeError(f"Not writing {self.output_path}: an earlier write failed")
+
+        try:
+            self._finish_database()
+            self._write_document_end()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._temp_path, self.output_path)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """Discard everything written so far, leaving the output file untouched."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        if self._temp_path:
+            self._remove_file(self._temp_path)
+
+    def _guarded(self, write, *args):
+        # Once a write fails the document is corrupt, so it must never be committed
+        try:
+            write(*args)
+        except BaseException:
+            self._failed = True
+            raise
+
+    def _start_database(self, db_name):
+        self._finish_database()
+        self._write_database_start(db_name)
+        self._has_databases = True
+        self._db_name = db_name
+        self._db_has_entries = False
+
+    def _finish_database(self):
+        if self._db_name is None:
+            return
+        self._finish_schema()
+        self._write_database_end()
+        self._written_databases.add(self._db_name)
+        self._db_name = None
+
+    def _start_schema(self, schema_name):
+        self._finish_schema()
+        if schema_name is None:
+            return
+        self._write_schema_start(schema_name)
+        self._db_has_entries = True
+        self._schema_name = schema_name
+        self._schema_has_entries = False
+
+    def _finish_schema(self):
+        if self._schema_name is None:
+            return
+        self._write_schema_end()
+        self._written_schemas.add((self._db_name, self._schema_name))
+        self._schema_name = None
+
+    def _write_table(self, table, table_info):
+        self._write_table_entry(table, table_info)
+        if self._schema_name is not None:
+            self._schema_has_entries = True
+        else:
+            self._db_has_entries = True
+
+    # JSON output. Subclasses for other formats override the methods below.
+
+    def _open_file(self, temp_path):
+        self._file = open(temp_path, 'w', encoding='utf-8')
+        self._file.write('{')
+
+    def _write_database_start(self, db_name):
+        if self._has_databases:
+            self._file.write(',')
+        self._file.write(f"\n  {json.dumps(db_name)}: {{")
+
+    def _write_database_end(self):
+        self._file.write('\n  }' if self._db_has_entries else '}')
+
+    def _write_schema_start(self, schema_name):
+        if self._db_has_entries:
+            self._file.write(',')
+        self._file.write(f"\n    {json.dumps(schema_name)}: {{")
+
+    def _write_schema_end(self):
+        self._file.write('\n    }' if self._schema_has_entries else '}')
+
+    def _write_table_entry(self, table, table_info):
+        if self._schema_name is not None:
+            indent = '\n      '
+            separator = ',' if self._schema_has_entries else ''
+        else:
+            indent = '\n    '
+            separator = ',' if self._db_has_entries else ''
+
+        # JSON strings never contain raw newlines, so re-indenting line by line is safe
+        table_json = json.dumps(table_info, indent=2).replace('\n', indent)
+        self._file.write(f"{separator}{indent}{json.dumps(table)}: {table_json}")
+
+    def _write_document_end(self):
+        self._file.write('\n}' if self._has_databases else '}')
+
+    @staticmethod
+    def _create_temp_file(output_path):
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(output_path)}.", suffix='.tmp', dir=output_dir
+        )
+        os.close(fd)
+        # mkstemp creates the file as 0600; give it the permissions a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        return temp_path
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
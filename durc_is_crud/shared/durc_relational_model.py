@@ -0,0 +1,390 @@
+import sys
+
+
+def _intern(value):
+    # Column names, data types and table names repeat across tables; share one copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class DurcColumn:
+    """
+    One column of a table.
+
+    Attributes:
+        table (DurcTable): Table the column belongs to
+        name (str): Column name
+        data_type (str): Simplified data type
+        is_primary_key (bool): Whether the column is part of the primary key
+        is_foreign_key (bool): Whether the column has a foreign key constraint
+        is_linked_key (bool): Whether the column follows the *_id naming convention
+        foreign_db (str): Database of the referenced table, or None
+        foreign_table (str): Referenced table, or None
+        is_nullable (bool): Whether the column accepts NULL
+        default_value: Column default, or None
+        is_auto_increment (bool): Whether the column is filled by a sequence
+    """
+
+    __slots__ = (
+        'table', 'name', 'data_type', 'is_primary_key', 'is_foreign_key', 'is_linked_key',
+        'foreign_db', 'foreign_table', 'is_nullable', 'default_value', 'is_auto_increment',
+    )
+
+    def __init__(self, table, column_info: dict):
+        self.table = table
+        self.name = _intern(column_info.get('column_name'))
+        self.data_type = _intern(column_info.get('data_type'))
+        self.is_primary_key = column_info.get('is_primary_key', False)
+        self.is_foreign_key = column_info.get('is_foreign_key', False)
+        self.is_linked_key = column_info.get('is_linked_key', False)
+        self.foreign_db = _intern(column_info.get('foreign_db'))
+        self.foreign_table = _intern(column_info.get('foreign_table'))
+        self.is_nullable = column_info.get('is_nullable', False)
+        self.default_value = column_info.get('default_value')
+        self.is_auto_increment = column_info.get('is_auto_increment', False)
+
+    def __repr__(self):
+        return f"<DurcColumn {self.table.qualified_name}.{self.name}>"
+
+
+class DurcRelationship:
+    """
+    A belongs_to or has_many relationship of a table.
+
+    belongs_to relationships fill the to_* attributes, has_many relationships the from_*
+    attributes; the others are None.
+
+    Attributes:
+        table (DurcTable): Table the relationship is declared on
+        kind (str): 'belongs_to' or 'has_many'
+        name (str): Relationship name (the key in the JSON model)
+        prefix (str): Prefix of the *_id column when it differs from the table name, or None
+        type (str): Name of the related table
+        local_key (str): belongs_to: column in this table holding the key
+        to_db (str): belongs_to: database of the referenced table
+        to_schema (str): belongs_to: schema of the referenced table, if it is in another schema
+        to_table (str): belongs_to: referenced table
+        from_db (str): has_many: database of the referencing table
+        from_schema (str): has_many: schema of the referencing table, if it is in another schema
+        from_table (str): has_many: referencing table
+        from_column (str): has_many: column in the referencing table holding the key
+        is_inferred (bool): Whether the relationship was inferred from naming conventions
+        target (DurcTable): The related table when it is in the model, otherwise None
+    """
+
+    __slots__ = (
+        'table', 'kind', 'name', 'prefix', 'type',
+        'local_key', 'to_db', 'to_schema', 'to_table',
+        'from_db', 'from_schema', 'from_table', 'from_column',
+        'is_inferred', 'target',
+    )
+
+    def __init__(self, table, kind: str, name: str, relationship_info: dict):
+        self.table = table
+        self.kind = kind
+        self.name = _intern(name)
+        self.prefix = _intern(relationship_info.get('prefix'))
+        self.type = _intern(relationship_info.get('type'))
+        self.local_key = _intern(relationship_info.get('local_key'))
+        self.to_db = _intern(relationship_info.get('to_db'))
+        self.to_schema = _intern(relationship_info.get('to_schema'))
+        self.to_table = _intern(relationship_info.get('to_table'))
+        self.from_db = _intern(relationship_info.get('from_db'))
+        self.from_schema = _intern(relationship_info.get('from_schema'))
+        self.from_table = _intern(relationship_info.get('from_table'))
+        self.from_column = _intern(relationship_info.get('from_column'))
+        self.is_inferred = relationship_info.get('is_inferred', False)
+        self.target = None
+
+    def __repr__(self):
+        return f"<DurcRelationship {self.kind} {self.table.qualified_name}.{self.name}>"
+
+
+class DurcTable:
+    """
+    One table of the relational model.
+
+    Attributes:
+        database (DurcDatabase): Database the table belongs to
+        schema (DurcSchema): Schema the table belongs to, or None for databases without a schema layer
+        name (str): Table name
+        create_table_sql (str): Simplified CREATE TABLE statement
+        columns (list): DurcColumn objects in table order
+        columns_by_name (dict): Column name -> DurcColumn
+        belongs_to (dict): Relationship name -> DurcRelationship for this table's foreign keys
+        has_many (dict): Relationship name -> DurcRelationship for tables referencing this one
+        inbound_foreign_keys (list): belongs_to relationships of other tables (or this one)
+            whose target is this table
+    """
+
+    __slots__ = (
+        'database', 'schema', 'name', 'create_table_sql', 'columns', 'columns_by_name',
+        'belongs_to', 'has_many', 'inbound_foreign_keys',
+    )
+
+    def __init__(self, database, schema, name: str, table_info: dict):
+        self.database = database
+        self.schema = schema
+        self.name = _intern(name)
+        self.create_table_sql = table_info.get('create_table_sql')
+        self.columns = [DurcColumn(self, column_info) for column_info in table_info.get('column_data', [])]
+        self.columns_by_name = {column.name: column for column in self.columns}
+        self.belongs_to = {
+            name: DurcRelationship(self, 'belongs_to', name, info)
+            for name, info in table_info.get('belongs_to', {}).items()
+        }
+        self.has_many = {
+            name: DurcRelationship(self, 'has_many', name, info)
+            for name, info in table_info.get('has_many', {}).items()
+        }
+        self.inbound_foreign_keys = []
+
+    @property
+    def schema_name(self):
+        """str: Schema name, or None for databases without a schema layer."""
+        return self.schema.name if self.schema is not None else None
+
+    @property
+    def qualified_name(self):
+        """str: db.schema.table, or db.table for databases without a schema layer."""
+        return DurcRelationalModel.qualified_name(self.database.name, self.schema_name, self.name)
+
+    def __repr__(self):
+        return f"<DurcTable {self.qualified_name}>"
+
+
+class DurcSchema:
+    """
+    One schema of a database with a schema layer (PostgreSQL).
+
+    Attributes:
+        database (DurcDatabase): Database the schema belongs to
+        name (str): Schema name
+        tables (dict): Table name -> DurcTable
+    """
+
+    __slots__ = ('database', 'name', 'tables')
+
+    def __init__(self, database, name: str):
+        self.database = database
+        self.name = _intern(name)
+        self.tables = {}
+
+    def __repr__(self):
+        return f"<DurcSchema {self.database.name}.{self.name}>"
+
+
+class DurcDatabase:
+    """
+    One database of the relational model.
+
+    A database either has a schema layer (PostgreSQL: db -> schema -> table) or holds its
+    tables directly (db -> table).
+
+    Attributes:
+        name (str): Database name
+        schemas (dict): Schema name -> DurcSchema, empty for databases without a schema layer
+        tables (dict): Table name -> DurcTable for databases without a schema layer
+    """
+
+    __slots__ = ('name', 'schemas', 'tables')
+
+    def __init__(self, name: str):
+        self.name = _intern(name)
+        self.schemas = {}
+        self.tables = {}
+
+    def iter_tables(self):
+        """Yield every table of the database, in model order."""
+        yield from self.tables.values()
+        for schema in self.schemas.values():
+            yield from schema.tables.values()
+
+    def __repr__(self):
+        return f"<DurcDatabase {self.name}>"
+
+
+class DurcRelationalModel:
+    """
+    Typed, indexed view of a relational model.
+
+    Built once from the table entries of a model file; every lookup after that is a
+    dictionary access instead of a walk over nested dictionaries, and nobody has to guess
+    whether a level of the JSON is a schema or a table.
+
+    Usage:
+        model = DurcDataLoader().load_model(path)
+        users = model.get_table('npd', 'public', 'users')
+        for relationship in users.inbound_foreign_keys:
+            ...
+
+    Attributes:
+        databases (dict): Database name -> DurcDatabase, in model order
+        tables_by_name (dict): Fully qualified name (see qualified_name()) -> DurcTable
+    """
+
+    __slots__ = ('databases', 'tables_by_name')
+
+    def __init__(self):
+        self.databases = {}
+        self.tables_by_name = {}
+
+    @staticmethod
+    def qualified_name(db_name: str, schema_name, table: str) -> str:
+        """
+        Get the fully qualified name of a table.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+            table (str): Table name
+
+        Returns:
+            str: db.schema.table, or db.table when there is no schema
+        """
+        if schema_name is None:
+            return f"{db_name}.{table}"
+        return f"{db_name}.{schema_name}.{table}"
+
+    @classmethod
+    def from_tables(cls, databases, tables):
+        """
+        Build the model from table entries.
+
+        Args:
+            databases (iterable): Database names, so that databases without tables are kept
+            tables (iterable): (db, schema or None, table, table_info) tuples, as yielded by
+                DurcLazyRelationalModel.iter_tables()
+
+        Returns:
+            DurcRelationalModel: The model, with its indexes built
+        """
+        model = cls()
+        for db_name in databases:
+            model._get_database(db_name)
+        for db_name, schema_name, table_name, table_info in tables:
+            model.add_table(db_name, schema_name, table_name, table_info)
+        model.link_relationships()
+        return model
+
+    @classmethod
+    def from_dict(cls, relational_model: dict):
+        """
+        Build the model from a nested relational model dictionary.
+
+        Args:
+            relational_model (dict): db -> table, or db -> schema -> table
+
+        Returns:
+            DurcRelationalModel: The model, with its indexes built
+        """
+        def iter_tables():
+            for db_name, db_model in relational_model.items():
+                for key, value in db_model.items():
+                    if isinstance(value, dict) and isinstance(value.get('table_name'), str):
+                        yield db_name, None, key, value
+                    elif isinstance(value, dict):
+                        # PostgreSQL schema layer: db -> schema -> table
+                        for table, table_info in value.items():
+                            yield db_name, key, table, table_info
+
+        return cls.from_tables(relational_model.keys(), iter_tables())
+
+    def add_table(self, db_name: str, schema_name, table_name: str, table_info: dict):
+        """
+        Add one table entry. Call link_relationships() once every table has been added.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None for databases without a schema layer
+            table_name (str): Table name
+            table_info (dict): Table entry
+
+        Returns:
+            DurcTable: The new table
+        """
+        database = self._get_database(db_name)
+        if schema_name is None:
+            schema = None
+            container = database.tables
+        else:
+            schema = database.schemas.get(schema_name)
+            if schema is None:
+                schema = database.schemas[schema_name] = DurcSchema(database, schema_name)
+            container = schema.tables
+
+        table = DurcTable(database, schema, table_name, table_info)
+        container[table.name] = table
+        self.tables_by_name[table.qualified_name] = table
+        return table
+
+    def link_relationships(self):
+        """Resolve relationship targets and rebuild every table's inbound foreign keys."""
+        for table in self.tables_by_name.values():
+            table.inbound_foreign_keys = []
+
+        for table in self.tables_by_name.values():
+            for relationship in table.belongs_to.values():
+                relationship.target = self.get_table(
+                    relationship.to_db or table.database.name,
+                    relationship.to_schema or table.schema_name,
+                    relationship.to_table
+                )
+                if relationship.target is not None:
+                    relationship.target.inbound_foreign_keys.append(relationship)
+            for relationship in table.has_many.values():
+                relationship.target = self.get_table(
+                    relationship.from_db or table.database.name,
+                    relationship.from_schema or table.schema_name,
+                    relationship.from_table
+                )
+
+    def get_table(self, db_name: str, schema_name, table: str):
+        """
+        Look up a table.
+
+        Args:
+            db_name (str): Database name
+            schema_name (str): Schema name, or None. For databases without a schema layer
+                the schema name is ignored
+            table (str): Table name
+
+        Returns:
+            DurcTable: The table, or None if the model has no such table
+        """
+        if table is None:
+            return None
+        found = None
+        if schema_name is not None:
+            found = self.tables_by_name.get(self.qualified_name(db_name, schema_name, table))
+        if found is None:
+            found = self.tables_by_name.get(self.qualified_name(db_name, None, table))
+        return found
+
+    def iter_tables(self, db_name: str = None, schema_name: str = None):
+        """
+        Iterate over tables in model order.
+
+        Args:
+            db_name (str): Only yield tables in this database
+            schema_name (str): Only yield tables in this schema. Tables of databases
+                without a schema layer are only yielded when no schema is given
+
+        Yields:
+            DurcTable: Matching tables
+        """
+        for database in self.databases.values():
+            if db_name is not None and database.name != db_name:
+                continue
+            for table in database.iter_tables():
+                if schema_name is not None and table.schema_name != schema_name:
+                    continue
+                yield table
+
+    def __len__(self):
+        return len(self.tables_by_name)
+
+    def _get_database(self, db_name):
+        database = self.databases.get(db_name)
+        if database is None:
+            database = self.databases[db_name] = DurcDatabase(db_name)
+        return database
@@ -0,0 +1,214 @@
+from .durc_table_pattern import GLOB_CHARS, glob_regex, is_glob, parse_table_pattern
+
+
+class DurcTableNameSet:
+    """
+    The table names or globs that patterns select within one database and schema.
+
+    Literal names are kept in a set. Each glob is compiled on its own and filed under its
+    literal prefix (the text before its first glob character) or, when that is shorter,
+    its literal suffix (the text after its last * or ?). A table name is only tested
+    against the globs filed under one of its own prefixes or suffixes, so checking it
+    costs one set lookup, one dictionary lookup per distinct prefix or suffix length and
+    one regex match per candidate glob. Globs without a literal prefix or suffix, such as
+    *, are tested against every name.
+    """
+
+    __slots__ = ('match_all', 'names', 'prefixes', 'suffixes', 'unanchored')
+
+    def __init__(self, table_patterns):
+        self.match_all = None in table_patterns
+        self.names = frozenset(part for part in table_patterns if part is not None and not is_glob(part))
+        # Length -> literal prefix (or suffix) of that length -> compiled globs filed under it
+        self.prefixes = {}
+        self.suffixes = {}
+        self.unanchored = []
+        for glob in sorted(part for part in table_patterns if is_glob(part)):
+            prefix, suffix = self._anchors(glob)
+            if not prefix and not suffix:
+                self.unanchored.append(glob_regex(glob))
+            elif len(prefix) >= len(suffix):
+                self.prefixes.setdefault(len(prefix), {}).setdefault(prefix, []).append(glob_regex(glob))
+            else:
+                self.suffixes.setdefault(len(suffix), {}).setdefault(suffix, []).append(glob_regex(glob))
+
+    @staticmethod
+    def _anchors(glob):
+        # Literal text the glob's matches must start and end with ('' if there is none)
+        prefix = glob[:min(glob.index(char) for char in GLOB_CHARS if char in glob)]
+        suffix = ''
+        if '[' not in glob:
+            suffix = glob[max(glob.rfind('*'), glob.rfind('?')) + 1:]
+        return prefix, suffix
+
+    def candidates(self, table_name):
+        """
+        Get the compiled globs a table name has to be tested against.
+
+        Args:
+            table_name (str): Table name
+
+        Returns:
+            list: Compiled globs sharing a literal prefix or suffix with the name, and the unanchored ones
+        """
+        found = list(self.unanchored)
+        for length, buckets in self.prefixes.items():
+            found += buckets.get(table_name[:length], ())
+        for length, buckets in self.suffixes.items():
+            if length <= len(table_name):
+                found += buckets.get(table_name[len(table_name) - length:], ())
+        return found
+
+    def __contains__(self, table_name):
+        return (
+            self.match_all
+            or table_name in self.names
+            or any(regex.match(table_name) is not None for regex in self.candidates(table_name))
+        )
+
+
+class DurcTableMatcher:
+    """
+    Compiled include/exclude filter for the tables of a relational model.
+
+    Patterns (as parsed by parse_table_pattern() from db, db.schema or db.schema.table
+    strings, where every part may be a glob) are stored in a nested db -> schema -> table
+    lookup. Literal database and schema names are dictionary keys; globs are compiled once
+    and kept in a separate bucket per level. The table names selected for a (db, schema)
+    pair are resolved once into a DurcTableNameSet and cached, so a table is only compared
+    with the literal names and the globs that share a prefix or suffix with it, not with
+    every pattern.
+
+    A name that is None is not compared: tables of a model without a schema layer match
+    patterns for any schema, and tables without a database (e.g. parsed from SQL files)
+    match patterns for any database.
+
+    Usage:
+        matcher = DurcTableMatcher.from_strings(['npd.public.provider_*'], ['npd.*.*_archive'])
+        tables = [table for table in model.iter_tables() if matcher.matches_table(table)]
+    """
+
+    def __init__(self, include_patterns=None, exclude_patterns=None):
+        """
+        Args:
+            include_patterns (list): Dictionaries with db, schema and table keys, or None to include every table
+            exclude_patterns (list): Dictionaries with db, schema and table keys for tables to leave out
+        """
+        self._include = self._build_tree(include_patterns) if include_patterns is not None else None
+        self._exclude = self._build_tree(exclude_patterns or [])
+        # (db, schema) -> (included table names, excluded table names)
+        self._scopes = {}
+
+    @classmethod
+    def from_strings(cls, include=None, exclude=None):
+        """
+        Build a matcher from pattern strings.
+
+        Args:
+            include (list): db, db.schema or db.schema.table strings, or None to include every table
+            exclude (list): Pattern strings for tables to leave out
+
+        Returns:
+            DurcTableMatcher: The compiled matcher
+
+        Raises:
+            ValueError: If a pattern has more than three parts
+        """
+        include_patterns = [parse_table_pattern(pattern) for pattern in include] if include is not None else None
+        exclude_patterns = [parse_table_pattern(pattern) for pattern in exclude or []]
+        return cls(include_patterns, exclude_patterns)
+
+    @staticmethod
+    def _build_tree(patterns):
+        # db -> schema (None for every schema) -> set of table names or globs (None for every table),
+        # with the compiled database globs and, per database entry, the compiled schema globs
+        tree = {}
+        for pattern in patterns:
+            schemas = tree.setdefault(pattern['db'], {})
+            schemas.setdefault(pattern.get('schema'), set()).add(pattern.get('table'))
+        db_globs = [(db, glob_regex(db)) for db in tree if is_glob(db)]
+        schema_globs = {
+            db: [(schema, glob_regex(schema)) for schema in schemas if is_glob(schema)]
+            for db, schemas in tree.items()
+        }
+        return tree, db_globs, schema_globs
+
+    @property
+    def databases(self):
+        """
+        The databases that can hold included tables.
+
+        Returns:
+            set: Database names, or None if every database can (no include patterns, or
+                a database glob)
+        """
+        if self._include is None:
+            return None
+        tree, db_globs, _ = self._include
+        if db_globs:
+            return None
+        return set(tree)
+
+    def matches(self, db_name, schema_name, table_name):
+        """
+        Check whether a table is included and not excluded.
+
+        Args:
+            db_name (str): Database name, or None if unknown
+            schema_name (str): Schema name, or None for models without a schema layer
+            table_name (str): Table name
+
+        Returns:
+            bool: True if the table passes the filter
+        """
+        scope = self._scopes.get((db_name, schema_name))
+        if scope is None:
+            scope = self._scopes[(db_name, schema_name)] = self._resolve_scope(db_name, schema_name)
+        included, excluded = scope
+        return (included is None or table_name in included) and table_name not in excluded
+
+    def matches_table(self, table):
+        """
+        Check whether a DurcTable passes the filter.
+
+        Args:
+            table (DurcTable): Table to check
+
+        Returns:
+            bool: True if the table passes the filter
+        """
+        return self.matches(table.database.name, table.schema_name, table.name)
+
+    def _resolve_scope(self, db_name, schema_name):
+        included = None
+        if self._include is not None:
+            included = DurcTableNameSet(self._collect_tables(self._include, db_name, schema_name))
+        excluded = DurcTableNameSet(self._collect_tables(self._exclude, db_name, schema_name))
+        return included, excluded
+
+    @classmethod
+    def _collect_tables(cls, compiled_tree, db_name, schema_name):
+        tree, db_globs, schema_globs = compiled_tree
+        table_patterns = set()
+        for db in cls._lookup(tree, db_globs, db_name):
+            schemas = tree[db]
+            for schema in cls._lookup(schemas, schema_globs[db], schema_name, wildcard=True):
+                table_patterns |= schemas[schema]
+        return table_patterns
+
+    @staticmethod
+    def _lookup(level, globs, name, wildcard=False):
+        # Keys of one tree level whose entries apply to a name: its exact key, the keys of
+        # matching (glob, regex) pairs and, with wildcard, the key of patterns that stop above
+        # this level
+        if name is None:
+            return list(level)
+        found = []
+        if name in level:
+            found.append(name)
+        for glob, regex in globs:
+            if glob != name and regex.match(name) is not None:
+                found.append(glob)
+        if wildcard and None in level:
+            found.append(None)
+        return found
@@ -0,0 +1,65 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+
+
+# Characters that make a pattern part a shell-style glob
+GLOB_CHARS = frozenset('*?[')
+
+
+def parse_table_pattern(pattern: str) -> dict:
+    """
+    Split a db, db.schema or db.schema.table pattern into its parts.
+
+    This is the pattern grammar of durc_mine's --include and --exclude options, shared by
+    DURC_IncludePatternParser and DurcTableMatcher.
+
+    Args:
+        pattern (str): Pattern string; each part may be a glob
+
+    Returns:
+        dict: Dictionary with db, schema and table keys (schema and table may be None)
+
+    Raises:
+        ValueError: If the pattern has more than three parts
+    """
+    parts = pattern.split('.')
+    if len(parts) > 3:
+        raise ValueError(f"{pattern}. Use format: db.schema.table, db.schema, or db")
+    parts += [None] * (3 - len(parts))
+    return {'db': parts[0], 'schema': parts[1], 'table': parts[2]}
+
+
+def is_glob(part):
+    """Check whether a pattern part contains glob characters."""
+    return part is not None and not GLOB_CHARS.isdisjoint(part)
+
+
+@lru_cache(maxsize=1024)
+def glob_regex(part):
+    """
+    Compile a pattern part into a regular expression, once per part.
+
+    Args:
+        part (str): Literal name or glob
+
+    Returns:
+        re.Pattern: Case-sensitive expression matching the whole name, as fnmatchcase() does
+    """
+    return re.compile(translate(part))
+
+
+def matches(part, name):
+    """
+    Check whether a name matches a pattern part.
+
+    Args:
+        part (str): Literal name or glob, or None to match any name
+        name (str): Database, schema or table name
+
+    Returns:
+        bool: True if the name matches
+    """
+    if part is None:
+        return True
+    return glob_regex(part).match(name) is not None
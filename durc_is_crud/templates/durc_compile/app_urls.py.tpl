@@ -0,0 +1,13 @@
+{# urls.py of an app: registers the viewset of every table #}
+{# header, tables: (module, class_name), sorted #}
+{{ header }}
+
+from rest_framework.routers import DefaultRouter
+from . import rest
+
+router = DefaultRouter()
+{% for module, class_name in tables %}
+router.register(r'api/{{ module }}', rest.{{ module }}_api.{{ class_name }}ViewSet)
+{% endfor %}
+
+urlpatterns = router.urls
@@ -0,0 +1,11 @@
+{# apps.py: the AppConfig of an app #}
+{# header, config_class, app_label #}
+{{ header }}
+
+from django.apps import AppConfig
+
+
+class {{ config_class }}(AppConfig):
+    name = __name__.rpartition('.')[0]
+    label = {{ repr(app_label) }}
+    default_auto_field = 'django.db.models.AutoField'
@@ -0,0 +1,22 @@
+{# forms/v_<table>_form.py: the ModelForm of a table #}
+{# header, class_name, fields: [field name], widgets: (field name, widget expression) #}
+{{ header }}
+
+from django import forms
+from ..models import {{ class_name }}
+
+
+class {{ class_name }}Form(forms.ModelForm):
+
+    class Meta:
+        model = {{ class_name }}
+        fields = [
+{% for field_name in fields %}
+            {{ repr(field_name) }},
+{% endfor %}
+        ]
+        widgets = {
+{% for field_name, widget in widgets %}
+            {{ repr(field_name) }}: {{ widget }},
+{% endfor %}
+        }
@@ -0,0 +1,7 @@
+{# forms/__init__.py: imports the form of every table in an app #}
+{# header, tables: (module, class_name), sorted #}
+{{ header }}
+
+{% for module, class_name in tables %}
+from .v_{{ module }}_form import {{ class_name }}Form
+{% endfor %}
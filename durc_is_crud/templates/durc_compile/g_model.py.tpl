@@ -0,0 +1,73 @@
+{# models/g_<table>.py: the generated abstract model of a table #}
+{# header, source, module, class_name, db_table, label_field (None if the table has no text column), #}
+{# fields: (field name, Django field class, [field arguments]), #}
+{# select_related: belongs_to paths joined by with_related(), depth: depth of the longest path, #}
+{# prefetch_related: has_many relations with_related(prefetch=True) loads, #}
+{# keyset: key fields list pages are ordered by (empty if the table has no primary key), page_size #}
+{{ header }}
+
+from django.db import models
+
+
+class G{{ class_name }}QuerySet(models.QuerySet):
+    """Queries of {{ source }} that load related rows with the page instead of one query per row."""
+
+    # belongs_to relations joined into with_related() queries, up to depth {{ depth }}
+    SELECT_RELATED = {{ repr(select_related) }}
+    # has_many relations with_related(prefetch=True) loads, one query each
+    PREFETCH_RELATED = {{ repr(prefetch_related) }}
+
+    def with_related(self, prefetch=False):
+        """
+        Join the belongs_to rows and, on request, prefetch the has_many rows.
+
+        Args:
+            prefetch (bool or list): True to prefetch every has_many relation, or the names to prefetch
+        """
+        queryset = self.select_related(*self.SELECT_RELATED) if self.SELECT_RELATED else self
+        if prefetch:
+            queryset = queryset.prefetch_related(*(self.PREFETCH_RELATED if prefetch is True else prefetch))
+        return queryset
+{% if keyset %}
+
+    # Key list pages are ordered by; seek() starts a page after a key instead of skipping rows with OFFSET
+    KEYSET = {{ repr(keyset) }}
+
+    def seek(self, after=None, size={{ page_size }}):
+        """
+        Get a page of rows in KEYSET order.
+
+        Args:
+            after (tuple): KEYSET values of the last row of the previous page, or None for the first page
+            size (int): Rows in the page
+        """
+        condition = models.Q()
+        if after is not None:
+            # (a, b) > (x, y) as a > x OR (a = x AND b > y), which seeks the key in the primary key index
+            for position, field_name in enumerate(self.KEYSET):
+                equal = dict(zip(self.KEYSET[:position], after[:position]))
+                condition |= models.Q(**equal, **{f"{field_name}__gt": after[position]})
+        return self.filter(condition).order_by(*self.KEYSET)[:size]
+{% endif %}
+
+
+class G{{ class_name }}(models.Model):
+    """Generated fields of {{ source }}. Subclassed by {{ class_name }} in v_{{ module }}.py."""
+
+{% for field_name, field_class, arguments in fields %}
+    {{ field_name }} = models.{{ field_class }}({{ ', '.join(arguments) }})
+{% endfor %}
+
+    objects = G{{ class_name }}QuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+        managed = False
+        db_table = {{ repr(db_table) }}
+
+    def __str__(self):
+{% if label_field is not None %}
+        return str(self.{{ label_field }})
+{% else %}
+        return f"{{ class_name }} {self.pk}"
+{% endif %}
@@ -0,0 +1,7 @@
+{# models/__init__.py: imports the validated model of every table in an app #}
+{# header, tables: (module, class_name), sorted #}
+{{ header }}
+
+{% for module, class_name in tables %}
+from .v_{{ module }} import {{ class_name }}
+{% endfor %}
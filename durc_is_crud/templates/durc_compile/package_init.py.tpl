@@ -0,0 +1,3 @@
+{# __init__.py of an app and of the packages above it #}
+{# header #}
+{{ header }}
@@ -0,0 +1,41 @@
+{# rest/<table>_api.py: the REST serializer and viewset of a table #}
+{# header, class_name, search_fields: [field name], related_fields: [foreign key field name], #}
+{# keyset: key fields list pages are ordered by (empty if the table has no primary key), page_size, max_page_size #}
+{{ header }}
+
+from rest_framework import filters, pagination, serializers, viewsets
+from ..models import {{ class_name }}
+
+
+class {{ class_name }}Serializer(serializers.ModelSerializer):
+{% for field_name in related_fields %}
+    {{ field_name }}_label = serializers.StringRelatedField(source={{ repr(field_name) }}, read_only=True)
+{% endfor %}
+
+    class Meta:
+        model = {{ class_name }}
+        fields = '__all__'
+
+
+{% if keyset %}
+class {{ class_name }}Pagination(pagination.CursorPagination):
+    """Pages of {{ class_name }} in key order; the cursor holds the last key, so deep pages cost as much as the first."""
+
+    ordering = {{ repr(keyset) }}
+    page_size = {{ page_size }}
+    page_size_query_param = 'page_size'
+    max_page_size = {{ max_page_size }}
+
+
+{% endif %}
+class {{ class_name }}ViewSet(viewsets.ModelViewSet):
+    """REST endpoint for {{ class_name }}; ?search= serves the Tom Select autosuggest widgets."""
+
+    # with_related() joins the foreign keys whose labels the list and detail views show
+    queryset = {{ class_name }}.objects.with_related()
+    serializer_class = {{ class_name }}Serializer
+    filter_backends = [filters.SearchFilter]
+    search_fields = {{ repr(search_fields) }}
+{% if keyset %}
+    pagination_class = {{ class_name }}Pagination
+{% endif %}
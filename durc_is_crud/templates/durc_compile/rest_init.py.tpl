@@ -0,0 +1,7 @@
+{# rest/__init__.py: imports the REST module of every table in an app #}
+{# header, tables: (module, class_name), sorted #}
+{{ header }}
+
+{% for module, class_name in tables %}
+from . import {{ module }}_api
+{% endfor %}
@@ -0,0 +1,15 @@
+{# urls.py of the output directory: includes the URLs of every app #}
+{# header, app_paths: package path of every app, sorted #}
+{{ header }}
+
+from django.urls import include, path
+
+{% for app_path in app_paths %}
+from .{{ '.'.join(app_path) }} import urls as {{ '_'.join(app_path) }}_urls
+{% endfor %}
+
+urlpatterns = [
+{% for app_path in app_paths %}
+    path('{{ '/'.join(app_path) }}/', include({{ '_'.join(app_path) }}_urls)),
+{% endfor %}
+]
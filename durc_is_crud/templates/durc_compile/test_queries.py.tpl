@@ -0,0 +1,14 @@
+{# tests/test_<table>_queries.py: checks that the table's list page takes a constant number of queries #}
+{# header, module, class_name, root_package: relative import of the output directory #}
+{{ header }}
+
+from {{ root_package }} import testing
+from ..models import {{ class_name }}
+from ..rest.{{ module }}_api import {{ class_name }}ViewSet
+
+
+class {{ class_name }}QueryCountTest(testing.QueryCountTestCase):
+    """The list page of {{ class_name }} takes as many queries for one row as for many."""
+
+    model = {{ class_name }}
+    viewset = {{ class_name }}ViewSet
@@ -0,0 +1,199 @@
+{# testing.py of the output directory: the base class of the generated query count tests #}
+{# header #}
+{{ header }}
+
+import itertools
+from datetime import date, time
+from decimal import Decimal
+from django.db import DatabaseError, connections, models, router, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Source of distinct values for generated rows
+_values = itertools.count(1)
+
+
+def prefetch_names(model):
+    """Get the has_many relations the model's with_related(prefetch=True) loads."""
+    return list(getattr(model._default_manager.all(), 'PREFETCH_RELATED', []))
+
+
+def select_paths(model):
+    """Get the foreign keys of the model and the belongs_to paths its with_related() joins."""
+    paths = [field.name for field in model._meta.concrete_fields if field.is_relation]
+    return paths + [path for path in getattr(model._default_manager.all(), 'SELECT_RELATED', []) if path not in paths]
+
+
+def related_models(model):
+    """Get the model, every model its foreign keys lead to and the models of its has_many relations."""
+    found = [model]
+    for current in found:
+        related = [field.related_model for field in current._meta.concrete_fields if field.is_relation]
+        if current is model:
+            related += [model._meta.get_field(name).related_model for name in prefetch_names(model)]
+        found += [related_model for related_model in related if related_model not in found]
+    return found
+
+
+def create_missing_tables(models_to_create, using):
+    """
+    Create the tables of unmanaged models that are not in the test database.
+
+    Returns:
+        str: The database error, or None if every table exists
+    """
+    connection = connections[using]
+    existing = set(connection.introspection.table_names())
+    try:
+        with connection.schema_editor() as editor:
+            for model in models_to_create:
+                db_table = model._meta.db_table
+                if db_table not in existing and db_table.rpartition('"."')[2] not in existing:
+                    editor.create_model(model)
+    except DatabaseError as e:
+        return str(e)
+    return None
+
+
+def sample_value(field):
+    """Get a value for a column of a generated row, distinct from the values of other rows."""
+    n = next(_values)
+    if isinstance(field, models.BooleanField):
+        return n % 2 == 0
+    if isinstance(field, models.IntegerField):
+        return n
+    if isinstance(field, models.FloatField):
+        return float(n)
+    if isinstance(field, models.DecimalField):
+        return Decimal(n)
+    if isinstance(field, models.DateTimeField):
+        return timezone.now()
+    if isinstance(field, models.DateField):
+        return date(2000, 1, 1)
+    if isinstance(field, models.TimeField):
+        return time(12, 0)
+    if isinstance(field, models.BinaryField):
+        return b''
+    text = f"{field.name} {n}"
+    return text[-field.max_length:] if field.max_length else text
+
+
+def make_row(model, using, values=None, path=()):
+    """
+    Insert a row with generated values, and a row for each of its foreign keys.
+
+    Nullable foreign keys that lead back to a model on the path are left empty.
+
+    Raises:
+        ValueError: If NOT NULL foreign keys form a cycle
+    """
+    values = dict(values or {})
+    for field in model._meta.concrete_fields:
+        if field.name in values or isinstance(field, models.AutoField):
+            continue
+        if not field.is_relation:
+            values[field.attname] = sample_value(field)
+        elif field.related_model is model or field.related_model in path:
+            if not field.null:
+                raise ValueError(f"{model.__name__}.{field.name} is a NOT NULL foreign key in a cycle")
+            values[field.name] = None
+        else:
+            values[field.name] = make_row(field.related_model, using, path=path + (model,))
+    return model._default_manager.using(using).create(**values)
+
+
+def show(row, path):
+    """Render a related row the way a list page does, following a belongs_to path."""
+    value = row
+    for name in path.split('__'):
+        value = getattr(value, name)
+        if value is None:
+            return
+    str(value)
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Checks that a list page takes as many queries for one row as for many.
+
+    Subclasses set model and the viewset of its list page. Generated models are not
+    managed by migrations, so the tables of the model and of the models its page loads
+    are created in the test database if they are missing, and filled with generated rows.
+    The tests are skipped if that fails, e.g. for tables outside the default schema.
+    """
+
+    databases = '__all__'
+    model = None
+    viewset = None
+    # Rows of the larger page
+    page_size = 3
+
+    using = 'default'
+    table_error = None
+
+    @classmethod
+    def setUpClass(cls):
+        # The tables are created before TestCase opens its transaction: SQLite cannot
+        # change the schema inside one
+        if cls.model is not None:
+            cls.using = router.db_for_write(cls.model)
+            cls.table_error = create_missing_tables(related_models(cls.model), cls.using)
+        super().setUpClass()
+
+    def setUp(self):
+        if self.model is None:
+            self.skipTest("QueryCountTestCase needs a model")
+        if self.table_error:
+            self.skipTest(f"Cannot create the tables of {self.model.__name__}: {self.table_error}")
+        try:
+            with transaction.atomic(using=self.using):
+                for _ in range(self.page_size):
+                    row = make_row(self.model, self.using)
+                    # One row per has_many relation: the foreign key may also be the primary key
+                    for name in prefetch_names(self.model):
+                        relation = self.model._meta.get_field(name)
+                        make_row(relation.related_model, self.using, {relation.field.name: row})
+        except (DatabaseError, ValueError) as e:
+            self.skipTest(f"Cannot create rows of {self.model.__name__}: {e}")
+
+    def assertConstantQueryCount(self, load_page):
+        """Assert that load_page(size) runs as many queries for a page of one row as for a full page."""
+        counts = []
+        for size in (1, self.page_size):
+            with CaptureQueriesContext(connections[self.using]) as queries:
+                load_page(size)
+            counts.append(len(queries))
+        self.assertEqual(
+            counts[0], counts[1],
+            f"{counts[0]} queries for one {self.model.__name__} row, {counts[1]} for {self.page_size} rows",
+        )
+
+    def test_list_query_count_is_constant(self):
+        """The list page loads the labels of every foreign key with the rows."""
+        def load_page(size):
+            if self.viewset is not None:
+                viewset = self.viewset()
+                rows = list(viewset.get_queryset().using(self.using)[:size])
+                viewset.get_serializer_class()(rows, many=True).data
+            else:
+                rows = list(self.model._default_manager.using(self.using).with_related()[:size])
+            for row in rows:
+                for path in select_paths(self.model):
+                    show(row, path)
+
+        self.assertConstantQueryCount(load_page)
+
+    def test_prefetch_query_count_is_constant(self):
+        """with_related(prefetch=True) loads every has_many relation in one query each."""
+        names = prefetch_names(self.model)
+        if not names:
+            self.skipTest(f"{self.model.__name__} has no has_many relations")
+
+        def load_page(size):
+            for row in self.model._default_manager.using(self.using).with_related(prefetch=True)[:size]:
+                for name in names:
+                    for related_row in getattr(row, name).all():
+                        str(related_row)
+
+        self.assertConstantQueryCount(load_page)
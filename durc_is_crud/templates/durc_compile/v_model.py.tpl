@@ -0,0 +1,11 @@
+{# models/v_<table>.py: the validated model of a table, only written if it does not exist #}
+{# source, module, class_name #}
+# Validated model for {{ source }}, created once by durc_compile. Edit freely: it is never overwritten.
+from .g_{{ module }} import G{{ class_name }}
+
+
+class {{ class_name }}(G{{ class_name }}):
+    """{{ class_name }} with validation rules and domain logic."""
+
+    def clean(self):
+        super().clean()
@@ -48,6 +48,10 @@ setup(
             "flake8",
             "coverage",
         ],
+        # The REST endpoints and tests that durc_compile generates import rest_framework
+        "rest": [
+            "djangorestframework>=3.12",
+        ],
     },
     include_package_data=True,
     project_urls={
@@ -1,9 +1,13 @@
 import os
 import json
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from durc_is_crud.management.commands.durc_utils.compile_manifest import DURC_CompileManifest
+from durc_is_crud.management.commands.durc_utils.template_loader import DURC_TemplateLoader
 from io import StringIO
 
 class TestDurcCompileCommand(unittest.TestCase):
@@ -51,29 +55,33 @@ class TestDurcCompileCommand(unittest.TestCase):
         if os.path.exists(self.input_path):
             os.remove(self.input_path)
         
-        placeholder_file = os.path.join('durc_generated', 'durc_compile_placeholder.txt')
-        if os.path.exists(placeholder_file):
-            os.remove(placeholder_file)
+        if os.path.exists(DURC_CompileManifest.DEFAULT_PATH):
+            os.remove(DURC_CompileManifest.DEFAULT_PATH)
+        
+        if os.path.exists(DURC_TemplateLoader.DEFAULT_CACHE_DIR):
+            shutil.rmtree(DURC_TemplateLoader.DEFAULT_CACHE_DIR)
         
         if os.path.exists('durc_config'):
             os.rmdir('durc_config')
         
         if os.path.exists('durc_generated'):
-            os.rmdir('durc_generated')
+            shutil.rmtree('durc_generated')
     
     def test_durc_compile_command_default_paths(self):
         # Test the command with default input and output paths
         out = StringIO()
         call_command('durc_compile', stdout=out)
         
-        # Check that the placeholder file was created
-        placeholder_file = os.path.join('durc_generated', 'durc_compile_placeholder.txt')
-        self.assertTrue(os.path.exists(placeholder_file))
+        # Check that the model, form and REST files of the table were generated
+        for relative_path in ('models/g_table1.py', 'models/v_table1.py', 'forms/v_table1_form.py', 'rest/table1_api.py'):
+            self.assertTrue(os.path.exists(os.path.join('durc_generated', 'testdb', relative_path)), relative_path)
         
-        # Check the content of the placeholder file
-        with open(placeholder_file, 'r') as f:
+        with open(os.path.join('durc_generated', 'testdb', 'models', 'g_table1.py'), 'r') as f:
             content = f.read()
-            self.assertIn('DURC compile command was run with input file', content)
+            self.assertIn('class GTable1(models.Model):', content)
+            self.assertIn('id = models.AutoField(primary_key=True)', content)
+            self.assertIn('name = models.CharField(max_length=255)', content)
+        self.assertIn('tables/s', out.getvalue())
     
     def test_durc_compile_command_custom_paths(self):
         # Test the command with custom input and output paths
@@ -91,14 +99,167 @@ class TestDurcCompileCommand(unittest.TestCase):
         out = StringIO()
         call_command('durc_compile', input_json_file=custom_input, output_dir=custom_output, stdout=out)
         
-        # Check that the placeholder file was created in the custom output directory
-        placeholder_file = os.path.join(custom_output, 'durc_compile_placeholder.txt')
-        self.assertTrue(os.path.exists(placeholder_file))
+        # Check that the files were generated in the custom output directory
+        self.assertTrue(os.path.exists(os.path.join(custom_output, 'testdb', 'models', 'g_table1.py')))
+        self.assertTrue(os.path.exists(os.path.join(custom_output, 'urls.py')))
         
         # Clean up custom files and directories
         os.remove(custom_input)
-        os.remove(placeholder_file)
-        os.rmdir(custom_output)
+        shutil.rmtree(custom_output)
+    
+    def test_durc_compile_relationships_and_indexes(self):
+        # Test foreign keys, enhanced widgets and the merged index files
+        model_path = os.path.join(os.path.dirname(__file__), '..', '..', 'AI_Instructions', 'DURC_simplified.example.json')
+        temp_dir = tempfile.mkdtemp()
+        try:
+            call_command('durc_compile', input_json_file=model_path, output_dir=temp_dir, stdout=StringIO())
+            app_dir = os.path.join(temp_dir, 'blog_db')
+            
+            with open(os.path.join(app_dir, 'models', 'g_post.py'), 'r') as f:
+                content = f.read()
+                self.assertIn(
+                    "author = models.ForeignKey('blog_db.User', models.DO_NOTHING, related_name='author_post', "
+                    "db_column='author_id')", content
+                )
+                self.assertIn("is_published = models.BooleanField()", content)
+            with open(os.path.join(app_dir, 'forms', 'v_post_form.py'), 'r') as f:
+                content = f.read()
+                self.assertIn("'data-autosuggest-url': '/blog_db/api/user/'", content)
+                self.assertIn("'published_at': forms.DateInput(attrs={'type': 'date'})", content)
+            with open(os.path.join(app_dir, 'rest', 'user_api.py'), 'r') as f:
+                self.assertIn("search_fields = ['username']", f.read())
+            with open(os.path.join(app_dir, 'rest', 'post_api.py'), 'r') as f:
+                content = f.read()
+                self.assertIn("author_label = serializers.StringRelatedField(source='author', read_only=True)", content)
+                self.assertIn("queryset = Post.objects.with_related()", content)
+                self.assertIn("ordering = ['id']", content)
+                self.assertIn("pagination_class = PostPagination", content)
+            with open(os.path.join(app_dir, 'rest', 'post_tag_api.py'), 'r') as f:
+                self.assertIn("ordering = ['post_id', 'tag_id']", f.read())
+            with open(os.path.join(app_dir, 'tests', 'test_post_queries.py'), 'r') as f:
+                content = f.read()
+                self.assertIn("from ... import testing", content)
+                self.assertIn("class PostQueryCountTest(testing.QueryCountTestCase):", content)
+            with open(os.path.join(app_dir, 'models', '__init__.py'), 'r') as f:
+                imports = [line for line in f.read().splitlines() if line.startswith('from')]
+                self.assertEqual(imports[0], 'from .v_comment import Comment')
+                self.assertEqual(len(imports), 6)
+            with open(os.path.join(app_dir, 'urls.py'), 'r') as f:
+                self.assertIn("router.register(r'api/post', rest.post_api.PostViewSet)", f.read())
+            with open(os.path.join(temp_dir, 'urls.py'), 'r') as f:
+                self.assertIn("path('blog_db/', include(blog_db_urls)),", f.read())
+            
+            # Every generated file is valid Python
+            for root, _, files in os.walk(temp_dir):
+                for name in files:
+                    with open(os.path.join(root, name), 'r') as f:
+                        compile(f.read(), name, 'exec')
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_durc_compile_workers_output_is_deterministic(self):
+        # Test that compiling in worker processes writes the same files as compiling in one process
+        tables = {}
+        for i in range(40):
+            tables[f"table_{i}"] = {
+                'table_name': f"table_{i}",
+                'db': 'testdb',
+                'column_data': self.sample_model['testdb']['table1']['column_data'] + [{
+                    'column_name': 'table_0_id', 'data_type': 'int', 'is_primary_key': False,
+                    'is_foreign_key': True, 'is_linked_key': False, 'foreign_db': 'testdb',
+                    'foreign_table': 'table_0', 'is_nullable': True, 'is_auto_increment': False
+                }],
+                'belongs_to': {'table_0': {'type': 'table_0', 'to_table': 'table_0', 'to_db': 'testdb', 'local_key': 'table_0_id'}},
+            }
+        with open(self.input_path, 'w') as f:
+            json.dump({'testdb': tables}, f)
+        
+        outputs = []
+        for workers in (1, 3):
+            temp_dir = tempfile.mkdtemp()
+            try:
+                out = StringIO()
+                call_command('durc_compile', output_dir=temp_dir, workers=workers, stdout=out)
+                self.assertIn("Compiled 40 tables", out.getvalue())
+                files = {}
+                for root, _, names in os.walk(temp_dir):
+                    for name in names:
+                        path = os.path.join(root, name)
+                        with open(path, 'r') as f:
+                            files[os.path.relpath(path, temp_dir)] = f.read()
+                outputs.append(files)
+            finally:
+                shutil.rmtree(temp_dir)
+        self.assertEqual(len(outputs[0]), 40 * 5 + 7 + 3)
+        self.assertEqual(outputs[0], outputs[1])
+    
+    def test_durc_compile_keeps_validated_models(self):
+        # Test that v_* model files are created once and never overwritten
+        call_command('durc_compile', stdout=StringIO())
+        validated_path = os.path.join('durc_generated', 'testdb', 'models', 'v_table1.py')
+        with open(validated_path, 'a') as f:
+            f.write("# custom code\n")
+        
+        call_command('durc_compile', stdout=StringIO())
+        with open(validated_path, 'r') as f:
+            self.assertIn('# custom code', f.read())
+
+    def test_durc_compile_incremental_and_full(self):
+        # Test that an unchanged model is up to date on the next compile, unless --full is given
+        call_command('durc_compile', stdout=StringIO())
+        self.assertTrue(os.path.exists(DURC_CompileManifest.DEFAULT_PATH))
+
+        out = StringIO()
+        call_command('durc_compile', stdout=out)
+        self.assertIn('rendered 0, 1 up to date, wrote 0 files', out.getvalue())
+
+        out = StringIO()
+        call_command('durc_compile', full=True, stdout=out)
+        self.assertIn('rendered 1, 0 up to date, wrote 0 files', out.getvalue())
+
+    def test_durc_compile_custom_template_dir(self):
+        # Test that templates in --template_dir replace the built-in ones and that editing one re-renders the tables
+        template_dir = tempfile.mkdtemp()
+        try:
+            template_path = os.path.join(template_dir, 'rest_api.py' + DURC_TemplateLoader.TEMPLATE_SUFFIX)
+            with open(template_path, 'w') as f:
+                f.write("{{ header }}\n# REST endpoints of {{ class_name }} are disabled\n")
+            call_command('durc_compile', template_dir=template_dir, stdout=StringIO())
+            rest_path = os.path.join('durc_generated', 'testdb', 'rest', 'table1_api.py')
+            with open(rest_path, 'r') as f:
+                self.assertIn('# REST endpoints of Table1 are disabled', f.read())
+            with open(os.path.join('durc_generated', 'testdb', 'models', 'g_table1.py'), 'r') as f:
+                self.assertIn('class GTable1(models.Model):', f.read())
+            
+            with open(template_path, 'w') as f:
+                f.write("{{ header }}\n# No REST endpoint for {{ class_name }}\n")
+            out = StringIO()
+            call_command('durc_compile', template_dir=template_dir, stdout=out)
+            self.assertIn('rendered 1, 0 up to date', out.getvalue())
+            with open(rest_path, 'r') as f:
+                self.assertIn('# No REST endpoint for Table1', f.read())
+        finally:
+            shutil.rmtree(template_dir)
+    
+    def test_durc_compile_command_invalid_templates(self):
+        # Test that a missing template directory or a broken template is reported before anything is written
+        with self.assertRaises(CommandError):
+            call_command('durc_compile', template_dir='nonexistent_templates', stdout=StringIO())
+        
+        template_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(template_dir, 'apps.py' + DURC_TemplateLoader.TEMPLATE_SUFFIX), 'w') as f:
+                f.write("{% if label %}\n")
+            with self.assertRaises(CommandError) as context:
+                call_command('durc_compile', template_dir=template_dir, stdout=StringIO())
+            self.assertIn('Template apps.py, line 1', str(context.exception))
+        finally:
+            shutil.rmtree(template_dir)
+    
+    def test_durc_compile_command_invalid_workers(self):
+        # Test that a negative worker count is rejected
+        with self.assertRaises(CommandError):
+            call_command('durc_compile', workers=-1, stdout=StringIO())
     
     def test_durc_compile_command_nonexistent_input(self):
         # Test that the command raises an error when the input file doesn't exist
@@ -134,5 +134,45 @@ class TestDurcMineCommand(unittest.TestCase):
         mock_parse.assert_called_once_with(['testdb.public'])
         mock_extract.assert_called_once()
 
+    @patch('durc_is_crud.management.commands.durc_utils.include_pattern_parser.DURC_IncludePatternParser.parse_include_patterns')
+    @patch('durc_is_crud.management.commands.durc_utils.relational_model_extractor.DURC_RelationalModelExtractor.extract_relational_model')
+    def test_durc_mine_incremental(self, mock_extract, mock_parse):
+        # Mock the return values
+        mock_parse.return_value = [{'db': 'testdb', 'schema': 'public', 'table': None}]
+        mock_extract.return_value = {'testdb': {'table1': {'table_name': 'table1', 'db': 'testdb'}}}
+        
+        # Call the command with incremental mining
+        out = StringIO()
+        call_command('durc_mine', include=['testdb.public'], incremental=True, stdout=out)
+        
+        # Check that the fingerprints were stored next to the output file
+        fingerprints_path = os.path.join('durc_config', 'DURC_relational_model.fingerprints.json')
+        self.assertTrue(os.path.exists(fingerprints_path))
+        with open(fingerprints_path, 'r') as f:
+            self.assertIn('tables', json.load(f))
+        
+        # Check that the extractor received the incremental state
+        self.assertIsNotNone(mock_extract.call_args.kwargs['incremental'])
+        self.assertIn('Reused 0 unchanged tables, refreshed 0 tables', out.getvalue())
+
+    @patch('durc_is_crud.management.commands.durc_utils.include_pattern_parser.DURC_IncludePatternParser.parse_include_patterns')
+    @patch('durc_is_crud.management.commands.durc_utils.relational_model_extractor.DURC_RelationalModelExtractor.extract_relational_model')
+    def test_durc_mine_stream(self, mock_extract, mock_parse):
+        # Mock the extractor streaming one table to the writer it is given
+        mock_parse.return_value = [{'db': 'testdb', 'schema': 'public', 'table': None}]
+        def stream_tables(*args, table_writer=None, **kwargs):
+            table_writer.add_table('testdb', None, 'table1', {'table_name': 'table1', 'db': 'testdb'})
+        mock_extract.side_effect = stream_tables
+        
+        # Call the command with streaming output
+        out = StringIO()
+        call_command('durc_mine', include=['testdb.public'], stream=True, stdout=out)
+        
+        # Check the content of the output file and that no temporary file is left behind
+        with open(self.output_path, 'r') as f:
+            data = json.load(f)
+            self.assertEqual(data, {'testdb': {'table1': {'table_name': 'table1', 'db': 'testdb'}}})
+        self.assertEqual(os.listdir('durc_config'), ['DURC_relational_model.json'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from django.core.management import call_command
+from durc_is_crud.shared.durc_model_writer import DurcModelWriter
+from durc_is_crud.cli.durc_mine_fkeys import ForeignKeyGenerator
+
+
+def _table(db_name, table_name, belongs_to=None):
+    table_info = {'table_name': table_name, 'db': db_name, 'column_data': []}
+    if belongs_to:
+        table_info['belongs_to'] = belongs_to
+    return table_info
+
+
+class TestDurcMineFkeysCommand(unittest.TestCase):
+    """Test cases for generating foreign key statements from a relational model file."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.temp_dir, 'model.json')
+        self.output_path = os.path.join(self.temp_dir, 'foreign_keys.sql')
+        organization = {'organization': {'local_key': 'organization_id', 'to_table': 'organization'}}
+        relational_model = {
+            'npd': {
+                'public': {
+                    'organization': _table('npd', 'organization'),
+                    'practitioner': _table('npd', 'practitioner', organization),
+                },
+                'billing': {
+                    'invoice': _table('npd', 'invoice', organization),
+                },
+            },
+            'legacy': {
+                'account': _table('legacy', 'account', {
+                    'owner': {'local_key': 'owner_id', 'to_table': 'user', 'to_db': 'legacy'}
+                }),
+                'user': _table('legacy', 'user'),
+            },
+        }
+        DurcModelWriter.write_relational_model(self.input_path, relational_model)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, *include, exclude=None):
+        out = StringIO()
+        call_command(
+            'durc_mine_fkeys', include=list(include), exclude=exclude, input_json_file=self.input_path,
+            output_sql_file=self.output_path, stdout=out
+        )
+        with open(self.output_path) as f:
+            return out.getvalue(), [line for line in f.read().splitlines() if line.startswith('ALTER TABLE')]
+
+    def test_schema_layer_tables(self):
+        """Test that tables inside a schema layer are found and filtered by schema."""
+        output, statements = self._run('npd.billing')
+
+        self.assertIn("Processing table: npd.billing.invoice", output)
+        self.assertNotIn("npd.public.practitioner", output)
+        self.assertEqual(statements, [
+            "ALTER TABLE billing.invoice ADD CONSTRAINT fk_invoice_organization_id "
+            "FOREIGN KEY (organization_id) REFERENCES npd.organization(id);"
+        ])
+
+    def test_tables_without_schema_layer(self):
+        """Test that databases without a schema layer still produce db-qualified statements."""
+        _, statements = self._run('legacy.account')
+
+        self.assertEqual(statements, [
+            "ALTER TABLE legacy.account ADD CONSTRAINT fk_account_owner_id "
+            "FOREIGN KEY (owner_id) REFERENCES legacy.user(id);"
+        ])
+
+    def test_glob_and_exclude_patterns(self):
+        """Test that schema and table globs select tables and exclude patterns leave them out."""
+        output, statements = self._run('npd.*', 'legacy.*.acc*', exclude=['npd.billing'])
+
+        self.assertIn("Processing table: npd.public.practitioner", output)
+        self.assertIn("Processing table: legacy.account", output)
+        self.assertNotIn("invoice", output)
+        self.assertEqual(len(statements), 2)
+
+    def test_standalone_generator(self):
+        """Test that the standalone durc-mine-fkeys generator reads every table lazily."""
+        ForeignKeyGenerator.generate_foreign_keys(self.input_path, self.output_path)
+
+        with open(self.output_path) as f:
+            content = f.read()
+        self.assertEqual(content.count('ALTER TABLE'), 3)
+
+        ForeignKeyGenerator.generate_foreign_keys(
+            self.input_path, self.output_path, include=['npd.*.*'], exclude=['npd.public']
+        )
+        with open(self.output_path) as f:
+            content = f.read()
+        self.assertEqual(content.count('ALTER TABLE'), 1)
+        self.assertIn('ALTER TABLE billing.invoice', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Helpers for building a fake information_schema inside the SQLite test database.
+
+The relational model extractor only reads a handful of information_schema views. SQLite
+can ATTACH a second in-memory database under the name "information_schema", so creating
+plain tables with the same names and columns lets the extractor run its real SQL in-process.
+The attached database is a named shared-cache in-memory database, so connections opened by
+other threads (e.g. the extractor's worker pool) can attach the same fake information_schema.
+"""
+
+import itertools
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+
+# A fresh database name per attach, so leftovers from a previous test are never seen
+_database_names = (f"file:durc_information_schema_{n}?mode=memory&cache=shared" for n in itertools.count())
+_attached_database = None
+
+
+INFORMATION_SCHEMA_DDL = [
+    """CREATE TABLE information_schema.tables (
+        table_schema TEXT, table_name TEXT, table_type TEXT
+    )""",
+    """CREATE TABLE information_schema.columns (
+        table_schema TEXT, table_name TEXT, column_name TEXT, data_type TEXT,
+        is_nullable TEXT, column_default TEXT, ordinal_position INTEGER
+    )""",
+    """CREATE TABLE information_schema.table_constraints (
+        constraint_name TEXT, table_schema TEXT, table_name TEXT, constraint_type TEXT
+    )""",
+    """CREATE TABLE information_schema.key_column_usage (
+        constraint_name TEXT, table_schema TEXT, table_name TEXT, column_name TEXT
+    )""",
+    """CREATE TABLE information_schema.constraint_column_usage (
+        constraint_name TEXT, table_schema TEXT, table_name TEXT, column_name TEXT
+    )""",
+]
+
+
+def _attach_to_new_connection(sender, connection, **kwargs):
+    """Attach the current fake information_schema to connections opened while it exists."""
+    if connection.vendor == 'sqlite' and _attached_database:
+        with connection.cursor() as cursor:
+            cursor.execute("ATTACH DATABASE %s AS information_schema", [_attached_database])
+
+
+def attach_information_schema():
+    """
+    Attach an empty fake information_schema to the default test connection and to every
+    connection opened until detach_information_schema() is called.
+    """
+    global _attached_database
+    _attached_database = next(_database_names)
+    with connection.cursor() as cursor:
+        cursor.execute("ATTACH DATABASE %s AS information_schema", [_attached_database])
+        for ddl in INFORMATION_SCHEMA_DDL:
+            cursor.execute(ddl)
+    connection_created.connect(_attach_to_new_connection)
+
+
+def detach_information_schema():
+    """Detach the fake information_schema from the default test connection."""
+    global _attached_database
+    connection_created.disconnect(_attach_to_new_connection)
+    _attached_database = None
+    with connection.cursor() as cursor:
+        cursor.execute("DETACH DATABASE information_schema")
+
+
+def add_table(schema, table, columns, primary_key=None, foreign_keys=None, table_type='BASE TABLE'):
+    """
+    Add a table to the fake information_schema.
+
+    Args:
+        schema (str): Schema name
+        table (str): Table name
+        columns (list): List of (column_name, data_type, is_nullable, column_default) tuples
+        primary_key (list): Primary key column names
+        foreign_keys (list): List of (column_name, ref_schema, ref_table, ref_column) tuples
+        table_type (str): information_schema table_type value
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO information_schema.tables VALUES (%s, %s, %s)",
+            [schema, table, table_type]
+        )
+        for position, (col_name, data_type, is_nullable, default_value) in enumerate(columns, 1):
+            cursor.execute(
+                "INSERT INTO information_schema.columns VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                [schema, table, col_name, data_type, is_nullable, default_value, position]
+            )
+        if primary_key:
+            constraint_name = f"{schema}_{table}_pkey"
+            cursor.execute(
+                "INSERT INTO information_schema.table_constraints VALUES (%s, %s, %s, %s)",
+                [constraint_name, schema, table, 'PRIMARY KEY']
+            )
+            for col_name in primary_key:
+                cursor.execute(
+                    "INSERT INTO information_schema.constraint_column_usage VALUES (%s, %s, %s, %s)",
+                    [constraint_name, schema, table, col_name]
+                )
+    for foreign_key in foreign_keys or []:
+        add_foreign_key(schema, table, *foreign_key)
+
+
+def add_column(schema, table, column):
+    """
+    Append a column to a table in the fake information_schema.
+
+    Args:
+        schema (str): Schema name
+        table (str): Table name
+        column (tuple): (column_name, data_type, is_nullable, column_default)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(MAX(ordinal_position), 0) + 1 FROM information_schema.columns "
+            "WHERE table_schema = %s AND table_name = %s",
+            [schema, table]
+        )
+        position = cursor.fetchone()[0]
+        cursor.execute(
+            "INSERT INTO information_schema.columns VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            [schema, table, *column, position]
+        )
+
+
+def add_foreign_key(schema, table, col_name, ref_schema, ref_table, ref_column):
+    """
+    Declare a foreign key constraint on a table in the fake information_schema.
+
+    Args:
+        schema (str): Schema name
+        table (str): Table name
+        col_name (str): Foreign key column name
+        ref_schema (str): Referenced schema
+        ref_table (str): Referenced table
+        ref_column (str): Referenced column
+    """
+    constraint_name = f"{schema}_{table}_{col_name}_fkey"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO information_schema.table_constraints VALUES (%s, %s, %s, %s)",
+            [constraint_name, schema, table, 'FOREIGN KEY']
+        )
+        cursor.execute(
+            "INSERT INTO information_schema.key_column_usage VALUES (%s, %s, %s, %s)",
+            [constraint_name, schema, table, col_name]
+        )
+        cursor.execute(
+            "INSERT INTO information_schema.constraint_column_usage VALUES (%s, %s, %s, %s)",
+            [constraint_name, ref_schema, ref_table, ref_column]
+        )
+
+
+def add_synthetic_schema(schema, table_count):
+    """
+    Add a schema of related tables: every table has an id, a name, a declared foreign key
+    to the previous table, and an undeclared linked key to the first table.
+
+    Args:
+        schema (str): Schema name
+        table_count (int): Number of tables to create
+    """
+    for i in range(table_count):
+        table = f"table_{i}"
+        columns = [
+            ('id', 'integer', 'NO', f"nextval('{table}_id_seq'::regclass)"),
+            ('name', 'character varying', 'YES', None),
+        ]
+        foreign_keys = []
+        if i > 0:
+            columns.append((f"table_{i - 1}_id", 'integer', 'YES', None))
+            foreign_keys.append((f"table_{i - 1}_id", schema, f"table_{i - 1}", 'id'))
+        if i > 1:
+            columns.append(('table_0_id', 'integer', 'YES', None))
+        add_table(schema, table, columns, primary_key=['id'], foreign_keys=foreign_keys)
@@ -0,0 +1,196 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TransactionTestCase
+from durc_is_crud.management.commands.durc_utils.catalog_snapshot import DURC_CatalogSnapshot
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from .information_schema_fixture import (
+    attach_information_schema, detach_information_schema, add_table, add_synthetic_schema
+)
+
+
+class TestCatalogSnapshot(TransactionTestCase):
+    """Test that mining from a catalog snapshot matches mining the live catalog."""
+
+    def setUp(self):
+        attach_information_schema()
+        self.temp_dir = tempfile.mkdtemp()
+        self.snapshot_path = os.path.join(self.temp_dir, 'catalog.sqlite')
+        self.mock_style = mock.MagicMock()
+        for level in ('SUCCESS', 'WARNING', 'ERROR'):
+            getattr(self.mock_style, level).side_effect = lambda message, level=level: f"{level}: {message}"
+        self.patterns = [
+            {'db': 'default', 'schema': 'public', 'table': None},
+            {'db': 'default', 'schema': 'other', 'table': None},
+        ]
+        add_synthetic_schema('public', 5)
+        add_table('public', 'vote', [
+            ('id', 'integer', 'NO', None),
+            ('up_table_2_id', 'integer', 'YES', None),
+            ('audit_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+        add_table('other', 'audit', [('id', 'integer', 'NO', None), ('vote_id', 'integer', 'YES', None)],
+                  primary_key=['id'])
+
+    def tearDown(self):
+        detach_information_schema()
+        shutil.rmtree(self.temp_dir)
+
+    def _extract(self, **options):
+        messages = []
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            self.patterns, messages.append, self.mock_style, **options
+        )
+        return result, messages
+
+    def test_snapshot_matches_live_catalog(self):
+        """Test that every extraction mode gives the same model from the snapshot as from the database."""
+        snapshot = DURC_CatalogSnapshot.write(self.snapshot_path, {'default': connection}, mock.MagicMock(), self.mock_style)
+        self.assertEqual(snapshot.engines, {'default': connection.settings_dict['ENGINE']})
+
+        for options in ({}, {'bulk': True}, {'pipeline': True}, {'workers': 2}):
+            live_model, live_messages = self._extract(**options)
+            snapshot_model, snapshot_messages = self._extract(catalog_snapshot=snapshot, **options)
+
+            self.assertEqual(len(live_model['default']), 7)
+            self.assertEqual(json.dumps(snapshot_model, indent=2), json.dumps(live_model, indent=2))
+            self.assertEqual(snapshot_messages, live_messages)
+
+    def test_snapshot_keeps_schema_layer(self):
+        """Test that a snapshot taken from PostgreSQL still mines into the db -> schema -> table layout."""
+        snapshot = DURC_CatalogSnapshot.write(self.snapshot_path, {'default': connection}, mock.MagicMock(), self.mock_style)
+
+        for engine in ('django.db.backends.postgresql', 'django.contrib.gis.db.backends.postgis'):
+            with self.subTest(engine=engine):
+                snapshot.engines['default'] = engine
+
+                result, _ = self._extract(catalog_snapshot=snapshot)
+
+                self.assertEqual(list(result['default']), ['public', 'other'])
+                self.assertEqual(result['default']['public']['vote']['schema'], 'public')
+                self.assertEqual(result['default']['public']['vote']['belongs_to']['audit']['to_schema'], 'other')
+
+    def test_database_missing_from_snapshot(self):
+        """Test that a pattern for a database the snapshot does not hold is reported and skipped."""
+        snapshot = DURC_CatalogSnapshot.write(self.snapshot_path, {'default': connection}, mock.MagicMock(), self.mock_style)
+        self.patterns.append({'db': 'other_db', 'schema': 'public', 'table': None})
+
+        result, messages = self._extract(catalog_snapshot=snapshot)
+
+        self.assertNotIn('other_db', result)
+        self.assertIn(
+            f"ERROR: Error connecting to database 'other_db': \"Database 'other_db' is not in catalog snapshot {self.snapshot_path}\"",
+            messages
+        )
+
+    def test_durc_mine_snapshot_round_trip(self):
+        """Test that durc_mine --snapshot-in reproduces the model written by --snapshot-out."""
+        live_output = os.path.join(self.temp_dir, 'live.json')
+        offline_output = os.path.join(self.temp_dir, 'offline.json')
+        include = ['default.public', 'default.other']
+
+        call_command('durc_mine', include=include, output_json_file=live_output,
+                     snapshot_out=self.snapshot_path, stdout=StringIO())
+        detach_information_schema()
+        try:
+            call_command('durc_mine', include=include, output_json_file=offline_output,
+                         snapshot_in=self.snapshot_path, stdout=StringIO())
+        finally:
+            attach_information_schema()
+
+        self.assertEqual(
+            DurcDataLoader().load_relational_model(offline_output),
+            DurcDataLoader().load_relational_model(live_output)
+        )
+
+    def test_durc_mine_snapshot_errors(self):
+        """Test the durc_mine errors for missing snapshots and incompatible options."""
+        with self.assertRaisesRegex(CommandError, 'does not exist'):
+            call_command('durc_mine', include=['default'], snapshot_in=os.path.join(self.temp_dir, 'missing.sqlite'))
+
+        not_a_snapshot = os.path.join(self.temp_dir, 'model.json')
+        with open(not_a_snapshot, 'w') as f:
+            f.write('{}')
+        with self.assertRaisesRegex(CommandError, 'not a DURC catalog snapshot'):
+            call_command('durc_mine', include=['default'], snapshot_in=not_a_snapshot)
+
+        with self.assertRaisesRegex(CommandError, 'cannot be used together'):
+            call_command('durc_mine', include=['default'], snapshot_in=not_a_snapshot, snapshot_out=self.snapshot_path)
+        with self.assertRaisesRegex(CommandError, 'pg_catalog'):
+            call_command('durc_mine', include=['default'], snapshot_in=not_a_snapshot, introspection='pg_catalog')
+
+
+class TestMineFromSql(TransactionTestCase):
+    """Test that durc_mine --from-sql builds the same model as mining the same tables from the database."""
+
+    DDL = """
+        CREATE TABLE public.table_0 (id integer NOT NULL DEFAULT nextval('table_0_id_seq'::regclass), name character varying, PRIMARY KEY (id));
+        CREATE TABLE public.table_1 (
+            id integer NOT NULL DEFAULT nextval('table_1_id_seq'::regclass) PRIMARY KEY,
+            name character varying,
+            table_0_id integer REFERENCES public.table_0 (id)
+        );
+        CREATE TABLE public.vote (id integer PRIMARY KEY, up_table_1_id integer, audit_id integer);
+        CREATE TABLE other.audit (id integer PRIMARY KEY, vote_id integer);
+    """
+
+    def setUp(self):
+        attach_information_schema()
+        self.temp_dir = tempfile.mkdtemp()
+        add_table('public', 'table_0', [
+            ('id', 'integer', 'NO', "nextval('table_0_id_seq'::regclass)"),
+            ('name', 'character varying', 'YES', None),
+        ], primary_key=['id'])
+        add_table('public', 'table_1', [
+            ('id', 'integer', 'NO', "nextval('table_1_id_seq'::regclass)"),
+            ('name', 'character varying', 'YES', None),
+            ('table_0_id', 'integer', 'YES', None),
+        ], primary_key=['id'], foreign_keys=[('table_0_id', 'public', 'table_0', 'id')])
+        add_table('public', 'vote', [
+            ('id', 'integer', 'NO', None),
+            ('up_table_1_id', 'integer', 'YES', None),
+            ('audit_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+        add_table('other', 'audit', [('id', 'integer', 'NO', None), ('vote_id', 'integer', 'YES', None)],
+                  primary_key=['id'])
+
+    def tearDown(self):
+        detach_information_schema()
+        shutil.rmtree(self.temp_dir)
+
+    def test_from_sql_matches_live_catalog(self):
+        """Test that the model mined from DDL files equals the one mined from the database."""
+        sql_dir = os.path.join(self.temp_dir, 'sql')
+        os.makedirs(sql_dir)
+        # Split over two files, with the foreign key's target in the second one
+        statements = [statement for statement in self.DDL.split(';') if statement.strip()]
+        with open(os.path.join(sql_dir, 'a.sql'), 'w') as f:
+            f.write(';\n'.join(statements[1:]) + ';\n')
+        with open(os.path.join(sql_dir, 'b.sql'), 'w') as f:
+            f.write(statements[0] + ';\n')
+
+        include = ['default.public', 'default.other']
+        live_output = os.path.join(self.temp_dir, 'live.json')
+        sql_output = os.path.join(self.temp_dir, 'sql.json')
+        call_command('durc_mine', include=include, output_json_file=live_output, stdout=StringIO())
+        out = StringIO()
+        call_command('durc_mine', include=include, output_json_file=sql_output, from_sql=[sql_dir], stdout=out)
+
+        sql_model = DurcDataLoader().load_relational_model(sql_output)
+        self.assertEqual(sql_model, DurcDataLoader().load_relational_model(live_output))
+        self.assertEqual(sql_model['default']['vote']['belongs_to']['up_table_1']['to_table'], 'table_1')
+        self.assertIn(f"Parsed 3 tables from {os.path.join(sql_dir, 'a.sql')}", out.getvalue())
+        # No snapshot file is left behind
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['live.json', 'sql', 'sql.json'])
+
+    def test_from_sql_without_files(self):
+        """Test that --from-sql fails when no SQL file matches."""
+        with self.assertRaisesRegex(CommandError, 'No SQL files found'):
+            call_command('durc_mine', include=['default'], from_sql=[os.path.join(self.temp_dir, '*.sql')])
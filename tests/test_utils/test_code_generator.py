@@ -0,0 +1,50 @@
+import unittest
+from durc_is_crud.management.commands.durc_utils.code_generator import DURC_CodeGenerator
+
+
+def _column(name, data_type='int', **flags):
+    column = {
+        'column_name': name, 'data_type': data_type, 'is_primary_key': False, 'is_foreign_key': False,
+        'is_linked_key': False, 'is_nullable': False, 'is_auto_increment': False,
+    }
+    column.update(flags)
+    return column
+
+
+class TestKeysetFields(unittest.TestCase):
+    """Test cases for choosing the key generated list pages are paginated by."""
+
+    def _render_rest(self, columns, belongs_to=None):
+        table_info = {'table_name': 'claim', 'column_data': columns, 'belongs_to': belongs_to or {}}
+        known_tables = {('npd', 'public', 'claim'), ('npd', 'public', 'provider')}
+        rendered = DURC_CodeGenerator.render_table('npd', 'public', 'claim', table_info, known_tables)
+        return rendered['files']['npd/public/rest/claim_api.py']
+
+    def test_auto_increment_key_is_the_whole_keyset(self):
+        """Test that an auto-increment key column is the key on its own, even in a composite primary key."""
+        columns = [
+            _column('Claim ID', is_primary_key=True, is_auto_increment=True),
+            _column('line', is_primary_key=True),
+            _column('name', 'varchar'),
+        ]
+        self.assertEqual(DURC_CodeGenerator.keyset_fields(columns, {}), ['claim_id'])
+
+    def test_composite_key_uses_every_key_column(self):
+        """Test that a composite key orders by every key column, by the column of a foreign key."""
+        columns = [_column('provider_id', is_primary_key=True), _column('line', is_primary_key=True)]
+        belongs_to = {'provider': {'to_table': 'provider', 'to_db': 'npd', 'local_key': 'provider_id'}}
+        source = self._render_rest(columns, belongs_to)
+        self.assertIn("ordering = ['provider_id', 'line']", source)
+        self.assertIn("pagination_class = ClaimPagination", source)
+
+    def test_table_without_primary_key_keeps_default_pagination(self):
+        """Test that a table without a primary key gets no keyset pagination."""
+        columns = [_column('name', 'varchar'), _column('amount', 'decimal')]
+        self.assertEqual(DURC_CodeGenerator.keyset_fields(columns, {}), [])
+        source = self._render_rest(columns)
+        self.assertNotIn('pagination_class', source)
+        compile(source, 'claim_api.py', 'exec')
+
+
+if __name__ == '__main__':
+    unittest.main()
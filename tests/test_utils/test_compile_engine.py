@@ -0,0 +1,170 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from durc_is_crud.management.commands.durc_utils.compile_engine import DURC_CompileEngine
+from durc_is_crud.management.commands.durc_utils.compile_manifest import DURC_CompileManifest
+
+
+def _column(name, data_type='int', **flags):
+    column = {
+        'column_name': name, 'data_type': data_type, 'is_primary_key': False, 'is_foreign_key': False,
+        'is_linked_key': False, 'foreign_db': None, 'foreign_table': None, 'is_nullable': False,
+        'default_value': None, 'is_auto_increment': False,
+    }
+    column.update(flags)
+    return column
+
+
+def _synthetic_tables(count):
+    """Tables where every table_i belongs to table_0; table_0 has many of each of them."""
+    tables = []
+    for i in range(count):
+        table_info = {
+            'table_name': f"table_{i}",
+            'db': 'npd',
+            'column_data': [
+                _column('id', is_primary_key=True, is_auto_increment=True),
+                _column('name', 'varchar'),
+                _column('table_0_id', is_foreign_key=True, foreign_db='npd', foreign_table='table_0'),
+            ],
+            'belongs_to': {'table_0': {'type': 'table_0', 'to_table': 'table_0', 'to_db': 'npd', 'local_key': 'table_0_id'}},
+        }
+        if i == 0:
+            table_info['has_many'] = {
+                f"table_{j}": {'type': f"table_{j}", 'from_table': f"table_{j}", 'from_db': 'npd', 'from_column': 'table_0_id'}
+                for j in range(count)
+            }
+        tables.append(('npd', 'public', f"table_{i}", table_info))
+    return tables
+
+
+class TestCompileEngine(unittest.TestCase):
+    """Test cases for incremental compiles with the compile manifest."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, 'durc_generated')
+        self.manifest_path = os.path.join(self.temp_dir, 'DURC_compile_manifest.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _compile(self, tables, workers=1):
+        manifest = DURC_CompileManifest.load(self.manifest_path, self.output_dir)
+        result = DURC_CompileEngine(self.output_dir, workers=workers, manifest=manifest).compile(tables)
+        manifest.save(self.manifest_path)
+        return result
+
+    def _path(self, relative_path):
+        return os.path.join(self.output_dir, *relative_path.split('/'))
+
+    def _mtimes(self):
+        mtimes = {}
+        for root, _, names in os.walk(self.output_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                mtimes[os.path.relpath(path, self.output_dir)] = os.stat(path).st_mtime_ns
+        return mtimes
+
+    def test_no_op_compile_writes_nothing(self):
+        """Test that compiling an unchanged model renders no table and leaves every file untouched."""
+        tables = _synthetic_tables(10)
+        first = self._compile(tables)
+        self.assertEqual(first.tables_rendered, 10)
+        mtimes = self._mtimes()
+
+        second = self._compile(tables)
+        self.assertEqual(second.tables_rendered, 0)
+        self.assertEqual(second.files_written, 0)
+        self.assertEqual(self._mtimes(), mtimes)
+
+    def test_changed_entry_renders_table_and_related_tables(self):
+        """Test that a changed entry renders that table and the tables related to it only."""
+        tables = _synthetic_tables(10)
+        self._compile(tables)
+        mtimes = self._mtimes()
+
+        # table_5 is only related to table_0
+        tables[5][3]['column_data'].append(_column('notes', 'text', is_nullable=True))
+        result = self._compile(tables)
+
+        self.assertEqual(result.tables_rendered, 2)
+        changed = sorted(path for path, mtime in self._mtimes().items() if mtimes.get(path) != mtime)
+        # table_0's rendered files do not depend on table_5's columns, so their bytes are the same
+        self.assertEqual(changed, [
+            os.path.join('npd', 'public', 'forms', 'v_table_5_form.py'),
+            os.path.join('npd', 'public', 'models', 'g_table_5.py'),
+        ])
+
+    def test_query_plan_change_renders_distant_table(self):
+        """Test that a table is rendered again when a table two joins away gets a foreign key."""
+        tables = [
+            ('npd', 'public', 'a', {'table_name': 'a', 'column_data': [_column('id', is_primary_key=True), _column('b_id')],
+                                    'belongs_to': {'b': {'to_table': 'b', 'to_db': 'npd', 'local_key': 'b_id'}}}),
+            ('npd', 'public', 'b', {'table_name': 'b', 'column_data': [_column('id', is_primary_key=True), _column('c_id')],
+                                    'belongs_to': {'c': {'to_table': 'c', 'to_db': 'npd', 'local_key': 'c_id'}}}),
+            ('npd', 'public', 'c', {'table_name': 'c', 'column_data': [_column('id', is_primary_key=True), _column('d_id')]}),
+            ('npd', 'public', 'd', {'table_name': 'd', 'column_data': [_column('id', is_primary_key=True)]}),
+        ]
+        self._compile(tables)
+
+        tables[2][3]['belongs_to'] = {'d': {'to_table': 'd', 'to_db': 'npd', 'local_key': 'd_id'}}
+        result = self._compile(tables)
+        # c and d are related to the changed entry; a and b now join c__d and b__c__d
+        self.assertEqual(result.tables_rendered, 4)
+        with open(self._path('npd/public/models/g_a.py'), 'r') as f:
+            self.assertIn("SELECT_RELATED = ['b', 'b__c', 'b__c__d']", f.read())
+
+    def test_edited_or_deleted_files_are_restored(self):
+        """Test that a generated file changed or deleted since the last compile is written again."""
+        tables = _synthetic_tables(3)
+        self._compile(tables)
+        generated_path = self._path('npd/public/models/g_table_1.py')
+        with open(generated_path, 'r') as f:
+            expected = f.read()
+        with open(generated_path, 'a') as f:
+            f.write("# local edit\n")
+        os.remove(self._path('npd/public/rest/table_2_api.py'))
+
+        result = self._compile(tables)
+        self.assertEqual(result.tables_rendered, 2)
+        with open(generated_path, 'r') as f:
+            self.assertEqual(f.read(), expected)
+        self.assertTrue(os.path.exists(self._path('npd/public/rest/table_2_api.py')))
+
+    def test_dropped_table_files_are_removed(self):
+        """Test that the overwritten files of a dropped table are removed and the indexes updated."""
+        tables = _synthetic_tables(3)
+        self._compile(tables)
+
+        result = self._compile(tables[:2])
+        self.assertEqual(result.files_removed, 4)
+        self.assertFalse(os.path.exists(self._path('npd/public/models/g_table_2.py')))
+        # The validated model holds user code and is kept
+        self.assertTrue(os.path.exists(self._path('npd/public/models/v_table_2.py')))
+        with open(self._path('npd/public/models/__init__.py'), 'r') as f:
+            self.assertNotIn('Table2', f.read())
+
+    def test_manifest_for_another_output_dir_is_ignored(self):
+        """Test that the manifest only applies to the output directory it was written for."""
+        tables = _synthetic_tables(3)
+        self._compile(tables)
+        manifest = DURC_CompileManifest.load(self.manifest_path, os.path.join(self.temp_dir, 'elsewhere'))
+        self.assertEqual(manifest.tables, {})
+
+    def test_no_op_compile_of_large_model_is_fast(self):
+        """Micro-benchmark: a no-op compile of 2,000 tables takes well under a second."""
+        tables = _synthetic_tables(2000)
+        self._compile(tables)
+
+        start = time.perf_counter()
+        result = self._compile(tables)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result.tables_rendered, 0)
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,55 @@
 import unittest
+from unittest import mock
 from durc_is_crud.management.commands.durc_utils.data_type_mapper import DURC_DataTypeMapper
 
+
+def _baseline_map_data_type(pg_type):
+    """The mapper before the type registry, kept to check that the registry maps every type the same way"""
+    pg_type = pg_type.lower()
+    if pg_type in ('integer', 'int', 'int4', 'serial', 'bigint', 'int8', 'bigserial', 'smallint', 'int2', 'smallserial'):
+        return 'int'
+    if pg_type.startswith('varchar') or pg_type.startswith('character varying'):
+        return 'varchar'
+    if pg_type == 'text':
+        return 'text'
+    if pg_type == 'char' or pg_type.startswith('character'):
+        return 'char'
+    if pg_type == 'mediumtext':
+        return 'mediumtext'
+    if pg_type == 'longtext':
+        return 'longtext'
+    if pg_type == 'real' or pg_type == 'float4' or pg_type == 'float8' or pg_type == 'double precision':
+        return 'float'
+    if pg_type.startswith('numeric') or pg_type.startswith('decimal'):
+        return 'decimal'
+    if pg_type == 'date':
+        return 'date'
+    if pg_type == 'timestamp' or pg_type.startswith('timestamp'):
+        return 'timestamp'
+    if pg_type == 'time' or pg_type.startswith('time'):
+        return 'time'
+    if pg_type == 'datetime':
+        return 'datetime'
+    if pg_type == 'bytea':
+        return 'blob'
+    if pg_type == 'boolean' or pg_type == 'bool':
+        return 'tinyint'
+    return pg_type
+
+
+# Type names reported by PostgreSQL, MySQL and SQLite catalogs
+CATALOG_TYPES = [
+    'integer', 'int', 'INT4', 'serial', 'bigint', 'int8', 'bigserial', 'smallint', 'int2', 'smallserial',
+    'mediumint', 'tinyint', 'tinyint(1)', 'int(11)', 'bigint(20) unsigned',
+    'varchar', 'varchar(255)', 'character varying', 'character varying(80)', 'nvarchar(20)', 'text', 'char',
+    'char(2)', 'character', 'character(10)', 'mediumtext', 'longtext', 'tinytext', 'clob',
+    'real', 'float', 'float4', 'float8', 'double', 'double precision', 'numeric', 'numeric(10,2)', 'decimal(5,1)',
+    'date', 'datetime', 'datetime(6)', 'timestamp', 'timestamp with time zone', 'timestamptz', 'time',
+    'time without time zone', 'timetz', 'year', 'interval',
+    'bytea', 'blob', 'tinyblob', 'mediumblob', 'longblob', 'binary(16)', 'varbinary(10)',
+    'boolean', 'bool', 'bit(1)', 'json', 'jsonb', 'uuid', "enum('a','b')", 'geometry', '',
+]
+
 class TestDataTypeMapper(unittest.TestCase):
     def test_integer_types(self):
         """Test mapping of integer data types"""
@@ -59,6 +108,61 @@ class TestDataTypeMapper(unittest.TestCase):
         self.assertEqual(DURC_DataTypeMapper.map_data_type('json'), 'json')
         self.assertEqual(DURC_DataTypeMapper.map_data_type('jsonb'), 'jsonb')
         self.assertEqual(DURC_DataTypeMapper.map_data_type('uuid'), 'uuid')
+    
+    def test_every_dialect_matches_the_baseline_mapper(self):
+        """Test that the built-in registry maps every catalog type as the mapper before it did, in every dialect"""
+        expected = [_baseline_map_data_type(data_type) for data_type in CATALOG_TYPES]
+        for dialect in (None, 'postgresql', 'mysql', 'sqlite'):
+            self.assertEqual(DURC_DataTypeMapper.map_data_types(CATALOG_TYPES, dialect=dialect), expected, dialect)
+    
+    def test_dialects(self):
+        """Test that dialect entries win over the shared ones and fall back to them"""
+        exact_types = {dialect: dict(types) for dialect, types in DURC_DataTypeMapper.EXACT_TYPES.items()}
+        with mock.patch.object(DURC_DataTypeMapper, 'EXACT_TYPES', exact_types):
+            DURC_DataTypeMapper.register_type('double', 'float', dialect='mysql')
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('double', 'mysql'), 'float')
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('double', 'postgresql'), 'double')
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('character varying(255)', 'mysql'), 'varchar')
+        DURC_DataTypeMapper.clear_cache()
+        
+        self.assertEqual(DURC_DataTypeMapper.dialect_for_engine('django.db.backends.postgresql'), 'postgresql')
+        self.assertEqual(DURC_DataTypeMapper.dialect_for_engine('django.db.backends.mysql'), 'mysql')
+        self.assertEqual(DURC_DataTypeMapper.dialect_for_engine('django.db.backends.sqlite3'), 'sqlite')
+        self.assertIsNone(DURC_DataTypeMapper.dialect_for_engine('django.db.backends.oracle'))
+    
+    def test_batch_mapping(self):
+        """Test mapping a whole table's column types in one call"""
+        self.assertEqual(
+            DURC_DataTypeMapper.map_data_types(['integer', 'character varying(80)', 'timestamp with time zone', 'jsonb']),
+            ['int', 'varchar', 'timestamp', 'jsonb']
+        )
+        self.assertEqual(DURC_DataTypeMapper.map_data_types([]), [])
+    
+    def test_register_custom_types(self):
+        """Test registering domain and extension types, and that the cache is cleared"""
+        exact_types = {dialect: dict(types) for dialect, types in DURC_DataTypeMapper.EXACT_TYPES.items()}
+        prefix_types = {dialect: list(types) for dialect, types in DURC_DataTypeMapper.PREFIX_TYPES.items()}
+        registry_fingerprint = DURC_DataTypeMapper.registry_fingerprint()
+        with mock.patch.object(DURC_DataTypeMapper, 'EXACT_TYPES', exact_types), \
+                mock.patch.object(DURC_DataTypeMapper, 'PREFIX_TYPES', prefix_types):
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('citext'), 'citext')
+            DURC_DataTypeMapper.register_type('CITEXT', 'text')
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('citext'), 'text')
+            self.assertNotEqual(DURC_DataTypeMapper.registry_fingerprint(), registry_fingerprint)
+            
+            DURC_DataTypeMapper.register_type('geometry', 'blob', dialect='postgresql', prefix=True)
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('geometry(Point,4326)', 'postgresql'), 'blob')
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('geometry(Point,4326)', 'mysql'), 'geometry(point,4326)')
+            
+            # A longer registered prefix wins over a shorter built-in one
+            DURC_DataTypeMapper.register_type('timestamptz_range', 'text', prefix=True)
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('timestamptz_range'), 'text')
+            self.assertEqual(DURC_DataTypeMapper.map_data_type('timestamptz'), 'timestamp')
+        
+        DURC_DataTypeMapper.clear_cache()
+        self.assertEqual(DURC_DataTypeMapper.map_data_type('citext'), 'citext')
+        self.assertEqual(DURC_DataTypeMapper.registry_fingerprint(), registry_fingerprint)
+        self.assertEqual(DURC_DataTypeMapper.map_data_type('geometry', 'postgresql'), 'geometry')
 
 if __name__ == '__main__':
     unittest.main()
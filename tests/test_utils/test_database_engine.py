@@ -0,0 +1,36 @@
+import unittest
+from durc_is_crud.management.commands.durc_utils.database_engine import DURC_DatabaseEngine
+from durc_is_crud.management.commands.durc_utils.data_type_mapper import DURC_DataTypeMapper
+
+
+ENGINES = {
+    'django.db.backends.postgresql': 'postgresql',
+    'django.db.backends.postgresql_psycopg2': 'postgresql',
+    'django.contrib.gis.db.backends.postgis': 'postgresql',
+    'django_psycopg_pool.backend': 'postgresql',
+    'django.db.backends.mysql': 'mysql',
+    'django.contrib.gis.db.backends.mysql': 'mysql',
+    'django.db.backends.sqlite3': 'sqlite',
+    'django.contrib.gis.db.backends.spatialite': 'sqlite',
+    'django.db.backends.oracle': None,
+}
+
+
+class TestDatabaseEngine(unittest.TestCase):
+    """Test cases for telling the database of a Django ENGINE setting."""
+
+    def test_dialect(self):
+        """Test the dialect of Django's own, GIS and driver-named backends."""
+        for engine, dialect in ENGINES.items():
+            self.assertEqual(DURC_DatabaseEngine.dialect(engine), dialect, engine)
+            self.assertEqual(DURC_DatabaseEngine.is_postgresql(engine), dialect == 'postgresql', engine)
+        self.assertIsNone(DURC_DatabaseEngine.dialect(None))
+
+    def test_data_type_dialect_agrees(self):
+        """Test that the data type registry picks the same dialect for every engine."""
+        for engine, dialect in ENGINES.items():
+            self.assertEqual(DURC_DataTypeMapper.dialect_for_engine(engine), dialect, engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
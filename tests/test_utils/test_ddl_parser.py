@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+from durc_is_crud.management.commands.durc_utils.ddl_parser import DURC_DDLParser
+
+
+POSTGRESQL_DDL = """
+-- Foreign keys can come before the tables, as in files written by durc-mine-fkeys
+ALTER TABLE ONLY billing.Invoice
+    ADD CONSTRAINT invoice_org_fkey FOREIGN KEY (payer_id) REFERENCES public.organization(id);
+
+CREATE TABLE IF NOT EXISTS organization (
+    id serial PRIMARY KEY,
+    "Legal Name" varchar(255) NOT NULL DEFAULT 'unknown'::character varying,
+    parent_id int REFERENCES organization ON DELETE CASCADE,
+    tags text[],
+    note text DEFAULT NULL, /* free text; commas, ( and ; are fine in comments */
+    created_at timestamptz DEFAULT now() NOT NULL
+);
+
+CREATE TABLE billing.invoice (
+    id bigint GENERATED ALWAYS AS IDENTITY,
+    payer_id integer,
+    amount numeric(10, 2) CHECK (amount > 0),
+    CONSTRAINT invoice_pkey PRIMARY KEY (id),
+    UNIQUE (payer_id, amount)
+);
+
+CREATE INDEX invoice_payer ON billing.invoice (payer_id);
+CREATE TABLE invoice_copy AS SELECT * FROM billing.invoice;
+"""
+
+MYSQL_DDL = """
+CREATE TABLE `author` (
+  `id` int(11) unsigned NOT NULL AUTO_INCREMENT,
+  `name` varchar(100) DEFAULT NULL,
+  `book_id` int(11) NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `book_id` (`book_id`),
+  CONSTRAINT `author_book` FOREIGN KEY (`book_id`) REFERENCES `book` (`id`)
+) ENGINE=InnoDB;
+"""
+
+
+class TestDDLParser(unittest.TestCase):
+    """Test cases for turning DDL into information_schema rows."""
+
+    def _rows(self, sql, postgresql, default_schema):
+        parser = DURC_DDLParser(postgresql=postgresql)
+        parser.parse_sql(sql)
+        return parser.information_schema_rows(default_schema)
+
+    def test_postgresql_ddl(self):
+        """Test columns, keys and types for PostgreSQL DDL, including an ALTER TABLE before its table."""
+        rows = self._rows(POSTGRESQL_DDL, postgresql=True, default_schema='public')
+
+        self.assertEqual(rows['tables'], [('public', 'organization', 'BASE TABLE'), ('billing', 'invoice', 'BASE TABLE')])
+        self.assertEqual([row[2:6] for row in rows['columns'] if row[1] == 'organization'], [
+            ('id', 'integer', 'NO', "nextval('organization_id_seq'::regclass)"),
+            ('Legal Name', 'character varying', 'NO', "'unknown'::character varying"),
+            ('parent_id', 'integer', 'YES', None),
+            ('tags', 'ARRAY', 'YES', None),
+            ('note', 'text', 'YES', None),
+            ('created_at', 'timestamp with time zone', 'NO', 'now()'),
+        ])
+        self.assertEqual([row[2:6] for row in rows['columns'] if row[1] == 'invoice'], [
+            ('id', 'bigint', 'NO', None),
+            ('payer_id', 'integer', 'YES', None),
+            ('amount', 'numeric', 'YES', None),
+        ])
+
+        constraints = {name: (table, kind) for name, _, table, kind in rows['table_constraints']}
+        self.assertEqual(sorted(constraints.values()), [
+            ('invoice', 'FOREIGN KEY'), ('invoice', 'PRIMARY KEY'),
+            ('organization', 'FOREIGN KEY'), ('organization', 'PRIMARY KEY'),
+        ])
+        foreign_keys = sorted(
+            (kcu[2], kcu[3], ccu[1], ccu[2], ccu[3])
+            for kcu in rows['key_column_usage'] if constraints[kcu[0]][1] == 'FOREIGN KEY'
+            for ccu in rows['constraint_column_usage'] if ccu[0] == kcu[0]
+        )
+        # A REFERENCES without columns points at the referenced table's primary key
+        self.assertEqual(foreign_keys, [
+            ('invoice', 'payer_id', 'public', 'organization', 'id'),
+            ('organization', 'parent_id', 'public', 'organization', 'id'),
+        ])
+
+    def test_mysql_ddl(self):
+        """Test that other dialects keep identifier case and report the base type name."""
+        rows = self._rows(MYSQL_DDL, postgresql=False, default_schema='library')
+
+        self.assertEqual([row[2:6] for row in rows['columns']], [
+            ('id', 'int', 'NO', 'auto_increment'),
+            ('name', 'varchar', 'YES', None),
+            ('book_id', 'int', 'NO', None),
+        ])
+        self.assertIn(('library', 'book', 'id'), [row[1:] for row in rows['constraint_column_usage']])
+
+    def test_redefined_table_replaces_earlier_definition(self):
+        """Test that a table defined again in a later file replaces the first definition."""
+        parser = DURC_DDLParser(postgresql=True)
+        parser.parse_sql("CREATE TABLE a (id integer PRIMARY KEY, old_column text); CREATE TABLE b (id integer);")
+        parser.parse_sql("CREATE TABLE A (id integer PRIMARY KEY, new_column text);")
+
+        rows = parser.information_schema_rows('public')
+        self.assertEqual([row[1] for row in rows['tables']], ['a', 'b'])
+        self.assertEqual([row[2] for row in rows['columns'] if row[1] == 'a'], ['id', 'new_column'])
+
+    def test_find_sql_files(self):
+        """Test that directories are searched recursively and merged files are skipped."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(temp_dir, 'nested'))
+            for name in ('b.sql', 'a.sql', '_merged_.sql', 'notes.txt', os.path.join('nested', 'c.sql')):
+                with open(os.path.join(temp_dir, name), 'w') as f:
+                    f.write('')
+
+            found = DURC_DDLParser.find_sql_files([temp_dir])
+            self.assertEqual(
+                [os.path.relpath(path, temp_dir) for path in found],
+                ['a.sql', 'b.sql', os.path.join('nested', 'c.sql')]
+            )
+            by_pattern = DURC_DDLParser.find_sql_files([os.path.join(temp_dir, 'b.sql'), os.path.join(temp_dir, '*.sql')])
+            self.assertEqual([os.path.basename(path) for path in by_pattern], ['b.sql', '_merged_.sql', 'a.sql'])
+            self.assertEqual(DURC_DDLParser.find_sql_files([os.path.join(temp_dir, 'missing.sql')]), [])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
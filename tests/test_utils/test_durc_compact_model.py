@@ -0,0 +1,143 @@
+import os
+import json
+import pickle
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from durc_is_crud.shared.durc_model_writer import DurcModelWriter
+from durc_is_crud.shared import durc_compact_model
+from durc_is_crud.shared.durc_compact_model import (
+    DurcCompactModelWriter, DurcCompactModelReader, get_model_writer_class
+)
+
+
+def _synthetic_model(table_count):
+    """A relational model shaped like durc_mine output, with one PostgreSQL and one MySQL database."""
+    def table_info(table, index, schema=None):
+        info = {
+            'table_name': table,
+            'db': 'npd' if schema else 'legacy',
+            'column_data': [
+                {
+                    'column_name': 'id', 'data_type': 'int', 'is_primary_key': True, 'is_foreign_key': False,
+                    'is_linked_key': False, 'foreign_db': None, 'foreign_table': None, 'is_nullable': False,
+                    'default_value': None, 'is_auto_increment': True,
+                },
+                {
+                    'column_name': f"table_{index - 1}_id", 'data_type': 'int', 'is_primary_key': False,
+                    'is_foreign_key': True, 'is_linked_key': True, 'foreign_db': 'npd', 'foreign_table': f"table_{index - 1}",
+                    'is_nullable': True, 'default_value': None, 'is_auto_increment': False,
+                },
+                {
+                    'column_name': 'näme', 'data_type': 'varchar', 'is_primary_key': False, 'is_foreign_key': False,
+                    'is_linked_key': False, 'foreign_db': None, 'foreign_table': None, 'is_nullable': True,
+                    'default_value': "'unnamed'::character varying", 'is_auto_increment': False,
+                },
+            ],
+            'create_table_sql': f"CREATE TABLE {table} (\n  id INT NOT NULL,\n  PRIMARY KEY (id)\n);",
+            'has_many': {f"table_{index + 1}": {'prefix': None, 'type': f"table_{index + 1}", 'from_column': f"{table}_id"}},
+            'belongs_to': {},
+        }
+        if schema:
+            info['schema'] = schema
+        return info
+
+    return {
+        'npd': {
+            'public': {f"table_{i}": table_info(f"table_{i}", i, 'public') for i in range(table_count)},
+            'billing': {'invoice': table_info('invoice', 0, 'billing')},
+        },
+        'empty': {},
+        'legacy': {f"table_{i}": table_info(f"table_{i}", i) for i in range(table_count // 2)},
+    }
+
+
+class TestDurcCompactModel(unittest.TestCase):
+    """Test cases for the compact relational model format."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.compact_path = os.path.join(self.temp_dir, 'DURC_relational_model.durcpack')
+        self.json_path = os.path.join(self.temp_dir, 'DURC_relational_model.json')
+        self.model = _synthetic_model(200)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip_matches_json(self):
+        """Test that a model written in the compact format loads exactly like its JSON form."""
+        DurcModelWriter.write_relational_model(self.json_path, self.model)
+        DurcCompactModelWriter.write_relational_model(self.compact_path, self.model)
+
+        loader = DurcDataLoader()
+        json_model = loader.load_relational_model(self.json_path)
+        compact_model = loader.load_relational_model(self.compact_path)
+
+        self.assertEqual(compact_model, json_model)
+        # Same key order too, so re-serializing gives the same JSON text
+        self.assertEqual(json.dumps(compact_model, indent=2), json.dumps(json_model, indent=2))
+
+    def test_streamed_file_matches_whole_model_file(self):
+        """Test that streaming tables gives the same file as writing the whole model."""
+        DurcCompactModelWriter.write_relational_model(self.compact_path, self.model)
+        with open(self.compact_path, 'rb') as f:
+            whole_model_bytes = f.read()
+
+        with DurcCompactModelWriter(self.compact_path) as writer:
+            for db_name, db_model in self.model.items():
+                writer.add_database(db_name)
+                for key, value in db_model.items():
+                    if 'table_name' in value:
+                        writer.add_table(db_name, None, key, value)
+                    else:
+                        for table, table_info in value.items():
+                            writer.add_table(db_name, key, table, table_info)
+        with open(self.compact_path, 'rb') as f:
+            self.assertEqual(f.read(), whole_model_bytes)
+
+    def test_compact_file_is_smaller(self):
+        """Test that string interning makes the compact file much smaller than the JSON file."""
+        DurcModelWriter.write_relational_model(self.json_path, self.model)
+        DurcCompactModelWriter.write_relational_model(self.compact_path, self.model)
+        self.assertLess(os.path.getsize(self.compact_path) * 2, os.path.getsize(self.json_path))
+
+    def test_read_single_table(self):
+        """Test that the index allows decoding a single table."""
+        DurcCompactModelWriter.write_relational_model(self.compact_path, self.model)
+        reader = DurcCompactModelReader.read_file(self.compact_path)
+
+        self.assertEqual(reader.databases, ['npd', 'empty', 'legacy'])
+        db_name, schema_name, table, chunk, position = reader.tables[200]
+        self.assertEqual((db_name, schema_name, table), ('npd', 'billing', 'invoice'))
+        self.assertEqual(reader.read_table(chunk, position), self.model['npd']['billing']['invoice'])
+
+    def test_writer_chosen_by_extension(self):
+        """Test that the output format is picked by file extension."""
+        self.assertIs(get_model_writer_class('model.durcpack'), DurcCompactModelWriter)
+        self.assertIs(get_model_writer_class('MODEL.DURCPACK'), DurcCompactModelWriter)
+        self.assertIs(get_model_writer_class('model.json'), DurcModelWriter)
+
+    def test_invalid_files_are_rejected(self):
+        """Test that files that are not compact models, or that contain objects, are refused."""
+        with open(self.compact_path, 'wb') as f:
+            f.write(b'{"npd": {}}' * 10)
+        with self.assertRaises(Exception):
+            DurcDataLoader().load_relational_model(self.compact_path)
+
+        # A well-formed file whose table record would construct an arbitrary object
+        payload = pickle.dumps([OrderedDict(id=1)], protocol=4)
+        header = durc_compact_model._HEADER.pack(durc_compact_model._MAGIC, durc_compact_model._FORMAT_VERSION)
+        index = pickle.dumps(
+            {'databases': ['npd'], 'chunks': [(len(header), len(payload))], 'tables': [('npd', None, 'evil', 0, 0)]},
+            protocol=4
+        )
+        trailer = durc_compact_model._TRAILER.pack(len(header) + len(payload), len(index), durc_compact_model._MAGIC)
+        reader = DurcCompactModelReader(header + payload + index + trailer)
+        with self.assertRaises(pickle.UnpicklingError):
+            reader.load_relational_model()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from durc_is_crud.shared.durc_model_writer import DurcModelWriter
+from durc_is_crud.shared.durc_compact_model import DurcCompactModelWriter
+from .test_durc_compact_model import _synthetic_model
+
+
+def _flatten(relational_model):
+    """All (db, schema or None, table, table_info) entries of a relational model, in order."""
+    for db_name, db_model in relational_model.items():
+        for key, value in db_model.items():
+            if isinstance(value.get('table_name'), str):
+                yield db_name, None, key, value
+            else:
+                for table, table_info in value.items():
+                    yield db_name, key, table, table_info
+
+
+class TestDurcLazyRelationalModel(unittest.TestCase):
+    """Test cases for lazy, memory-mapped access to relational model files."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.model = _synthetic_model(20)
+        self.model['npd']['public']['table_3']['create_table_sql'] = 'CREATE TABLE "odd {name}" (\n  "]" INT\n);'
+        self.model['npd']['empty_schema'] = {}
+        self.loader = DurcDataLoader()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, file_name, write):
+        path = os.path.join(self.temp_dir, file_name)
+        write(path, self.model)
+        return path
+
+    def _assert_lazy_model_matches(self, path):
+        with self.loader.open_relational_model(path) as lazy_model:
+            self.assertEqual(lazy_model.databases, ['npd', 'empty', 'legacy'])
+            self.assertEqual(list(lazy_model.iter_tables()), list(_flatten(self.model)))
+            self.assertEqual(len(lazy_model), 31)
+
+            self.assertEqual(lazy_model.get_table('npd', 'public', 'table_3'), self.model['npd']['public']['table_3'])
+            self.assertEqual(lazy_model.get_table('npd', 'billing', 'invoice'), self.model['npd']['billing']['invoice'])
+            # Databases without a schema layer ignore the schema name
+            self.assertEqual(lazy_model.get_table('legacy', 'legacy', 'table_9'), self.model['legacy']['table_9'])
+            self.assertIsNone(lazy_model.get_table('npd', 'public', 'missing'))
+
+            billing_tables = [table for _, _, table, _ in lazy_model.iter_tables('npd', 'billing')]
+            self.assertEqual(billing_tables, ['invoice'])
+            self.assertEqual(len(list(lazy_model.iter_tables('legacy'))), 10)
+            return lazy_model
+
+    def test_indented_json(self):
+        """Test that durc_mine's JSON layout is indexed without loading the whole file."""
+        path = self._write('model.json', DurcModelWriter.write_relational_model)
+        lazy_model = self._assert_lazy_model_matches(path)
+        self.assertIsNone(lazy_model._loaded_model)
+
+    def test_compact_model(self):
+        """Test that .durcpack files are read through their own index."""
+        path = self._write('model.durcpack', DurcCompactModelWriter.write_relational_model)
+        self._assert_lazy_model_matches(path)
+
+    def test_other_json_layouts(self):
+        """Test that JSON in any other layout still works, by loading it in full."""
+        def write_minified(path, model):
+            with open(path, 'w') as f:
+                json.dump(model, f)
+
+        path = self._write('model.json', write_minified)
+        self._assert_lazy_model_matches(path)
+
+    def test_tables_without_leading_table_name(self):
+        """Test that tables whose first key is not table_name are not dropped from the indented layout."""
+        def write_sorted(path, model):
+            with open(path, 'w') as f:
+                json.dump(model, f, indent=2, sort_keys=True)
+
+        # Only the tables whose keys sort after table_name would be found by the indented index
+        self.model['npd']['public']['zeta'] = {'column_data': [], 'table_name': 'zeta'}
+        self.model['legacy']['zeta'] = {'column_data': [], 'table_name': 'zeta'}
+        path = self._write('model.json', write_sorted)
+        with self.loader.open_relational_model(path) as lazy_model:
+            self.assertEqual(len(lazy_model), 33)
+            self.assertEqual(sorted(lazy_model.iter_tables()), sorted(_flatten(self.model)))
+            self.assertEqual(lazy_model.get_table('npd', 'public', 'zeta')['table_name'], 'zeta')
+            self.assertEqual(lazy_model.get_table('legacy', None, 'zeta')['table_name'], 'zeta')
+
+        # A single hand-edited table in durc_mine's layout is enough to fall back to a full load
+        self.model = {'db': {'public': {
+            'provider': {'table_name': 'provider', 'column_data': []},
+            'zeta': {'column_data': [], 'table_name': 'zeta'},
+        }}}
+        path = self._write('edited.json', DurcModelWriter.write_relational_model)
+        with self.loader.open_relational_model(path) as lazy_model:
+            self.assertEqual(lazy_model.table_keys, [('db', 'public', 'provider'), ('db', 'public', 'zeta')])
+
+    def test_table_named_table_name(self):
+        """Test that a schema whose first table is named table_name is not indexed as a table."""
+        self.model = {
+            'npd': {'public': {
+                'table_name': {'table_name': 'table_name', 'column_data': []},
+                'provider': {'table_name': 'provider', 'column_data': []},
+            }},
+            'legacy': {'table_name': {'table_name': 'table_name', 'column_data': []}},
+        }
+        path = self._write('model.json', DurcModelWriter.write_relational_model)
+        with self.loader.open_relational_model(path) as lazy_model:
+            self.assertIsNone(lazy_model._loaded_model)
+            self.assertEqual(lazy_model.table_keys, [
+                ('npd', 'public', 'table_name'), ('npd', 'public', 'provider'), ('legacy', None, 'table_name')
+            ])
+            self.assertEqual(list(lazy_model.iter_tables()), list(_flatten(self.model)))
+            self.assertEqual(lazy_model.get_table('npd', 'public', 'provider')['table_name'], 'provider')
+
+    def test_empty_model(self):
+        """Test that an empty model has no tables."""
+        path = os.path.join(self.temp_dir, 'model.json')
+        DurcModelWriter.write_relational_model(path, {})
+        with self.loader.open_relational_model(path) as lazy_model:
+            self.assertEqual(len(lazy_model), 0)
+            self.assertEqual(list(lazy_model.iter_tables()), [])
+
+    def test_missing_file(self):
+        """Test that a missing file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            self.loader.open_relational_model(os.path.join(self.temp_dir, 'missing.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from django.test import TransactionTestCase
+from durc_is_crud.shared.durc_model_writer import DurcModelWriter
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from .information_schema_fixture import attach_information_schema, detach_information_schema, add_table
+
+
+def _table_info(table, schema=None):
+    table_info = {
+        'table_name': table,
+        'db': 'mydb',
+        'column_data': [{'column_name': 'id', 'data_type': 'int', 'default_value': None}],
+        'create_table_sql': f"CREATE TABLE {table} (\n  id INT\n)",
+        'has_many': {},
+        'belongs_to': {},
+    }
+    if schema:
+        table_info['schema'] = schema
+    return table_info
+
+
+class TestDurcModelWriter(unittest.TestCase):
+    """Test cases for the streaming relational model writer."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.temp_dir, 'DURC_relational_model.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _read_output(self):
+        with open(self.output_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_streamed_output_matches_json_dump(self):
+        """Test that streaming produces exactly the text of json.dump(indent=2)."""
+        expected_model = {
+            'pgdb': {
+                'public': {'users': _table_info('users', 'public'), 'posts': _table_info('posts', 'public')},
+                'billing': {'invoices': _table_info('invoices', 'billing')},
+            },
+            'empty_db': {},
+            'mydb': {'accounts': _table_info('accounts'), 'café': _table_info('café')},
+        }
+
+        with DurcModelWriter(self.output_path) as writer:
+            for db_name, db_model in expected_model.items():
+                writer.add_database(db_name)
+                for key, value in db_model.items():
+                    if 'table_name' in value:
+                        writer.add_table(db_name, None, key, value)
+                    else:
+                        for table, table_info in value.items():
+                            writer.add_table(db_name, key, table, table_info)
+
+        self.assertEqual(self._read_output(), json.dumps(expected_model, indent=2))
+
+    def test_empty_model(self):
+        """Test that a writer with no tables writes an empty object."""
+        with DurcModelWriter(self.output_path):
+            pass
+        self.assertEqual(self._read_output(), json.dumps({}, indent=2))
+
+    def test_duplicate_tables_are_written_once(self):
+        """Test that a table added twice appears once."""
+        with DurcModelWriter(self.output_path) as writer:
+            writer.add_table('mydb', None, 'accounts', _table_info('accounts'))
+            writer.add_table('mydb', None, 'accounts', _table_info('accounts'))
+        self.assertEqual(json.loads(self._read_output()), {'mydb': {'accounts': _table_info('accounts')}})
+
+    def test_failure_leaves_existing_output_untouched(self):
+        """Test that an error while writing never replaces the output file."""
+        with open(self.output_path, 'w') as f:
+            f.write('{"previous": {}}')
+
+        with self.assertRaises(RuntimeError):
+            with DurcModelWriter(self.output_path) as writer:
+                writer.add_table('mydb', None, 'accounts', _table_info('accounts'))
+                raise RuntimeError('mining failed')
+
+        # A database that is split across the file cannot be committed
+        with self.assertRaises(RuntimeError):
+            with DurcModelWriter(self.output_path) as writer:
+                writer.add_table('db1', None, 'accounts', _table_info('accounts'))
+                writer.add_table('db2', None, 'accounts', _table_info('accounts'))
+                with self.assertRaises(ValueError):
+                    writer.add_table('db1', None, 'posts', _table_info('posts'))
+
+        self.assertEqual(self._read_output(), '{"previous": {}}')
+        self.assertEqual(os.listdir(self.temp_dir), ['DURC_relational_model.json'])
+
+    def test_write_relational_model(self):
+        """Test that a complete model is written atomically with json.dump formatting."""
+        model = {'mydb': {'accounts': _table_info('accounts')}}
+        DurcModelWriter.write_relational_model(self.output_path, model)
+
+        self.assertEqual(self._read_output(), json.dumps(model, indent=2))
+        self.assertEqual(os.listdir(self.temp_dir), ['DURC_relational_model.json'])
+
+
+class TestStreamingExtraction(TransactionTestCase):
+    """Test that streaming extraction writes the same model as in-memory extraction."""
+
+    def setUp(self):
+        attach_information_schema()
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.temp_dir, 'DURC_relational_model.json')
+        for table in ('users', 'posts'):
+            add_table('public', table, [('id', 'integer', 'NO', None), ('account_id', 'integer', 'YES', None)],
+                      primary_key=['id'])
+        add_table('billing', 'account', [('id', 'integer', 'NO', None)], primary_key=['id'])
+
+    def tearDown(self):
+        detach_information_schema()
+        shutil.rmtree(self.temp_dir)
+
+    def test_streamed_model_matches_in_memory_model(self):
+        """Test that interleaved patterns are grouped and streamed to the same JSON text."""
+        patterns = [
+            {'db': 'default', 'schema': 'public', 'table': 'users'},
+            {'db': 'unknown_db', 'schema': 'billing', 'table': None},
+            {'db': 'default', 'schema': 'billing', 'table': None},
+            {'db': 'default', 'schema': 'public', 'table': 'posts'},
+        ]
+        for workers in (1, 3):
+            relational_model = DURC_RelationalModelExtractor.extract_relational_model(
+                patterns, mock.MagicMock(), mock.MagicMock(), workers=workers
+            )
+            with DurcModelWriter(self.output_path) as writer:
+                result = DURC_RelationalModelExtractor.extract_relational_model(
+                    patterns, mock.MagicMock(), mock.MagicMock(), workers=workers, table_writer=writer
+                )
+
+            self.assertIsNone(result)
+            self.assertEqual(list(relational_model['default']), ['users', 'account', 'posts'])
+            with open(self.output_path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read(), json.dumps(relational_model, indent=2))
+
+    def test_postgresql_patterns_are_grouped_by_schema(self):
+        """Test that patterns are grouped by schema only for databases with a schema layer."""
+        patterns = [
+            {'db': 'pgdb', 'schema': 'public', 'table': 'users'},
+            {'db': 'default', 'schema': 'public', 'table': 'users'},
+            {'db': 'pgdb', 'schema': 'billing', 'table': None},
+            {'db': 'default', 'schema': 'billing', 'table': None},
+            {'db': 'pgdb', 'schema': 'public', 'table': 'posts'},
+            {'db': 'default', 'schema': 'public', 'table': 'posts'},
+        ]
+        with mock.patch.object(DURC_RelationalModelExtractor, '_is_postgresql',
+                               side_effect=lambda conn: conn.alias == 'pgdb'), \
+                mock.patch('durc_is_crud.management.commands.durc_utils.relational_model_extractor.connections',
+                           {'pgdb': mock.MagicMock(alias='pgdb'), 'default': mock.MagicMock(alias='default')}):
+            grouped = DURC_RelationalModelExtractor._group_patterns(patterns)
+
+        self.assertEqual(
+            [(pattern['db'], pattern['schema'], pattern['table']) for pattern in grouped],
+            [
+                ('pgdb', 'public', 'users'), ('pgdb', 'public', 'posts'), ('pgdb', 'billing', None),
+                ('default', 'public', 'users'), ('default', 'billing', None), ('default', 'public', 'posts'),
+            ]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
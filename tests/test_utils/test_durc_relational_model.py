@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from durc_is_crud.shared.durc_model_writer import DurcModelWriter
+from durc_is_crud.shared.durc_relational_model import DurcRelationalModel
+
+
+def _column(name, data_type='int', **flags):
+    column_info = {
+        'column_name': name, 'data_type': data_type, 'is_primary_key': name == 'id',
+        'is_foreign_key': False, 'is_linked_key': name.endswith('_id'), 'foreign_db': None,
+        'foreign_table': None, 'is_nullable': False, 'default_value': None, 'is_auto_increment': False,
+    }
+    column_info.update(flags)
+    return column_info
+
+
+class TestDurcRelationalModel(unittest.TestCase):
+    """Test cases for the typed relational model and its indexes."""
+
+    def setUp(self):
+        self.relational_model = {
+            'npd': {
+                'public': {
+                    'organization': {
+                        'table_name': 'organization', 'db': 'npd', 'schema': 'public',
+                        'column_data': [_column('id'), _column('name', 'varchar')],
+                        'has_many': {
+                            'practitioner': {
+                                'prefix': None, 'type': 'practitioner', 'from_table': 'practitioner',
+                                'from_db': 'npd', 'from_column': 'organization_id'
+                            },
+                        },
+                    },
+                    'practitioner': {
+                        'table_name': 'practitioner', 'db': 'npd', 'schema': 'public',
+                        'column_data': [
+                            _column('id'),
+                            _column('organization_id', is_foreign_key=True, foreign_db='npd', foreign_table='organization'),
+                        ],
+                        'belongs_to': {
+                            'organization': {
+                                'prefix': None, 'type': 'organization', 'to_table': 'organization',
+                                'to_db': 'npd', 'local_key': 'organization_id'
+                            },
+                        },
+                    },
+                },
+                'billing': {
+                    'invoice': {
+                        'table_name': 'invoice', 'db': 'npd', 'schema': 'billing',
+                        'column_data': [_column('id'), _column('payer_id')],
+                        'belongs_to': {
+                            'payer': {
+                                'prefix': 'payer', 'type': 'organization', 'to_table': 'organization',
+                                'to_db': 'npd', 'to_schema': 'public', 'local_key': 'payer_id'
+                            },
+                        },
+                    },
+                },
+            },
+            'legacy': {
+                'account': {'table_name': 'account', 'db': 'legacy', 'column_data': [_column('id')]},
+            },
+            'empty': {},
+        }
+
+    def test_structure(self):
+        """Test that schema layers and databases without one are told apart."""
+        model = DurcRelationalModel.from_dict(self.relational_model)
+
+        self.assertEqual(list(model.databases), ['npd', 'legacy', 'empty'])
+        self.assertEqual(list(model.databases['npd'].schemas), ['public', 'billing'])
+        self.assertEqual(model.databases['npd'].tables, {})
+        self.assertEqual(list(model.databases['legacy'].tables), ['account'])
+        self.assertEqual(len(model), 4)
+        self.assertEqual(
+            [table.qualified_name for table in model.iter_tables()],
+            ['npd.public.organization', 'npd.public.practitioner', 'npd.billing.invoice', 'legacy.account']
+        )
+        self.assertEqual([table.name for table in model.iter_tables('npd', 'billing')], ['invoice'])
+
+    def test_indexes(self):
+        """Test the qualified name, column and inbound foreign key indexes."""
+        model = DurcRelationalModel.from_dict(self.relational_model)
+        organization = model.tables_by_name['npd.public.organization']
+        practitioner = model.get_table('npd', 'public', 'practitioner')
+        invoice = model.get_table('npd', 'billing', 'invoice')
+
+        self.assertIs(model.get_table('legacy', 'ignored', 'account'), model.tables_by_name['legacy.account'])
+        self.assertIsNone(model.get_table('npd', 'public', 'missing'))
+
+        column = practitioner.columns_by_name['organization_id']
+        self.assertTrue(column.is_foreign_key)
+        self.assertEqual(column.foreign_table, 'organization')
+        self.assertIs(column.table, practitioner)
+
+        self.assertIs(practitioner.belongs_to['organization'].target, organization)
+        self.assertIs(invoice.belongs_to['payer'].target, organization)
+        self.assertIs(organization.has_many['practitioner'].target, practitioner)
+        self.assertEqual(
+            [(relationship.table.name, relationship.local_key) for relationship in organization.inbound_foreign_keys],
+            [('practitioner', 'organization_id'), ('invoice', 'payer_id')]
+        )
+
+    def test_slots(self):
+        """Test that model objects have no per-instance __dict__."""
+        model = DurcRelationalModel.from_dict(self.relational_model)
+        table = model.get_table('npd', 'public', 'practitioner')
+        for obj in (model, model.databases['npd'], table.schema, table, table.columns[0], table.belongs_to['organization']):
+            self.assertFalse(hasattr(obj, '__dict__'), type(obj).__name__)
+
+    def test_load_model(self):
+        """Test that DurcDataLoader builds the same model from a file, optionally for some databases only."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'model.json')
+            DurcModelWriter.write_relational_model(path, self.relational_model)
+
+            model = DurcDataLoader().load_model(path)
+            self.assertEqual(list(model.tables_by_name), list(DurcRelationalModel.from_dict(self.relational_model).tables_by_name))
+            self.assertEqual(len(model.get_table('npd', 'public', 'organization').inbound_foreign_keys), 2)
+
+            legacy_only = DurcDataLoader().load_model(path, databases={'legacy'})
+            self.assertEqual(list(legacy_only.tables_by_name), ['legacy.account'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+from fnmatch import fnmatchcase
+from durc_is_crud.shared.durc_table_matcher import DurcTableMatcher, DurcTableNameSet
+from durc_is_crud.shared.durc_table_pattern import glob_regex, parse_table_pattern
+
+
+def _naive_matches(patterns, db_name, schema_name, table_name):
+    """The original loop over every parsed pattern, extended with globs."""
+    for pattern in patterns:
+        if not fnmatchcase(db_name, pattern['db']):
+            continue
+        if pattern['schema'] and schema_name is not None and not fnmatchcase(schema_name, pattern['schema']):
+            continue
+        if pattern['table'] and not fnmatchcase(table_name, pattern['table']):
+            continue
+        return True
+    return False
+
+
+class TestDurcTableMatcher(unittest.TestCase):
+    """Test cases for the compiled include/exclude table matcher."""
+
+    def test_parse_table_pattern(self):
+        """Test splitting pattern strings into their parts."""
+        self.assertEqual(parse_table_pattern('npd'), {'db': 'npd', 'schema': None, 'table': None})
+        self.assertEqual(parse_table_pattern('npd.public'), {'db': 'npd', 'schema': 'public', 'table': None})
+        self.assertEqual(parse_table_pattern('npd.*.x_?'), {'db': 'npd', 'schema': '*', 'table': 'x_?'})
+        with self.assertRaises(ValueError):
+            parse_table_pattern('a.b.c.d')
+
+    def test_pattern_levels(self):
+        """Test database, schema and table patterns, with and without a schema layer."""
+        matcher = DurcTableMatcher.from_strings(['legacy', 'npd.billing', 'npd.public.provider_*'])
+
+        self.assertTrue(matcher.matches('legacy', None, 'account'))
+        self.assertTrue(matcher.matches('npd', 'billing', 'invoice'))
+        self.assertTrue(matcher.matches('npd', 'public', 'provider_a'))
+        self.assertFalse(matcher.matches('npd', 'public', 'practitioner'))
+        self.assertFalse(matcher.matches('other', None, 'account'))
+        # Models without a schema layer are not compared on the schema
+        self.assertTrue(matcher.matches('npd', None, 'invoice'))
+        self.assertEqual(matcher.databases, {'legacy', 'npd'})
+
+    def test_exclude_patterns(self):
+        """Test that exclude patterns win over include patterns, at every level."""
+        matcher = DurcTableMatcher.from_strings(['npd'], ['npd.*.*_archive', 'npd.scratch', '*.audit.*'])
+
+        self.assertTrue(matcher.matches('npd', 'public', 'provider'))
+        self.assertFalse(matcher.matches('npd', 'public', 'provider_archive'))
+        self.assertFalse(matcher.matches('npd', 'scratch', 'provider'))
+        self.assertFalse(matcher.matches('npd', 'audit', 'log'))
+
+        # Without include patterns every table is included, and unknown databases are not compared
+        matcher = DurcTableMatcher.from_strings(None, ['*.*.tmp_*'])
+        self.assertIsNone(matcher.databases)
+        self.assertTrue(matcher.matches(None, None, 'provider'))
+        self.assertFalse(matcher.matches(None, None, 'tmp_load'))
+
+    def test_matches_pattern_loop(self):
+        """Test that the matcher accepts exactly what a loop over every pattern accepts."""
+        strings = ['npd.public', 'npd.b*.inv?ice', 'npd.*.provider_[ab]', 'legacy.*.user', 'legacy.x.account']
+        patterns = [parse_table_pattern(pattern) for pattern in strings]
+        matcher = DurcTableMatcher.from_strings(strings)
+
+        for db_name in ('npd', 'legacy', 'other'):
+            for schema_name in (None, 'public', 'billing', 'x', 'y'):
+                for table_name in ('invoice', 'inveice', 'provider_a', 'provider_c', 'user', 'account'):
+                    self.assertEqual(
+                        matcher.matches(db_name, schema_name, table_name),
+                        _naive_matches(patterns, db_name, schema_name, table_name),
+                        (db_name, schema_name, table_name)
+                    )
+
+    def test_globs_compiled_once(self):
+        """Test that database and schema globs are compiled when the matcher is built, not per lookup."""
+        matcher = DurcTableMatcher.from_strings(['n*.pub?ic.provider', 'npd.*.invoice'], ['*.tmp_*'])
+
+        with mock.patch('durc_is_crud.shared.durc_table_pattern.translate', side_effect=AssertionError):
+            self.assertTrue(matcher.matches('npd', 'public', 'provider'))
+            self.assertTrue(matcher.matches('npd2', 'pubxic', 'provider'))
+            self.assertTrue(matcher.matches('npd', 'billing', 'invoice'))
+            self.assertFalse(matcher.matches('npd', 'tmp_load', 'invoice'))
+            self.assertFalse(matcher.matches('legacy', 'public', 'provider'))
+
+    def test_globs_tested_only_against_candidates(self):
+        """Test that a table name is only matched against the globs sharing its literal prefix or suffix."""
+        name_set = DurcTableNameSet({'table_1', 'extra_1_*', 'extra_12_*', 'extra_1?', '*_archive', 'log_[0-9]', '*', None})
+        self.assertEqual(sorted(name_set.prefixes), [4, 7, 8, 9])
+        self.assertEqual(name_set.prefixes[7], {'extra_1': [glob_regex('extra_1?')]})
+        self.assertEqual(name_set.prefixes[4], {'log_': [glob_regex('log_[0-9]')]})
+        self.assertEqual(name_set.suffixes, {8: {'_archive': [glob_regex('*_archive')]}})
+        self.assertEqual(name_set.unanchored, [glob_regex('*')])
+
+        self.assertEqual(name_set.candidates('extra_12_a'), [
+            glob_regex('*'), glob_regex('extra_12_*'), glob_regex('extra_1?')
+        ])
+        self.assertTrue('extra_12_a' in name_set and 'anything' in name_set)
+        self.assertEqual(name_set.candidates('log_1'), [glob_regex('*'), glob_regex('log_[0-9]')])
+        self.assertEqual(name_set.candidates('npd_archive'), [glob_regex('*'), glob_regex('*_archive')])
+
+    def test_match_cost_independent_of_pattern_count(self):
+        """Test that the regex matches per table do not grow with the number of patterns."""
+        table_names = [f"table_{i}" for i in range(2000)] + [f"extra_{i}_x" for i in range(2000)]
+
+        def count_matches(pattern_count):
+            strings = [f"npd.public.table_{i}" for i in range(pattern_count)]
+            strings += [f"npd.public.extra_{i}_*" for i in range(pattern_count)]
+            matcher = DurcTableMatcher.from_strings(strings)
+            matcher.matches('npd', 'public', 'table_0')
+            included, _ = matcher._scopes[('npd', 'public')]
+            candidate_count = sum(len(included.candidates(table)) for table in table_names)
+            selected = [table for table in table_names if matcher.matches('npd', 'public', table)]
+            self.assertEqual(len(selected), pattern_count * 2)
+            return candidate_count
+
+        self.assertEqual(count_matches(5), 5)
+        self.assertEqual(count_matches(500), 500)
+        self.assertEqual(count_matches(2000), 2000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from importlib import import_module
+from django.test import TransactionTestCase, override_settings
+from django.conf import settings
+from durc_is_crud.management.commands.durc_utils.compile_engine import DURC_CompileEngine
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'AI_Instructions', 'DURC_simplified.example.json')
+
+
+class TestGeneratedQuerysets(TransactionTestCase):
+    """Test cases for the with_related() querysets and query count tests durc_compile generates."""
+
+    databases = '__all__'
+    package = 'durc_generated_querysets'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        with DurcDataLoader().open_relational_model(MODEL_PATH) as relational_model:
+            DURC_CompileEngine(os.path.join(cls.temp_dir, cls.package)).compile(relational_model.iter_tables())
+        sys.path.insert(0, cls.temp_dir)
+        cls.installed_apps = override_settings(INSTALLED_APPS=settings.INSTALLED_APPS + [f"{cls.package}.blog_db"])
+        cls.installed_apps.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.installed_apps.disable()
+        sys.path.remove(cls.temp_dir)
+        for module in [name for name in sys.modules if name.split('.')[0] == cls.package]:
+            del sys.modules[module]
+        shutil.rmtree(cls.temp_dir)
+
+    def _run_query_count_test(self, model_name):
+        testing = import_module(f"{self.package}.testing")
+        model = getattr(import_module(f"{self.package}.blog_db.models"), model_name)
+        test_case = type(f"{model_name}QueryCountTest", (testing.QueryCountTestCase,), {'model': model})
+        result = unittest.TestResult()
+        unittest.defaultTestLoader.loadTestsFromTestCase(test_case).run(result)
+        return result
+
+    def test_with_related_joins_belongs_to(self):
+        """Test that with_related() joins the planned belongs_to paths and prefetches on request."""
+        models = import_module(f"{self.package}.blog_db.models")
+        queryset = models.PostTag.objects.with_related()
+        self.assertEqual(queryset.query.select_related, {'post': {'author': {}}, 'tag': {}})
+        self.assertEqual(models.Post.objects.with_related(prefetch=True)._prefetch_related_lookups, ('comment', 'post_tag'))
+        self.assertEqual(models.Post.objects.with_related(prefetch=['comment'])._prefetch_related_lookups, ('comment',))
+        self.assertFalse(models.Tag.objects.with_related().query.select_related)
+
+    def test_generated_query_count_tests_pass(self):
+        """Test that the generated query count test passes against real tables and rows."""
+        for model_name in ('Comment', 'Post', 'PostTag', 'User'):
+            result = self._run_query_count_test(model_name)
+            self.assertEqual(result.testsRun, 2, model_name)
+            self.assertEqual(result.failures + result.errors, [], model_name)
+            # Only the prefetch test of a table without has_many relations is skipped
+            skipped = [test.id().rpartition('.')[2] for test, _ in result.skipped]
+            self.assertEqual(skipped, ['test_prefetch_query_count_is_constant'] if model_name == 'PostTag' else [])
+
+    def test_generated_query_count_test_detects_n_plus_one(self):
+        """Test that the generated query count test fails when the foreign keys are not joined."""
+        models = import_module(f"{self.package}.blog_db.models")
+        queryset_class = type(models.Comment.objects.all())
+        with patch.object(queryset_class, 'SELECT_RELATED', []):
+            result = self._run_query_count_test('Comment')
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn('test_list_query_count_is_constant', result.failures[0][0].id())
+
+    def test_seek_pages_by_key_without_offset(self):
+        """Test that seek() pages through every row in key order, starting each page after a key."""
+        testing = import_module(f"{self.package}.testing")
+        models = import_module(f"{self.package}.blog_db.models")
+        self.assertIsNone(testing.create_missing_tables([models.Tag], 'default'))
+        ids = sorted(testing.make_row(models.Tag, 'default').pk for _ in range(5))
+
+        pages = [list(models.Tag.objects.seek(size=2))]
+        while pages[-1]:
+            pages.append(list(models.Tag.objects.seek(after=(pages[-1][-1].pk,), size=2)))
+        self.assertEqual([[row.pk for row in page] for page in pages], [ids[0:2], ids[2:4], ids[4:], []])
+        self.assertNotIn('OFFSET', str(models.Tag.objects.seek(after=(ids[1],), size=2).query).upper())
+
+    def test_seek_on_composite_key(self):
+        """Test that a table without an auto-increment key is ordered and sought by every key column."""
+        models = import_module(f"{self.package}.blog_db.models")
+        queryset = models.PostTag.objects.seek(after=(3, 7))
+        self.assertEqual(queryset.query.order_by, ('post_id', 'tag_id'))
+        self.assertIn(
+            'WHERE ("post_tag"."post_id" > 3 OR ("post_tag"."post_id" = 3 AND "post_tag"."tag_id" > 7))',
+            str(queryset.query),
+        )
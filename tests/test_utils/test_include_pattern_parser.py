@@ -1,6 +1,7 @@
 import unittest
 from django.core.management.base import CommandError
 from durc_is_crud.management.commands.durc_utils.include_pattern_parser import DURC_IncludePatternParser
+from durc_is_crud.shared.durc_table_matcher import DurcTableMatcher
 
 class TestIncludePatternParser(unittest.TestCase):
     def test_db_only_pattern(self):
@@ -46,6 +47,48 @@ class TestIncludePatternParser(unittest.TestCase):
         
         with self.assertRaises(CommandError):
             DURC_IncludePatternParser.parse_include_patterns(patterns)
+    
+    def test_glob_patterns(self):
+        """Test that schema and table globs are kept, and database globs are only allowed in exclude patterns"""
+        result = DURC_IncludePatternParser.parse_include_patterns(['npd.public.provider_*', 'npd.*'])
+        self.assertEqual(result[0], {'db': 'npd', 'schema': 'public', 'table': 'provider_*'})
+        self.assertEqual(result[1], {'db': 'npd', 'schema': '*', 'table': None})
+        
+        with self.assertRaises(CommandError):
+            DURC_IncludePatternParser.parse_include_patterns(['n*.public'])
+        
+        result = DURC_IncludePatternParser.parse_exclude_patterns(['*.*.*_archive'])
+        self.assertEqual(result[0], {'db': '*', 'schema': '*', 'table': '*_archive'})
+        
+        with self.assertRaisesRegex(CommandError, 'Invalid exclude pattern'):
+            DURC_IncludePatternParser.parse_exclude_patterns(['a.b.c.d'])
+    
+    def test_glob_to_like(self):
+        """Test the translation of globs into LIKE patterns"""
+        self.assertEqual(DURC_IncludePatternParser.glob_to_like('provider_*'), 'provider!_%')
+        self.assertEqual(DURC_IncludePatternParser.glob_to_like('?100%!'), '_100!%!!')
+        self.assertEqual(DURC_IncludePatternParser.glob_to_like('log_[0-9]*'), 'log!__%')
+        self.assertEqual(DURC_IncludePatternParser.glob_to_like('a[]]b'), 'a_b')
+        self.assertEqual(DURC_IncludePatternParser.glob_to_like('a[b'), 'a[b')
+        
+        self.assertTrue(DURC_IncludePatternParser.matches('log_[0-9]*', 'log_2024'))
+        self.assertFalse(DURC_IncludePatternParser.matches('log_[0-9]*', 'log_old'))
+        self.assertTrue(DURC_IncludePatternParser.matches(None, 'anything'))
+    
+    def test_patterns_build_matcher(self):
+        """Test that the parsed patterns select the same tables in DurcTableMatcher as the strings they came from"""
+        include = ['npd.public.provider_*', 'npd.b*']
+        exclude = ['*.*.*_archive']
+        parsed = DurcTableMatcher(
+            DURC_IncludePatternParser.parse_include_patterns(include),
+            DURC_IncludePatternParser.parse_exclude_patterns(exclude)
+        )
+        from_strings = DurcTableMatcher.from_strings(include, exclude)
+        
+        for schema_name, table_name in [('public', 'provider_a'), ('public', 'provider_archive'),
+                                        ('billing', 'invoice'), ('scratch', 'provider_a')]:
+            self.assertEqual(parsed.matches('npd', schema_name, table_name),
+                             from_strings.matches('npd', schema_name, table_name))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,115 @@
+import os
+import json
+import shutil
+import tempfile
+from unittest import mock
+from django.test import TransactionTestCase
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from durc_is_crud.management.commands.durc_utils.incremental_mining import DURC_IncrementalMiningState
+from durc_is_crud.management.commands.durc_utils.data_type_mapper import DURC_DataTypeMapper
+from .information_schema_fixture import (
+    attach_information_schema, detach_information_schema, add_table, add_column, add_foreign_key,
+    add_synthetic_schema
+)
+
+
+class TestIncrementalMining(TransactionTestCase):
+    """Test that incremental re-mining only refreshes tables whose catalog rows changed."""
+
+    def setUp(self):
+        attach_information_schema()
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.temp_dir, 'DURC_relational_model.json')
+        self.patterns = [{'db': 'default', 'schema': 'public', 'table': None}]
+        add_synthetic_schema('public', 6)
+
+    def tearDown(self):
+        detach_information_schema()
+        shutil.rmtree(self.temp_dir)
+
+    def _mine(self, incremental=None):
+        return DURC_RelationalModelExtractor.extract_relational_model(
+            self.patterns, mock.MagicMock(), mock.MagicMock(), incremental=incremental
+        )
+
+    def _mine_incrementally(self):
+        """Run an incremental mine the way durc_mine does: load, extract, write, save."""
+        incremental = DURC_IncrementalMiningState.load(self.output_path)
+        relational_model = self._mine(incremental)
+        with open(self.output_path, 'w') as f:
+            json.dump(relational_model, f, indent=2)
+        incremental.save(self.output_path)
+        return relational_model, incremental
+
+    def test_first_run_mines_everything(self):
+        """Test that without a previous run every table is refreshed and fingerprints are stored."""
+        relational_model, incremental = self._mine_incrementally()
+
+        self.assertEqual(incremental.reused_tables, [])
+        self.assertEqual(len(incremental.refreshed_tables), 6)
+        self.assertEqual(relational_model, self._mine())
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'DURC_relational_model.fingerprints.json')))
+
+    def test_unchanged_tables_are_reused(self):
+        """Test that a second run over an unchanged catalog reuses every table."""
+        first_model, _ = self._mine_incrementally()
+
+        with mock.patch.object(DURC_RelationalModelExtractor, '_process_table') as mock_process_table:
+            second_model, incremental = self._mine_incrementally()
+
+        mock_process_table.assert_not_called()
+        self.assertEqual(len(incremental.reused_tables), 6)
+        self.assertEqual(incremental.refreshed_tables, [])
+        self.assertEqual(json.dumps(second_model, indent=2), json.dumps(first_model, indent=2))
+
+    def test_changed_tables_are_refreshed(self):
+        """Test that a new foreign key refreshes the changed table and the table it points at."""
+        self._mine_incrementally()
+
+        add_column('public', 'table_4', ('owner_table_1_id', 'integer', 'YES', None))
+        add_foreign_key('public', 'table_4', 'owner_table_1_id', 'public', 'table_1', 'id')
+        relational_model, incremental = self._mine_incrementally()
+
+        self.assertEqual(sorted(incremental.refreshed_tables), ['default.public.table_1', 'default.public.table_4'])
+        self.assertEqual(len(incremental.reused_tables), 4)
+        self.assertEqual(json.dumps(relational_model, indent=2), json.dumps(self._mine(), indent=2))
+        self.assertIn('owner_table_1_table_4', relational_model['default']['table_1']['has_many'])
+
+    def test_new_table_refreshes_naming_convention_matches(self):
+        """Test that adding a table refreshes tables whose *_id columns now resolve to it."""
+        add_table('public', 'vote', [('id', 'integer', 'NO', None), ('ballot_id', 'integer', 'YES', None)],
+                  primary_key=['id'])
+        self._mine_incrementally()
+
+        add_table('public', 'ballot', [('id', 'integer', 'NO', None)], primary_key=['id'])
+        relational_model, incremental = self._mine_incrementally()
+
+        self.assertEqual(sorted(incremental.refreshed_tables), ['default.public.ballot', 'default.public.vote'])
+        self.assertEqual(relational_model['default']['vote']['belongs_to']['ballot']['to_table'], 'ballot')
+
+    def test_fingerprint_version_mismatch_mines_everything(self):
+        """Test that fingerprints from another fingerprint version are ignored."""
+        self._mine_incrementally()
+
+        version = DURC_IncrementalMiningState.FINGERPRINT_VERSION + 1
+        with mock.patch.object(DURC_IncrementalMiningState, 'FINGERPRINT_VERSION', version):
+            _, incremental = self._mine_incrementally()
+
+        self.assertEqual(incremental.reused_tables, [])
+        self.assertEqual(len(incremental.refreshed_tables), 6)
+
+    def test_registered_type_mines_everything(self):
+        """Test that a type registered since the previous run refreshes tables whose catalog rows did not change."""
+        self._mine_incrementally()
+
+        exact_types = {dialect: dict(types) for dialect, types in DURC_DataTypeMapper.EXACT_TYPES.items()}
+        with mock.patch.object(DURC_DataTypeMapper, 'EXACT_TYPES', exact_types):
+            DURC_DataTypeMapper.register_type('character varying', 'text')
+            try:
+                relational_model, incremental = self._mine_incrementally()
+            finally:
+                DURC_DataTypeMapper.clear_cache()
+
+        self.assertEqual(incremental.reused_tables, [])
+        self.assertEqual(len(incremental.refreshed_tables), 6)
+        self.assertEqual(relational_model['default']['table_0']['column_data'][1]['data_type'], 'text')
@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+from django.core.management.base import CommandError
+from durc_is_crud.management.commands.durc_utils.introspection_backends import (
+    DURC_InformationSchemaBackend, DURC_PgCatalogBackend, DURC_SQLiteBackend, INTROSPECTION_BACKENDS
+)
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+
+
+def _sql_attributes(backend_class):
+    return {name: getattr(backend_class, name) for name in dir(backend_class)
+            if name.endswith('_SQL') and not name.startswith('_')}
+
+
+class TestIntrospectionBackends(unittest.TestCase):
+    """Test cases for the catalog introspection backends."""
+
+    def test_backend_selection(self):
+        """Test that PostgreSQL gets the pg_catalog backend and other engines get information_schema."""
+        self.assertIsInstance(DURC_RelationalModelExtractor._get_introspection_backend(True), DURC_PgCatalogBackend)
+        backend = DURC_RelationalModelExtractor._get_introspection_backend(False)
+        self.assertIs(type(backend), DURC_InformationSchemaBackend)
+
+        # An explicit backend name overrides the automatic choice
+        backend = DURC_RelationalModelExtractor._get_introspection_backend(True, 'information_schema')
+        self.assertIs(type(backend), DURC_InformationSchemaBackend)
+
+        with self.assertRaises(CommandError):
+            DURC_RelationalModelExtractor._get_introspection_backend(True, 'no_such_backend')
+
+    def test_pg_catalog_backend_avoids_information_schema(self):
+        """Test that every pg_catalog query reads pg_catalog and takes the same parameters."""
+        base_sql = _sql_attributes(DURC_InformationSchemaBackend)
+        pg_sql = _sql_attributes(DURC_PgCatalogBackend)
+
+        self.assertEqual(set(base_sql), set(pg_sql))
+        for name, sql in pg_sql.items():
+            self.assertIsNot(sql, base_sql[name], f"{name} is not overridden")
+            self.assertIn('pg_catalog.', sql, name)
+            self.assertNotIn('information_schema.', sql, name)
+            self.assertEqual(
+                sql.replace('%%', '').count('%s'), base_sql[name].replace('%%', '').count('%s'), name
+            )
+
+    def test_pg_catalog_nullability_matches_information_schema(self):
+        """Test that columns of a NOT NULL domain are NOT NULL, as information_schema.columns reports them."""
+        for name in ('TABLE_COLUMNS_SQL', 'SCHEMA_COLUMNS_SQL'):
+            sql = getattr(DURC_PgCatalogBackend, name)
+            self.assertIn("CASE WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) THEN 'NO' ELSE 'YES' END", sql, name)
+            self.assertIn('JOIN pg_catalog.pg_type t ON t.oid = a.atttypid', sql, name)
+
+    def test_sqlite_backend_reads_pragmas(self):
+        """Test that every SQLite query reads the pragma functions and takes the same parameters."""
+        base_sql = _sql_attributes(DURC_InformationSchemaBackend)
+        sqlite_sql = _sql_attributes(DURC_SQLiteBackend)
+
+        self.assertEqual(set(base_sql), set(sqlite_sql))
+        for name, sql in sqlite_sql.items():
+            self.assertIsNot(sql, base_sql[name], f"{name} is not overridden")
+            self.assertIn('pragma_table_list', sql, name)
+            self.assertNotIn('information_schema.', sql, name)
+            self.assertEqual(
+                sql.replace('%%', '').count('%s'), base_sql[name].replace('%%', '').count('%s'), name
+            )
+
+    def test_backend_registry(self):
+        """Test that every backend is registered by name."""
+        self.assertIs(INTROSPECTION_BACKENDS['information_schema'], DURC_InformationSchemaBackend)
+        self.assertIs(INTROSPECTION_BACKENDS['pg_catalog'], DURC_PgCatalogBackend)
+        self.assertIs(INTROSPECTION_BACKENDS['sqlite'], DURC_SQLiteBackend)
+
+    @mock.patch('durc_is_crud.management.commands.durc_utils.relational_model_extractor.connections')
+    def test_postgresql_extraction_uses_pg_catalog(self, mock_connections):
+        """Test that mining a PostgreSQL database issues pg_catalog queries only."""
+        mock_conn = mock.MagicMock()
+        mock_conn.settings_dict = {'ENGINE': 'django.db.backends.postgresql'}
+        mock_cursor = mock.MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connections.__contains__.return_value = True
+        mock_connections.__getitem__.return_value = mock_conn
+
+        mock_cursor.fetchall.side_effect = [
+            [('users',)],
+            [('public', 'users', True)],
+            [('id', 'integer', 'NO', None), ('name', 'character varying', 'YES', None)],
+            [('id',)],
+            [],
+            [],
+            [],
+            [],
+        ]
+
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            [{'db': 'npd', 'schema': 'public', 'table': None}], mock.MagicMock(), mock.MagicMock()
+        )
+
+        self.assertEqual(result['npd']['public']['users']['schema'], 'public')
+        self.assertEqual(
+            [col['data_type'] for col in result['npd']['public']['users']['column_data']], ['int', 'varchar']
+        )
+        executed_sql = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertEqual(len(executed_sql), 8)
+        for sql in executed_sql:
+            self.assertIn('pg_catalog.', sql)
+            self.assertNotIn('information_schema.', sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
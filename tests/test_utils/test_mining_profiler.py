@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from durc_is_crud.management.commands.durc_utils.mining_profiler import DURC_MiningProfiler
+from durc_is_crud.management.commands.durc_utils.query_counter import DURC_QueryCounter
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from .information_schema_fixture import (
+    attach_information_schema, detach_information_schema, add_table, add_synthetic_schema
+)
+
+
+class TestMiningProfiler(TransactionTestCase):
+    """Test the per-phase, per-table profile of a mining run."""
+
+    def setUp(self):
+        attach_information_schema()
+        self.patterns = [
+            {'db': 'default', 'schema': 'public', 'table': None},
+            {'db': 'default', 'schema': 'other', 'table': None},
+        ]
+        add_synthetic_schema('public', 5)
+        add_table('other', 'audit', [('id', 'integer', 'NO', None), ('table_1_id', 'integer', 'YES', None)],
+                  primary_key=['id'])
+
+    def tearDown(self):
+        detach_information_schema()
+
+    def _profile(self, **options):
+        profiler = DURC_MiningProfiler(top_n=3)
+        query_counter = DURC_QueryCounter()
+        DURC_RelationalModelExtractor.extract_relational_model(
+            self.patterns, mock.MagicMock(), mock.MagicMock(), query_counter=query_counter, profiler=profiler, **options
+        )
+        return profiler.report(), query_counter.query_count
+
+    def test_per_table_mode(self):
+        """Test that every catalog query is counted in its phase and every table is timed."""
+        report, query_count = self._profile()
+        phases = report['phases']
+
+        self.assertEqual(report['query_count'], query_count)
+        self.assertEqual(report['table_count'], 6)
+        # Two schema listings and one table index, then one query per kind of row for each table
+        self.assertEqual(phases['table_listing']['queries'], 3)
+        self.assertEqual(phases['columns']['queries'], 6)
+        self.assertEqual(phases['primary_keys']['queries'], 6)
+        self.assertEqual(phases['foreign_keys']['queries'], 12)
+        self.assertEqual(phases['has_many']['queries'], 6)
+        self.assertEqual(phases['cross_schema_scan']['queries'], 6)
+        self.assertEqual(phases['other']['queries'], 0)
+        for phase in ('linked_keys', 'has_many', 'relationship_graph'):
+            self.assertGreater(phases[phase]['seconds'], 0)
+
+        latency = report['table_latency_ms']
+        self.assertEqual(list(latency), ['p50', 'p90', 'p95', 'p99', 'max'])
+        self.assertEqual(sorted(latency.values()), list(latency.values()))
+
+        slowest = report['slowest_tables']
+        self.assertEqual(len(slowest), 3)
+        self.assertEqual([entry['ms'] for entry in slowest], sorted((entry['ms'] for entry in slowest), reverse=True))
+        self.assertEqual(slowest[0]['ms'], latency['max'])
+        self.assertTrue(all(entry['queries'] == 6 for entry in slowest))
+
+    def test_bulk_and_pipeline_modes(self):
+        """Test that schema-level and combined batch queries are attributed too."""
+        report, query_count = self._profile(bulk=True)
+        self.assertEqual(report['query_count'], query_count)
+        self.assertEqual(report['phases']['columns']['queries'], 2)
+        self.assertEqual(report['phases']['cross_schema_scan']['queries'], 2)
+
+        report, query_count = self._profile(pipeline=True)
+        self.assertEqual(report['query_count'], query_count)
+        self.assertEqual(report['phases']['catalog_batch']['queries'], 12)
+        self.assertEqual(report['phases']['columns']['queries'], 0)
+
+    def test_durc_mine_profile(self):
+        """Test that durc_mine --profile writes the report next to the model."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            output_path = os.path.join(temp_dir, 'model.json')
+            out = StringIO()
+            call_command('durc_mine', include=['default.public', 'default.other'], output_json_file=output_path,
+                         profile=True, profile_top=2, stream=True, stdout=out)
+
+            profile_path = os.path.join(temp_dir, 'model.profile.json')
+            self.assertIn(f"Wrote mining profile to {profile_path}", out.getvalue())
+            with open(profile_path) as f:
+                report = json.load(f)
+            self.assertEqual(report['version'], DURC_MiningProfiler.PROFILE_VERSION)
+            self.assertEqual(report['table_count'], 6)
+            self.assertEqual(len(report['slowest_tables']), 2)
+            self.assertEqual(list(report['phases']), list(DURC_MiningProfiler.PHASES))
+        finally:
+            shutil.rmtree(temp_dir)
@@ -0,0 +1,52 @@
+import unittest
+from durc_is_crud.management.commands.durc_utils.query_planner import DURC_QueryPlanner
+
+
+def _key(table):
+    return ('npd', 'public', table)
+
+
+class TestQueryPlanner(unittest.TestCase):
+    """Test cases for planning the related rows of the generated querysets."""
+
+    def test_chain_is_followed_to_max_depth(self):
+        """Test that a chain of single foreign keys is joined up to MAX_SELECT_DEPTH levels."""
+        edges = {_key(f"t{i}"): [('next', _key(f"t{i + 1}"), f"t{i}")] for i in range(5)}
+        edges[_key('t5')] = []
+        plans = DURC_QueryPlanner.plan(edges)
+
+        self.assertEqual(plans[_key('t0')]['select_related'], ['next', 'next__next', 'next__next__next'])
+        self.assertEqual(plans[_key('t0')]['depth'], DURC_QueryPlanner.MAX_SELECT_DEPTH)
+        self.assertEqual(plans[_key('t4')]['select_related'], ['next'])
+        self.assertEqual(plans[_key('t5')], {'select_related': [], 'prefetch_related': ['t4'], 'depth': 0})
+
+    def test_wide_tables_get_shallow_plans(self):
+        """Test that a level that would exceed MAX_SELECT_JOINS is not added, but direct keys always are."""
+        lookup_edges = [(f"lookup_{i}", _key(f"lookup_{i}"), 'claim') for i in range(10)]
+        edges = {_key('claim'): lookup_edges, _key('line'): [('claim', _key('claim'), 'line')]}
+        for i in range(10):
+            edges[_key(f"lookup_{i}")] = [('code_set', _key('code_set'), f"lookup_{i}")]
+        edges[_key('code_set')] = []
+        plans = DURC_QueryPlanner.plan(edges)
+
+        self.assertEqual(len(plans[_key('claim')]['select_related']), 10)
+        self.assertEqual(plans[_key('claim')]['depth'], 1)
+        # line -> claim is one join; claim's ten lookups would make eleven
+        self.assertEqual(plans[_key('line')]['select_related'], ['claim'])
+
+    def test_cycles_are_not_followed(self):
+        """Test that a path never returns to a table it passed through, except a direct self reference."""
+        edges = {
+            _key('comment'): [('parent', _key('comment'), 'parent_comment'), ('user', _key('user'), 'comment')],
+            _key('user'): [('mentor', _key('user'), 'mentor_user')],
+        }
+        plans = DURC_QueryPlanner.plan(edges)
+
+        self.assertEqual(plans[_key('comment')]['select_related'], ['parent', 'user', 'parent__user'])
+        self.assertEqual(plans[_key('user')]['select_related'], ['mentor'])
+        self.assertEqual(plans[_key('user')]['prefetch_related'], ['comment', 'mentor_user'])
+        self.assertEqual(plans[_key('comment')]['prefetch_related'], ['parent_comment'])
+
+
+if __name__ == '__main__':
+    unittest.main()
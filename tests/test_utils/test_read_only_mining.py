@@ -0,0 +1,209 @@
+import json
+from unittest import mock
+from django.db import connection
+from django.db.utils import OperationalError
+from django.test import TransactionTestCase
+from durc_is_crud.management.commands.durc_utils.read_only_mining import DURC_ReadOnlyMining
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from .information_schema_fixture import (
+    attach_information_schema, detach_information_schema, add_table, add_synthetic_schema
+)
+
+
+class _RecordingCursor:
+    """Cursor stand-in that records the statements of a fake connection."""
+
+    def __init__(self, statements, row):
+        self.statements = statements
+        self.row = row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    def fetchone(self):
+        return self.row
+
+
+class _RecordingConnection:
+    """Connection stand-in for checking the statements sent to other database engines."""
+
+    def __init__(self, vendor, row=('00000003-0000001B-1',)):
+        self.vendor = vendor
+        self.alias = 'default'
+        self.in_atomic_block = False
+        self.statements = []
+        self.row = row
+
+    def cursor(self):
+        return _RecordingCursor(self.statements, self.row)
+
+
+class _TimeoutCause(Exception):
+    sqlstate = '57014'
+
+
+def _timeout_error():
+    error = OperationalError('canceling statement due to statement timeout')
+    error.__cause__ = _TimeoutCause()
+    return error
+
+
+class TestReadOnlyMining(TransactionTestCase):
+    """Test the read-only, timeout-limited mining mode."""
+
+    def setUp(self):
+        attach_information_schema()
+        self.mock_style = mock.MagicMock()
+        for level in ('SUCCESS', 'WARNING', 'ERROR'):
+            getattr(self.mock_style, level).side_effect = lambda message, level=level: f"{level}: {message}"
+        self.patterns = [
+            {'db': 'default', 'schema': 'public', 'table': None},
+            {'db': 'default', 'schema': 'other', 'table': None},
+        ]
+        add_synthetic_schema('public', 4)
+        add_table('other', 'audit', [('id', 'integer', 'NO', None), ('table_1_id', 'integer', 'YES', None)],
+                  primary_key=['id'])
+
+    def tearDown(self):
+        detach_information_schema()
+
+    def _extract(self, **options):
+        messages = []
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            self.patterns, messages.append, self.mock_style, **options
+        )
+        return result, messages
+
+    def test_read_only_matches_default_mode(self):
+        """Test that read-only mode gives the same model, serially and with workers, and closes its transaction."""
+        plain_model, _ = self._extract()
+        for workers in (1, 2):
+            read_only_model, messages = self._extract(read_only=DURC_ReadOnlyMining(), workers=workers)
+            self.assertEqual(json.dumps(read_only_model, indent=2), json.dumps(plain_model, indent=2))
+            self.assertFalse([message for message in messages if message.startswith(('ERROR', 'WARNING'))])
+            self.assertFalse(connection.in_atomic_block)
+
+    @mock.patch('durc_is_crud.management.commands.durc_utils.read_only_mining.time.sleep')
+    def test_timed_out_table_is_retried_with_backoff(self, mock_sleep):
+        """Test that a table that times out twice is retried with doubling delays and still mined."""
+        process_table = DURC_RelationalModelExtractor._process_table
+        failures = {'table_2': 2}
+
+        def flaky_process_table(conn, cursor, db_name, schema_name, table, *args, **kwargs):
+            if failures.get(table):
+                failures[table] -= 1
+                # Run a query first, as a real timeout would, so the savepoint has something to roll back
+                cursor.execute("SELECT 1")
+                raise _timeout_error()
+            return process_table(conn, cursor, db_name, schema_name, table, *args, **kwargs)
+
+        with mock.patch.object(DURC_RelationalModelExtractor, '_process_table', side_effect=flaky_process_table):
+            result, messages = self._extract(read_only=DURC_ReadOnlyMining(backoff_seconds=0.25))
+
+        self.assertIn('table_2', result['default'])
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [0.25, 0.5])
+        self.assertIn(
+            "WARNING: Timed out mining table default.public.table_2 (attempt 1 of 4), retrying in 0.25s", messages
+        )
+
+    @mock.patch('durc_is_crud.management.commands.durc_utils.read_only_mining.time.sleep')
+    def test_table_that_keeps_timing_out_is_skipped(self, mock_sleep):
+        """Test that only the table that keeps timing out is left out, and other errors still fail the database."""
+        process_table = DURC_RelationalModelExtractor._process_table
+
+        def failing_process_table(conn, cursor, db_name, schema_name, table, *args, **kwargs):
+            if table == 'table_1':
+                raise _timeout_error()
+            return process_table(conn, cursor, db_name, schema_name, table, *args, **kwargs)
+
+        with mock.patch.object(DURC_RelationalModelExtractor, '_process_table', side_effect=failing_process_table):
+            result, messages = self._extract(read_only=DURC_ReadOnlyMining(retries=1))
+
+        self.assertEqual(sorted(result['default']), ['audit', 'table_0', 'table_2', 'table_3'])
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertIn(
+            "ERROR: Skipped table default.public.table_1: timed out 2 times "
+            "(canceling statement due to statement timeout)",
+            messages
+        )
+
+        with mock.patch.object(DURC_RelationalModelExtractor, '_process_table',
+                               side_effect=OperationalError('relation does not exist')):
+            result, messages = self._extract(read_only=DURC_ReadOnlyMining())
+        self.assertEqual(result['default'], {})
+        self.assertIn("ERROR: Database operation error: relation does not exist", messages)
+
+    def test_postgresql_transaction_statements(self):
+        """Test the statements that start the coordinating and the worker transactions on PostgreSQL."""
+        read_only = DURC_ReadOnlyMining(lock_timeout_ms=250, statement_timeout_ms=5000)
+        coordinator = _RecordingConnection('postgresql')
+        worker = _RecordingConnection('postgresql')
+
+        with mock.patch('durc_is_crud.management.commands.durc_utils.read_only_mining.transaction.atomic'):
+            with read_only.coordinate(coordinator, export_snapshot=True):
+                with read_only.transaction(worker):
+                    pass
+
+        timeouts = (
+            "SELECT set_config('lock_timeout', %s, true), set_config('statement_timeout', %s, true)",
+            ['250ms', '5000ms']
+        )
+        self.assertEqual(coordinator.statements, [
+            ("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY", None),
+            timeouts,
+            ("SELECT pg_export_snapshot()", None),
+        ])
+        self.assertEqual(worker.statements, [
+            ("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY", None),
+            ("SET TRANSACTION SNAPSHOT '00000003-0000001B-1'", None),
+            timeouts,
+        ])
+
+    def test_mysql_session_variables_restored(self):
+        """Test that the MySQL session timeouts are set for the transaction and set back after it, even on errors."""
+        read_only = DURC_ReadOnlyMining(lock_timeout_ms=2500, statement_timeout_ms=5000)
+        conn = _RecordingConnection('mysql', row=(0, 31536000, 50))
+
+        with mock.patch('durc_is_crud.management.commands.durc_utils.read_only_mining.transaction.atomic'):
+            with self.assertRaises(OperationalError):
+                with read_only.transaction(conn):
+                    raise _timeout_error()
+
+        self.assertEqual(conn.statements, [
+            ("SELECT @@SESSION.max_execution_time, @@SESSION.lock_wait_timeout, "
+             "@@SESSION.innodb_lock_wait_timeout", None),
+            ("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY", None),
+            ("SET SESSION max_execution_time = %s", [5000]),
+            ("SET SESSION lock_wait_timeout = %s", [3]),
+            ("SET SESSION innodb_lock_wait_timeout = %s", [3]),
+            ("SET SESSION max_execution_time = %s, lock_wait_timeout = %s, innodb_lock_wait_timeout = %s",
+             [0, 31536000, 50]),
+        ])
+
+        # A block joining an open transaction leaves the session alone
+        conn.statements.clear()
+        conn.in_atomic_block = True
+        with read_only.transaction(conn):
+            pass
+        self.assertEqual(conn.statements, [])
+
+    def test_is_timeout_error(self):
+        """Test timeout detection for PostgreSQL, MySQL and other errors."""
+        self.assertTrue(DURC_ReadOnlyMining.is_timeout_error(_timeout_error()))
+
+        lock_not_available = OperationalError('canceling statement due to lock timeout')
+        lock_not_available.__cause__ = type('LockNotAvailable', (Exception,), {'sqlstate': '55P03'})()
+        self.assertTrue(DURC_ReadOnlyMining.is_timeout_error(lock_not_available))
+
+        deadlock = OperationalError('deadlock detected')
+        deadlock.__cause__ = type('DeadlockDetected', (Exception,), {'sqlstate': '40P01'})()
+        self.assertFalse(DURC_ReadOnlyMining.is_timeout_error(deadlock))
+
+        self.assertTrue(DURC_ReadOnlyMining.is_timeout_error(OperationalError(3024, 'Query execution was interrupted')))
+        self.assertFalse(DURC_ReadOnlyMining.is_timeout_error(OperationalError('no such table: audit')))
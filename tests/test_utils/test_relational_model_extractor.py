@@ -1,9 +1,22 @@
+import json
+import sqlite3
+import types
 import unittest
+from contextlib import contextmanager
 from unittest import mock
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.db import connection
 from django.core.management.base import CommandError
 from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from durc_is_crud.management.commands.durc_utils.query_counter import DURC_QueryCounter
+from durc_is_crud.management.commands.durc_utils.introspection_backends import (
+    DURC_InformationSchemaBackend, DURC_SQLiteBackend
+)
+from durc_is_crud.management.commands.durc_utils.mining_profiler import DURC_MiningProfiler
+from durc_is_crud.management.commands.durc_utils.read_only_mining import DURC_ReadOnlyMining
+from .information_schema_fixture import (
+    attach_information_schema, detach_information_schema, add_table, add_synthetic_schema
+)
 
 class TestRelationalModelExtractor(TestCase):
     """Test cases for the DURC_RelationalModelExtractor utility."""
@@ -149,3 +162,334 @@ class TestRelationalModelExtractor(TestCase):
         self.assertTrue(user_id_column['is_foreign_key'])
         self.assertTrue(user_id_column['is_linked_key'])
         self.assertEqual(user_id_column['foreign_table'], 'user')
+    
+    def test_create_table_sql_primary_key_order(self):
+        """Test that a composite primary key is written in column order, not in set order."""
+        columns_data = [
+            ('tenant_id', 'integer', 'NO', None),
+            ('provider_id', 'integer', 'NO', None),
+            ('note', 'text', 'YES', None),
+            ('address_id', 'integer', 'NO', None),
+        ]
+        for primary_keys in ({'address_id', 'provider_id', 'tenant_id'}, {'tenant_id', 'address_id', 'provider_id'}):
+            create_table_sql = DURC_RelationalModelExtractor._generate_create_table_sql(
+                'public', 'provider_address', columns_data, primary_keys, {}
+            )
+            self.assertIn("  PRIMARY KEY (tenant_id, provider_id, address_id)", create_table_sql)
+
+
+class TestRelationalModelExtractorBulkMode(TransactionTestCase):
+    """Test that bulk catalog extraction matches per-table extraction with a constant query count."""
+    
+    def setUp(self):
+        attach_information_schema()
+        self.mock_style = mock.MagicMock()
+        self.mock_stdout_writer = mock.MagicMock()
+        self.patterns = [{'db': 'default', 'schema': 'public', 'table': None}]
+    
+    def tearDown(self):
+        detach_information_schema()
+    
+    def _extract(self, bulk):
+        query_counter = DURC_QueryCounter()
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            self.patterns, self.mock_stdout_writer, self.mock_style, bulk=bulk, query_counter=query_counter
+        )
+        return result, query_counter.query_count
+    
+    def test_bulk_mode_matches_per_table_mode(self):
+        """Test that bulk mode produces exactly the same relational model as per-table mode."""
+        add_synthetic_schema('public', 6)
+        add_table('public', 'vote', [
+            ('id', 'integer', 'NO', None),
+            ('table_3_id', 'integer', 'YES', None),
+            ('up_table_2_id', 'integer', 'YES', None),
+            ('lookup_id', 'integer', 'YES', None),
+            ('missing_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+        add_table('other', 'lookup', [('id', 'integer', 'NO', None)], primary_key=['id'])
+        add_table('other', 'audit', [
+            ('id', 'integer', 'NO', None),
+            ('vote_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+        
+        per_table_model, _ = self._extract(bulk=False)
+        bulk_model, _ = self._extract(bulk=True)
+        
+        self.assertEqual(len(per_table_model['default']), 7)
+        self.assertEqual(json.dumps(bulk_model, indent=2), json.dumps(per_table_model, indent=2))
+        
+        vote = bulk_model['default']['vote']
+        self.assertEqual(vote['belongs_to']['table_3']['to_table'], 'table_3')
+        self.assertEqual(vote['belongs_to']['up_table_2']['to_table'], 'table_2')
+        self.assertEqual(vote['belongs_to']['lookup']['to_schema'], 'other')
+        self.assertNotIn('missing', vote['belongs_to'])
+        self.assertIn('other_audit', vote['has_many'])
+        self.assertIn('table_1', bulk_model['default']['table_0']['has_many'])
+        # Derived from vote's pattern-based belongs_to by the relationship graph pass
+        self.assertTrue(bulk_model['default']['table_2']['has_many']['up_table_2_vote']['is_derived'])
+    
+    def test_bulk_mode_query_count_is_constant(self):
+        """Test that the number of queries in bulk mode does not grow with the number of tables."""
+        add_synthetic_schema('public', 5)
+        _, small_per_table_count = self._extract(bulk=False)
+        _, small_bulk_count = self._extract(bulk=True)
+        
+        add_synthetic_schema('other', 1)
+        for i in range(5, 50):
+            add_table('public', f"extra_{i}", [('id', 'integer', 'NO', None), ('table_0_id', 'integer', 'YES', None)])
+        _, large_per_table_count = self._extract(bulk=False)
+        _, large_bulk_count = self._extract(bulk=True)
+        
+        self.assertEqual(small_bulk_count, large_bulk_count)
+        self.assertGreater(large_per_table_count, small_per_table_count)
+        self.assertLess(large_bulk_count, large_per_table_count)
+    
+    def test_linked_keys_use_table_index(self):
+        """Test that linked key detection adds no queries per *_id column."""
+        add_table('other', 'region', [('id', 'integer', 'NO', None)], primary_key=['id'])
+        id_columns = [(f"table_{i}_id", 'integer', 'YES', None) for i in range(20)]
+        add_table('public', 'wide', [('id', 'integer', 'NO', None), ('region_id', 'integer', 'YES', None)] + id_columns,
+                  primary_key=['id'])
+        add_synthetic_schema('public', 3)
+        
+        result, query_count = self._extract(bulk=False)
+        
+        # One table listing, one table index, and six catalog queries per table
+        self.assertEqual(query_count, 2 + 6 * 4)
+        wide = result['default']['wide']
+        self.assertEqual(wide['belongs_to']['region']['to_schema'], 'other')
+        self.assertEqual(wide['belongs_to']['table_2']['to_table'], 'table_2')
+        self.assertNotIn('table_3', wide['belongs_to'])
+
+
+class _PipelineConnection:
+    """Stands in for a psycopg 3 connection: records pipeline flushes, runs queries on the test database."""
+    
+    def __init__(self):
+        self.flushes = 0
+        self.cursors = 0
+    
+    @contextmanager
+    def pipeline(self):
+        yield
+        self.flushes += 1
+    
+    def cursor(self):
+        self.cursors += 1
+        return connection.cursor()
+
+
+class _QueryCanceled(sqlite3.OperationalError):
+    """Driver error like psycopg.errors.QueryCanceled, which Django has not wrapped."""
+    sqlstate = '57014'
+
+
+class _TimingOutPipelineConnection(_PipelineConnection):
+    """Pipeline connection whose flush hits the statement timeout."""
+    
+    @contextmanager
+    def pipeline(self):
+        yield
+        self.flushes += 1
+        raise _QueryCanceled('canceling statement due to statement timeout')
+
+
+class TestRelationalModelExtractorPipelineMode(TransactionTestCase):
+    """Test that pipeline mode batches the per-table catalog queries without changing the output."""
+    
+    def setUp(self):
+        attach_information_schema()
+        self.mock_style = mock.MagicMock()
+        self.mock_stdout_writer = mock.MagicMock()
+        add_synthetic_schema('public', 60)
+        add_synthetic_schema('other', 2)
+        add_table('public', 'vote', [
+            ('id', 'integer', 'NO', None),
+            ('table_3_id', 'integer', 'YES', None),
+            ('table_0_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+    
+    def tearDown(self):
+        detach_information_schema()
+    
+    def _extract(self, patterns, pipeline):
+        query_counter = DURC_QueryCounter()
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            patterns, self.mock_stdout_writer, self.mock_style, query_counter=query_counter, pipeline=pipeline
+        )
+        return result, query_counter.query_count
+    
+    def test_pipeline_mode_matches_per_table_mode(self):
+        """Test that combined statements give the same model with six queries per batch of tables."""
+        patterns = [{'db': 'default', 'schema': 'public', 'table': None}]
+        per_table_model, per_table_count = self._extract(patterns, pipeline=False)
+        pipeline_model, pipeline_count = self._extract(patterns, pipeline=True)
+        
+        self.assertEqual(len(per_table_model['default']), 61)
+        self.assertEqual(json.dumps(pipeline_model, indent=2), json.dumps(per_table_model, indent=2))
+        # One table listing, one table index, and six catalog queries per table or per batch of 50
+        self.assertEqual(per_table_count, 2 + 6 * 61)
+        self.assertEqual(pipeline_count, 2 + 6 * 2)
+    
+    def test_pipeline_mode_for_selected_tables(self):
+        """Test that adjacent table patterns for one schema share a table listing and a batch."""
+        patterns = [
+            {'db': 'default', 'schema': 'public', 'table': 'vote'},
+            {'db': 'default', 'schema': 'public', 'table': 'missing'},
+            {'db': 'default', 'schema': 'public', 'table': 'table_3'},
+        ]
+        per_table_model, per_table_count = self._extract(patterns, pipeline=False)
+        pipeline_model, pipeline_count = self._extract(patterns, pipeline=True)
+        
+        self.assertEqual(list(per_table_model['default']), ['vote', 'table_3'])
+        self.assertEqual(json.dumps(pipeline_model, indent=2), json.dumps(per_table_model, indent=2))
+        self.assertEqual(per_table_count, 3 + 1 + 6 * 2)
+        self.assertEqual(pipeline_count, 1 + 1 + 6)
+    
+    def test_psycopg_pipeline_is_used_when_available(self):
+        """Test that every per-table query is queued in a single pipeline flush when the driver supports it."""
+        backend = DURC_InformationSchemaBackend()
+        pipeline_connection = _PipelineConnection()
+        tables = ['vote', 'table_0', 'table_3']
+        
+        catalog = backend.load_tables_catalog(types.SimpleNamespace(connection=pipeline_connection), 'public', tables)
+        
+        self.assertEqual(pipeline_connection.flushes, 1)
+        self.assertEqual(pipeline_connection.cursors, 6 * len(tables))
+        with connection.cursor() as cursor:
+            for table in tables:
+                expected = backend.load_table_catalog(cursor, 'public', table)
+                self.assertEqual(catalog.columns[table], expected.columns[table])
+                self.assertEqual(catalog.foreign_keys[table], expected.foreign_keys[table])
+                self.assertEqual(catalog.referencing_keys[table], expected.referencing_keys[table])
+                self.assertEqual(catalog.named_references[f"{table}_id"], expected.named_references[f"{table}_id"])
+    
+    def test_psycopg_pipeline_queries_are_counted_and_profiled(self):
+        """Test that queries queued on the raw connection still reach the query counter and the profiler."""
+        query_counter = DURC_QueryCounter()
+        profiler = DURC_MiningProfiler()
+        pipeline_connection = _PipelineConnection()
+        cursor = profiler.wrap_cursor(query_counter.wrap_cursor(types.SimpleNamespace(connection=pipeline_connection)))
+        
+        DURC_InformationSchemaBackend().load_tables_catalog(cursor, 'public', ['vote', 'table_0'])
+        
+        self.assertEqual(pipeline_connection.flushes, 1)
+        self.assertEqual(query_counter.query_count, 6 * 2)
+        report = profiler.report()
+        self.assertEqual(report['query_count'], 6 * 2)
+        self.assertEqual(report['phases']['columns']['queries'], 2)
+    
+    def test_psycopg_pipeline_timeout_is_retried(self):
+        """Test that a timeout raised by the raw pipeline cursors is retried and falls back to per-table queries."""
+        patterns = [{'db': 'default', 'schema': 'public', 'table': None}]
+        per_table_model = DURC_RelationalModelExtractor.extract_relational_model(
+            patterns, self.mock_stdout_writer, self.mock_style
+        )
+        
+        pipeline_connection = _TimingOutPipelineConnection()
+        load_tables_catalog = DURC_InformationSchemaBackend.load_tables_catalog
+        
+        def load_with_pipeline(backend, cursor, schema_name, tables):
+            pipeline_cursor = types.SimpleNamespace(connection=pipeline_connection, db=cursor.db)
+            return load_tables_catalog(backend, pipeline_cursor, schema_name, tables)
+        
+        messages = []
+        style = mock.MagicMock()
+        style.ERROR.side_effect = style.WARNING.side_effect = str
+        with mock.patch.object(DURC_InformationSchemaBackend, 'load_tables_catalog', load_with_pipeline):
+            pipeline_model = DURC_RelationalModelExtractor.extract_relational_model(
+                patterns, messages.append, style, pipeline=True,
+                read_only=DURC_ReadOnlyMining(retries=1, backoff_seconds=0)
+            )
+        
+        self.assertEqual(json.dumps(pipeline_model, indent=2), json.dumps(per_table_model, indent=2))
+        # Two batches, each tried twice before falling back
+        self.assertEqual(pipeline_connection.flushes, 4)
+        self.assertEqual(len([message for message in messages if str(message).startswith('Skipped catalog batch')]), 2)
+    
+    def test_combined_statement_is_ordered(self):
+        """Test that a combined statement orders its rows instead of relying on the order of UNION ALL branches."""
+        for backend, schema_name, tables in (
+            (DURC_InformationSchemaBackend(), 'public', ['vote', 'table_0', 'table_3']),
+            (DURC_SQLiteBackend(), 'main', ['django_migrations', 'django_content_type']),
+        ):
+            with connection.cursor() as cursor:
+                statements = []
+                
+                def execute(sql, params=None):
+                    statements.append(sql)
+                    return cursor.execute(sql, params)
+                
+                recording_cursor = types.SimpleNamespace(execute=execute, fetchall=cursor.fetchall)
+                catalog = backend.load_tables_catalog(recording_cursor, schema_name, tables)
+                
+                self.assertEqual(len(statements), 6)
+                for sql in statements:
+                    self.assertTrue(sql.endswith('ORDER BY durc_query, durc_ordinal'), sql)
+                for table in tables:
+                    expected = backend.load_table_catalog(cursor, schema_name, table)
+                    self.assertTrue(expected.columns[table])
+                    self.assertEqual(catalog.columns[table], expected.columns[table])
+                    self.assertEqual(catalog.foreign_keys[table], expected.foreign_keys[table])
+
+
+class TestRelationalModelExtractorWorkers(TransactionTestCase):
+    """Test that mining patterns with a worker pool gives the same result as a serial run."""
+    
+    def setUp(self):
+        attach_information_schema()
+        self.mock_style = mock.MagicMock()
+        for level in ('SUCCESS', 'WARNING', 'ERROR'):
+            getattr(self.mock_style, level).side_effect = lambda message, level=level: f"{level}: {message}"
+        self.patterns = [
+            {'db': 'default', 'schema': 'public', 'table': None},
+            {'db': 'default', 'schema': 'other', 'table': None},
+            {'db': 'default', 'schema': 'public', 'table': 'vote'},
+            {'db': 'default', 'schema': 'public', 'table': 'missing'},
+        ]
+        add_synthetic_schema('public', 8)
+        add_synthetic_schema('other', 4)
+        add_table('public', 'vote', [
+            ('id', 'integer', 'NO', None),
+            ('up_table_2_id', 'integer', 'YES', None),
+            ('audit_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+        add_table('other', 'audit', [('id', 'integer', 'NO', None), ('vote_id', 'integer', 'YES', None)],
+                  primary_key=['id'])
+    
+    def tearDown(self):
+        detach_information_schema()
+    
+    def _extract(self, workers, bulk=False):
+        messages = []
+        query_counter = DURC_QueryCounter()
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            self.patterns, messages.append, self.mock_style, bulk=bulk, query_counter=query_counter, workers=workers
+        )
+        return result, messages, query_counter.query_count
+    
+    def test_workers_output_is_identical_to_serial(self):
+        """Test that the JSON output and the messages do not depend on the number of workers."""
+        for bulk in (False, True):
+            serial_model, serial_messages, serial_count = self._extract(workers=1, bulk=bulk)
+            parallel_model, parallel_messages, parallel_count = self._extract(workers=4, bulk=bulk)
+            
+            # Not PostgreSQL, so both schemas share the db -> table layer
+            self.assertEqual(len(serial_model['default']), 10)
+            self.assertEqual(json.dumps(parallel_model, indent=2), json.dumps(serial_model, indent=2))
+            self.assertEqual(parallel_messages, serial_messages)
+            self.assertFalse([message for message in parallel_messages if message.startswith('ERROR')])
+            # The table index is still built once per database
+            self.assertEqual(parallel_count, serial_count)
+    
+    def test_unknown_database_uses_default_connection(self):
+        """Test that a pattern for an unconfigured database falls back to the default connection."""
+        self.patterns = [
+            {'db': 'default', 'schema': 'other', 'table': 'audit'},
+            {'db': 'unknown_db', 'schema': 'public', 'table': 'vote'},
+        ]
+        result, messages, _ = self._extract(workers=2)
+        
+        self.assertIn("WARNING: Database 'unknown_db' not found in settings, using default connection", messages)
+        self.assertIn('vote', result['unknown_db'])
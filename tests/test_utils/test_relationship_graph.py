@@ -0,0 +1,117 @@
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+from durc_is_crud.management.commands.durc_utils.relationship_graph import DURC_RelationshipGraph
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from durc_is_crud.shared.durc_model_writer import DurcModelWriter
+
+
+def _table(db_name, table, foreign_keys=(), linked_keys=(), has_many=None, schema=None):
+    """A table entry with belongs_to edges for the given declared and linked *_id columns."""
+    column_data = [{'column_name': 'id', 'is_foreign_key': False}]
+    belongs_to = {}
+    for is_declared, keys in ((True, foreign_keys), (False, linked_keys)):
+        for local_key, to_table, to_schema in keys:
+            column_data.append({'column_name': local_key, 'is_foreign_key': is_declared})
+            relationship = {'prefix': None, 'type': to_table, 'to_table': to_table, 'to_db': db_name, 'local_key': local_key}
+            if to_schema:
+                relationship['to_schema'] = to_schema
+            belongs_to[local_key[:-3]] = relationship
+
+    table_info = {'table_name': table, 'db': db_name, 'column_data': column_data}
+    if schema:
+        table_info['schema'] = schema
+    if has_many:
+        table_info['has_many'] = has_many
+    if belongs_to:
+        table_info['belongs_to'] = belongs_to
+    return table_info
+
+
+class TestRelationshipGraph(unittest.TestCase):
+    """Test cases for deriving has_many relationships from belongs_to edges."""
+
+    def setUp(self):
+        declared_has_many = {
+            'post': {'prefix': None, 'type': 'post', 'from_table': 'post', 'from_db': 'blog', 'from_column': 'user_id'}
+        }
+        self.flat_model = {
+            'blog': {
+                'user': _table('blog', 'user', has_many=declared_has_many),
+                'post': _table('blog', 'post', foreign_keys=[('user_id', 'user', None)]),
+                'comment': _table('blog', 'comment', linked_keys=[('post_id', 'post', None), ('other_user_id', 'user', None)]),
+                '_audit': _table('blog', '_audit', linked_keys=[('user_id', 'user', None)]),
+            }
+        }
+        self.schema_model = {
+            'npd': {
+                'public': {
+                    'organization': _table('npd', 'organization', schema='public'),
+                },
+                'billing': {
+                    'invoice': _table('npd', 'invoice', linked_keys=[('organization_id', 'organization', 'public')],
+                                      schema='billing'),
+                },
+            }
+        }
+
+    def test_inferred_and_pattern_based_links(self):
+        """Test that same-schema *_id links and pattern-based links reach the target's has_many."""
+        derived_count = DURC_RelationshipGraph.complete_relational_model(self.flat_model)
+        blog = self.flat_model['blog']
+
+        self.assertEqual(derived_count, 2)
+        self.assertEqual(blog['post']['has_many'], {
+            'comment': {
+                'prefix': None, 'type': 'comment', 'from_table': 'comment', 'from_db': 'blog',
+                'from_column': 'post_id', 'is_inferred': True, 'is_derived': True,
+            }
+        })
+        self.assertEqual(list(blog['user']['has_many']), ['post', 'other_user_comment'])
+        self.assertEqual(blog['user']['has_many']['other_user_comment']['prefix'], 'other_user')
+        # The declared foreign key was already on has_many, and _audit is skipped like in the extractor
+        self.assertNotIn('is_derived', blog['user']['has_many']['post'])
+        self.assertNotIn('_audit', blog['user']['has_many'])
+        # has_many stays before belongs_to
+        self.assertEqual(list(blog['post']), ['table_name', 'db', 'column_data', 'has_many', 'belongs_to'])
+
+    def test_schema_layer(self):
+        """Test that cross-schema edges in a schema-layer model record the source schema."""
+        DURC_RelationshipGraph.complete_relational_model(self.schema_model)
+
+        has_many = self.schema_model['npd']['public']['organization']['has_many']
+        self.assertEqual(has_many['invoice']['from_schema'], 'billing')
+        self.assertTrue(has_many['invoice']['is_inferred'])
+
+    def test_stale_derived_entries_are_replaced(self):
+        """Test that the pass is idempotent and drops derived entries whose belongs_to edge is gone."""
+        DURC_RelationshipGraph.complete_relational_model(self.flat_model)
+        once = copy.deepcopy(self.flat_model)
+        DURC_RelationshipGraph.complete_relational_model(self.flat_model)
+        self.assertEqual(self.flat_model, once)
+
+        del self.flat_model['blog']['comment']['belongs_to']['post']
+        DURC_RelationshipGraph.complete_relational_model(self.flat_model)
+        self.assertNotIn('has_many', self.flat_model['blog']['post'])
+
+    def test_model_file(self):
+        """Test that completing a model file gives the same result as completing it in memory."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            input_path = os.path.join(temp_dir, 'mined.json')
+            output_path = os.path.join(temp_dir, 'model.json')
+            DurcModelWriter.write_relational_model(input_path, self.flat_model)
+
+            derived_count = DURC_RelationshipGraph.complete_model_file(input_path, output_path, DurcModelWriter)
+            DURC_RelationshipGraph.complete_relational_model(self.flat_model)
+
+            self.assertEqual(derived_count, 2)
+            self.assertEqual(DurcDataLoader().load_relational_model(output_path), self.flat_model)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
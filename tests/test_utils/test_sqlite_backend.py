@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from durc_is_crud.management.commands.durc_utils.include_pattern_parser import DURC_IncludePatternParser
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from .information_schema_fixture import attach_information_schema, detach_information_schema, add_table
+
+
+SQLITE_DDL = [
+    """CREATE TABLE sq_provider (
+        id integer NOT NULL PRIMARY KEY,
+        name varchar(50) NOT NULL,
+        rank integer DEFAULT 0
+    )""",
+    """CREATE TABLE sq_address (
+        id integer NOT NULL PRIMARY KEY,
+        sq_provider_id integer REFERENCES sq_provider (id),
+        street text
+    )""",
+    """CREATE TABLE sq_note (
+        id integer NOT NULL PRIMARY KEY,
+        sq_provider_id integer,
+        body text
+    )""",
+]
+
+# The same tables, as the information_schema backend would see them. SQLite reports the
+# INTEGER and TEXT type names in upper case.
+FIXTURE_TABLES = [
+    ('sq_provider', [
+        ('id', 'INTEGER', 'NO', None), ('name', 'varchar(50)', 'NO', None), ('rank', 'INTEGER', 'YES', '0'),
+    ], []),
+    ('sq_address', [
+        ('id', 'INTEGER', 'NO', None), ('sq_provider_id', 'INTEGER', 'YES', None), ('street', 'TEXT', 'YES', None),
+    ], [('sq_provider_id', 'main', 'sq_provider', 'id')]),
+    ('sq_note', [
+        ('id', 'INTEGER', 'NO', None), ('sq_provider_id', 'INTEGER', 'YES', None), ('body', 'TEXT', 'YES', None),
+    ], []),
+]
+
+
+class TestSQLiteBackend(TransactionTestCase):
+    """Test mining real SQLite tables through the pragma functions."""
+
+    def setUp(self):
+        self.mock_style = mock.MagicMock()
+        for level in ('SUCCESS', 'WARNING', 'ERROR'):
+            getattr(self.mock_style, level).side_effect = lambda message, level=level: f"{level}: {message}"
+        with connection.cursor() as cursor:
+            for ddl in SQLITE_DDL:
+                cursor.execute(ddl)
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            for table in ('sq_note', 'sq_address', 'sq_provider'):
+                cursor.execute(f"DROP TABLE {table}")
+
+    def _extract(self, include, **options):
+        messages = []
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            DURC_IncludePatternParser.parse_include_patterns(include), messages.append, self.mock_style, **options
+        )
+        self.assertFalse([message for message in messages if message.startswith('ERROR')], messages)
+        return result
+
+    def test_relational_model_structure(self):
+        """Test columns, keys and relationships mined from the pragma functions."""
+        result = self._extract(['default.main.sq_*'], introspection_backend='sqlite')
+
+        self.assertEqual(sorted(result['default']), ['sq_address', 'sq_note', 'sq_provider'])
+        provider = result['default']['sq_provider']
+        self.assertNotIn('schema', provider)
+        self.assertEqual(
+            [(col['column_name'], col['data_type'], col['is_nullable']) for col in provider['column_data']],
+            [('id', 'int', False), ('name', 'varchar', False), ('rank', 'int', True)]
+        )
+        self.assertTrue(provider['column_data'][0]['is_primary_key'])
+        self.assertEqual(provider['column_data'][2]['default_value'], '0')
+
+        address = result['default']['sq_address']
+        self.assertEqual(address['belongs_to']['sq_provider']['to_table'], 'sq_provider')
+        self.assertEqual(provider['has_many']['sq_address']['from_table'], 'sq_address')
+        # A *_id column without a declared foreign key is found through the table index
+        self.assertTrue(result['default']['sq_note']['column_data'][1]['is_linked_key'])
+
+    def test_same_model_as_information_schema(self):
+        """Test that every extraction mode produces the model the information_schema backend does."""
+        results = [
+            self._extract(['default.main.sq_*'], introspection_backend='sqlite', **options)
+            for options in ({}, {'bulk': True}, {'pipeline': True}, {'workers': 2})
+        ]
+
+        attach_information_schema()
+        try:
+            for table, columns, foreign_keys in FIXTURE_TABLES:
+                add_table('main', table, columns, primary_key=['id'], foreign_keys=foreign_keys)
+            expected = self._extract(['default.main.sq_*'], introspection_backend='information_schema')
+        finally:
+            detach_information_schema()
+
+        # pragma_table_list does not list tables in creation order
+        for result in results:
+            self.assertEqual(json.dumps(result, indent=2, sort_keys=True), json.dumps(expected, indent=2, sort_keys=True))
+
+    def test_mixed_case_references(self):
+        """Test that bulk mining finds the has_many of a table referenced with different case, as per-table mining does."""
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE sq_user (id integer NOT NULL PRIMARY KEY)")
+            cursor.execute("CREATE TABLE sq_login (id integer NOT NULL PRIMARY KEY, owner integer REFERENCES SQ_User (id))")
+        try:
+            per_table = self._extract(['default.main.sq_*'], introspection_backend='sqlite')
+            bulk = self._extract(['default.main.sq_*'], introspection_backend='sqlite', bulk=True)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("DROP TABLE sq_login")
+                cursor.execute("DROP TABLE sq_user")
+
+        self.assertEqual(per_table['default']['sq_user']['has_many']['sq_login']['from_table'], 'sq_login')
+        self.assertEqual(json.dumps(bulk, indent=2, sort_keys=True), json.dumps(per_table, indent=2, sort_keys=True))
+
+    def test_durc_mine_with_sqlite_introspection(self):
+        """Test that durc_mine mines the main schema of a SQLite database with --introspection sqlite."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            output_path = os.path.join(temp_dir, 'model.json')
+            call_command('durc_mine', include=['default'], introspection='sqlite',
+                         output_json_file=output_path, stdout=StringIO())
+            model = DurcDataLoader().load_relational_model(output_path)
+            self.assertIn('sq_provider', model['default'])
+            self.assertNotIn('sqlite_sequence', model['default'])
+        finally:
+            shutil.rmtree(temp_dir)
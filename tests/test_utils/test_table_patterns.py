@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from durc_is_crud.management.commands.durc_utils.include_pattern_parser import DURC_IncludePatternParser
+from durc_is_crud.management.commands.durc_utils.introspection_backends import DURC_PgCatalogBackend
+from durc_is_crud.management.commands.durc_utils.query_counter import DURC_QueryCounter
+from durc_is_crud.management.commands.durc_utils.relational_model_extractor import DURC_RelationalModelExtractor
+from durc_is_crud.shared.durc_data_loader import DurcDataLoader
+from .information_schema_fixture import (
+    attach_information_schema, detach_information_schema, add_table, add_synthetic_schema
+)
+
+
+class TestTablePatterns(TransactionTestCase):
+    """Test that include and exclude globs select a slice of a schema in the table listing query."""
+
+    def setUp(self):
+        attach_information_schema()
+        self.mock_style = mock.MagicMock()
+        for level in ('SUCCESS', 'WARNING', 'ERROR'):
+            getattr(self.mock_style, level).side_effect = lambda message, level=level: f"{level}: {message}"
+        add_synthetic_schema('public', 40)
+        for table in ('provider_a', 'provider_b', 'provider_archive', 'providerx'):
+            add_table('public', table, [
+                ('id', 'integer', 'NO', None),
+                ('up_table_1_id', 'integer', 'YES', None),
+            ], primary_key=['id'])
+        add_table('other', 'audit', [('id', 'integer', 'NO', None)], primary_key=['id'])
+        add_table('other', 'audit_archive', [('id', 'integer', 'NO', None)], primary_key=['id'])
+
+    def tearDown(self):
+        detach_information_schema()
+
+    def _extract(self, include, exclude=(), **options):
+        messages = []
+        query_counter = DURC_QueryCounter()
+        result = DURC_RelationalModelExtractor.extract_relational_model(
+            DURC_IncludePatternParser.parse_include_patterns(include), messages.append, self.mock_style,
+            query_counter=query_counter, exclude_patterns=DURC_IncludePatternParser.parse_exclude_patterns(exclude),
+            **options
+        )
+        return result, messages, query_counter.query_count
+
+    def test_slice_costs_in_proportion_to_the_slice(self):
+        """Test that mining a glob slice reads the catalog of the matching tables only."""
+        result, messages, query_count = self._extract(['default.public.provider_*'], ['default.*.*_archive'])
+
+        self.assertEqual(list(result['default']), ['provider_a', 'provider_b'])
+        # One listing query and the table index, then one query per kind of row for each table
+        self.assertEqual(query_count, 2 + 6 * 2)
+        self.assertFalse([message for message in messages if message.startswith(('ERROR', 'WARNING'))])
+
+        # Pattern-based relationships still resolve against every table in the schema
+        full_result, _, full_query_count = self._extract(['default.public'])
+        self.assertGreater(full_query_count, 6 * 40)
+        self.assertEqual(
+            json.dumps(result['default']['provider_a'], indent=2),
+            json.dumps(full_result['default']['provider_a'], indent=2)
+        )
+        self.assertEqual(result['default']['provider_a']['belongs_to']['up_table_1']['to_table'], 'table_1')
+
+    def test_slice_and_full_mine_ignore_views_alike(self):
+        """Test that a view in the schema gives a slice the same relationships as the whole schema."""
+        add_table('public', 'provider_c', [
+            ('id', 'integer', 'NO', None),
+            ('billing_account_id', 'integer', 'YES', None),
+        ], primary_key=['id'])
+        add_table('public', 'account', [('id', 'integer', 'NO', None)], table_type='VIEW')
+
+        full_result, _, _ = self._extract(['default.public'])
+        self.assertNotIn('account', full_result['default'])
+        for options in ({}, {'bulk': True}):
+            result, _, _ = self._extract(['default.public.provider_*'], ['default.*.*_archive'], **options)
+            self.assertEqual(
+                json.dumps(result['default']['provider_c'], indent=2),
+                json.dumps(full_result['default']['provider_c'], indent=2)
+            )
+
+    def test_slice_in_bulk_and_pipeline_modes(self):
+        """Test that the other extraction modes mine the same slice."""
+        expected, _, _ = self._extract(['default.public.provider_?'])
+        self.assertEqual(list(expected['default']), ['provider_a', 'provider_b'])
+        for options in ({'bulk': True}, {'pipeline': True}, {'workers': 2}):
+            result, _, _ = self._extract(['default.public.provider_?'], **options)
+            self.assertEqual(json.dumps(result, indent=2), json.dumps(expected, indent=2))
+
+    def test_schema_globs_and_excluded_schemas(self):
+        """Test that a schema glob is expanded and that whole schemas can be excluded."""
+        result, messages, _ = self._extract(['default.*'], ['default.public', 'default.other.*_archive'])
+
+        self.assertEqual(list(result['default']), ['audit'])
+        self.assertIn("Excluded schema: default.public", messages)
+
+        result, messages, _ = self._extract(['default.o*.audit*'])
+        self.assertEqual(list(result['default']), ['audit', 'audit_archive'])
+
+        result, messages, _ = self._extract(['default.missing_*'])
+        self.assertNotIn('default', result)
+        self.assertIn("WARNING: No schema in database 'default' matches 'missing_*'", messages)
+
+    def test_literal_table_excluded_without_warning(self):
+        """Test that literal table names still warn when missing, but not when excluded."""
+        _, messages, _ = self._extract(
+            ['default.public.provider_archive', 'default.public.no_such_table'], ['default.public.*_archive']
+        )
+        self.assertEqual(messages.count("WARNING: Table 'no_such_table' not found in schema 'public'"), 1)
+        self.assertFalse([message for message in messages if 'provider_archive' in message])
+
+    def test_durc_mine_include_and_exclude(self):
+        """Test that durc_mine passes --include globs and --exclude patterns to the extractor."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            output_path = os.path.join(temp_dir, 'model.json')
+            call_command('durc_mine', include=['default.public.provider*', 'default.other'],
+                         exclude=['default.*.*_archive', 'default.public.providerx'],
+                         output_json_file=output_path, stdout=StringIO())
+            model = DurcDataLoader().load_relational_model(output_path)
+            self.assertEqual(sorted(model['default']), ['audit', 'provider_a', 'provider_b'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_pg_catalog_listing_predicates(self):
+        """Test the LIKE predicates added to the pg_catalog table listing query."""
+        cursor = mock.MagicMock()
+        cursor.fetchall.return_value = [('provider_a',), ('Provider_B',), ('provider_archive',)]
+
+        tables = DURC_PgCatalogBackend().list_tables(cursor, 'public', ['provider_*'], ['*_archive'])
+
+        sql, params = cursor.execute.call_args.args
+        self.assertTrue(sql.startswith(DURC_PgCatalogBackend.TABLES_SQL))
+        self.assertIn("AND (c.relname LIKE %s ESCAPE '!')", sql)
+        self.assertIn("AND (c.relname NOT LIKE %s ESCAPE '!')", sql)
+        self.assertEqual(params, ['public', 'provider!_%', '%!_archive'])
+        # Rows that only match because of a case-insensitive collation are dropped
+        self.assertEqual(tables, ['provider_a'])
@@ -0,0 +1,79 @@
+import time
+import unittest
+from durc_is_crud.management.commands.durc_utils.table_suffix_index import DURC_TableSuffixIndex
+
+
+def _naive_matches(col_name, table_names):
+    """All tables the original linear scan would have accepted for a column."""
+    return [table for table in table_names
+            if col_name.endswith(f"_{table}_id") and col_name != f"{table}_id"]
+
+
+def _time_lookups(suffix_index, col_names, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for col_name in col_names:
+            suffix_index.find_table(col_name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class TestTableSuffixIndex(unittest.TestCase):
+    """Test cases for the DURC_TableSuffixIndex class."""
+
+    def setUp(self):
+        self.tables = ['user', 'other_user', 'post', 'post_tag', 'tag', 'address']
+        self.suffix_index = DURC_TableSuffixIndex(self.tables)
+
+    def test_find_table(self):
+        """Test that prefix_{table_name}_id columns resolve to the table."""
+        self.assertEqual(self.suffix_index.find_table('author_user_id'), 'user')
+        self.assertEqual(self.suffix_index.find_table('shipping_address_id'), 'address')
+        self.assertEqual(self.suffix_index.find_table('_tag_id'), 'tag')
+
+    def test_longest_table_wins(self):
+        """Test that the longest matching table name is chosen."""
+        self.assertEqual(self.suffix_index.find_table('a_other_user_id'), 'other_user')
+        self.assertEqual(self.suffix_index.find_table('main_post_tag_id'), 'post_tag')
+
+    def test_no_match(self):
+        """Test columns that do not follow the pattern."""
+        # A bare {table_name}_id is a linked key, not a pattern-based relationship
+        self.assertIsNone(self.suffix_index.find_table('user_id'))
+        self.assertIsNone(self.suffix_index.find_table('author_user'))
+        self.assertIsNone(self.suffix_index.find_table('superuser_id'))
+        self.assertIsNone(self.suffix_index.find_table('a_comment_id'))
+        self.assertIsNone(self.suffix_index.find_table('id'))
+        self.assertIsNone(self.suffix_index.find_table('_id'))
+
+    def test_matches_linear_scan(self):
+        """Test that the trie accepts exactly what the linear scan accepts, preferring the longest."""
+        col_names = [
+            'id', 'user_id', 'other_user_id', 'a_other_user_id', 'x_user_id', 'post_tag_id',
+            'main_post_tag_id', 'tag_id', 'xtag_id', 'a__tag_id', 'home_address_id', 'name',
+        ]
+        for col_name in col_names:
+            matches = _naive_matches(col_name, self.tables)
+            expected = max(matches, key=len) if matches else None
+            self.assertEqual(self.suffix_index.find_table(col_name), expected, col_name)
+
+    def test_lookup_time_independent_of_table_count(self):
+        """Micro-benchmark: lookups against 10k tables cost about the same as against 100."""
+        col_names = [f"owner_table_{i}_id" for i in range(0, 100_000, 97)]
+        col_names += [f"owner_missing_{i}_id" for i in range(0, 100_000, 97)]
+
+        small_index = DURC_TableSuffixIndex(f"table_{i}" for i in range(100))
+        large_index = DURC_TableSuffixIndex(f"table_{i}" for i in range(10_000))
+
+        self.assertEqual(large_index.find_table('owner_table_9999_id'), 'table_9999')
+        small_time = _time_lookups(small_index, col_names)
+        large_time = _time_lookups(large_index, col_names)
+
+        # Generous bound to stay stable on loaded machines; the linear scan is ~100x slower here
+        self.assertLess(large_time, small_time * 5 + 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from durc_is_crud.management.commands.durc_utils.template_loader import DURC_Template, DURC_TemplateLoader
+
+
+class TestTemplateLoader(unittest.TestCase):
+    """Test cases for the compiled, disk-cached durc_compile templates."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_dir = os.path.join(self.temp_dir, 'templates')
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        os.makedirs(self.template_dir)
+        # Every test starts with an empty in-process cache
+        self.compiled = patch.dict(DURC_TemplateLoader._compiled, clear=True)
+        self.compiled.start()
+
+    def tearDown(self):
+        self.compiled.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _write_template(self, name, text):
+        with open(os.path.join(self.template_dir, name + DURC_TemplateLoader.TEMPLATE_SUFFIX), 'w') as f:
+            f.write(text)
+
+    def _render(self, text, **context):
+        code = DURC_TemplateLoader.compile_source('test', text)
+        return DURC_Template('test', code).render(context)
+
+    def test_expressions_loops_and_conditions(self):
+        """Test substitutions, for loops with tuple targets, if/elif/else and comments."""
+        text = (
+            "{# a comment line #}\n"
+            "class {{ name }}:\n"
+            "{% for field, kind in fields %}\n"
+            "    {{ field }} = {{ kind.upper() }}\n"
+            "{% endfor %}\n"
+            "{% if count > 1 %}\n"
+            "    many = {{ repr(count) }}\n"
+            "{% elif count == 1 %}\n"
+            "    one = True\n"
+            "{% else %}\n"
+            "    pass\n"
+            "{% endif %}\n"
+            "    names = {{ [field for field, _ in fields] }}\n"
+        )
+        fields = [('id', 'auto'), ('name', 'char')]
+        self.assertEqual(
+            self._render(text, name='Provider', fields=fields, count=2),
+            "class Provider:\n    id = AUTO\n    name = CHAR\n    many = 2\n    names = ['id', 'name']\n",
+        )
+        self.assertIn("    one = True\n", self._render(text, name='P', fields=[], count=1))
+        self.assertIn("    pass\n", self._render(text, name='P', fields=[], count=0))
+
+    def test_syntax_errors(self):
+        """Test that malformed templates are rejected with the template name and line."""
+        for text, message in (
+            ("{% for x in y %}\n", "line 1: for block is never closed"),
+            ("{% endif %}\n", "line 1: unexpected endif"),
+            ("a\n{% while x %}\n", "line 2: unknown tag 'while'"),
+            ("a {% if x %} b\n", "line 1: tags must be on a line of their own"),
+            ("{{ 1 + }}\n", "line 1: invalid expression"),
+            ("{% else %}\n", "line 1: else outside of an if block"),
+        ):
+            with self.assertRaises(ValueError) as context:
+                DURC_TemplateLoader.compile_source('broken.py', text)
+            self.assertIn(f"Template broken.py, {message}", str(context.exception))
+
+    def test_missing_variable(self):
+        """Test that rendering without a variable the template uses names the variable."""
+        with self.assertRaises(ValueError) as context:
+            self._render("{{ class_name }}\n")
+        self.assertIn("needs the variable 'class_name'", str(context.exception))
+
+    def test_context_variable_reused_as_loop_variable(self):
+        """Test that a variable read at top level is taken from the context even if a loop also binds it."""
+        text = "{{ item }}\n{% for item in items %}\n- {{ item }}\n{% endfor %}\n{{ item }}\n"
+        self.assertEqual(self._render(text, item='top', items=['a', 'b']), "top\n- a\n- b\nb\n")
+
+        with self.assertRaises(ValueError) as context:
+            self._render(text, items=['a'])
+        self.assertIn("Template test reads a variable before setting it", str(context.exception))
+        self.assertIn("'item'", str(context.exception))
+
+    def test_custom_templates_override_builtin_templates(self):
+        """Test that a custom directory only needs the templates it changes."""
+        self._write_template('package_init.py', "# custom: {{ header }}\n")
+        templates = DURC_TemplateLoader(self.template_dir)
+
+        self.assertEqual(templates.render('package_init.py', header='h'), "# custom: h\n")
+        self.assertEqual(
+            templates.source_path('apps.py'),
+            os.path.join(DURC_TemplateLoader.BUILTIN_DIR, 'apps.py' + DURC_TemplateLoader.TEMPLATE_SUFFIX),
+        )
+        self.assertEqual(DURC_TemplateLoader().render('package_init.py', header='h'), "h\n")
+        with self.assertRaises(FileNotFoundError):
+            templates.get_template('no_such_template.py')
+
+    def test_compiled_templates_are_loaded_from_the_disk_cache(self):
+        """Test that a new process loads compiled templates from the cache instead of compiling them."""
+        DURC_TemplateLoader(cache_dir=self.cache_dir).compile_all()
+        names = DURC_TemplateLoader().template_names()
+        self.assertEqual(len(os.listdir(self.cache_dir)), len(names))
+
+        DURC_TemplateLoader._compiled.clear()
+        with patch.object(DURC_TemplateLoader, 'compile_source', side_effect=AssertionError('compiled again')):
+            templates = DURC_TemplateLoader(cache_dir=self.cache_dir)
+            templates.compile_all()
+            self.assertEqual(templates.render('package_init.py', header='h'), "h\n")
+
+    def test_edited_template_is_compiled_without_flushing_the_cache(self):
+        """Test that an edit to a custom template is picked up and only that template is compiled."""
+        self._write_template('package_init.py', "# first {{ header }}\n")
+        DURC_TemplateLoader(self.template_dir, cache_dir=self.cache_dir).compile_all()
+        first_fingerprint = DURC_TemplateLoader(self.template_dir).fingerprint()
+
+        self._write_template('package_init.py', "# second {{ header }}\n")
+        DURC_TemplateLoader._compiled.clear()
+        with patch.object(DURC_TemplateLoader, 'compile_source', wraps=DURC_TemplateLoader.compile_source) as compile_source:
+            templates = DURC_TemplateLoader(self.template_dir, cache_dir=self.cache_dir)
+            templates.compile_all()
+        self.assertEqual([call.args[0] for call in compile_source.call_args_list], ['package_init.py'])
+        self.assertEqual(templates.render('package_init.py', header='h'), "# second h\n")
+        self.assertNotEqual(templates.fingerprint(), first_fingerprint)
+
+    def test_corrupt_cache_entry_is_compiled_again(self):
+        """Test that an unreadable cache entry is replaced instead of failing the compile."""
+        DURC_TemplateLoader(cache_dir=self.cache_dir).compile_all()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), 'wb') as f:
+                f.write(b'\x00garbage')
+
+        DURC_TemplateLoader._compiled.clear()
+        templates = DURC_TemplateLoader(cache_dir=self.cache_dir)
+        self.assertEqual(templates.render('package_init.py', header='h'), "h\n")
+
+    def test_pickled_loader_keeps_the_sources_it_read(self):
+        """Test that a loader sent to a worker process renders the templates the parent read."""
+        self._write_template('package_init.py', "# before {{ header }}\n")
+        templates = DURC_TemplateLoader(self.template_dir)
+        payload = pickle.dumps(templates)
+
+        self._write_template('package_init.py', "# after {{ header }}\n")
+        worker_templates = pickle.loads(payload)
+        self.assertEqual(worker_templates.render('package_init.py', header='h'), "# before h\n")
+        self.assertEqual(worker_templates.fingerprint(), templates.fingerprint())
+
+
+if __name__ == '__main__':
+    unittest.main()